@@ -224,6 +224,16 @@ public sealed class DataManager : IDisposable
         }
     }
 
+    /// <summary>
+    /// Pushes the active dataset to the given destination path, reporting to
+    /// <paramref name="progress"/>, which another thread may poll while this call runs.
+    /// </summary>
+    public void Push(string path, NativeProgress progress)
+    {
+        ThrowIfDisposed();
+        Check(NativeMethods.e4e_push_with_progress_handle(_handle, path, progress.Handle));
+    }
+
     /// <summary>Validates the active dataset and returns a list of failure messages.</summary>
     public List<string> ValidateFailures()
     {
@@ -254,6 +264,18 @@ public sealed class DataManager : IDisposable
         }
     }
 
+    /// <summary>
+    /// Validates the active dataset, reporting to <paramref name="progress"/>, and returns
+    /// a list of failure messages.
+    /// </summary>
+    public List<string> ValidateFailures(NativeProgress progress)
+    {
+        ThrowIfDisposed();
+        Check(NativeMethods.e4e_validate_with_progress_handle(_handle, out IntPtr ptr, progress.Handle));
+        var json = ReadAndFreeString(ptr);
+        return DeserializeOrThrow<List<string>>(json);
+    }
+
     /// <summary>Removes a mission from the named dataset.</summary>
     public void RemoveMission(string dataset, string mission)
     {
@@ -273,6 +295,25 @@ public sealed class DataManager : IDisposable
         return DeserializeOrThrow<List<string>>(json);
     }
 
+    /// <summary>
+    /// Overrides the I/O limits for this process without persisting them.  Safe to call
+    /// from a progress callback to change the rate of a running operation.
+    /// </summary>
+    /// <param name="bytesPerSec">Read bandwidth limit, 0 for unlimited.</param>
+    /// <param name="filesPerSec">Files opened per second, 0 for unlimited.</param>
+    /// <param name="priority"><c>normal</c>, <c>low</c>, <c>idle</c>, or null to keep the current one.</param>
+    public static void SetIoLimits(ulong bytesPerSec, ulong filesPerSec, string? priority = null)
+    {
+        Check(NativeMethods.e4e_set_io_limits(bytesPerSec, filesPerSec, priority));
+    }
+
+    /// <summary>Persists the I/O limits in the manager configuration and applies them.</summary>
+    public void SetIoConfig(ulong bytesPerSec, ulong filesPerSec, string? priority = null)
+    {
+        ThrowIfDisposed();
+        Check(NativeMethods.e4e_dm_set_io_config(_handle, bytesPerSec, filesPerSec, priority));
+    }
+
     // ── IDisposable ──────────────────────────────────────────────────────────
 
     public void Dispose()
@@ -288,3 +329,48 @@ public sealed class DataManager : IDisposable
         }
     }
 }
+
+/// <summary>
+/// Native progress counters for a push or validate.  Poll them from a UI timer while
+/// the operation runs on a background thread.
+/// </summary>
+public sealed class NativeProgress : IDisposable
+{
+    internal IntPtr Handle { get; private set; }
+
+    public NativeProgress()
+    {
+        Handle = NativeMethods.e4e_progress_new(0, IntPtr.Zero);
+    }
+
+    /// <summary>Returns the current phase, counts and throughput.</summary>
+    public ProgressSnapshot Poll()
+    {
+        if (Handle == IntPtr.Zero)
+            throw new ObjectDisposedException(nameof(NativeProgress));
+        if (NativeMethods.e4e_progress_poll(Handle, out var snapshot) != 0)
+            throw new E4EException(NativeMethods.LastError);
+        return snapshot;
+    }
+
+    /// <summary>
+    /// Asks the running operation to stop at the next file or chunk.  The operation
+    /// then throws an <see cref="E4EException"/> reporting "Operation cancelled".
+    /// </summary>
+    public void Cancel()
+    {
+        if (Handle == IntPtr.Zero)
+            throw new ObjectDisposedException(nameof(NativeProgress));
+        if (NativeMethods.e4e_progress_cancel(Handle) != 0)
+            throw new E4EException(NativeMethods.LastError);
+    }
+
+    public void Dispose()
+    {
+        if (Handle != IntPtr.Zero)
+        {
+            NativeMethods.e4e_progress_free(Handle);
+            Handle = IntPtr.Zero;
+        }
+    }
+}
@@ -1,3 +1,4 @@
+using System.Runtime.InteropServices;
 using System.Text.Json.Serialization;
 
 namespace E4EDataManagement.Native;
@@ -28,3 +29,31 @@ public record DatasetInfo(
     [property: JsonPropertyName("last_site")]     string? LastSite,
     [property: JsonPropertyName("missions")]      List<MissionInfo> Missions,
     [property: JsonPropertyName("active_mission")] string? ActiveMission);
+
+/// <summary>
+/// Phase of a running push or validate, as reported by <see cref="ProgressSnapshot"/>.
+/// </summary>
+public enum ProgressPhase : uint
+{
+    Idle = 0,
+    Hash = 1,
+    Copy = 2,
+    Verify = 3,
+    Done = 4,
+}
+
+/// <summary>
+/// Snapshot of a <see cref="NativeProgress"/> handle.  File and byte counts are per
+/// phase; <see cref="BytesPerSec"/> is smoothed over the whole operation.
+/// </summary>
+[StructLayout(LayoutKind.Sequential)]
+public readonly struct ProgressSnapshot
+{
+    public readonly ProgressPhase Phase;
+    public readonly ulong FilesDone;
+    public readonly ulong FilesTotal;
+    public readonly ulong BytesDone;
+    public readonly ulong BytesTotal;
+    public readonly double BytesPerSec;
+    public readonly double ElapsedSecs;
+}
@@ -134,6 +134,36 @@ internal static class NativeMethods
         out IntPtr @out,
         ProgressCallback? callback);
 
+    [DllImport(LibName, CharSet = CharSet.Ansi, EntryPoint = "e4e_push_with_progress_handle")]
+    internal static extern int e4e_push_with_progress_handle(
+        IntPtr dm,
+        [MarshalAs(UnmanagedType.LPStr)] string path,
+        IntPtr progress);
+
+    [DllImport(LibName, CharSet = CharSet.Ansi, EntryPoint = "e4e_validate_with_progress_handle")]
+    internal static extern int e4e_validate_with_progress_handle(
+        IntPtr dm,
+        out IntPtr @out,
+        IntPtr progress);
+
+    // ── Progress handles ────────────────────────────────────────────────────
+
+    /// <summary>
+    /// Creates a progress handle that can be polled from any thread while an
+    /// operation runs.  Pass IntPtr.Zero as the callback to only poll.
+    /// </summary>
+    [DllImport(LibName, CharSet = CharSet.Ansi, EntryPoint = "e4e_progress_new")]
+    internal static extern IntPtr e4e_progress_new(ulong intervalMs, IntPtr callback);
+
+    [DllImport(LibName, CharSet = CharSet.Ansi, EntryPoint = "e4e_progress_free")]
+    internal static extern void e4e_progress_free(IntPtr progress);
+
+    [DllImport(LibName, CharSet = CharSet.Ansi, EntryPoint = "e4e_progress_poll")]
+    internal static extern int e4e_progress_poll(IntPtr progress, out ProgressSnapshot snapshot);
+
+    [DllImport(LibName, CharSet = CharSet.Ansi, EntryPoint = "e4e_progress_cancel")]
+    internal static extern int e4e_progress_cancel(IntPtr progress);
+
     [DllImport(LibName, CharSet = CharSet.Ansi, EntryPoint = "e4e_remove_mission")]
     internal static extern int e4e_remove_mission(
         IntPtr dm,
@@ -142,4 +172,21 @@ internal static class NativeMethods
 
     [DllImport(LibName, CharSet = CharSet.Ansi, EntryPoint = "e4e_prune")]
     internal static extern int e4e_prune(IntPtr dm, out IntPtr @out);
+
+    /// <summary>
+    /// Overrides the process-wide I/O limits (0 = unlimited) without persisting them.
+    /// A null priority leaves the current priority unchanged.
+    /// </summary>
+    [DllImport(LibName, CharSet = CharSet.Ansi, EntryPoint = "e4e_set_io_limits")]
+    internal static extern int e4e_set_io_limits(
+        ulong bytesPerSec,
+        ulong filesPerSec,
+        [MarshalAs(UnmanagedType.LPStr)] string? priority);
+
+    [DllImport(LibName, CharSet = CharSet.Ansi, EntryPoint = "e4e_dm_set_io_config")]
+    internal static extern int e4e_dm_set_io_config(
+        IntPtr dm,
+        ulong bytesPerSec,
+        ulong filesPerSec,
+        [MarshalAs(UnmanagedType.LPStr)] string? priority);
 }
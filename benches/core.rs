@@ -0,0 +1,178 @@
+//! Micro-benchmarks of the work under `add`, `commit`, `push` and `validate`:
+//! hashing, verified copies, `manifest.json` and the dataset database.
+//!
+//! Run with `cargo bench --no-default-features --features bench`.  Criterion
+//! keeps its results in `target/criterion`, which `benchmarks/e2e.py
+//! --criterion target/criterion` adds to its JSON.
+
+use std::fs;
+use std::path::Path;
+use std::sync::Arc;
+
+use _core::bench::{
+    compute_file_hash, copy_and_verify, load_dataset_state, read_manifest, save_dataset_state,
+    write_manifest, DatasetState, ManifestData, ManifestEntry, MetadataRecord, MissionRecord,
+    MissionState,
+};
+use criterion::{criterion_group, criterion_main, BatchSize, BenchmarkId, Criterion, Throughput};
+use tempfile::{tempdir, TempDir};
+
+const FILE_SIZES: [usize; 3] = [4 << 10, 1 << 20, 16 << 20];
+const MANIFEST_ENTRIES: [usize; 2] = [1_000, 100_000];
+const MISSIONS: [usize; 2] = [10, 100];
+const FILES_PER_MISSION: usize = 1_000;
+
+/// Write `size` bytes of a fixed pattern to `path`.
+fn write_file(path: &Path, size: usize) {
+    let data: Vec<u8> = (0..size).map(|i| (i * 31 % 251) as u8).collect();
+    fs::write(path, data).unwrap();
+}
+
+fn file_size_id(size: usize) -> String {
+    format!("{}KiB", size >> 10)
+}
+
+// ─────────────────────────────────────────────────────────────
+// Files
+// ─────────────────────────────────────────────────────────────
+
+fn bench_hash(c: &mut Criterion) {
+    let dir = tempdir().unwrap();
+    let mut group = c.benchmark_group("compute_file_hash");
+    for size in FILE_SIZES {
+        let path = dir.path().join("src.bin");
+        write_file(&path, size);
+        group.throughput(Throughput::Bytes(size as u64));
+        group.bench_with_input(
+            BenchmarkId::from_parameter(file_size_id(size)),
+            &path,
+            |b, path| b.iter(|| compute_file_hash(path).unwrap()),
+        );
+    }
+    group.finish();
+}
+
+fn bench_copy(c: &mut Criterion) {
+    let dir = tempdir().unwrap();
+    let mut group = c.benchmark_group("copy_and_verify");
+    for size in FILE_SIZES {
+        let src = dir.path().join("src.bin");
+        let dst = dir.path().join("dst.bin");
+        write_file(&src, size);
+        let hash = compute_file_hash(&src).unwrap();
+        group.throughput(Throughput::Bytes(size as u64));
+        group.bench_function(BenchmarkId::from_parameter(file_size_id(size)), |b| {
+            b.iter(|| copy_and_verify(&src, &dst, &hash).unwrap())
+        });
+    }
+    group.finish();
+}
+
+// ─────────────────────────────────────────────────────────────
+// manifest.json
+// ─────────────────────────────────────────────────────────────
+
+fn manifest_data(entries: usize) -> ManifestData {
+    (0..entries)
+        .map(|i| {
+            let path = format!("ED-00/M{:03}/{:06}.bin", i % 100, i);
+            let entry = ManifestEntry {
+                sha256sum: format!("{:064x}", i),
+                size: i as u64,
+            };
+            (path, entry)
+        })
+        .collect()
+}
+
+fn bench_manifest(c: &mut Criterion) {
+    let dir = tempdir().unwrap();
+    let mut group = c.benchmark_group("manifest");
+    for entries in MANIFEST_ENTRIES {
+        let data = manifest_data(entries);
+        let path = dir.path().join("manifest.json");
+        write_manifest(&path, &data).unwrap();
+        group.throughput(Throughput::Elements(entries as u64));
+        group.bench_function(BenchmarkId::new("write", entries), |b| {
+            b.iter(|| write_manifest(&path, &data).unwrap())
+        });
+        group.bench_function(BenchmarkId::new("read", entries), |b| {
+            b.iter(|| read_manifest(&path).unwrap())
+        });
+    }
+    group.finish();
+}
+
+// ─────────────────────────────────────────────────────────────
+// Dataset database
+// ─────────────────────────────────────────────────────────────
+
+/// A dataset in a new directory, not saved yet, with `missions` missions of
+/// `FILES_PER_MISSION` committed files each.
+fn unsaved_dataset(missions: usize) -> (TempDir, DatasetState) {
+    let dir = tempdir().unwrap();
+    let mut state = DatasetState::new(dir.path(), "2024-01-01");
+    for idx in 0..missions {
+        let name = format!("M{:03}", idx);
+        let mut mission = MissionState::new(MissionRecord {
+            name: format!("ED-00 {}", name),
+            path: dir
+                .path()
+                .join("ED-00")
+                .join(&name)
+                .to_string_lossy()
+                .into_owned(),
+            metadata: MetadataRecord {
+                timestamp: "2024-01-01T09:00:00-08:00".to_string(),
+                device: "bench".to_string(),
+                country: "USA".to_string(),
+                region: "California".to_string(),
+                site: "SD".to_string(),
+                mission_name: name,
+                properties: "{}".to_string(),
+                notes: String::new(),
+            },
+        });
+        mission.committed_files = Some(
+            (0..FILES_PER_MISSION)
+                .map(|i| format!("{:06}.bin", i))
+                .collect(),
+        );
+        state.missions.push(Arc::new(mission));
+    }
+    (dir, state)
+}
+
+fn bench_db(c: &mut Criterion) {
+    let mut group = c.benchmark_group("dataset_db");
+    group.sample_size(20);
+    for missions in MISSIONS {
+        group.throughput(Throughput::Elements((missions * FILES_PER_MISSION) as u64));
+        group.bench_function(BenchmarkId::new("save", missions), |b| {
+            b.iter_batched(
+                || unsaved_dataset(missions),
+                |(dir, mut state)| {
+                    save_dataset_state(&mut state).unwrap();
+                    dir
+                },
+                BatchSize::PerIteration,
+            )
+        });
+
+        let (dir, mut state) = unsaved_dataset(missions);
+        save_dataset_state(&mut state).unwrap();
+        group.bench_function(BenchmarkId::new("load", missions), |b| {
+            b.iter(|| {
+                let mut state = load_dataset_state(dir.path()).unwrap();
+                for idx in 0..state.missions.len() {
+                    state.mission_committed_files(idx).unwrap();
+                }
+                state
+            })
+        });
+    }
+    group.finish();
+}
+
+criterion_group!(benches, bench_hash, bench_copy, bench_manifest, bench_db);
+criterion_main!(benches);
@@ -0,0 +1,148 @@
+'''Times how long e4edm takes to start and run quick commands on a large dataset
+
+Usage:
+    python benchmarks/cli_startup.py [--missions N] [--files N] [--runs N]
+
+Sets up a private configuration with one active dataset of N missions, each with
+N committed files (written straight into its `.e4edm.db`), then runs
+`e4edm --version` and `e4edm status` in fresh interpreters and prints the
+median wall time of each.  `e4edm status` should stay under 100 ms.
+'''
+import argparse
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Dict, List
+
+TARGET_MS = 100
+
+
+def private_env(home: Path) -> Dict[str, str]:
+    """An environment whose configuration, data and log directories are under `home`
+
+    Args:
+        home (Path): Directory standing in for the user's home
+
+    Returns:
+        Dict[str, str]: Environment variables
+    """
+    env = dict(os.environ)
+    env.update({
+        'HOME': str(home),
+        'XDG_CONFIG_HOME': str(home / 'config'),
+        'XDG_DATA_HOME': str(home / 'data'),
+        'XDG_CACHE_HOME': str(home / 'cache'),
+    })
+    return env
+
+
+def build_dataset(env: Dict[str, str], root: Path, n_missions: int, n_files: int) -> None:
+    """Creates the active dataset and its missions through e4edm, then adds the
+    committed files and manifest entries directly
+
+    Args:
+        env (Dict[str, str]): Environment from `private_env`
+        root (Path): Directory to create the dataset in
+        n_missions (int): Number of missions
+        n_files (int): Committed files per mission
+    """
+    script = f'''
+import datetime as dt
+from pathlib import Path
+from e4e_data_management.core import DataManager
+from e4e_data_management.metadata import Metadata
+app = DataManager()
+app.initialize_dataset(date=dt.date(2024, 1, 1), project='Bench', location='SD',
+                       directory=Path({str(root)!r}))
+for idx in range({n_missions}):
+    app.initialize_mission(metadata=Metadata(
+        timestamp=dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc) + dt.timedelta(minutes=idx),
+        device='bench', country='USA', region='California', site='SD', mission=f'M{{idx:04d}}'))
+print(app.active_dataset.root)
+'''
+    output = subprocess.run([sys.executable, '-c', script], env=env, check=True,
+                            capture_output=True, text=True).stdout
+    dataset_root = Path(output.strip().splitlines()[-1])
+    with sqlite3.connect(dataset_root / '.e4edm.db') as conn:
+        missions = [row[0] for row in conn.execute('SELECT name FROM missions')]
+        for name in missions:
+            day, mission = name.split(' ', 1)
+            paths = [f'{idx:06d}.bin' for idx in range(n_files)]
+            conn.executemany(
+                'INSERT INTO mission_committed_files (mission_name, path) VALUES (?, ?)',
+                ((name, path) for path in paths))
+            conn.executemany(
+                'INSERT INTO manifest (path, sha256, size) VALUES (?, ?, ?)',
+                ((f'{day}/{mission}/{path}', '0' * 64, 1024) for path in paths))
+
+
+def time_command(env: Dict[str, str], args: List[str], runs: int) -> float:
+    """Runs `e4edm args` in a fresh interpreter `runs` times
+
+    Args:
+        env (Dict[str, str]): Environment from `private_env`
+        args (List[str]): Command line arguments
+        runs (int): Number of runs
+
+    Returns:
+        float: Median wall time in milliseconds
+    """
+    command = [sys.executable, '-m', 'e4e_data_management.cli', *args]
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, env=env, check=True, stdout=subprocess.DEVNULL)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def run(n_missions: int, n_files: int, runs: int) -> None:
+    """Builds the dataset and prints the start-up timings
+
+    Args:
+        n_missions (int): Number of missions
+        n_files (int): Committed files per mission
+        runs (int): Runs per command
+    """
+    with TemporaryDirectory() as work:
+        home = Path(work)
+        env = private_env(home)
+        start = time.perf_counter()
+        build_dataset(env, home / 'datasets', n_missions, n_files)
+        print(f'{n_missions} missions, {n_files} files each, '
+              f'built in {time.perf_counter() - start:.1f} s')
+        baseline = time_command(env, ['--version'], runs)
+        status = time_command(env, ['status'], runs)
+        interpreter = statistics.median(_time_interpreter(env) for _ in range(runs))
+        print(f'{"":<24}{"median (ms)":>12}')
+        print(f'{"python -c pass":<24}{interpreter:>12.1f}')
+        print(f'{"e4edm --version":<24}{baseline:>12.1f}')
+        print(f'{"e4edm status":<24}{status:>12.1f}')
+        verdict = 'within' if status < TARGET_MS else 'over'
+        print(f'e4edm status is {verdict} the {TARGET_MS} ms target')
+
+
+def _time_interpreter(env: Dict[str, str]) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', 'pass'], env=env, check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    """Benchmark entry point
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--missions', type=int, default=200)
+    parser.add_argument('--files', type=int, default=1000)
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+    run(args.missions, args.files, args.runs)
+
+
+if __name__ == '__main__':
+    main()
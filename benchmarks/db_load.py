@@ -0,0 +1,160 @@
+'''Compares dataset database load time before and after the schema upgrade
+
+Usage:
+    python benchmarks/db_load.py [--missions N] [--files N] [--copies N]
+
+Builds a `.e4edm.db` in the pre-migration layout, where committed files had no
+index or uniqueness and each save could duplicate them, then times the loader's
+per-mission queries and a full dataset load on it, lets e4edm upgrade it, and
+times both again.
+'''
+import argparse
+import sqlite3
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from e4e_data_management._core import PyDataset
+
+# Schema of `.e4edm.db` before migrations (user_version 0)
+LEGACY_SCHEMA = '''
+    CREATE TABLE dataset_meta (
+        id              INTEGER PRIMARY KEY CHECK (id = 1),
+        day_0           TEXT NOT NULL,
+        pushed          INTEGER NOT NULL DEFAULT 0,
+        version         INTEGER NOT NULL DEFAULT 2,
+        last_country    TEXT,
+        last_region     TEXT,
+        last_site       TEXT
+    );
+    CREATE TABLE missions (
+        name            TEXT PRIMARY KEY,
+        path            TEXT NOT NULL,
+        timestamp       TEXT NOT NULL,
+        device          TEXT NOT NULL,
+        country         TEXT NOT NULL,
+        region          TEXT NOT NULL,
+        site            TEXT NOT NULL,
+        mission_name    TEXT NOT NULL,
+        properties      TEXT NOT NULL DEFAULT '{}',
+        notes           TEXT NOT NULL DEFAULT ''
+    );
+    CREATE TABLE mission_staged_files (
+        id              INTEGER PRIMARY KEY AUTOINCREMENT,
+        mission_name    TEXT NOT NULL,
+        origin_path     TEXT NOT NULL,
+        target_path     TEXT NOT NULL,
+        hash            TEXT NOT NULL,
+        UNIQUE(origin_path, target_path)
+    );
+    CREATE TABLE mission_committed_files (
+        id              INTEGER PRIMARY KEY AUTOINCREMENT,
+        mission_name    TEXT NOT NULL,
+        path            TEXT NOT NULL
+    );
+    CREATE TABLE dataset_staged_files (
+        id              INTEGER PRIMARY KEY AUTOINCREMENT,
+        path            TEXT NOT NULL UNIQUE
+    );
+    CREATE TABLE dataset_committed_files (
+        id              INTEGER PRIMARY KEY AUTOINCREMENT,
+        path            TEXT NOT NULL UNIQUE
+    );
+'''
+
+
+def build_legacy_db(root: Path, n_missions: int, n_files: int, copies: int) -> None:
+    """Writes a pre-migration `.e4edm.db` into `root`
+
+    Args:
+        root (Path): Dataset root
+        n_missions (int): Number of missions
+        n_files (int): Committed files per mission
+        copies (int): How many times each committed file is duplicated
+    """
+    with sqlite3.connect(root / '.e4edm.db') as conn:
+        conn.executescript(LEGACY_SCHEMA)
+        conn.execute("INSERT INTO dataset_meta (id, day_0) VALUES (1, '2024-01-01')")
+        for mission in range(n_missions):
+            name = f'ED-00 M{mission:03d}'
+            conn.execute(
+                'INSERT INTO missions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (name, str(root / 'ED-00' / f'M{mission:03d}'), '2024-01-01T09:00:00-08:00',
+                 'bench', 'USA', 'California', 'SD', f'M{mission:03d}', '{}', ''))
+            conn.executemany(
+                'INSERT INTO mission_committed_files (mission_name, path) VALUES (?, ?)',
+                ((name, f'{idx:05d}.bin') for _ in range(copies) for idx in range(n_files)))
+
+
+def time_queries(db_path: Path, n_missions: int) -> float:
+    """Times the per-mission file lookups the loader issues
+
+    Args:
+        db_path (Path): Database file
+        n_missions (int): Number of missions
+
+    Returns:
+        float: Seconds taken
+    """
+    with sqlite3.connect(db_path) as conn:
+        start = time.perf_counter()
+        for mission in range(n_missions):
+            name = f'ED-00 M{mission:03d}'
+            conn.execute('SELECT origin_path, target_path, hash FROM mission_staged_files '
+                         'WHERE mission_name=?', (name,)).fetchall()
+            conn.execute('SELECT path FROM mission_committed_files WHERE mission_name=?',
+                         (name,)).fetchall()
+        return time.perf_counter() - start
+
+
+def time_load(root: Path) -> float:
+    """Times loading the dataset state through e4edm
+
+    Args:
+        root (Path): Dataset root
+
+    Returns:
+        float: Seconds taken
+    """
+    start = time.perf_counter()
+    PyDataset.load(str(root))
+    return time.perf_counter() - start
+
+
+def run(n_missions: int, n_files: int, copies: int) -> None:
+    """Builds the legacy database and prints timings before and after the upgrade
+
+    Args:
+        n_missions (int): Number of missions
+        n_files (int): Committed files per mission
+        copies (int): How many times each committed file is duplicated
+    """
+    with TemporaryDirectory() as work:
+        root = Path(work)
+        db_path = root / '.e4edm.db'
+        build_legacy_db(root, n_missions, n_files, copies)
+        rows = n_missions * n_files * copies
+        print(f'{n_missions} missions, {n_files} files each, {rows} committed rows')
+        print(f'{"":<24}{"queries (s)":>12}{"load (s)":>12}')
+        before_queries = time_queries(db_path, n_missions)
+        upgrade_load = time_load(root)
+        print(f'{"before":<24}{before_queries:>12.3f}{"":>12}')
+        print(f'{"upgrade + first load":<24}{"":>12}{upgrade_load:>12.3f}')
+        print(f'{"after":<24}{time_queries(db_path, n_missions):>12.3f}'
+              f'{time_load(root):>12.3f}')
+
+
+def main():
+    """Benchmark entry point
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--missions', type=int, default=50)
+    parser.add_argument('--files', type=int, default=2000)
+    parser.add_argument('--copies', type=int, default=3,
+                        help='Duplicates of each committed file row')
+    args = parser.parse_args()
+    run(args.missions, args.files, args.copies)
+
+
+if __name__ == '__main__':
+    main()
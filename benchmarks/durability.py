@@ -0,0 +1,98 @@
+'''Compares push throughput at each durability level
+
+Usage:
+    python benchmarks/durability.py [--files N] [--size BYTES] [--target DIR]
+
+`--target` should sit on the drive being evaluated (e.g. an external SSD); by
+default a temporary directory on the system drive is used.
+'''
+import argparse
+import datetime as dt
+import os
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import List, Optional, Tuple
+
+from e4e_data_management.core import DataManager
+from e4e_data_management.metadata import Metadata
+
+LEVELS: List[Tuple[str, bool]] = [
+    ('none', False),
+    ('batched', False),
+    ('batched', True),
+    ('full', False),
+    ('full', True),
+]
+
+
+def build_dataset(work_dir: Path, n_files: int, file_size: int) -> DataManager:
+    """Creates a committed, pushable dataset of random files
+
+    Args:
+        work_dir (Path): Scratch directory for the config, source data and dataset
+        n_files (int): Number of data files
+        file_size (int): Size of each data file in bytes
+
+    Returns:
+        DataManager: App with the dataset active
+    """
+    config_dir = work_dir / 'config'
+    data_dir = work_dir / 'data'
+    config_dir.mkdir()
+    data_dir.mkdir()
+    for idx in range(n_files):
+        data_dir.joinpath(f'{idx:05d}.bin').write_bytes(os.urandom(file_size))
+    readme = work_dir / 'readme.md'
+    readme.write_text('benchmark\n', encoding='ascii')
+
+    app = DataManager(app_config_dir=config_dir)
+    app.initialize_dataset(date=dt.date(2024, 1, 1), project='Bench',
+                           location='Durability', directory=work_dir)
+    app.initialize_mission(metadata=Metadata(
+        timestamp=dt.datetime.fromisoformat('2024-01-01T09:00-08:00'),
+        device='bench', country='USA', region='California', site='SD', mission='M1'))
+    app.add(sorted(data_dir.iterdir()))
+    app.commit()
+    app.add([readme], readme=True)
+    app.commit(readme=True)
+    return app
+
+
+def run(n_files: int, file_size: int, target: Optional[Path]) -> None:
+    """Pushes the same dataset once per durability level and prints the throughput
+
+    Args:
+        n_files (int): Number of data files
+        file_size (int): Size of each data file in bytes
+        target (Optional[Path]): Directory to push into
+    """
+    total_mb = n_files * file_size / 1024**2
+    with TemporaryDirectory() as work, TemporaryDirectory(dir=target) as dest_root:
+        app = build_dataset(Path(work), n_files, file_size)
+        print(f'{n_files} files, {total_mb:.1f} MiB')
+        print(f'{"durability":<12}{"readback":<10}{"seconds":>10}{"MiB/s":>10}')
+        for idx, (durability, readback) in enumerate(LEVELS):
+            dest = Path(dest_root) / str(idx)
+            dest.mkdir()
+            start = time.perf_counter()
+            app.push(dest, full=True, durability=durability, readback=readback)
+            elapsed = time.perf_counter() - start
+            print(f'{durability:<12}{str(readback):<10}{elapsed:>10.2f}'
+                  f'{total_mb / elapsed:>10.1f}')
+
+
+def main():
+    """Benchmark entry point
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=2000)
+    parser.add_argument('--size', type=int, default=256 * 1024)
+    parser.add_argument('--target', type=Path, default=None,
+                        help='Directory on the drive to benchmark')
+    args = parser.parse_args()
+    run(args.files, args.size, args.target)
+
+
+if __name__ == '__main__':
+    main()
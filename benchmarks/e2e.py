@@ -0,0 +1,188 @@
+'''Times e4edm operations end to end on a synthetic dataset and flags regressions
+
+Usage:
+    python benchmarks/e2e.py [--files N] [--size SPEC] [--depth N] [--fanout N]
+                             [--seed N] [--runs N] [--output FILE]
+                             [--baseline FILE] [--threshold FRACTION]
+                             [--criterion DIR]
+
+Generates a source tree with `synthetic.py`, then, `--runs` times over, creates
+a dataset and mission under a private configuration and times `add`, `commit`,
+`status`, `validate`, `push` and `zip` on it.  The median of each is written to
+`--output` as JSON along with the dataset spec and the environment.
+
+`--criterion target/criterion` adds the Rust micro-benchmarks from the last
+`cargo bench --no-default-features --features bench` run.  With `--baseline`,
+every result more than `--threshold` (default 15%) slower than the same result
+in that file is reported, and the exit status is 1.
+'''
+import argparse
+import datetime as dt
+import json
+import platform
+import statistics
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, Callable, Dict, List
+
+import e4e_data_management
+from e4e_data_management.core import DataManager
+from e4e_data_management.metadata import Metadata
+from synthetic import SyntheticSpec, generate
+
+OPERATIONS = ['add', 'commit', 'status', 'validate', 'push', 'zip']
+
+
+def run_once(work_dir: Path, sources: List[Path]) -> Dict[str, float]:
+    """Takes a new dataset through every operation once
+
+    Args:
+        work_dir (Path): Empty scratch directory for the config, dataset and copies
+        sources (List[Path]): Files to add to the mission
+
+    Returns:
+        Dict[str, float]: Seconds taken by each operation
+    """
+    app = DataManager(app_config_dir=work_dir / 'config')
+    app.initialize_dataset(date=dt.date(2024, 1, 1), project='Bench', location='E2E',
+                           directory=work_dir)
+    app.initialize_mission(metadata=Metadata(
+        timestamp=dt.datetime.fromisoformat('2024-01-01T09:00-08:00'),
+        device='bench', country='USA', region='California', site='SD', mission='M1'))
+    (work_dir / 'push').mkdir()
+    steps: Dict[str, Callable[[], Any]] = {
+        'add': lambda: app.add(sources),
+        'commit': app.commit,
+        'status': app.status,
+        'validate': app.validate,
+        'push': lambda: app.push(work_dir / 'push'),
+        'zip': lambda: app.zip(work_dir / 'dataset.zip'),
+    }
+    timings = {}
+    for name in OPERATIONS:
+        start = time.perf_counter()
+        steps[name]()
+        timings[name] = time.perf_counter() - start
+    return timings
+
+
+def criterion_results(criterion_dir: Path) -> Dict[str, Dict[str, float]]:
+    """Reads the median of every benchmark in a criterion output directory
+
+    Args:
+        criterion_dir (Path): `target/criterion`
+
+    Returns:
+        Dict[str, Dict[str, float]]: Results keyed by `micro.<benchmark id>`
+    """
+    results = {}
+    for estimates in sorted(criterion_dir.glob('**/new/estimates.json')):
+        benchmark = json.loads(estimates.with_name('benchmark.json').read_text(encoding='utf-8'))
+        median_ns = json.loads(estimates.read_text(encoding='utf-8'))['median']['point_estimate']
+        results[f'micro.{benchmark["full_id"]}'] = {'seconds': median_ns / 1e9}
+    return results
+
+
+def regressions(results: Dict[str, Any], baseline: Dict[str, Any],
+                threshold: float) -> List[str]:
+    """Compares `results` with `baseline` and prints the change in each result
+
+    Args:
+        results (Dict[str, Any]): Results of this run
+        baseline (Dict[str, Any]): Results of an earlier run
+        threshold (float): Slowdown, as a fraction, counted as a regression
+
+    Returns:
+        List[str]: Names of the results that regressed
+    """
+    if results['spec'] != baseline['spec']:
+        print(f'Warning: the baseline was run on a different dataset: {baseline["spec"]}')
+    regressed = []
+    print(f'{"":<40}{"baseline":>12}{"current":>12}{"change":>10}')
+    for name, current in results['results'].items():
+        previous = baseline['results'].get(name)
+        if previous is None:
+            continue
+        change = current['seconds'] / previous['seconds'] - 1
+        flag = ''
+        if change > threshold:
+            regressed.append(name)
+            flag = '  REGRESSION'
+        print(f'{name:<40}{previous["seconds"]:>12.4f}{current["seconds"]:>12.4f}'
+              f'{change:>+10.1%}{flag}')
+    return regressed
+
+
+def run(spec: SyntheticSpec, runs: int) -> Dict[str, Any]:
+    """Generates the source tree and times every operation `runs` times
+
+    Args:
+        spec (SyntheticSpec): Source tree to generate
+        runs (int): Datasets to time
+
+    Returns:
+        Dict[str, Any]: The spec, environment and median result of each operation
+    """
+    with TemporaryDirectory() as work:
+        sources, total = generate(Path(work) / 'sources', spec)
+        print(f'{len(sources)} files, {total / 1024**2:.1f} MiB')
+        timings: Dict[str, List[float]] = {name: [] for name in OPERATIONS}
+        for idx in range(runs):
+            run_dir = Path(work) / f'run{idx}'
+            run_dir.mkdir()
+            for name, seconds in run_once(run_dir, sources).items():
+                timings[name].append(seconds)
+    results = {}
+    for name, samples in timings.items():
+        seconds = statistics.median(samples)
+        results[f'e2e.{name}'] = {'seconds': seconds, 'files': len(sources), 'bytes': total}
+        print(f'{name:<12}{seconds:>10.3f} s{total / 1024**2 / seconds:>10.1f} MiB/s')
+    return {
+        'created': dt.datetime.now(dt.timezone.utc).isoformat(),
+        'e4edm': e4e_data_management.__version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'spec': asdict(spec),
+        'runs': runs,
+        'results': results,
+    }
+
+
+def main():
+    """Benchmark entry point
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=SyntheticSpec.files)
+    parser.add_argument('--size', default=SyntheticSpec.size)
+    parser.add_argument('--depth', type=int, default=SyntheticSpec.depth)
+    parser.add_argument('--fanout', type=int, default=SyntheticSpec.fanout)
+    parser.add_argument('--seed', type=int, default=SyntheticSpec.seed)
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--output', type=Path, default=Path('bench_results.json'))
+    parser.add_argument('--baseline', type=Path, default=None)
+    parser.add_argument('--threshold', type=float, default=0.15)
+    parser.add_argument('--criterion', type=Path, default=None,
+                        help='criterion output directory to include, e.g. target/criterion')
+    args = parser.parse_args()
+
+    spec = SyntheticSpec(files=args.files, size=args.size, depth=args.depth,
+                         fanout=args.fanout, seed=args.seed)
+    results = run(spec, args.runs)
+    if args.criterion is not None:
+        results['results'].update(criterion_results(args.criterion))
+    args.output.write_text(json.dumps(results, indent=4), encoding='utf-8')
+    print(f'Results written to {args.output}')
+
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+        regressed = regressions(results, baseline, args.threshold)
+        if regressed:
+            print(f'{len(regressed)} results regressed by more than {args.threshold:.0%}')
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
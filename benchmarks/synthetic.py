@@ -0,0 +1,124 @@
+'''Writes a reproducible synthetic source tree for the benchmarks
+
+Usage:
+    python benchmarks/synthetic.py OUTPUT [--files N] [--size SPEC] [--depth N]
+                                          [--fanout N] [--seed N]
+
+Spreads N files over a directory tree `--depth` levels deep with `--fanout`
+subdirectories per level, the way a card from a field device is laid out.  SPEC
+is a fixed size (`64K`), a uniform range (`4K-1M`) or a log-normal distribution
+around a median (`lognormal:256K`).  The same arguments always produce the same
+names, sizes and contents, so runs on different machines or commits compare.
+'''
+import argparse
+import json
+import math
+import random
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List, Tuple
+
+_UNITS = {'': 1, 'k': 1024, 'm': 1024**2, 'g': 1024**3}
+# Contents are repeated from one random block per file; larger blocks make the
+# files less compressible but the generator slower.
+_BLOCK = 64 * 1024
+
+
+def parse_size(token: str) -> int:
+    """Parses a size such as `512`, `64K` or `1.5M` (binary multiples)
+
+    Args:
+        token (str): Size with an optional K, M or G suffix
+
+    Returns:
+        int: Bytes
+    """
+    value = token.strip().lower().removesuffix('b').removesuffix('i')
+    unit = value[-1] if value and value[-1] in _UNITS else ''
+    return round(float(value[:len(value) - len(unit)]) * _UNITS[unit])
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    """What to generate; see the module documentation
+    """
+    files: int = 1000
+    size: str = '4K-1M'
+    depth: int = 2
+    fanout: int = 4
+    seed: int = 0
+
+    def sizes(self, rng: random.Random) -> List[int]:
+        """Draws the size of every file
+
+        Args:
+            rng (random.Random): Generator seeded from `seed`
+
+        Returns:
+            List[int]: File sizes in bytes
+        """
+        if self.size.startswith('lognormal:'):
+            median = parse_size(self.size.split(':', 1)[1])
+            return [max(1, round(rng.lognormvariate(math.log(median), 1.0)))
+                    for _ in range(self.files)]
+        if '-' in self.size:
+            low, high = (parse_size(part) for part in self.size.split('-', 1))
+            return [rng.randint(low, high) for _ in range(self.files)]
+        return [parse_size(self.size)] * self.files
+
+    def directories(self) -> List[Path]:
+        """The leaf directories files are spread over, relative to the output
+
+        Returns:
+            List[Path]: `fanout ** depth` directories, or `.` for depth 0
+        """
+        dirs = [Path()]
+        for level in range(self.depth):
+            dirs = [parent / f'd{level}_{idx:02d}' for parent in dirs for idx in range(self.fanout)]
+        return dirs
+
+
+def generate(output: Path, spec: SyntheticSpec) -> Tuple[List[Path], int]:
+    """Writes the files of `spec` under `output`
+
+    Args:
+        output (Path): Directory to write into, created if missing
+        spec (SyntheticSpec): What to generate
+
+    Returns:
+        Tuple[List[Path], int]: The files written, sorted, and their total bytes
+    """
+    rng = random.Random(spec.seed)
+    sizes = spec.sizes(rng)
+    dirs = spec.directories()
+    paths = []
+    for idx, size in enumerate(sizes):
+        path = output / dirs[idx % len(dirs)] / f'{idx:06d}.bin'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        block = rng.randbytes(min(size, _BLOCK))
+        with open(path, 'wb') as handle:
+            for offset in range(0, size, _BLOCK):
+                handle.write(block[:size - offset])
+        paths.append(path)
+    return sorted(paths), sum(sizes)
+
+
+def main():
+    """Generator entry point
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('output', type=Path)
+    parser.add_argument('--files', type=int, default=SyntheticSpec.files)
+    parser.add_argument('--size', default=SyntheticSpec.size)
+    parser.add_argument('--depth', type=int, default=SyntheticSpec.depth)
+    parser.add_argument('--fanout', type=int, default=SyntheticSpec.fanout)
+    parser.add_argument('--seed', type=int, default=SyntheticSpec.seed)
+    args = vars(parser.parse_args())
+    output = args.pop('output')
+    spec = SyntheticSpec(**args)
+    paths, total = generate(output, spec)
+    print(json.dumps({**asdict(spec), 'written': len(paths), 'bytes': total}))
+
+
+if __name__ == '__main__':
+    main()
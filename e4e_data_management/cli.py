@@ -2,6 +2,7 @@
 '''
 import argparse
 import datetime as dt
+import json
 import logging
 import logging.handlers
 import sys
@@ -9,17 +10,188 @@ import time
 from dataclasses import dataclass
 from glob import glob
 from pathlib import Path
-from typing import Callable, List, Optional, TypeVar
-
-from rich.progress import (BarColumn, MofNCompleteColumn, Progress,
-                           SpinnerColumn, TextColumn, TimeRemainingColumn)
-from wakepy import keep
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union
 
 from e4e_data_management import __version__
 from e4e_data_management.core import DataManager
+from e4e_data_management.core import Progress as NativeProgress
 from e4e_data_management.metadata import Metadata
 from e4e_data_management.data import Dataset
+
+# rich and wakepy take longer to import than the rest of the CLI; they are
+# imported by the commands that use them.
+if TYPE_CHECKING:
+    from rich.console import Console
+    from rich.progress import Progress
 T = TypeVar('T')
+
+
+def destination(token: str) -> Union[Path, str]:
+    """Parses a push/duplicate destination
+
+    Args:
+        token (str): User input token
+
+    Returns:
+        Union[Path, str]: `s3://bucket/prefix` URLs unchanged, otherwise a local Path
+    """
+    if token.startswith('s3://'):
+        return token
+    return Path(token)
+
+
+IO_PRIORITIES = ('normal', 'low', 'idle')
+DURABILITY_LEVELS = ('none', 'batched', 'full')
+EXPORT_FORMATS = ('tar', 'tar.zst')
+_RATE_UNITS = {'': 1, 'k': 1024, 'm': 1024**2, 'g': 1024**3}
+_IN_DATASET_NOTES = {'hash': 'duplicate', 'size': 'same size'}
+
+
+def io_rate(token: str) -> int:
+    """Parses a bandwidth limit such as `50M`, `1.5GiB` or `unlimited`
+
+    Args:
+        token (str): User input token, binary multiples with an optional `B`/`iB`/`/s` suffix
+
+    Returns:
+        int: Bytes per second, 0 for unlimited
+    """
+    value = token.strip().lower()
+    if value in ('', 'none', 'unlimited'):
+        return 0
+    value = value.removesuffix('/s').removesuffix('b').removesuffix('i')
+    unit = value[-1] if value and value[-1] in _RATE_UNITS else ''
+    number = value[:len(value) - len(unit)]
+    try:
+        rate = round(float(number) * _RATE_UNITS[unit])
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f'Invalid rate: {token}') from exc
+    if rate < 0:
+        raise argparse.ArgumentTypeError(f'Rate cannot be negative: {token}')
+    return rate
+
+
+def files_rate(token: str) -> int:
+    """Parses a files-per-second limit
+
+    Args:
+        token (str): User input token, a whole number
+
+    Returns:
+        int: Files per second, 0 for unlimited
+    """
+    try:
+        rate = int(token)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f'Invalid rate: {token}') from exc
+    if rate < 0:
+        raise argparse.ArgumentTypeError(f'Rate cannot be negative: {token}')
+    return rate
+
+
+def query_bound(token: str) -> Union[dt.date, dt.datetime]:
+    """Parses a `query` time bound
+
+    Args:
+        token (str): `YYYY-MM-DD` or an ISO 8601 timestamp, assumed to be in the local
+        timezone if timezone-naive
+
+    Returns:
+        Union[dt.date, dt.datetime]: Date or timezone-aware timestamp
+    """
+    try:
+        if len(token) == 10:
+            return dt.date.fromisoformat(token)
+        timestamp = dt.datetime.fromisoformat(token)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f'Invalid date or timestamp: {token}') from exc
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.astimezone()
+    return timestamp
+
+
+def query_property(token: str) -> Tuple[str, str]:
+    """Parses a `query` property condition
+
+    Args:
+        token (str): `KEY=VALUE`
+
+    Returns:
+        Tuple[str, str]: Key and value
+    """
+    key, sep, value = token.partition('=')
+    if not sep or not key:
+        raise argparse.ArgumentTypeError(f'Expected KEY=VALUE: {token}')
+    return key, value
+
+
+def ingest_source(token: str) -> Tuple[str, Path]:
+    """Parses an `ingest` source
+
+    Args:
+        token (str): `MISSION=PATH`
+
+    Returns:
+        Tuple[str, Path]: Mission name and source path
+    """
+    mission, sep, path = token.partition('=')
+    if not sep or not mission or not path:
+        raise argparse.ArgumentTypeError(f'Expected MISSION=PATH: {token}')
+    return mission, Path(path)
+
+
+def format_io_rate(rate: int) -> str:
+    """Formats a bandwidth limit for display
+
+    Args:
+        rate (int): Bytes per second, 0 for unlimited
+
+    Returns:
+        str: Human readable rate
+    """
+    if rate == 0:
+        return 'unlimited'
+    for suffix, scale in (('G', 1024**3), ('M', 1024**2), ('K', 1024)):
+        if rate % scale == 0:
+            return f'{rate // scale}{suffix}'
+    return str(rate)
+
+
+def format_throughput(bytes_per_sec: float) -> str:
+    """Formats a measured transfer rate for display
+
+    Args:
+        bytes_per_sec (float): Bytes per second
+
+    Returns:
+        str: Human readable rate, empty before the first measurement
+    """
+    if bytes_per_sec <= 0:
+        return ''
+    for suffix, scale in (('GiB', 1024**3), ('MiB', 1024**2), ('KiB', 1024)):
+        if bytes_per_sec >= scale:
+            return f'{bytes_per_sec / scale:.1f} {suffix}/s'
+    return f'{bytes_per_sec:.0f} B/s'
+
+
+def format_size(size: Optional[int]) -> str:
+    """Formats a file size for display
+
+    Args:
+        size (Optional[int]): Bytes, None if unknown
+
+    Returns:
+        str: Human readable size, `-` if unknown
+    """
+    if size is None:
+        return '-'
+    for suffix, scale in (('GiB', 1024**3), ('MiB', 1024**2), ('KiB', 1024)):
+        if size >= scale:
+            return f'{size / scale:.1f} {suffix}'
+    return f'{size} B'
+
+
+
 @dataclass
 class Parameter:
     """Command Line Parameters
@@ -39,26 +211,29 @@ class DataManagerCLI:
         self.__configure_logging()
         self._log = logging.getLogger('e4edm.cli')
         self._log.debug('Invoking version %s from %s', __version__, __file__)
+        self.__app: Optional[DataManager] = None
         try:
-            self.app = DataManager.load()
-            commands = [
-                'init',
-                'status',
-                'list',
-                'config',
-                'activate',
-                'add',
-                'commit',
-                'duplicate',
-                'validate',
-                'push',
-                'zip',
-                'unzip',
-                'prune',
-                'ls',
-                'reset',
-                'rm',
-            ]
+            commands = {
+                'init': self.__configure_init_parser,
+                'status': self.__configure_status_parser,
+                'list': self.__configure_list_parser,
+                'config': self.__configure_config_parser,
+                'activate': self.__configure_activate_parser,
+                'add': self.__configure_add_parser,
+                'commit': self.__configure_commit_parser,
+                'ingest': self.__configure_ingest_parser,
+                'duplicate': self.__configure_duplicate_parser,
+                'validate': self.__configure_validate_parser,
+                'push': self.__configure_push_parser,
+                'zip': self.__configure_zip_parser,
+                'unzip': self.__configure_unzip_parser,
+                'export': self.__configure_export_parser,
+                'prune': self.__configure_prune_parser,
+                'ls': self.__configure_ls_parser,
+                'reset': self.__configure_reset_parser,
+                'rm': self.__configure_rm_parser,
+                'query': self.__configure_query_parser,
+            }
             self.parameters = [
                 Parameter(
                 name='dataset_dir',
@@ -75,66 +250,94 @@ class DataManagerCLI:
                 parser=int,
                 formatter=str,
                 validator=None
-                )
+                ),
+                Parameter(
+                name='io_rate',
+                getter=lambda: getattr(self.app, 'io_bytes_per_sec'),
+                setter=lambda x: setattr(self.app, 'io_bytes_per_sec', x),
+                parser=io_rate,
+                formatter=format_io_rate,
+                validator=lambda x: x >= 0
+                ),
+                Parameter(
+                name='io_files_rate',
+                getter=lambda: getattr(self.app, 'io_files_per_sec'),
+                setter=lambda x: setattr(self.app, 'io_files_per_sec', x),
+                parser=int,
+                formatter=str,
+                validator=lambda x: x >= 0
+                ),
+                Parameter(
+                name='io_priority',
+                getter=lambda: getattr(self.app, 'io_priority'),
+                setter=lambda x: setattr(self.app, 'io_priority', x),
+                parser=str.lower,
+                formatter=str,
+                validator=lambda x: x in IO_PRIORITIES
+                ),
             ]
             self.parser = argparse.ArgumentParser()
             subparsers = self.parser.add_subparsers()
-            parsers = {cmd:subparsers.add_parser(cmd) for cmd in commands}
-
-            self.__configure_init_parser(parsers['init'])
-            self.__configure_status_parser(parsers['status'])
-            self.__configure_list_parser(parsers['list'])
-            self.__configure_add_parser(parsers['add'])
-            self.__configure_commit_parser(parsers['commit'])
-            self.__configure_duplicate_parser(parsers['duplicate'])
-            self.__configure_push_parser(parsers['push'])
-            self.__configure_prune_parser(parsers['prune'])
-            self.__configure_config_parser(parsers['config'])
-            self.__configure_activate_parser(parsers['activate'])
-            self.__configure_ls_parser(parsers['ls'])
-            self.__configure_validate_parser(parsers['validate'])
-            self.__configure_reset_parser(parsers['reset'])
-            self.__configure_rm_parser(parsers['rm'])
-            # self.__configure_zip_parser(parsers['zip'])
-            # self.__configure_unzip_parser(parsers['unzip'])
+            # Only the invoked command's arguments are set up; the others are
+            # listed in the help but never parsed.
+            argv = sys.argv[1:]
+            invoked = next((arg for idx, arg in enumerate(argv)
+                            if not arg.startswith('-') and argv[idx - 1:idx] != ['--profile']),
+                           None)
+            for cmd, configure in commands.items():
+                parser = subparsers.add_parser(cmd)
+                if cmd == invoked:
+                    configure(parser)
 
             self.parser.add_argument('--version', action='version', version=f'e4edm {__version__}')
+            self.parser.add_argument('--profile', type=Path, default=None, metavar='PATH',
+                                     help='Write a Chrome trace of the command to PATH and '
+                                     'print where its time went')
             self.parser.set_defaults(func=self.parser.print_help)
         except Exception as exc:
             self._log.exception('Exception during application load/configuration')
             raise exc
 
+    @property
+    def app(self) -> DataManager:
+        """The data manager, loaded when a command first needs it
+        """
+        if self.__app is None:
+            self.__app = DataManager.load()
+        return self.__app
+
+    def __configure_io_arguments(self, parser: argparse.ArgumentParser):
+        group = parser.add_argument_group('I/O throttling',
+                                          'Override the configured limits for this command')
+        group.add_argument('--io-rate', type=io_rate, default=None,
+                           help='Read bandwidth limit, e.g. 50M (0 = unlimited)')
+        group.add_argument('--io-files-rate', type=files_rate, default=None,
+                           help='Files opened per second (0 = unlimited)')
+        group.add_argument('--io-priority', choices=IO_PRIORITIES, default=None,
+                           help='Scheduler priority hint')
+
+    def __configure_durability_arguments(self, parser: argparse.ArgumentParser):
+        group = parser.add_argument_group('Durability',
+                                          'How local destinations are flushed to disk')
+        group.add_argument('--durability', choices=DURABILITY_LEVELS, default='none',
+                           help='none: leave it to the OS, batched: one sync per batch, '
+                                'full: fsync every file and directory')
+        group.add_argument('--readback', action='store_true',
+                           help='Re-hash written files from disk, bypassing the page cache')
+
     def __configure_validate_parser(self, parser: argparse.ArgumentParser):
         parser.add_argument('root_dir', nargs='?', default=None, type=Path)
+        self.__configure_io_arguments(parser)
         parser.set_defaults(func=self.__external_validate)
 
     def __external_validate(self, root_dir: Optional[Path]):
-        with Progress(
-            SpinnerColumn(),
-            TextColumn('[bold blue]{task.description}'),
-            BarColumn(),
-            MofNCompleteColumn(),
-            TimeRemainingColumn(),
-            speed_estimate_period=600,
-        ) as progress:
-            task = progress.add_task('Validating\u2026', total=None)
-            # Parallel callbacks arrive in bursts with identical timestamps, which
-            # prevents Rich from computing a rate.  Render at most 10 times per
-            # second so samples are spaced in time.
-            last_t = [time.monotonic()]
-            interval = 0.1
-
-            def on_validate_progress(current: int, total: int) -> None:
-                now = time.monotonic()
-                if now - last_t[0] >= interval or current == total:
-                    last_t[0] = now
-                    progress.update(task, completed=current, total=total)
-
+        with self.__progress_display() as progress:
+            native = self.__native_progress(progress, {'hash': 'Validating\u2026'})
             if root_dir is None:
-                failures = self.app.validate_failures_with_progress(on_validate_progress)
+                failures = self.app.validate_failures(progress=native)
             else:
                 dataset = Dataset.load(path=root_dir)
-                failures = dataset.validate_failures_with_progress(on_validate_progress)
+                failures = dataset.validate_failures(progress=native)
 
         if failures:
             print('Dataset validation failed:')
@@ -204,6 +407,16 @@ class DataManagerCLI:
         Args:
             args (List[str]): Arguments
         """
+        missing = [key for key in ('country', 'region', 'site') if kwargs[key] is None]
+        if missing:
+            # Looked up only when needed, as it loads the active dataset
+            dataset = self.app.active_dataset
+            for key in missing:
+                kwargs[key] = getattr(dataset, f'last_{key}', None)
+            missing = [key for key in missing if kwargs[key] is None]
+        if missing:
+            self.parser.error('the following arguments are required: '
+                              + ', '.join(f'--{key}' for key in missing))
         metadata = Metadata(
             **kwargs
         )
@@ -272,32 +485,66 @@ class DataManagerCLI:
                               <= end]
         self.app.add(paths=resolved_paths, readme=readme, destination=destination)
 
-    def status_cmd(self):
+    def status_cmd(self, files: Optional[str] = None, mission: Optional[str] = None,
+                   match: Optional[str] = None, offset: int = 0, limit: int = 100):
         """Handles status cmd
 
+        Prints the summary of the active dataset and mission, or with `files` a
+        page of the files in that state.
+
         Args:
-            app (DataManager): DataManager app
+            files (Optional[str]): `staged` or `committed` to list those files
+            mission (Optional[str]): Mission to list, defaults to the active one
+            match (Optional[str]): Glob the listed paths must match
+            offset (int): Files to skip
+            limit (int): Files to list
         """
-        status_message = self.app.status()
-        for line in status_message.splitlines():
-            print(line)
-
-    def ls_dir(self, path: Path):
+        # pylint: disable=too-many-arguments
+        # One argument per option of `e4edm status`
+        if files is None:
+            status_message = self.app.status()
+            for line in status_message.splitlines():
+                print(line)
+            return
+        rows = self.app.status_files(state=files, mission=mission, pattern=match,
+                                     offset=offset, limit=limit)
+        for row in rows:
+            print(f'{format_size(row["size"]):>10} {row["path"]}')
+        if len(rows) == limit:
+            print(f'... more with --offset {offset + limit}')
+
+    def ls_dir(self, path: Path, recursive: bool, totals: bool, hash_files: bool):
         """Lists the files in the given directory with information relevant to e4edm
 
+        Each entry shows its modification time, its size (the bytes below a
+        directory when walked), whether it is staged or committed in the active
+        dataset, and whether the dataset already holds a file of the same size
+        (`same size`) or the same size and hash (`duplicate`).
+
         Args:
             path (Path): Path to ls
+            recursive (bool): List subdirectories too
+            totals (bool): Sum the bytes below each directory
+            hash_files (bool): Hash files whose size matches a dataset file
         """
         local_tz = dt.datetime.now().astimezone().tzinfo
         print(path.as_posix())
-        dirs = sorted([node for node in path.glob('*') if node.is_dir()])
-        files = sorted([node for node in path.glob('*') if node.is_file()])
-        dir_times = [dt.datetime.fromtimestamp(node.stat().st_mtime, local_tz) for node in dirs]
-        file_times = [dt.datetime.fromtimestamp(node.stat().st_mtime, local_tz) for node in files]
-        for idx, dir_path in enumerate(dirs):
-            print(f'{dir_times[idx].isoformat()} {dir_path.name}')
-        for idx, file in enumerate(files):
-            print(f'{file_times[idx].isoformat()} {file.name}')
+        for entry in self.app.ls(path, recursive=recursive, totals=totals, hash_files=hash_files):
+            mtime = entry['mtime'].astimezone(local_tz)
+            notes = ['unreadable'] if entry['unreadable'] else []
+            if entry['is_dir']:
+                name = f'{entry["path"].name}/'
+                if entry['files'] is not None:
+                    notes.append(f'{entry["files"]} files')
+            else:
+                name = entry['path'].name
+                if entry['tracked']:
+                    notes.append(entry['tracked'])
+                if entry['in_dataset']:
+                    notes.append(_IN_DATASET_NOTES[entry['in_dataset']])
+            indent = '  ' * entry['depth']
+            print(f'{mtime.isoformat()} {format_size(entry["size"]):>10} '
+                  f'{", ".join(notes):<20} {indent}{name}')
 
     def prune_cmd(self):
         """Prunes old datasets
@@ -317,17 +564,50 @@ class DataManagerCLI:
 
             arg_fn = args.func
             arg_dict.pop('func')
-
-            with keep.running():
-                arg_fn(**arg_dict)
+            io_overrides = {
+                'bytes_per_sec': arg_dict.pop('io_rate', None),
+                'files_per_sec': arg_dict.pop('io_files_rate', None),
+                'priority': arg_dict.pop('io_priority', None),
+            }
+            if any(value is not None for value in io_overrides.values()):
+                self.app.set_io_limits(**io_overrides)
+            profile = arg_dict.pop('profile', None)
+
+            from wakepy import keep  # pylint: disable=import-outside-toplevel
+            if profile is not None:
+                self.app.start_profiling()
+            try:
+                with keep.running():
+                    arg_fn(**arg_dict)
+            finally:
+                if profile is not None:
+                    self.__report_profile(profile)
         except KeyboardInterrupt:
             sys.exit(130)
         except Exception as exc:
             self._log.exception('Exception during main execution')
             raise exc
 
+    def __report_profile(self, output: Path, top: int = 15):
+        """Stops profiling, writes the trace to `output` and prints the spans that
+        took longest to stderr
+        """
+        summary = self.app.stop_profiling(output)
+        print(f'Profile written to {output}', file=sys.stderr)
+        if summary:
+            print(f'{"span":<24}{"count":>8}{"total s":>12}{"max s":>12}', file=sys.stderr)
+        for span in summary[:top]:
+            print(f'{span["name"]:<24}{span["count"]:>8}{span["total"]:>12.3f}'
+                  f'{span["max"]:>12.3f}', file=sys.stderr)
+
     def __configure_ls_parser(self, parser: argparse.ArgumentParser):
-        parser.add_argument('path', type=Path, default=Path('.'))
+        parser.add_argument('path', type=Path, nargs='?', default=Path('.'))
+        parser.add_argument('--recursive', '-R', action='store_true',
+                            help='List subdirectories too')
+        parser.add_argument('--totals', action='store_true',
+                            help='Show the bytes below each directory')
+        parser.add_argument('--hash', action='store_true', dest='hash_files',
+                            help='Hash files whose size matches a file in the dataset')
         parser.set_defaults(func=self.ls_dir)
 
     def __configure_config_parser(self, parser: argparse.ArgumentParser):
@@ -366,68 +646,173 @@ class DataManagerCLI:
     def __configure_prune_parser(self, parser: argparse.ArgumentParser):
         parser.set_defaults(func=self.prune_cmd)
 
-    def push_cmd(self, path: Path) -> None:
-        """Push the active dataset to `path` with a rich progress bar."""
-        with Progress(
+    def push_cmd(self, path: Union[Path, str], full: bool = False,
+                 durability: str = 'none', readback: bool = False) -> None:
+        """Push the active dataset to `path` with a rich progress bar.
+
+        `path` may also be an `s3://bucket/prefix` URL.  Unless `full` is set, only
+        files not recorded in the push ledger for `path` are transferred and verified.
+        `durability` and `readback` control flushing and read-back verification of
+        local destinations.
+        """
+        if isinstance(path, Path):
+            if not path.exists():
+                raise FileNotFoundError(f'Path not found: {path.resolve()}')
+            target = path.resolve()
+        else:
+            target = path
+        with self.__progress_display() as progress:
+            native = self.__native_progress(progress, {
+                'hash': 'Checking\u2026',
+                'copy': 'Pushing\u2026',
+                'verify': 'Validating\u2026',
+            })
+            try:
+                self.app.push(path, full=full, durability=durability, readback=readback,
+                              progress=native)
+            except RuntimeError as exc:
+                raise RuntimeError(f'Push to {target} failed: {exc}') from exc
+
+    def ingest_cmd(self, sources: List[Tuple[str, Path]]) -> None:
+        """Stage and commit each source into its mission, all missions at once,
+        with one rich progress bar for all of them.
+        """
+        for _, path in sources:
+            if not path.exists():
+                raise FileNotFoundError(f'Path not found: {path.resolve()}')
+        with self.__progress_display() as progress:
+            native = self.__native_progress(progress, {
+                'hash': 'Staging\u2026',
+                'copy': 'Committing\u2026',
+            })
+            self.app.ingest(sources, progress=native)
+
+    def zip_cmd(self, output_path: Path) -> None:
+        """Archive the active dataset to `output_path` with a rich progress bar."""
+        with self.__progress_display() as progress:
+            native = self.__native_progress(progress, {'copy': 'Zipping\u2026'})
+            self.app.zip(output_path, progress=native)
+
+    def unzip_cmd(self, input_file: Path, output_path: Path) -> None:
+        """Restore the archive `input_file` into `output_path` with a rich progress bar."""
+        with self.__progress_display() as progress:
+            native = self.__native_progress(progress, {'copy': 'Extracting\u2026'})
+            self.app.unzip(input_file, output_path, progress=native)
+
+    def export_cmd(self, output: str, format: str = 'tar',  # pylint: disable=redefined-builtin
+                   index: Optional[Path] = None, level: int = 3, threads: int = 0) -> None:
+        """Export the active dataset to `output` (`-` for stdout) with a rich
+        progress bar on stderr.
+        """
+        # pylint: disable=too-many-arguments
+        # One argument per option of `e4edm export`
+        from rich.console import Console  # pylint: disable=import-outside-toplevel
+        console = Console(stderr=True)
+        with self.__progress_display(console) as progress:
+            native = self.__native_progress(progress, {'copy': 'Exporting\u2026'})
+            self.app.export(output if output == '-' else Path(output), format=format,
+                            index=index, level=level, threads=threads, progress=native)
+
+    @staticmethod
+    def __progress_display(console: Optional['Console'] = None) -> 'Progress':
+        # pylint: disable=import-outside-toplevel
+        from rich.progress import (BarColumn, MofNCompleteColumn, Progress,
+                                   SpinnerColumn, TextColumn, TimeRemainingColumn)
+        return Progress(
             SpinnerColumn(),
             TextColumn('[bold blue]{task.description}'),
             BarColumn(),
             MofNCompleteColumn(),
+            TextColumn('{task.fields[rate]}'),
             TimeRemainingColumn(),
             speed_estimate_period=600,
-        ) as progress:
-            push_task = progress.add_task('Pushing\u2026', total=None)
-            val_task = progress.add_task('Validating\u2026', total=None, visible=False)
-            # Parallel callbacks arrive in bursts with identical timestamps, which
-            # prevents Rich from computing a rate.  Count every callback but only
-            # render at most 10 times per second so samples are spaced in time.
-            counts = [0, 0]   # [push_done, val_done]
-            last_t = [time.monotonic()]
-            interval = 0.1
-
-            def on_push_progress(current: int, total: int) -> None:
-                file_count = total // 2
-                now = time.monotonic()
-                if current <= file_count:
-                    counts[0] += 1
-                    if now - last_t[0] >= interval or counts[0] == file_count:
-                        last_t[0] = now
-                        progress.update(push_task, total=file_count, completed=counts[0])
-                else:
-                    if not progress.tasks[int(val_task)].visible:
-                        progress.update(push_task, visible=False)
-                        progress.update(val_task, total=file_count, visible=True)
-                        last_t[0] = now
-                    counts[1] += 1
-                    if now - last_t[0] >= interval or counts[1] == file_count:
-                        last_t[0] = now
-                        progress.update(val_task, completed=counts[1])
+            console=console,
+        )
 
-            if not path.exists():
-                raise FileNotFoundError(f'Path not found: {path.resolve()}')
-            try:
-                self.app.push_with_progress(path, on_push_progress)
-            except RuntimeError as exc:
-                raise RuntimeError(f'Push to {path.resolve()} failed: {exc}') from exc
+    @staticmethod
+    def __native_progress(progress: 'Progress', labels: Dict[str, str]) -> NativeProgress:
+        """Creates a native progress handle that shows each phase in `labels` as a
+        rich task.  Snapshots are already throttled natively to 10 per second.
+        """
+        current: List[Any] = [None, None]   # [phase, task]
+
+        def on_snapshot(snapshot: Dict[str, Any]) -> None:
+            phase = snapshot['phase']
+            if phase not in labels:
+                return
+            if phase != current[0]:
+                if current[1] is not None:
+                    progress.update(current[1], visible=False)
+                current[0] = phase
+                current[1] = progress.add_task(labels[phase], total=None, rate='')
+            progress.update(current[1],
+                            total=snapshot['files_total'],
+                            completed=snapshot['files_done'],
+                            rate=format_throughput(snapshot['bytes_per_sec']))
+
+        return NativeProgress(on_snapshot, interval=0.1)
 
     def __configure_push_parser(self, parser: argparse.ArgumentParser):
-        parser.add_argument('path', type=Path)
+        parser.add_argument('path', type=destination,
+                            help='Destination directory or s3://bucket/prefix URL')
+        parser.add_argument('--full', action='store_true',
+                            help='Ignore the push ledger and re-verify the whole destination')
+        self.__configure_durability_arguments(parser)
+        self.__configure_io_arguments(parser)
         parser.set_defaults(func=self.push_cmd)
 
+    def __configure_zip_parser(self, parser: argparse.ArgumentParser):
+        parser.add_argument('output_path', type=Path,
+                            help='Archive file, or directory to write <dataset>.zip into')
+        self.__configure_io_arguments(parser)
+        parser.set_defaults(func=self.zip_cmd)
+
+    def __configure_unzip_parser(self, parser: argparse.ArgumentParser):
+        parser.add_argument('input_file', type=Path, help='Archive written by e4edm zip')
+        parser.add_argument('output_path', type=Path,
+                            help='Directory to restore the dataset into')
+        self.__configure_io_arguments(parser)
+        parser.set_defaults(func=self.unzip_cmd)
+
+    def __configure_export_parser(self, parser: argparse.ArgumentParser):
+        parser.add_argument('output', help='Archive file, or - for stdout')
+        parser.add_argument('--format', choices=EXPORT_FORMATS, default='tar')
+        parser.add_argument('--index', type=Path, default=None,
+                            help='Entry index to write (default: <output>.index.json, '
+                            'none for stdout)')
+        parser.add_argument('--level', type=int, default=3, help='zstd compression level')
+        parser.add_argument('--threads', type=int, default=0,
+                            help='zstd worker threads, 0 for one per core')
+        self.__configure_io_arguments(parser)
+        parser.set_defaults(func=self.export_cmd)
+
     def __configure_duplicate_parser(self, parser: argparse.ArgumentParser):
-        parser.add_argument('paths', nargs='+', type=Path)
+        parser.add_argument('paths', nargs='+', type=destination,
+                            help='Destination directories or s3://bucket/prefix URLs')
+        self.__configure_durability_arguments(parser)
+        self.__configure_io_arguments(parser)
         parser.set_defaults(func=self.app.duplicate)
 
     def __configure_commit_parser(self, parser: argparse.ArgumentParser):
         parser.add_argument('--readme', action='store_true')
+        self.__configure_io_arguments(parser)
         parser.set_defaults(func=self.app.commit)
 
+    def __configure_ingest_parser(self, parser: argparse.ArgumentParser):
+        parser.add_argument('--mission', '-m', action='append', required=True,
+                            type=ingest_source, dest='sources', metavar='MISSION=PATH',
+                            help='Mission and the file or directory (e.g. a card) to ingest '
+                            'into it, may be repeated')
+        self.__configure_io_arguments(parser)
+        parser.set_defaults(func=self.ingest_cmd)
+
     def __configure_add_parser(self, parser: argparse.ArgumentParser):
         parser.add_argument('paths', nargs='+', type=str)
         parser.add_argument('--readme', action='store_true')
         parser.add_argument('--start', default=None, type=dt.datetime.fromisoformat)
         parser.add_argument('--end', default=None, type=dt.datetime.fromisoformat)
         parser.add_argument('--destination', default=None, type=Path)
+        self.__configure_io_arguments(parser)
         parser.set_defaults(func=self.add_files_cmd)
 
     def __configure_list_parser(self, parser: argparse.ArgumentParser):
@@ -439,6 +824,14 @@ class DataManagerCLI:
         parser.set_defaults(func=parser.print_help)
 
     def __configure_status_parser(self, parser: argparse.ArgumentParser):
+        parser.add_argument('--files', choices=['staged', 'committed'], default=None,
+                            help='List the files in this state instead of the summary')
+        parser.add_argument('--mission', default=None,
+                            help='Mission to list, defaults to the active mission')
+        parser.add_argument('--match', default=None, metavar='GLOB',
+                            help='Only list files whose path in the mission matches')
+        parser.add_argument('--offset', type=int, default=0, help='Files to skip')
+        parser.add_argument('--limit', type=int, default=100, help='Files to list')
         parser.set_defaults(func=self.status_cmd)
 
     def __configure_init_mission_parser(self, parser: argparse.ArgumentParser):
@@ -451,33 +844,11 @@ class DataManagerCLI:
                             help='Mission device identifier',
                             required=True,
                             type=str)
-        if self.app.active_dataset and self.app.active_dataset.last_country:
-            parser.add_argument('--country', '-c',
-                                help='Mission country',
-                                required=False,
-                                default=self.app.active_dataset.last_country)
-        else:
-            parser.add_argument('--country', '-c',
-                                help='Mission country',
-                                required=True)
-        if self.app.active_dataset and self.app.active_dataset.last_region:
-            parser.add_argument('--region', '-r',
-                                help='Mission region',
-                                required=False,
-                                default=self.app.active_dataset.last_region)
-        else:
-            parser.add_argument('--region', '-r',
-                                help='Mission region',
-                                required=True)
-        if self.app.active_dataset and self.app.active_dataset.last_site:
-            parser.add_argument('--site', '-s',
-                                help='Mission site',
-                                required=False,
-                                default=self.app.active_dataset.last_site)
-        else:
-            parser.add_argument('--site', '-s',
-                                help='Mission site',
-                                required=True)
+        for option, short in (('country', '-c'), ('region', '-r'), ('site', '-s')):
+            parser.add_argument(f'--{option}', short,
+                                help=f'Mission {option}, defaults to the last one used in the '
+                                'active dataset',
+                                default=None)
         parser.add_argument('--name', '-n',
                             help='Mission name',
                             required=True,
@@ -535,6 +906,51 @@ class DataManagerCLI:
         mission_parser.set_defaults(func=self.rm_mission_cmd)
         parser.set_defaults(func=parser.print_help)
 
+    def query_cmd(self, files: bool, as_json: bool, properties: List[Tuple[str, str]],
+                  **conditions) -> None:
+        """Searches the catalog of registered datasets
+
+        Args:
+            files (bool): List matching files rather than missions
+            as_json (bool): Print the results as a JSON array
+            properties (List[Tuple[str, str]]): Mission property conditions
+        """
+        if files:
+            rows = self.app.query_files(properties=dict(properties), **conditions)
+        else:
+            rows = self.app.query(properties=dict(properties), **conditions)
+        if as_json:
+            print(json.dumps(rows, indent=4, default=str))
+            return
+        for row in rows:
+            if files:
+                print(f'{row["dataset"]}\t{row["path"]}\t{row["sha256"]}\t{row["size"]}')
+            else:
+                print(f'{row["dataset"]}\t{row["mission"]}\t{row["timestamp"]}\t'
+                      f'{row["device"]}\t{row["country"]}/{row["region"]}/{row["site"]}')
+
+    def __configure_query_parser(self, parser: argparse.ArgumentParser):
+        parser.add_argument('--dataset', default=None, help='Dataset name')
+        parser.add_argument('--site', '-s', default=None, help='Mission site')
+        parser.add_argument('--device', '-d', default=None, help='Mission device identifier')
+        parser.add_argument('--country', '-c', default=None, help='Mission country')
+        parser.add_argument('--region', '-r', default=None, help='Mission region')
+        parser.add_argument('--start', default=None, type=query_bound,
+                            help='Earliest mission date (YYYY-MM-DD) or timestamp')
+        parser.add_argument('--end', default=None, type=query_bound,
+                            help='Latest mission date (YYYY-MM-DD) or timestamp')
+        parser.add_argument('--property', '-p', action='append', default=[],
+                            type=query_property, dest='properties', metavar='KEY=VALUE',
+                            help='Mission property value, may be repeated')
+        parser.add_argument('--sha256', default=None, help='File hash')
+        parser.add_argument('--path', default=None,
+                            help='File path glob, relative to the dataset root')
+        parser.add_argument('--files', action='store_true',
+                            help='List matching files instead of missions')
+        parser.add_argument('--json', action='store_true', dest='as_json',
+                            help='Print the results as JSON')
+        parser.set_defaults(func=self.query_cmd)
+
 def main():
     """Main bootstrap
     """
@@ -1,27 +1,161 @@
 '''Core application logic
 '''
+import asyncio
 import datetime as dt
 import json
 import logging
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Set
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
 
 import appdirs
 
 from e4e_data_management._core import (
+    PyCancelToken as _CancelToken,
     PyDataManager as _DataManager,
     PyDataset as _Dataset,
     PyMission as _Mission,
+    PyProgress as _Progress,
     default_config_dir as _default_config_dir,
+    io_limits as _io_limits,
+    read_export_entry as _read_export_entry,
+    set_io_limits as _set_io_limits,
+    start_trace as _start_trace,
+    stop_trace as _stop_trace,
 )
-from e4e_data_management.data import Manifest as _Manifest
+from e4e_data_management.data import DatasetManifest
+
+
+class CancelToken:
+    """Cooperative cancellation of a running operation.
+
+    Workers check the token between files and between 64 KiB chunks.  A cancelled
+    operation raises `Cancelled`; temp files are removed, nothing is recorded for a
+    push destination and a mission commit keeps the files copied so far.
+    """
+
+    def __init__(self):
+        self._inner = _CancelToken()
+
+    def cancel(self) -> None:
+        self._inner.cancel()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._inner.cancelled
+
+
+class Progress:
+    """Progress of a push, duplicate or validate, aggregated natively.
+
+    Pass an instance as `progress=` and either poll it from another thread or give
+    it a `callback`, which receives the same dict as `poll` at most once every
+    `interval` seconds, at each phase change and when a phase's last file is done.
+
+    The dict holds `phase` (`hash`, `copy`, `verify` or `done`), per-phase
+    `files_done`, `files_total`, `bytes_done` and `bytes_total`, the smoothed
+    `bytes_per_sec` and `elapsed` seconds.
+
+    Cancelling `cancel_token` (or `cancel` if given) stops the operation.
+    """
+
+    def __init__(self, callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 interval: float = 0.1, cancel: Optional[CancelToken] = None):
+        self.cancel_token = cancel if cancel is not None else CancelToken()
+        self._inner = _Progress(callback, interval,
+                                self.cancel_token._inner)  # pylint: disable=protected-access
+
+    def poll(self) -> Dict[str, Any]:
+        return self._inner.poll()
+
+
+def _native(progress: Optional[Progress]) -> Optional[_Progress]:
+    return progress._inner if progress is not None else None  # pylint: disable=protected-access
+
+
+def _settle(future: asyncio.Future, result: Any, error: Optional[BaseException]) -> None:
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+async def _run_native(start: Callable[[Callable[[Any, Any], None], _Progress], None],
+                      progress: Optional[Progress], cancel: Optional[CancelToken]) -> Any:
+    """Awaits a native operation that reports to `done(result, error)` from its
+    worker thread.  Cancelling the awaiting task cancels the operation and waits for
+    its workers to stop before re-raising.
+    """
+    if progress is None:
+        progress = Progress(cancel=cancel)
+    elif cancel is not None and cancel is not progress.cancel_token:
+        raise ValueError('Pass the cancel token to Progress instead')
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def done(result, error):
+        try:
+            loop.call_soon_threadsafe(_settle, future, result, error)
+        except RuntimeError:
+            pass  # The loop was closed before the operation finished
+
+    start(done, _native(progress))
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        progress.cancel_token.cancel()
+        await asyncio.wait([future])
+        if not future.cancelled():
+            future.exception()  # Retrieved here so it is not logged as unhandled
+        raise
+
+
+def read_export_entry(archive: Path, name: str, output: Path,
+                      index: Optional[Path] = None) -> None:
+    """Copies the member `name` of a tar export to `output`.
+
+    The export's index (`<archive>.index.json` unless `index` is given) locates
+    the member, so only the zstd frame holding it is decompressed.  The copy is
+    checked against the hash recorded in the index.
+    """
+    if index is None:
+        index = Path(f'{archive}.index.json')
+    _read_export_entry(str(archive), str(index), name, str(output))
+
+
+def _catalog_filter(properties: Optional[Dict[str, Any]],
+                    start: Union[dt.date, str, None],
+                    end: Union[dt.date, str, None], **conditions) -> Dict[str, Any]:
+    """Arguments of the native catalog query for the conditions of `DataManager.query`
+    """
+    def bound(value: Union[dt.date, str, None]) -> Optional[str]:
+        return value.isoformat() if isinstance(value, dt.date) else value
+
+    def text(value: Any) -> str:
+        # SQLite's JSON functions give booleans as 1 and 0
+        return str(int(value)) if isinstance(value, bool) else str(value)
+
+    return {
+        'start': bound(start),
+        'end': bound(end),
+        'properties': [(key, text(value)) for key, value in (properties or {}).items()],
+        **conditions,
+    }
 
 
 class _MissionView:
-    """Thin wrapper around PyMission for Python attribute access"""
+    """Thin wrapper around PyMission for Python attribute access
+
+    The file lists are converted on first access and kept, like the mission
+    itself, as of when the view was made.
+    """
+    __slots__ = ('_inner', '_staged_files', '_committed_files')
 
     def __init__(self, inner: _Mission):
         self._inner = inner
+        self._staged_files = None
+        self._committed_files = None
 
     @property
     def name(self) -> str:
@@ -33,11 +167,15 @@ class _MissionView:
 
     @property
     def staged_files(self) -> list:
-        return self._inner.staged_files
+        if self._staged_files is None:
+            self._staged_files = self._inner.staged_files
+        return self._staged_files
 
     @property
     def committed_files(self) -> List[str]:
-        return self._inner.committed_files
+        if self._committed_files is None:
+            self._committed_files = self._inner.committed_files
+        return self._committed_files
 
     @property
     def country(self) -> str:
@@ -61,73 +199,135 @@ class _MissionView:
 
 
 class _DatasetView:
-    """Thin wrapper around PyDataset for Python attribute access"""
+    """Thin wrapper around PyDataset for Python attribute access
+
+    Views from `DataManager.datasets` start from the dataset's summary in
+    `config.db` and only load the dataset on the first access that needs it.
+    A view shares the dataset state with the manager instead of copying it; the
+    file lists, missions and sets derived from it are built on first access and
+    kept, so a view stays a snapshot of the dataset as it was when made.
+    """
+    __slots__ = ('__inner', '_summary', '_loader', '_cache')
+
+    def __init__(self,
+                 inner: Optional[_Dataset] = None,
+                 *,
+                 summary: Optional[Dict[str, Any]] = None,
+                 loader: Optional[Callable[[], _Dataset]] = None):
+        self.__inner = inner
+        self._summary = summary or {}
+        self._loader = loader
+        self._cache: Dict[str, Any] = {}
 
-    def __init__(self, inner: _Dataset):
-        self._inner = inner
+    @property
+    def _inner(self) -> _Dataset:
+        if self.__inner is None:
+            self.__inner = self._loader()
+        return self.__inner
+
+    def _cached(self, key: str, build: Callable[[], Any]) -> Any:
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    def _field(self, key: str) -> Any:
+        if self.__inner is None and key in self._summary:
+            return self._summary[key]
+        return getattr(self._inner, key)
+
+    def _aggregate(self, key: str, attribute: str) -> Set[str]:
+        if self.__inner is None and self._summary.get(key) is not None:
+            return self._cached(key, lambda: set(self._summary[key]))
+        return self._cached(
+            key, lambda: {getattr(m, attribute) for m in self.missions.values()})
 
     @property
     def pushed(self) -> bool:
-        return self._inner.pushed
+        return self._field('pushed')
 
     @property
     def last_country(self) -> Optional[str]:
-        return self._inner.last_country
+        return self._field('last_country')
 
     @property
     def last_region(self) -> Optional[str]:
-        return self._inner.last_region
+        return self._field('last_region')
 
     @property
     def last_site(self) -> Optional[str]:
-        return self._inner.last_site
+        return self._field('last_site')
 
     @property
     def root(self) -> Path:
-        return Path(self._inner.root)
+        return self._cached('root', lambda: Path(self._field('root')))
 
     @property
     def name(self) -> str:
-        return self._inner.name
+        return self._field('name')
+
+    @property
+    def mission_count(self) -> int:
+        if self.__inner is None and self._summary.get('mission_count') is not None:
+            return self._summary['mission_count']
+        return len(self.missions)
+
+    @property
+    def file_count(self) -> Optional[int]:
+        """Committed files recorded in the catalog, or None if not yet catalogued"""
+        return self._summary.get('file_count')
+
+    @property
+    def total_bytes(self) -> Optional[int]:
+        """Bytes of the committed files recorded in the catalog, or None if not yet catalogued"""
+        return self._summary.get('total_bytes')
+
+    @property
+    def last_validated(self) -> Optional[dt.datetime]:
+        """When the dataset last passed `validate`, if ever"""
+        value = self._summary.get('last_validated')
+        if value is None:
+            return None
+        return dt.datetime.fromisoformat(value.replace('Z', '+00:00'))
 
     @property
     def staged_files(self) -> List[Path]:
-        return [Path(p) for p in self._inner.staged_files]
+        return self._cached('staged_files',
+                            lambda: [Path(p) for p in self._inner.staged_files])
 
     @property
     def committed_files(self) -> List[str]:
-        return self._inner.committed_files
+        return self._cached('committed_files', lambda: self._inner.committed_files)
 
     @property
     def missions(self) -> Dict[str, _MissionView]:
-        return {m.name: _MissionView(m) for m in self._inner.missions}
+        return self._cached('missions',
+                            lambda: {m.name: _MissionView(m) for m in self._inner.missions})
 
     @property
     def sites(self) -> Set[str]:
-        return {m.site for m in self._inner.missions}
+        return self._aggregate('sites', 'site')
 
     @property
     def countries(self) -> Set[str]:
-        return {m.country for m in self._inner.missions}
+        return self._aggregate('countries', 'country')
 
     @property
     def regions(self) -> Set[str]:
-        return {m.region for m in self._inner.missions}
+        return self._aggregate('regions', 'region')
 
     @property
     def devices(self) -> Set[str]:
-        return {m.device for m in self._inner.missions}
+        return self._aggregate('devices', 'device')
 
     @property
-    def manifest(self) -> _Manifest:
-        root = Path(self._inner.root)
-        return _Manifest(root / 'manifest.json', root)
+    def manifest(self) -> DatasetManifest:
+        return self._inner.manifest
 
     def validate(self) -> bool:
         return self._inner.validate()
 
-    def validate_failures(self) -> List[str]:
-        return self._inner.validate_failures()
+    def validate_failures(self, progress: Optional[Progress] = None) -> List[str]:
+        return self._inner.validate_failures(_native(progress))
 
 
 class DataManager:  # pylint: disable=too-many-public-methods
@@ -172,7 +372,13 @@ class DataManager:  # pylint: disable=too-many-public-methods
 
     @property
     def datasets(self) -> Dict[str, _DatasetView]:
-        return {name: _DatasetView(ds) for name, ds in self._inner.datasets.items()}
+        return {
+            name: _DatasetView(summary=summary, loader=self.__loader(name))
+            for name, summary in self._inner.datasets.items()
+        }
+
+    def __loader(self, name: str) -> Callable[[], _Dataset]:
+        return lambda: self._inner.load_dataset(name)
 
     @property
     def dataset_dir(self) -> Path:
@@ -186,6 +392,66 @@ class DataManager:  # pylint: disable=too-many-public-methods
     def version(self) -> int:
         return self._inner.version
 
+    @property
+    def io_bytes_per_sec(self) -> int:
+        """Persisted read bandwidth limit in bytes/sec (0 = unlimited)"""
+        return self._inner.io_bytes_per_sec
+
+    @io_bytes_per_sec.setter
+    def io_bytes_per_sec(self, value: int) -> None:
+        self._inner.io_bytes_per_sec = int(value)
+
+    @property
+    def io_files_per_sec(self) -> int:
+        """Persisted file open rate limit in files/sec (0 = unlimited)"""
+        return self._inner.io_files_per_sec
+
+    @io_files_per_sec.setter
+    def io_files_per_sec(self, value: int) -> None:
+        self._inner.io_files_per_sec = int(value)
+
+    @property
+    def io_priority(self) -> str:
+        """Persisted I/O priority hint: `normal`, `low` or `idle`"""
+        return self._inner.io_priority
+
+    @io_priority.setter
+    def io_priority(self, value: str) -> None:
+        self._inner.io_priority = value
+
+    @staticmethod
+    def set_io_limits(bytes_per_sec: Optional[int] = None,
+                      files_per_sec: Optional[int] = None,
+                      priority: Optional[str] = None) -> None:
+        """Override the I/O limits for this process without persisting them.
+
+        `None` leaves a setting unchanged and 0 means unlimited.  This may be
+        called from a progress callback to change the rate of a running operation.
+        """
+        _set_io_limits(bytes_per_sec, files_per_sec, priority)
+
+    @staticmethod
+    def io_limits() -> Tuple[int, int, str]:
+        """Returns the `(bytes_per_sec, files_per_sec, priority)` currently in effect"""
+        return _io_limits()
+
+    @staticmethod
+    def start_profiling() -> None:
+        """Start recording timing spans around the hashing, copying, database and
+        archive steps of every operation in this process.
+        """
+        _start_trace()
+
+    @staticmethod
+    def stop_profiling(output: Optional[Path] = None) -> List[Dict[str, Any]]:
+        """Stop recording timing spans.
+
+        With `output`, the spans are written there as a Chrome trace, which
+        chrome://tracing and https://ui.perfetto.dev open.  Returns the `count`,
+        `total` and `max` seconds of each span `name`, longest total first.
+        """
+        return _stop_trace(None if output is None else str(output))
+
     def initialize_dataset(self, date: dt.date, project: str, location: str,
                            directory: Path) -> None:
         dataset_name = f'{date.strftime("%Y.%m.%d")}.{project}.{location}'
@@ -210,6 +476,40 @@ class DataManager:  # pylint: disable=too-many-public-methods
     def status(self) -> str:
         return self._inner.status()
 
+    def status_summary(self) -> Optional[Dict[str, Any]]:
+        """The active dataset's counts, read from the counters in `.e4edm.db`.
+
+        Returns a dict with `dataset`, `root`, the active `mission` (or None),
+        `missions` mapping each mission name to its counts, `dataset_files`
+        with the counts of the files outside every mission and
+        `staged_readmes`.  Counts are a dict with `staged` and `committed` as
+        `(files, bytes)` and `pushed` mapping each destination to
+        `(files, bytes)`.  None if no dataset is active.
+        """
+        summary = self._inner.status_summary()
+        if summary is not None:
+            summary['root'] = Path(summary['root'])
+        return summary
+
+    def status_files(self, state: str = 'staged', mission: Optional[str] = None,
+                     pattern: Optional[str] = None, offset: int = 0,
+                     limit: int = 100) -> List[Dict[str, Any]]:
+        """A page of the files `mission` (by default the active mission) has in
+        `state`, `staged` or `committed`.
+
+        Skips `offset` files and returns up to `limit`; with `pattern`, only
+        those whose path in the mission matches that glob.  Returns a dict per
+        file with its `path` in the mission, `sha256` and `size`, and for
+        staged files its `origin_path`.
+        """
+        # pylint: disable=too-many-arguments
+        # A filter and a page of a listing, as `e4edm status --files` takes them
+        rows = self._inner.status_files(state, mission, pattern, offset, limit)
+        for row in rows:
+            if 'origin_path' in row:
+                row['origin_path'] = Path(row['origin_path'])
+        return rows
+
     def activate(self, dataset: str, day=None, mission=None,
                  root_dir=None) -> None:
         self._inner.activate(
@@ -230,31 +530,134 @@ class DataManager:  # pylint: disable=too-many-public-methods
     def commit(self, readme: bool = False) -> None:
         self._inner.commit(readme)
 
-    def duplicate(self, paths: List[Path]) -> None:
-        self._inner.duplicate([str(p) for p in paths])
+    def ingest(self, sources: Iterable[Tuple[str, Union[Path, str]]],
+               progress: Optional[Progress] = None) -> None:
+        """Stage and commit files into several missions of the active dataset at once.
+
+        `sources` pairs each mission, by name, with a file or directory to ingest into it,
+        as `e4edm ingest --mission` does; see the README.
+        """
+        self._inner.ingest([(mission, str(path)) for mission, path in sources],
+                           _native(progress))
+
+    def duplicate(self, paths: List[Union[Path, str]], durability: str = 'none',
+                  readback: bool = False, progress: Optional[Progress] = None) -> None:
+        """Duplicate the active dataset into each path or `s3://bucket/prefix` URL.
+
+        `durability` and `readback` apply to local paths as in `push`.
+        """
+        self._inner.duplicate([str(p) for p in paths], durability, readback, _native(progress))
 
     def validate(self) -> bool:
         return self._inner.validate()
 
-    def validate_failures(self) -> List[str]:
-        return self._inner.validate_failures()
+    def validate_failures(self, progress: Optional[Progress] = None) -> List[str]:
+        return self._inner.validate_failures(_native(progress))
+
+    def push(self, path: Union[Path, str], full: bool = False, durability: str = 'none',
+             readback: bool = False, progress: Optional[Progress] = None) -> None:
+        """Push the active dataset into a directory or an `s3://bucket/prefix` URL.
 
-    def push(self, path: Path) -> None:
-        self._inner.push(str(path))
+        `full`, `durability` and `readback` are the options of `e4edm push`; see the README.
+        """
+        # pylint: disable=too-many-arguments
+        # One argument per option of the native push, which takes them all at once
+        self._inner.push(str(path), full, durability, readback, _native(progress))
 
-    def push_with_progress(self, path: Path, callback) -> None:
+    def push_with_progress(self, path: Union[Path, str], callback, full: bool = False,
+                           durability: str = 'none', readback: bool = False) -> None:
         """Push the active dataset to `path`, calling `callback(current, total)` per file."""
-        self._inner.push_with_progress(str(path), callback)
+        # pylint: disable=too-many-arguments
+        # The options of `push`, with a callback in place of a Progress
+        self._inner.push_with_progress(str(path), callback, full, durability, readback)
 
     def validate_failures_with_progress(self, callback) -> List[str]:
         """Validate the active dataset, calling `callback(current, total)` per file hashed."""
         return self._inner.validate_failures_with_progress(callback)
 
+    # The *_async methods run the operation on a native worker thread and complete
+    # an asyncio future from it.  Other calls, blocking or awaited, may run meanwhile:
+    # the worker updates a copy of the active dataset, which is re-read from
+    # .e4edm.db when it replaces the active one, so their changes are kept; calls
+    # that touch the same mission wait for each other on the dataset's locks.
+
+    async def add_async(self, paths: Iterable[Path], readme: bool = False, destination=None,
+                        progress: Optional[Progress] = None,
+                        cancel: Optional[CancelToken] = None) -> None:
+        """Awaitable `add`; hashing is reported as the `hash` phase."""
+        # pylint: disable=too-many-arguments
+        # The options of `add`, plus the progress and cancel token every *_async takes
+        paths = [str(p) for p in paths]
+        destination = str(destination) if destination is not None else None
+        await _run_native(
+            lambda done, native: self._inner.add_async(paths, done, readme, destination, native),
+            progress, cancel)
+
+    async def commit_async(self, readme: bool = False, progress: Optional[Progress] = None,
+                           cancel: Optional[CancelToken] = None) -> None:
+        """Awaitable `commit`; copying is reported as the `copy` phase.
+
+        If cancelled, the files copied so far are committed and the rest stay staged.
+        """
+        await _run_native(
+            lambda done, native: self._inner.commit_async(done, readme, native),
+            progress, cancel)
+
+    async def validate_failures_async(self, progress: Optional[Progress] = None,
+                                      cancel: Optional[CancelToken] = None) -> List[str]:
+        """Awaitable `validate_failures`"""
+        return await _run_native(
+            lambda done, native: self._inner.validate_failures_async(done, native),
+            progress, cancel)
+
+    async def push_async(self, path: Union[Path, str], full: bool = False,
+                         durability: str = 'none', readback: bool = False,
+                         progress: Optional[Progress] = None,
+                         cancel: Optional[CancelToken] = None) -> None:
+        """Awaitable `push`.  A cancelled push writes no destination manifest, so the
+        next push to the same destination picks up where it stopped.
+        """
+        # pylint: disable=too-many-arguments
+        # The options of `push`, plus the cancel token every *_async takes
+        await _run_native(
+            lambda done, native: self._inner.push_async(
+                str(path), done, full, durability, readback, native),
+            progress, cancel)
+
     def remove_mission(self, dataset: str, mission: str) -> None:
         self._inner.remove_mission(dataset, mission)
 
-    def zip(self, output_path: Path) -> None:
-        self._inner.zip_dataset(str(output_path))
+    def zip(self, output_path: Path, progress: Optional[Progress] = None) -> None:
+        """Archive the active dataset and its manifest into `output_path`, a `.zip` file or a
+        directory to name the archive after the dataset in; see the README."""
+        self._inner.zip_dataset(str(output_path), _native(progress))
+
+    def export(self, output: Union[Path, str], format: str = 'tar',  # pylint: disable=redefined-builtin
+               index: Optional[Path] = None, level: int = 3, threads: int = 0,
+               progress: Optional[Progress] = None) -> None:
+        """Stream the active dataset as a `tar` or `tar.zst` archive to `output`, or to stdout
+        if `output` is `-`; the options are those of `e4edm export`, see the README."""
+        # pylint: disable=too-many-arguments
+        # The format and compression options map one to one onto `e4edm export`
+        if index is None and str(output) != '-':
+            index = Path(f'{output}.index.json')
+        self._inner.export_dataset(str(output), format,
+                                   str(index) if index is not None else None,
+                                   level, threads, _native(progress))
+
+    def unzip(self, input_file: Path, output_path: Path,
+              progress: Optional[Progress] = None) -> str:
+        """Restore a dataset archived with `zip` into `output_path`.
+
+        Entries are extracted in parallel and each is checked against the
+        archived `manifest.json` as it is written, so no separate `validate` is
+        needed.  The dataset's `.e4edm.db` is rebuilt from its manifests and
+        mission metadata, and the dataset is registered (but not activated).
+        Returns the dataset name.
+
+        `progress` receives the `copy` phase of the extraction.
+        """
+        return self._inner.unzip_dataset(str(input_file), str(output_path), _native(progress))
 
     def prune(self) -> Set[str]:
         return set(self._inner.prune())
@@ -264,3 +667,82 @@ class DataManager:  # pylint: disable=too-many-public-methods
 
     def list_datasets(self) -> List[str]:
         return self._inner.list_datasets()
+
+    def ls(self, path: Union[Path, str], recursive: bool = False, totals: bool = False,
+           hash_files: bool = False) -> List[Dict[str, Any]]:
+        """List the directory `path` against the active dataset.
+
+        The entries of each directory are stat'ed in parallel.  Directories come
+        first, then files, each sorted by name; with `recursive` the contents of
+        each directory follow it.  With `recursive` or `totals` the bytes and
+        files below every directory are summed.
+
+        Returns a dict per entry with `path` relative to `path`, `depth`,
+        `is_dir`, `size` (None for a directory not walked), `files` (the files
+        below a walked directory), `mtime` as a UTC datetime, `tracked` and
+        `in_dataset`.  `tracked` is `staged` for a file staged in the active
+        mission, `committed` for a file in the dataset manifest at this path,
+        or None.  `in_dataset` is `hash` for a file with the size and hash of a
+        dataset file, `size` for one whose size matches but whose hash is not
+        known, or None.  Only staged files have known hashes unless
+        `hash_files` is set, in which case files whose size matches are read.
+        `unreadable` is set for an entry that could not be stat'ed or read, or
+        a directory that could not be walked; the listing goes on without it.
+        """
+        rows = self._inner.list_dir(str(path), recursive, totals, hash_files)
+        for row in rows:
+            row['path'] = Path(row['path'])
+            row['mtime'] = dt.datetime.fromtimestamp(row['mtime'], dt.timezone.utc)
+        return rows
+
+    def query(self, *, dataset: Optional[str] = None, site: Optional[str] = None,
+              device: Optional[str] = None, country: Optional[str] = None,
+              region: Optional[str] = None, start: Union[dt.date, str, None] = None,
+              end: Union[dt.date, str, None] = None,
+              properties: Optional[Dict[str, Any]] = None, sha256: Optional[str] = None,
+              path: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Search the missions of every registered dataset.
+
+        The catalog in `config.db` is kept up to date as missions are created,
+        committed to, pushed and removed; datasets registered before it existed
+        are indexed on the first query.
+
+        Every condition given must hold.  `start` and `end` bound the mission
+        timestamp inclusively: a `date` (or `YYYY-MM-DD`) is compared with the
+        mission's local date, a `datetime` with its time in UTC.  `properties`
+        values are compared with the mission's properties as text.  `sha256` and
+        `path`, a glob relative to the dataset root, select missions holding a
+        matching file.
+
+        Returns a dict per mission, in timestamp order, with `dataset`,
+        `mission`, `path`, `timestamp`, `device`, `country`, `region`, `site`,
+        `properties` and `notes`.
+        """
+        # pylint: disable=too-many-arguments
+        # One keyword-only argument per condition, as `e4edm query` has one flag each
+        rows = self._inner.query(False, **_catalog_filter(
+            dataset=dataset, site=site, device=device, country=country, region=region,
+            start=start, end=end, properties=properties, sha256=sha256, path=path))
+        for row in rows:
+            row['path'] = Path(row['path'])
+            row['properties'] = json.loads(row['properties'] or '{}')
+        return rows
+
+    def query_files(self, *, dataset: Optional[str] = None, site: Optional[str] = None,
+                    device: Optional[str] = None, country: Optional[str] = None,
+                    region: Optional[str] = None, start: Union[dt.date, str, None] = None,
+                    end: Union[dt.date, str, None] = None,
+                    properties: Optional[Dict[str, Any]] = None, sha256: Optional[str] = None,
+                    path: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Search the manifest entries of every registered dataset.
+
+        Takes the same conditions as `query`; those on missions leave out files
+        outside any mission.  Returns a dict per file, by dataset and path, with
+        `dataset`, `mission` (or None), `path` relative to the dataset root,
+        `sha256` and `size`.
+        """
+        # pylint: disable=too-many-arguments
+        # The conditions of `query`
+        return self._inner.query(True, **_catalog_filter(
+            dataset=dataset, site=site, device=device, country=country, region=region,
+            start=start, end=end, properties=properties, sha256=sha256, path=path))
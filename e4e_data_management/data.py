@@ -3,11 +3,17 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Mapping
 from hashlib import sha256
 from pathlib import Path
 from typing import Dict, Iterable, Optional, Union
 
 from e4e_data_management._core import PyDataset as _Dataset
+from e4e_data_management._core import PyManifest as DatasetManifest
+
+# A read-only mapping of path -> (sha256sum, size), read from the dataset's
+# `.e4edm.db` one key or one page at a time.
+Mapping.register(DatasetManifest)
 
 
 class Manifest:
@@ -88,8 +94,6 @@ class Dataset:
 
     def __init__(self, inner: _Dataset):
         self._inner = inner
-        self._manifest = Manifest(Path(self._inner.root) / 'manifest.json',
-                                  Path(self._inner.root))
 
     @classmethod
     def load(cls, path: Path) -> 'Dataset':
@@ -98,16 +102,18 @@ class Dataset:
     def validate(self) -> bool:
         return self._inner.validate()
 
-    def validate_failures(self) -> list:
-        return self._inner.validate_failures()
+    def validate_failures(self, progress=None) -> list:
+        """Returns the failure messages, reporting to an optional `core.Progress`."""
+        return self._inner.validate_failures(
+            progress._inner if progress is not None else None)  # pylint: disable=protected-access
 
     def validate_failures_with_progress(self, callback) -> list:
         """Same as validate_failures, but invokes callback(current, total) as files are checked."""
         return self._inner.validate_failures_with_progress(callback)
 
     @property
-    def manifest(self) -> Manifest:
-        return self._manifest
+    def manifest(self) -> DatasetManifest:
+        return self._inner.manifest
 
     @property
     def pushed(self) -> bool:
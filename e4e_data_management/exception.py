@@ -6,6 +6,7 @@ from e4e_data_management._core import (
     ReadmeNotFound,
     CorruptedDataset,
     Incomplete,
+    Cancelled,
 )
 
 __all__ = [
@@ -14,4 +15,5 @@ __all__ = [
     'ReadmeNotFound',
     'CorruptedDataset',
     'Incomplete',
+    'Cancelled',
 ]
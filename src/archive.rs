@@ -0,0 +1,590 @@
+// archive.rs – exporting datasets as zip archives and restoring them.
+//
+// Every manifest entry is streamed from disk through a SHA-256 hasher into its
+// compressor, so checking the dataset against its manifest and reading it for
+// the archive are the same pass, and memory use does not depend on file sizes.
+//
+// Entries to be deflated are compressed in parallel, each into a single-entry
+// part archive in a scratch directory beside the output.  The final archive is
+// then written in manifest order: parts are copied in without being
+// decompressed (`raw_copy_file`) and removed as they go, and stored entries are
+// streamed straight from the dataset, so they are written only once.  The
+// dataset's manifest.json is written first so the archive can be checked and
+// restored on its own.
+//
+// Formats that are already compressed (JPEG, MP4, FLAC, ...) are stored.  Any
+// other file is deflated unless deflating its first `SAMPLE_SIZE` bytes saves
+// less than `MIN_SAVING`.
+//
+// Restoring reverses this: every worker opens its own handle on the archive,
+// writes its entries through a hasher to temp files beside their targets and
+// renames them into place once they match the archived manifest.
+
+use std::fs;
+use std::io::{BufWriter, Read, Seek, Write};
+use std::path::{Path, PathBuf};
+
+use flate2::write::DeflateEncoder;
+use flate2::Compression;
+use rayon::prelude::*;
+use sha2::{Digest, Sha256};
+use zip::write::SimpleFileOptions;
+use zip::CompressionMethod;
+
+use crate::dataset::{self, DatasetState};
+use crate::db;
+use crate::errors::{E4EError, Result};
+use crate::lock::DatasetLock;
+use crate::manifest::{self, ManifestEntry};
+use crate::progress::{Phase, Progress};
+use crate::throttle;
+use crate::trace;
+
+const MANIFEST_NAME: &str = "manifest.json";
+
+/// Extensions (lower case) of formats that deflate cannot shrink.
+const STORED_EXTENSIONS: &[&str] = &[
+    "jpg", "jpeg", "png", "gif", "webp", "heic", "heif", "mp4", "m4v", "mov", "mkv", "avi",
+    "webm", "insv", "lrv", "flac", "mp3", "aac", "m4a", "ogg", "opus", "zip", "gz", "tgz",
+    "bz2", "xz", "zst", "7z", "rar",
+];
+/// Bytes deflated to estimate how compressible a file of unknown type is.
+const SAMPLE_SIZE: u64 = 256 * 1024;
+/// Smallest relative saving on the sample for a file to be deflated.
+const MIN_SAVING: f64 = 0.05;
+/// Entries larger than this need zip64 extra fields.
+const ZIP32_LIMIT: u64 = 0xFFFF_FFFF;
+
+fn zip_err(e: zip::result::ZipError) -> E4EError {
+    E4EError::Runtime(e.to_string())
+}
+
+fn is_precompressed(path: &Path) -> bool {
+    path.extension()
+        .map(|ext| STORED_EXTENSIONS.contains(&ext.to_string_lossy().to_ascii_lowercase().as_str()))
+        .unwrap_or(false)
+}
+
+/// Store known compressed formats and files whose sample does not deflate well;
+/// deflate everything else.
+pub fn choose_method(path: &Path) -> Result<CompressionMethod> {
+    if is_precompressed(path) {
+        return Ok(CompressionMethod::Stored);
+    }
+    let mut sample = Vec::new();
+    fs::File::open(path)?.take(SAMPLE_SIZE).read_to_end(&mut sample)?;
+    if sample.is_empty() {
+        return Ok(CompressionMethod::Stored);
+    }
+    let mut encoder = DeflateEncoder::new(Vec::new(), Compression::fast());
+    encoder.write_all(&sample)?;
+    let compressed = encoder.finish()?.len() as f64;
+    if compressed <= sample.len() as f64 * (1.0 - MIN_SAVING) {
+        Ok(CompressionMethod::Deflated)
+    } else {
+        Ok(CompressionMethod::Stored)
+    }
+}
+
+/// Write `src` to `writer` as the entry `arc_path`, checking its hash against
+/// `entry` as it is read.
+fn write_entry<W: Write + Seek>(
+    writer: &mut zip::ZipWriter<W>,
+    src: &Path,
+    arc_path: &str,
+    entry: &ManifestEntry,
+    method: CompressionMethod,
+    progress: &Progress,
+) -> Result<()> {
+    let _span = trace::span("zip.entry");
+    let options = SimpleFileOptions::default()
+        .compression_method(method)
+        .large_file(entry.size > ZIP32_LIMIT);
+    writer.start_file(arc_path, options).map_err(zip_err)?;
+
+    let mut file = fs::File::open(src)
+        .map_err(|e| E4EError::Runtime(format!("Cannot open '{}': {}", src.display(), e)))?;
+    let mut hasher = Sha256::new();
+    let mut buf = [0u8; 65536];
+    throttle::acquire_file();
+    loop {
+        progress.cancel_token().check()?;
+        let n = file.read(&mut buf)?;
+        if n == 0 {
+            break;
+        }
+        throttle::acquire_bytes(n as u64);
+        hasher.update(&buf[..n]);
+        writer.write_all(&buf[..n])?;
+    }
+    if hex::encode(hasher.finalize()) != entry.sha256sum {
+        return Err(E4EError::CorruptedDataset);
+    }
+    Ok(())
+}
+
+/// Deflate `src` as the only entry `arc_path` of a new archive at `part`.
+fn write_part(src: &Path, arc_path: &str, entry: &ManifestEntry, part: &Path, progress: &Progress) -> Result<()> {
+    let mut writer = zip::ZipWriter::new(BufWriter::new(fs::File::create(part)?));
+    write_entry(&mut writer, src, arc_path, entry, CompressionMethod::Deflated, progress)?;
+    writer.finish().map_err(zip_err)?;
+    Ok(())
+}
+
+/// Check that the files under `state.root` are exactly those in its manifest.
+/// Reads no file contents; hashes are checked while the archive is written.
+pub fn check_file_list(state: &DatasetState, manifest_data: &manifest::ManifestData) -> Result<()> {
+    let on_disk: std::collections::HashSet<String> = dataset::get_dataset_files(&state.root)
+        .iter()
+        .filter_map(|file| {
+            let rel = file.strip_prefix(&state.root).ok()?;
+            Some(
+                rel.components()
+                    .map(|c| c.as_os_str().to_string_lossy().into_owned())
+                    .collect::<Vec<_>>()
+                    .join("/"),
+            )
+        })
+        .collect();
+    if on_disk.len() != manifest_data.len() || !manifest_data.keys().all(|k| on_disk.contains(k)) {
+        return Err(E4EError::CorruptedDataset);
+    }
+    Ok(())
+}
+
+/// Archive the dataset and its manifest to `zip_path`, with entries under the
+/// dataset's directory name, reporting the archived files as a `Copy` phase to
+/// `progress`.  The dataset must be complete (see `dataset::check_ready`); a file that
+/// does not match the manifest fails with `CorruptedDataset` and leaves no archive.
+pub fn create_zip_with_progress(state: &DatasetState, zip_path: &Path, progress: &Progress) -> Result<()> {
+    let _lock = DatasetLock::shared(&state.root)?;
+    let plan = trace::span("zip.plan");
+    dataset::check_ready(state)?;
+    let manifest_data = dataset::export_manifest(&state.root)?;
+    check_file_list(state, &manifest_data)?;
+    drop(plan);
+
+    let parts_dir = PathBuf::from(format!("{}.e4edm_parts", zip_path.display()));
+    let result = write_archive(state, &manifest_data, zip_path, &parts_dir, progress);
+    let _ = fs::remove_dir_all(&parts_dir);
+    if result.is_err() {
+        let _ = fs::remove_file(zip_path);
+    } else {
+        progress.finish();
+    }
+    result
+}
+
+fn write_archive(
+    state: &DatasetState,
+    manifest_data: &manifest::ManifestData,
+    zip_path: &Path,
+    parts_dir: &Path,
+    progress: &Progress,
+) -> Result<()> {
+    let dataset_name = state
+        .root
+        .file_name()
+        .unwrap_or_default()
+        .to_string_lossy()
+        .into_owned();
+    let mut keys: Vec<&String> = manifest_data.keys().collect();
+    keys.sort();
+
+    fs::create_dir_all(parts_dir)?;
+    let bytes_total = manifest_data.values().map(|e| e.size).sum();
+    progress.start_phase(Phase::Copy, keys.len() as u64, bytes_total);
+    // The part archive of each deflated entry; stored entries have none.
+    let parts: Vec<Option<PathBuf>> = keys
+        .par_iter()
+        .enumerate()
+        .map(|(idx, rel_path)| -> Result<Option<PathBuf>> {
+            let src = state.root.join(rel_path.as_str());
+            if choose_method(&src)? == CompressionMethod::Stored {
+                return Ok(None);
+            }
+            let entry = &manifest_data[rel_path.as_str()];
+            let part = parts_dir.join(format!("{:08}.zip", idx));
+            write_part(&src, &format!("{}/{}", dataset_name, rel_path), entry, &part, progress)?;
+            progress.advance(1, entry.size);
+            Ok(Some(part))
+        })
+        .collect::<Result<_>>()?;
+
+    let _span = trace::span("zip.assemble");
+    let mut zip = zip::ZipWriter::new(BufWriter::new(fs::File::create(zip_path)?));
+    let manifest_options = SimpleFileOptions::default().compression_method(CompressionMethod::Deflated);
+    zip.start_file(format!("{}/{}", dataset_name, MANIFEST_NAME), manifest_options)
+        .map_err(zip_err)?;
+    zip.write_all(&fs::read(state.root.join(MANIFEST_NAME))?)?;
+    for (rel_path, part) in keys.iter().zip(&parts) {
+        match part {
+            Some(part) => {
+                let mut archive = zip::ZipArchive::new(fs::File::open(part)?).map_err(zip_err)?;
+                zip.raw_copy_file(archive.by_index_raw(0).map_err(zip_err)?)
+                    .map_err(zip_err)?;
+                drop(archive);
+                fs::remove_file(part)?;
+            }
+            None => {
+                let entry = &manifest_data[rel_path.as_str()];
+                write_entry(
+                    &mut zip,
+                    &state.root.join(rel_path.as_str()),
+                    &format!("{}/{}", dataset_name, rel_path),
+                    entry,
+                    CompressionMethod::Stored,
+                    progress,
+                )?;
+                progress.advance(1, entry.size);
+            }
+        }
+    }
+    zip.finish().map_err(zip_err)?.flush()?;
+    Ok(())
+}
+
+// ─────────────────────────────────────────────────────────────
+// Import
+// ─────────────────────────────────────────────────────────────
+
+fn open_archive(zip_path: &Path) -> Result<zip::ZipArchive<fs::File>> {
+    zip::ZipArchive::new(fs::File::open(zip_path)?).map_err(zip_err)
+}
+
+/// The dataset directory name of an archive written by
+/// `create_zip_with_progress`, from its top-level `<dataset>/manifest.json` entry.
+fn archived_dataset_name(archive: &zip::ZipArchive<fs::File>) -> Result<String> {
+    let suffix = format!("/{}", MANIFEST_NAME);
+    archive
+        .file_names()
+        .filter_map(|name| name.strip_suffix(suffix.as_str()))
+        .find(|prefix| {
+            !prefix.is_empty() && !prefix.contains(['/', '\\']) && *prefix != "." && *prefix != ".."
+        })
+        .map(str::to_string)
+        .ok_or_else(|| E4EError::Runtime("Archive has no dataset manifest.json".to_string()))
+}
+
+/// The name of the dataset archived in `zip_path`, from the archive's listing
+/// alone, so that a restore can be refused before anything is extracted.
+pub fn archive_dataset_name(zip_path: &Path) -> Result<String> {
+    archived_dataset_name(&open_archive(zip_path)?)
+}
+
+/// Write one archive entry to `tmp`, hashing it as it is written.
+fn write_entry(mut reader: impl Read, tmp: &Path, entry: &ManifestEntry, progress: &Progress) -> Result<()> {
+    let mut out = BufWriter::new(fs::File::create(tmp)?);
+    let mut hasher = Sha256::new();
+    let mut written = 0u64;
+    let mut buf = [0u8; 65536];
+    loop {
+        progress.cancel_token().check()?;
+        let n = reader.read(&mut buf)?;
+        if n == 0 {
+            break;
+        }
+        throttle::acquire_bytes(n as u64);
+        hasher.update(&buf[..n]);
+        out.write_all(&buf[..n])?;
+        written += n as u64;
+    }
+    out.flush()?;
+    if written != entry.size || hex::encode(hasher.finalize()) != entry.sha256sum {
+        return Err(E4EError::CorruptedDataset);
+    }
+    Ok(())
+}
+
+/// Restore a dataset archived by `create_zip_with_progress` into
+/// `dest_dir/<dataset>` and rebuild its `.e4edm.db` (see
+/// `dataset::rebuild_dataset_state`), reporting the extracted files as a `Copy`
+/// phase to `progress`.  Entries are checked against the archived manifest as
+/// they are written; a mismatched, missing or unlisted entry fails with
+/// `CorruptedDataset` and removes the restored directory.
+pub fn extract_zip_with_progress(zip_path: &Path, dest_dir: &Path, progress: &Progress) -> Result<DatasetState> {
+    let mut archive = open_archive(zip_path)?;
+    let dataset_name = archived_dataset_name(&archive)?;
+    let manifest_name = format!("{}/{}", dataset_name, MANIFEST_NAME);
+    let mut manifest_bytes = Vec::new();
+    archive
+        .by_name(&manifest_name)
+        .map_err(zip_err)?
+        .read_to_end(&mut manifest_bytes)?;
+    let manifest_data: manifest::ManifestData = serde_json::from_slice(&manifest_bytes)?;
+
+    // Match the archive listing against the manifest before writing anything.
+    let prefix = format!("{}/", dataset_name);
+    let mut seen = std::collections::HashSet::new();
+    let mut entries: Vec<(usize, &str, &ManifestEntry)> = Vec::new();
+    for idx in 0..archive.len() {
+        let file = archive.by_index_raw(idx).map_err(zip_err)?;
+        if file.is_dir() || file.name() == manifest_name {
+            continue;
+        }
+        let (rel_path, entry) = file
+            .name()
+            .strip_prefix(prefix.as_str())
+            .and_then(|rel| manifest_data.get_key_value(rel))
+            .filter(|_| file.enclosed_name().is_some())
+            .ok_or(E4EError::CorruptedDataset)?;
+        if !seen.insert(rel_path.as_str()) {
+            return Err(E4EError::CorruptedDataset);
+        }
+        entries.push((idx, rel_path.as_str(), entry));
+    }
+    if entries.len() != manifest_data.len() {
+        return Err(E4EError::CorruptedDataset);
+    }
+
+    let root = dest_dir.join(&dataset_name);
+    if root.exists() {
+        return Err(E4EError::Runtime(format!("'{}' already exists", root.display())));
+    }
+    fs::create_dir_all(&root)?;
+    let result = extract_entries(zip_path, &root, &entries, progress).and_then(|()| {
+        fs::write(root.join(MANIFEST_NAME), &manifest_bytes)?;
+        dataset::rebuild_dataset_state(&root)
+    });
+    if result.is_err() {
+        db::release_dataset(&root);
+        let _ = fs::remove_dir_all(&root);
+    } else {
+        progress.finish();
+    }
+    result
+}
+
+fn extract_entries(
+    zip_path: &Path,
+    root: &Path,
+    entries: &[(usize, &str, &ManifestEntry)],
+    progress: &Progress,
+) -> Result<()> {
+    let bytes_total = entries.iter().map(|(_, _, e)| e.size).sum();
+    progress.start_phase(Phase::Copy, entries.len() as u64, bytes_total);
+    // Each worker reads through its own handle on the archive.
+    entries
+        .par_iter()
+        .map_init(
+            || open_archive(zip_path),
+            |archive, (idx, rel_path, entry)| -> Result<()> {
+                let archive = archive.as_mut().map_err(|e| E4EError::Runtime(e.to_string()))?;
+                let dst = root.join(rel_path);
+                if let Some(parent) = dst.parent() {
+                    fs::create_dir_all(parent)?;
+                }
+                let tmp = manifest::temp_path_for(&dst);
+                throttle::acquire_file();
+                let reader = archive.by_index(*idx).map_err(zip_err)?;
+                if let Err(e) = write_entry(reader, &tmp, entry, progress) {
+                    let _ = fs::remove_file(&tmp);
+                    return Err(e);
+                }
+                fs::rename(&tmp, &dst)?;
+                progress.advance(1, entry.size);
+                Ok(())
+            },
+        )
+        .collect()
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::dataset::{commit_dataset_files, create_dataset, stage_dataset_files};
+    use tempfile::tempdir;
+
+    fn create_zip(state: &DatasetState, zip_path: &Path) -> Result<()> {
+        create_zip_with_progress(state, zip_path, &Progress::new())
+    }
+
+    fn extract_zip(zip_path: &Path, dest_dir: &Path) -> Result<DatasetState> {
+        extract_zip_with_progress(zip_path, dest_dir, &Progress::new())
+    }
+
+    fn readme_dataset(tmp: &tempfile::TempDir, extra: &[(&str, &[u8])]) -> DatasetState {
+        let root = tmp.path().join("2023.03.02.Test.SD");
+        let mut state = create_dataset(&root, "2023-03-02").unwrap();
+        let mut paths = Vec::new();
+        for (name, content) in [("readme.md", b"readme".as_slice())].iter().chain(extra) {
+            let path = tmp.path().join(name);
+            fs::write(&path, content).unwrap();
+            paths.push(path);
+        }
+        stage_dataset_files(&mut state, &paths).unwrap();
+        commit_dataset_files(&mut state).unwrap();
+        state
+    }
+
+    #[test]
+    fn create_zip_produces_non_empty_archive_with_correct_paths() {
+        let tmp = tempdir().unwrap();
+        let state = readme_dataset(&tmp, &[]);
+
+        let zip_path = tmp.path().join("archive.zip");
+        create_zip(&state, &zip_path).unwrap();
+        assert!(zip_path.exists());
+
+        let zip_file = fs::File::open(&zip_path).unwrap();
+        let mut archive = zip::ZipArchive::new(zip_file).unwrap();
+        let names: Vec<String> =
+            (0..archive.len()).map(|i| archive.by_index(i).unwrap().name().to_string()).collect();
+        assert!(
+            names.iter().any(|n| n.contains("readme.md")),
+            "readme.md not found in zip; entries: {names:?}"
+        );
+        // Paths should be prefixed with the dataset name
+        assert!(names.iter().all(|n| n.starts_with("2023.03.02.Test.SD/")));
+        assert_eq!(names[0], "2023.03.02.Test.SD/manifest.json");
+        assert!(!tmp.path().join("archive.zip.e4edm_parts").exists());
+        assert_eq!(archive_dataset_name(&zip_path).unwrap(), "2023.03.02.Test.SD");
+    }
+
+    #[test]
+    fn media_is_stored_and_text_is_deflated() {
+        let tmp = tempdir().unwrap();
+        let text = b"sensor,value\n".repeat(4096);
+        let state = readme_dataset(&tmp, &[("photo.JPG", b"not really a jpeg".as_slice()), ("log.csv", text.as_slice())]);
+
+        let zip_path = tmp.path().join("archive.zip");
+        create_zip(&state, &zip_path).unwrap();
+        let mut archive = zip::ZipArchive::new(fs::File::open(&zip_path).unwrap()).unwrap();
+        let method = |archive: &mut zip::ZipArchive<fs::File>, name: &str| {
+            archive.by_name(&format!("2023.03.02.Test.SD/{}", name)).unwrap().compression()
+        };
+        assert_eq!(method(&mut archive, "photo.JPG"), CompressionMethod::Stored);
+        assert_eq!(method(&mut archive, "log.csv"), CompressionMethod::Deflated);
+
+        let mut content = Vec::new();
+        archive
+            .by_name("2023.03.02.Test.SD/log.csv")
+            .unwrap()
+            .read_to_end(&mut content)
+            .unwrap();
+        assert_eq!(content, text);
+
+        // Stored entries are streamed into the archive in manifest order.
+        let names: Vec<String> =
+            (0..archive.len()).map(|i| archive.by_index(i).unwrap().name().to_string()).collect();
+        assert_eq!(
+            names[1..],
+            ["2023.03.02.Test.SD/log.csv", "2023.03.02.Test.SD/photo.JPG", "2023.03.02.Test.SD/readme.md"]
+        );
+        content.clear();
+        archive
+            .by_name("2023.03.02.Test.SD/photo.JPG")
+            .unwrap()
+            .read_to_end(&mut content)
+            .unwrap();
+        assert_eq!(content, b"not really a jpeg");
+    }
+
+    #[test]
+    fn incompressible_sample_is_stored() {
+        let tmp = tempdir().unwrap();
+        let path = tmp.path().join("noise.bin");
+        // xorshift output does not deflate.
+        let mut x: u64 = 0x9E37_79B9_7F4A_7C15;
+        let noise: Vec<u8> = (0..65536)
+            .map(|_| {
+                x ^= x << 13;
+                x ^= x >> 7;
+                x ^= x << 17;
+                x as u8
+            })
+            .collect();
+        fs::write(&path, noise).unwrap();
+        assert_eq!(choose_method(&path).unwrap(), CompressionMethod::Stored);
+    }
+
+    #[test]
+    fn corrupted_file_fails_and_leaves_no_archive() {
+        let tmp = tempdir().unwrap();
+        let state = readme_dataset(&tmp, &[("data.bin", b"original".as_slice())]);
+        fs::write(state.root.join("data.bin"), b"tampered").unwrap();
+
+        let zip_path = tmp.path().join("archive.zip");
+        assert!(matches!(create_zip(&state, &zip_path), Err(E4EError::CorruptedDataset)));
+        assert!(!zip_path.exists());
+        assert!(!tmp.path().join("archive.zip.e4edm_parts").exists());
+    }
+
+    #[test]
+    fn extract_zip_restores_files_and_database() {
+        let tmp = tempdir().unwrap();
+        let mut state = readme_dataset(&tmp, &[("notes.txt", b"field notes".as_slice())]);
+        let meta = crate::metadata::MetadataRecord {
+            timestamp: "2023-03-03T10:00:00-08:00".to_string(),
+            device: "Camera".to_string(),
+            country: "USA".to_string(),
+            region: "California".to_string(),
+            site: "La Jolla".to_string(),
+            mission_name: "Dive".to_string(),
+            properties: "{}".to_string(),
+            notes: String::new(),
+        };
+        crate::dataset::add_mission(&mut state, &meta).unwrap();
+        let data = tmp.path().join("data.bin");
+        fs::write(&data, b"payload").unwrap();
+        crate::dataset::stage_mission_files(&mut state, "ED-01 Dive", &[data], None).unwrap();
+        crate::dataset::commit_mission_files(&mut state, "ED-01 Dive").unwrap();
+
+        let zip_path = tmp.path().join("archive.zip");
+        create_zip(&state, &zip_path).unwrap();
+        let restore = tmp.path().join("restore");
+        let restored = extract_zip(&zip_path, &restore).unwrap();
+
+        let root = restore.join("2023.03.02.Test.SD");
+        assert_eq!(restored.root, root);
+        assert_eq!(fs::read(root.join("ED-01/Dive/data.bin")).unwrap(), b"payload");
+        assert!(dataset::validate_dataset(&root).unwrap());
+
+        let mut loaded = dataset::load_dataset_state(&root).unwrap();
+        loaded.load_committed_files().unwrap();
+        assert_eq!(loaded.day_0, "2023-03-02");
+        assert_eq!(loaded.missions.len(), 1);
+        assert_eq!(loaded.missions[0].record.name, "ED-01 Dive");
+        assert_eq!(loaded.missions[0].committed_files, Some(vec!["data.bin".to_string()]));
+        assert_eq!(loaded.last_site, Some("La Jolla".to_string()));
+        assert!(dataset::check_ready(&loaded).is_ok());
+    }
+
+    #[test]
+    fn extract_zip_rejects_tampered_entry_and_cleans_up() {
+        let tmp = tempdir().unwrap();
+        let state = readme_dataset(&tmp, &[]);
+        let zip_path = tmp.path().join("archive.zip");
+        create_zip(&state, &zip_path).unwrap();
+
+        // Rewrite the archive with the same manifest but different readme contents.
+        let mut source = zip::ZipArchive::new(fs::File::open(&zip_path).unwrap()).unwrap();
+        let tampered_path = tmp.path().join("tampered.zip");
+        let mut tampered = zip::ZipWriter::new(fs::File::create(&tampered_path).unwrap());
+        for idx in 0..source.len() {
+            let file = source.by_index(idx).unwrap();
+            if file.name().ends_with("readme.md") {
+                let name = file.name().to_string();
+                drop(file);
+                tampered.start_file(name, SimpleFileOptions::default()).unwrap();
+                tampered.write_all(b"edited").unwrap();
+            } else {
+                tampered.raw_copy_file(file).unwrap();
+            }
+        }
+        tampered.finish().unwrap();
+
+        let restore = tmp.path().join("restore");
+        assert!(matches!(extract_zip(&tampered_path, &restore), Err(E4EError::CorruptedDataset)));
+        assert!(!restore.join("2023.03.02.Test.SD").exists());
+    }
+
+    #[test]
+    fn unlisted_file_fails_before_reading() {
+        let tmp = tempdir().unwrap();
+        let state = readme_dataset(&tmp, &[]);
+        fs::write(state.root.join("stray.bin"), b"stray").unwrap();
+        let zip_path = tmp.path().join("archive.zip");
+        assert!(matches!(create_zip(&state, &zip_path), Err(E4EError::CorruptedDataset)));
+    }
+}
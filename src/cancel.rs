@@ -0,0 +1,57 @@
+// cancel.rs – cooperative cancellation of long-running operations.
+//
+// A `CancelToken` is a shared flag.  Copy, hash and upload loops check it
+// between files and between 64 KiB chunks, so a cancelled operation stops
+// within one chunk per worker.  The loops return `E4EError::Cancelled` through
+// their normal error path, which already removes the temp file being written
+// and leaves the dataset database as it was before the current step.
+
+use std::sync::atomic::{AtomicBool, Ordering};
+use std::sync::Arc;
+
+use crate::errors::{E4EError, Result};
+
+/// A cancellation flag shared between the caller and the workers.  Clones refer
+/// to the same flag.
+#[derive(Clone, Debug, Default)]
+pub struct CancelToken {
+    flag: Arc<AtomicBool>,
+}
+
+impl CancelToken {
+    pub fn new() -> Self {
+        CancelToken::default()
+    }
+
+    /// Ask every operation holding this token to stop.
+    pub fn cancel(&self) {
+        self.flag.store(true, Ordering::Relaxed);
+    }
+
+    pub fn is_cancelled(&self) -> bool {
+        self.flag.load(Ordering::Relaxed)
+    }
+
+    /// `Err(E4EError::Cancelled)` once `cancel` has been called.
+    pub fn check(&self) -> Result<()> {
+        if self.is_cancelled() {
+            Err(E4EError::Cancelled)
+        } else {
+            Ok(())
+        }
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn clones_share_the_flag() {
+        let token = CancelToken::new();
+        let worker = token.clone();
+        assert!(worker.check().is_ok());
+        token.cancel();
+        assert!(matches!(worker.check(), Err(E4EError::Cancelled)));
+    }
+}
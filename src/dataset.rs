@@ -1,14 +1,24 @@
+use std::collections::{BTreeSet, HashSet};
+use std::hash::Hash;
 use std::fs;
 use std::io;
 use std::path::{Path, PathBuf};
-use std::sync::atomic::{AtomicU64, Ordering};
+use std::sync::Arc;
 
 use rayon::prelude::*;
 
-use crate::db::{DatasetDb, DatasetMeta, MissionRecord, StagedFileRecord};
+use crate::db::{DatasetDb, DatasetMeta, MissionRecord, PushLedger, Snapshot, StagedFileRecord};
+#[cfg(any(test, feature = "python"))]
+use crate::db::FileStats;
+use crate::durability::{self, Durability};
 use crate::errors::{E4EError, Result};
+use crate::lock::DatasetLock;
 use crate::manifest;
 use crate::metadata::{self, MetadataRecord};
+use crate::objstore;
+use crate::progress::{Phase, Progress};
+use crate::throttle;
+use crate::trace;
 
 // ─────────────────────────────────────────────────────────────
 // State types
@@ -18,7 +28,11 @@ use crate::metadata::{self, MetadataRecord};
 pub struct MissionState {
     pub record: MissionRecord,
     pub staged_files: Vec<StagedFileRecord>,
-    pub committed_files: Vec<String>,
+    /// Paths relative to the mission; `None` until read from `.e4edm.db`, see
+    /// [`DatasetState::load_committed_files`].
+    pub committed_files: Option<Vec<String>>,
+    /// What `.e4edm.db` holds for this mission.
+    pub saved: SavedMission,
 }
 
 #[derive(Clone, Debug)]
@@ -30,9 +44,171 @@ pub struct DatasetState {
     pub last_country: Option<String>,
     pub last_region: Option<String>,
     pub last_site: Option<String>,
-    pub missions: Vec<MissionState>,
+    /// Shared with copies of the state (and the Python views of it); a mission
+    /// is copied only when one copy changes it, see [`Arc::make_mut`].
+    pub missions: Vec<Arc<MissionState>>,
     pub staged_files: Vec<PathBuf>,
     pub committed_files: Vec<String>,
+    /// What `.e4edm.db` holds for the dataset itself.
+    pub saved: SavedDataset,
+    /// `.e4edm.db` as of the last load or save, see [`DatasetState::refresh`].
+    /// `None` if the state was never read from or written to it.
+    snapshot: Option<Snapshot>,
+}
+
+/// The rows of a mission as of the last load or save; `save_dataset_state`
+/// writes only where the mission differs from them.  Committed files are only
+/// ever appended, so their count is enough.
+#[derive(Clone, Debug, Default)]
+pub struct SavedMission {
+    record: Option<MissionRecord>,
+    staged_files: Vec<StagedFileRecord>,
+    committed: usize,
+}
+
+/// The dataset-level rows as of the last load or save.
+#[derive(Clone, Debug, Default)]
+pub struct SavedDataset {
+    meta: Option<DatasetMeta>,
+    staged_files: Vec<PathBuf>,
+    committed: usize,
+}
+
+impl MissionState {
+    /// A mission that is not in the database yet.
+    pub fn new(record: MissionRecord) -> Self {
+        MissionState {
+            record,
+            staged_files: Vec::new(),
+            committed_files: Some(Vec::new()),
+            saved: SavedMission::default(),
+        }
+    }
+
+    /// Whether `.e4edm.db` already holds the mission as it is.
+    fn is_saved(&self) -> bool {
+        self.saved.record.as_ref() == Some(&self.record)
+            && self.saved.staged_files == self.staged_files
+            && self.saved.committed == self.committed_files.as_ref().map_or(0, Vec::len)
+    }
+
+    fn mark_saved(&mut self) {
+        self.saved = SavedMission {
+            record: Some(self.record.clone()),
+            staged_files: self.staged_files.clone(),
+            committed: self.committed_files.as_ref().map_or(0, Vec::len),
+        };
+    }
+
+    fn set_committed_files(&mut self, files: Vec<String>) {
+        self.saved.committed = files.len();
+        self.committed_files = Some(files);
+    }
+}
+
+impl DatasetState {
+    /// An empty dataset that is not in the database yet.
+    pub fn new(root: &Path, day_0: &str) -> Self {
+        DatasetState {
+            root: root.to_path_buf(),
+            day_0: day_0.to_string(),
+            pushed: false,
+            version: VERSION,
+            last_country: None,
+            last_region: None,
+            last_site: None,
+            missions: Vec::new(),
+            staged_files: Vec::new(),
+            committed_files: Vec::new(),
+            saved: SavedDataset::default(),
+            snapshot: None,
+        }
+    }
+
+    fn meta(&self) -> DatasetMeta {
+        DatasetMeta {
+            day_0: self.day_0.clone(),
+            pushed: self.pushed,
+            version: self.version,
+            last_country: self.last_country.clone(),
+            last_region: self.last_region.clone(),
+            last_site: self.last_site.clone(),
+        }
+    }
+
+    fn mark_saved(&mut self) {
+        self.saved = SavedDataset {
+            meta: Some(self.meta()),
+            staged_files: self.staged_files.clone(),
+            committed: self.committed_files.len(),
+        };
+        // Missions that did not change stay shared.
+        for mission in self.missions.iter_mut().filter(|m| !m.is_saved()) {
+            Arc::make_mut(mission).mark_saved();
+        }
+    }
+
+    /// Read the committed files of every mission that has not loaded them yet,
+    /// in one query.
+    #[cfg_attr(not(test), allow(dead_code))]
+    pub fn load_committed_files(&mut self) -> Result<()> {
+        if self.missions.iter().all(|m| m.committed_files.is_some()) {
+            return Ok(());
+        }
+        let mut by_mission = DatasetDb::open(&self.root)?.get_all_mission_committed_files()?;
+        for mission in self.missions.iter_mut().filter(|m| m.committed_files.is_none()) {
+            let files = by_mission.remove(&mission.record.name).unwrap_or_default();
+            Arc::make_mut(mission).set_committed_files(files);
+        }
+        Ok(())
+    }
+
+    /// Whether another process (or another copy of the state) has written to
+    /// `.e4edm.db` since this state was loaded or saved.
+    pub fn is_stale(&self) -> Result<bool> {
+        match &self.snapshot {
+            Some(snapshot) if self.root.join(DB_NAME).exists() => {
+                DatasetDb::open(&self.root)?.changed_since(snapshot)
+            }
+            _ => Ok(false),
+        }
+    }
+
+    /// Reload the state from `.e4edm.db` if it is stale.  Every change is saved
+    /// as it is made, so nothing in memory is lost.
+    pub fn refresh(&mut self) -> Result<()> {
+        if self.is_stale()? {
+            *self = load_dataset_state(&self.root)?;
+        }
+        Ok(())
+    }
+
+    /// The committed files of one mission, read from `.e4edm.db` on first use.
+    pub fn mission_committed_files(&mut self, mission_idx: usize) -> Result<&mut Vec<String>> {
+        let mission = Arc::make_mut(&mut self.missions[mission_idx]);
+        if mission.committed_files.is_none() {
+            let files =
+                DatasetDb::open(&self.root)?.get_mission_committed_files(&mission.record.name)?;
+            mission.set_committed_files(files);
+        }
+        Ok(mission.committed_files.get_or_insert_with(Vec::new))
+    }
+}
+
+/// The items only in `saved` and the items only in `current`.
+fn changes<'a, T: Eq + Hash>(saved: &'a [T], current: &'a [T]) -> (Vec<&'a T>, Vec<&'a T>) {
+    let saved_set: HashSet<&T> = saved.iter().collect();
+    let current_set: HashSet<&T> = current.iter().collect();
+    (
+        saved.iter().filter(|item| !current_set.contains(item)).collect(),
+        current.iter().filter(|item| !saved_set.contains(item)).collect(),
+    )
+}
+
+/// The committed files appended since `saved` of them were written; all of them
+/// if the list was rebuilt meanwhile (adding is idempotent).
+fn unsaved_committed(files: &[String], saved: usize) -> &[String] {
+    files.get(saved..).unwrap_or(files)
 }
 
 const VERSION: i32 = 2;
@@ -43,8 +219,9 @@ const DB_NAME: &str = ".e4edm.db";
 // Load / Save helpers
 // ─────────────────────────────────────────────────────────────
 
-/// Load all dataset state from `.e4edm.db`.  Falls back to scanning filesystem
-/// for `metadata.json` files if the DB doesn't exist yet.
+/// Load dataset state from `.e4edm.db`.  Falls back to scanning filesystem
+/// for `metadata.json` files if the DB doesn't exist yet.  Mission committed
+/// files are left unloaded; they are read when first needed.
 pub fn load_dataset_state(root: &Path) -> Result<DatasetState> {
     let db_path = root.join(DB_NAME);
     if db_path.exists() {
@@ -56,25 +233,29 @@ pub fn load_dataset_state(root: &Path) -> Result<DatasetState> {
 }
 
 fn load_from_db(db: &DatasetDb, root: &Path) -> Result<DatasetState> {
+    let _span = trace::span("db.load");
+    let snapshot = db.snapshot()?;
     let meta = db.get_dataset_meta()?;
-    let mission_records = db.get_missions()?;
-    let mut missions = Vec::new();
-    for rec in mission_records {
-        let staged = db.get_mission_staged_files(&rec.name)?;
-        let committed = db.get_mission_committed_files(&rec.name)?;
-        missions.push(MissionState {
-            record: rec,
-            staged_files: staged,
-            committed_files: committed,
-        });
-    }
+    let mut staged = db.get_all_mission_staged_files()?;
+    let missions = db
+        .get_missions()?
+        .into_iter()
+        .map(|rec| {
+            Arc::new(MissionState {
+                staged_files: staged.remove(&rec.name).unwrap_or_default(),
+                record: rec,
+                committed_files: None,
+                saved: SavedMission::default(),
+            })
+        })
+        .collect();
     let staged_paths: Vec<PathBuf> = db
         .get_dataset_staged_files()?
         .into_iter()
         .map(PathBuf::from)
         .collect();
     let committed = db.get_dataset_committed_files()?;
-    Ok(DatasetState {
+    let mut state = DatasetState {
         root: root.to_path_buf(),
         day_0: meta.day_0,
         pushed: meta.pushed,
@@ -85,7 +266,11 @@ fn load_from_db(db: &DatasetDb, root: &Path) -> Result<DatasetState> {
         missions,
         staged_files: staged_paths,
         committed_files: committed,
-    })
+        saved: SavedDataset::default(),
+        snapshot: Some(snapshot),
+    };
+    state.mark_saved();
+    Ok(state)
 }
 
 fn load_from_filesystem(root: &Path) -> Result<DatasetState> {
@@ -130,18 +315,7 @@ fn load_from_filesystem(root: &Path) -> Result<DatasetState> {
         mission_date
     };
 
-    Ok(DatasetState {
-        root: root.to_path_buf(),
-        day_0,
-        pushed: false,
-        version: VERSION,
-        last_country: None,
-        last_region: None,
-        last_site: None,
-        missions: Vec::new(),
-        staged_files: Vec::new(),
-        committed_files: Vec::new(),
-    })
+    Ok(DatasetState::new(root, &day_0))
 }
 
 fn visit_dirs(dir: &Path, cb: &mut dyn FnMut(&Path)) -> io::Result<()> {
@@ -159,39 +333,147 @@ fn visit_dirs(dir: &Path, cb: &mut dyn FnMut(&Path)) -> io::Result<()> {
     Ok(())
 }
 
-/// Save dataset state back to `.e4edm.db`.
-pub fn save_dataset_state(state: &DatasetState) -> Result<()> {
+/// Save dataset state back to `.e4edm.db`, in one transaction.  Only the rows
+/// that differ from what was last loaded or saved are written.
+pub fn save_dataset_state(state: &mut DatasetState) -> Result<()> {
+    let _span = trace::span("db.save");
     let db = DatasetDb::open(&state.root)?;
-    let meta = DatasetMeta {
-        day_0: state.day_0.clone(),
-        pushed: state.pushed,
-        version: state.version,
-        last_country: state.last_country.clone(),
-        last_region: state.last_region.clone(),
-        last_site: state.last_site.clone(),
-    };
-    // Ensure a row exists
-    db.init_dataset(&state.day_0, state.version)?;
-    db.update_dataset_meta(&meta)?;
+    let meta = state.meta();
+    let snapshot = db.transaction(|db| {
+        match &state.saved.meta {
+            None => {
+                // Ensure a row exists
+                db.init_dataset(&meta.day_0, meta.version)?;
+                db.update_dataset_meta(&meta)?;
+            }
+            Some(saved) if *saved != meta => db.update_dataset_meta(&meta)?,
+            Some(_) => {}
+        }
 
-    for mission in &state.missions {
-        db.insert_mission(&mission.record)?;
-        db.set_mission_staged_files(&mission.record.name, &mission.staged_files)?;
-        db.add_mission_committed_files(
-            &mission.record.name,
-            &mission.committed_files,
-        )?;
+        for mission in &state.missions {
+            let name = &mission.record.name;
+            let saved = &mission.saved;
+            if saved.record.as_ref() != Some(&mission.record) {
+                db.insert_mission(&mission.record)?;
+            }
+            let (removed, added) = changes(&saved.staged_files, &mission.staged_files);
+            db.remove_mission_staged_files(name, removed)?;
+            db.add_mission_staged_files(name, added)?;
+            if let Some(files) = &mission.committed_files {
+                let committed = unsaved_committed(files, saved.committed);
+                if !committed.is_empty() {
+                    db.add_mission_committed_files(name, committed)?;
+                }
+            }
+        }
+
+        let (removed, added) = changes(&state.saved.staged_files, &state.staged_files);
+        let to_strings = |paths: Vec<&PathBuf>| -> Vec<String> {
+            paths.iter().map(|p| p.to_string_lossy().into_owned()).collect()
+        };
+        db.remove_dataset_staged_files(&to_strings(removed))?;
+        db.add_dataset_staged_files(&to_strings(added))?;
+        let committed = unsaved_committed(&state.committed_files, state.saved.committed);
+        if !committed.is_empty() {
+            db.add_dataset_committed_files(committed)?;
+        }
+        record_write(db, state)
+    })?;
+    state.mark_saved();
+    state.snapshot = snapshot;
+    Ok(())
+}
+
+/// Count a write of `state` in the transaction making it, and return the
+/// snapshot the state moves to: one as of this write if the state was current
+/// until it (or is new to the database), else its old one so that it stays
+/// stale.
+fn record_write(db: &DatasetDb, state: &DatasetState) -> Result<Option<Snapshot>> {
+    let previous = db.bump_revision()?;
+    match &state.snapshot {
+        Some(seen) if seen.revision() != previous => Ok(Some(seen.clone())),
+        Some(_) => db.snapshot().map(Some),
+        None if state.saved.meta.is_none() => db.snapshot().map(Some),
+        None => Ok(None),
     }
+}
+
+/// Reconstruct the state of a dataset directory that has no `.e4edm.db` (e.g.
+/// one restored from an archive) from its manifests and mission
+/// `metadata.json` files, and persist it to a new `.e4edm.db`.  Every file in
+/// the manifests is taken as committed; nothing is staged or pushed.
+#[cfg_attr(not(feature = "python"), allow(dead_code))]
+pub fn rebuild_dataset_state(root: &Path) -> Result<DatasetState> {
+    let manifest_data = manifest::read_manifest(&root.join(MANIFEST_NAME))?;
 
-    let staged_strs: Vec<String> = state
-        .staged_files
+    // Missions live in ED-NN/<mission>/ next to their metadata.json.
+    let mut missions = Vec::new();
+    for rel_path in manifest_data.keys() {
+        let parts: Vec<&str> = rel_path.split('/').collect();
+        if parts.len() != 3 || !parts[0].starts_with("ED-") || parts[2] != "metadata.json" {
+            continue;
+        }
+        let mission_path = root.join(parts[0]).join(parts[1]);
+        let meta = metadata::read_metadata(&mission_path)?;
+        let mut committed: Vec<String> = manifest::read_manifest(&mission_path.join(MANIFEST_NAME))?
+            .into_keys()
+            .filter(|k| k != "metadata.json")
+            .collect();
+        committed.sort();
+        let mut mission = MissionState::new(MissionRecord {
+            name: format!("{} {}", parts[0], meta.mission_name),
+            path: mission_path.to_string_lossy().into_owned(),
+            metadata: meta,
+        });
+        mission.committed_files = Some(committed);
+        missions.push(Arc::new(mission));
+    }
+    missions.sort_by(|a, b| a.record.metadata.timestamp.cmp(&b.record.metadata.timestamp));
+
+    let day_0 = match missions.first() {
+        Some(first) => {
+            let day: i64 = first.record.name[3..]
+                .split(' ')
+                .next()
+                .and_then(|d| d.parse().ok())
+                .unwrap_or(0);
+            subtract_days(&parse_date_from_iso(&first.record.metadata.timestamp)?, day)
+        }
+        // Without missions, fall back to the date in the dataset name.
+        None => {
+            let name = root.file_name().unwrap_or_default().to_string_lossy();
+            let date = name.get(..10).unwrap_or_default().replace('.', "-");
+            date_to_days(&date)?;
+            date
+        }
+    };
+
+    let mission_prefixes: Vec<String> = missions
         .iter()
-        .map(|p| p.to_string_lossy().into_owned())
+        .filter_map(|m| {
+            Path::new(&m.record.path)
+                .strip_prefix(root)
+                .ok()
+                .map(|rel| format!("{}/", rel.to_string_lossy().replace('\\', "/")))
+        })
         .collect();
-    db.set_dataset_staged_files(&staged_strs)?;
-    db.add_dataset_committed_files(&state.committed_files)?;
+    let mut committed_files: Vec<String> = manifest_data
+        .keys()
+        .filter(|k| !mission_prefixes.iter().any(|p| k.starts_with(p.as_str())))
+        .map(|k| root.join(k).to_string_lossy().into_owned())
+        .collect();
+    committed_files.sort();
 
-    Ok(())
+    let mut state = DatasetState::new(root, &day_0);
+    if let Some(last) = missions.last().map(|m| &m.record.metadata) {
+        state.last_country = Some(last.country.clone());
+        state.last_region = Some(last.region.clone());
+        state.last_site = Some(last.site.clone());
+    }
+    state.missions = missions;
+    state.committed_files = committed_files;
+    save_dataset_state(&mut state)?;
+    Ok(state)
 }
 
 // ─────────────────────────────────────────────────────────────
@@ -201,25 +483,13 @@ pub fn save_dataset_state(state: &DatasetState) -> Result<()> {
 /// Create a new empty dataset on disk, init the DB, write an empty manifest.
 pub fn create_dataset(root: &Path, day_0: &str) -> Result<DatasetState> {
     fs::create_dir_all(root)?;
-    let db = DatasetDb::open(root)?;
-    db.init_dataset(day_0, VERSION)?;
+    let mut state = DatasetState::new(root, day_0);
+    save_dataset_state(&mut state)?;
 
     // Write empty manifest
     let manifest_path = root.join(MANIFEST_NAME);
     manifest::write_manifest(&manifest_path, &manifest::ManifestData::new())?;
 
-    let state = DatasetState {
-        root: root.to_path_buf(),
-        day_0: day_0.to_string(),
-        pushed: false,
-        version: VERSION,
-        last_country: None,
-        last_region: None,
-        last_site: None,
-        missions: Vec::new(),
-        staged_files: Vec::new(),
-        committed_files: Vec::new(),
-    };
     Ok(state)
 }
 
@@ -230,7 +500,11 @@ pub fn add_mission(state: &mut DatasetState, meta: &MetadataRecord) -> Result<Mi
     let expedition_day = days_between(&state.day_0, &mission_date)?;
     let day_path = state.root.join(format!("ED-{:02}", expedition_day));
     let mission_path = day_path.join(&meta.mission_name);
+    // Mission name is "ED-{day:02} {mission_name}"
+    let mission_name = format!("ED-{:02} {}", expedition_day, meta.mission_name);
 
+    let _lock = DatasetLock::mission(&state.root, &mission_name)?;
+    state.refresh()?;
     fs::create_dir_all(&mission_path)?;
     metadata::write_metadata(&mission_path, meta)?;
 
@@ -241,9 +515,6 @@ pub fn add_mission(state: &mut DatasetState, meta: &MetadataRecord) -> Result<Mi
         manifest::compute_hashes(&mission_path, &mission_meta_files)?;
     manifest::write_manifest(&mission_manifest_path, &mission_manifest_data)?;
 
-    // Mission name is "ED-{day:02} {mission_name}"
-    let mission_name = format!("ED-{:02} {}", expedition_day, meta.mission_name);
-
     let record = MissionRecord {
         name: mission_name.clone(),
         path: mission_path.to_string_lossy().into_owned(),
@@ -255,74 +526,70 @@ pub fn add_mission(state: &mut DatasetState, meta: &MetadataRecord) -> Result<Mi
         mission_path.join("metadata.json"),
         mission_manifest_path,
     ];
-    let dataset_manifest_path = state.root.join(MANIFEST_NAME);
-    manifest::update_manifest(&dataset_manifest_path, &state.root, &new_files)?;
+    let new_entries = manifest::compute_hashes(&state.root, &new_files)?;
+    DatasetDb::open(&state.root)?.upsert_manifest_entries(&new_entries)?;
 
     // Update last_country, last_region, last_site
     state.last_country = Some(meta.country.clone());
     state.last_region = Some(meta.region.clone());
     state.last_site = Some(meta.site.clone());
 
-    let mission_state = MissionState {
-        record: record.clone(),
-        staged_files: Vec::new(),
-        committed_files: Vec::new(),
-    };
-    state.missions.push(mission_state);
+    state.missions.push(Arc::new(MissionState::new(record.clone())));
 
     // Persist
-    let db = DatasetDb::open(&state.root)?;
-    db.insert_mission(&record)?;
-    let dataset_meta = DatasetMeta {
-        day_0: state.day_0.clone(),
-        pushed: state.pushed,
-        version: state.version,
-        last_country: state.last_country.clone(),
-        last_region: state.last_region.clone(),
-        last_site: state.last_site.clone(),
-    };
-    db.update_dataset_meta(&dataset_meta)?;
+    save_dataset_state(state)?;
 
     Ok(record)
 }
 
-/// Remove a mission from the dataset: strip its files from the dataset manifest,
-/// delete its directory from disk, and remove it from the DB.
-pub fn remove_mission(state: &mut DatasetState, mission_name: &str) -> Result<()> {
-    let idx = state
-        .missions
-        .iter()
-        .position(|m| m.record.name == mission_name)
-        .ok_or_else(|| E4EError::Runtime(format!("Mission not found: {}", mission_name)))?;
+/// A mission's directory, and its posix path relative to the dataset root that
+/// prefixes its manifest keys (e.g. "ED-00/M1").
+///
+/// Derived from `state.root` and the mission name to avoid stale absolute paths
+/// stored in the DB (e.g. from a previous TemporaryDirectory).  Mission name
+/// format: "ED-{day} {mission_sub_name}" where mission_sub_name may contain
+/// slashes for nested paths like "reef-laser-03/right/box".
+pub fn mission_dir(state: &DatasetState, record: &MissionRecord) -> Result<(PathBuf, String)> {
+    mission_dir_in(&state.root, record)
+}
 
-    // Derive mission_path from state.root and the mission name to avoid stale
-    // absolute paths stored in the DB (e.g. from a previous TemporaryDirectory).
-    // Mission name format: "ED-{day} {mission_sub_name}" where mission_sub_name
-    // may contain slashes for nested paths like "reef-laser-03/right/box".
+/// `mission_dir` for a mission of the dataset at `root`.
+pub fn mission_dir_in(root: &Path, record: &MissionRecord) -> Result<(PathBuf, String)> {
     let mission_path = {
-        let parts: Vec<&str> = mission_name.splitn(2, ' ').collect();
+        let parts: Vec<&str> = record.name.splitn(2, ' ').collect();
         if parts.len() == 2 {
-            state.root.join(parts[0]).join(parts[1])
+            root.join(parts[0]).join(parts[1])
         } else {
-            PathBuf::from(&state.missions[idx].record.path)
+            PathBuf::from(&record.path)
         }
     };
-
-    // Build the posix-style relative prefix used as manifest keys (e.g. "ED-00/M1")
     let rel_prefix = mission_path
-        .strip_prefix(&state.root)
+        .strip_prefix(root)
         .map_err(|e| E4EError::Runtime(e.to_string()))?;
     let rel_prefix_posix = rel_prefix
         .components()
         .map(|c| c.as_os_str().to_string_lossy().into_owned())
         .collect::<Vec<_>>()
         .join("/");
+    Ok((mission_path, rel_prefix_posix))
+}
+
+/// Remove a mission from the dataset: strip its files from the dataset manifest,
+/// delete its directory from disk, and remove it from the DB.
+pub fn remove_mission(state: &mut DatasetState, mission_name: &str) -> Result<()> {
+    let _lock = DatasetLock::exclusive(&state.root)?;
+    state.refresh()?;
+    let idx = state
+        .missions
+        .iter()
+        .position(|m| m.record.name == mission_name)
+        .ok_or_else(|| E4EError::Runtime(format!("Mission not found: {}", mission_name)))?;
+
+    let (mission_path, rel_prefix_posix) = mission_dir(state, &state.missions[idx].record)?;
 
     // Remove all matching entries from the dataset manifest
-    let manifest_path = state.root.join(MANIFEST_NAME);
-    let mut manifest_data = manifest::read_manifest(&manifest_path)?;
-    manifest_data.retain(|k, _| !k.starts_with(&format!("{}/", rel_prefix_posix)));
-    manifest::write_manifest(&manifest_path, &manifest_data)?;
+    let db = DatasetDb::open(&state.root)?;
+    db.delete_manifest_dir(&rel_prefix_posix)?;
 
     // Delete the mission directory
     if mission_path.exists() {
@@ -341,8 +608,10 @@ pub fn remove_mission(state: &mut DatasetState, mission_name: &str) -> Result<()
     }
 
     // Remove from DB
-    let db = DatasetDb::open(&state.root)?;
-    db.delete_mission(mission_name)?;
+    state.snapshot = db.transaction(|db| {
+        db.delete_mission(mission_name)?;
+        record_write(db, state)
+    })?;
 
     // Remove from in-memory state
     state.missions.remove(idx);
@@ -357,6 +626,20 @@ pub fn stage_mission_files(
     paths: &[PathBuf],
     destination: Option<&Path>,
 ) -> Result<Vec<StagedFileRecord>> {
+    stage_mission_files_with_progress(state, mission_name, paths, destination, &Progress::new())
+}
+
+/// `stage_mission_files`, reporting the hashing as a `Hash` phase to `progress`.
+/// Nothing is staged if the operation is cancelled.
+pub fn stage_mission_files_with_progress(
+    state: &mut DatasetState,
+    mission_name: &str,
+    paths: &[PathBuf],
+    destination: Option<&Path>,
+    progress: &Progress,
+) -> Result<Vec<StagedFileRecord>> {
+    let _lock = DatasetLock::mission(&state.root, mission_name)?;
+    state.refresh()?;
     let mission_idx = state
         .missions
         .iter()
@@ -369,18 +652,15 @@ pub fn stage_mission_files(
         None => mission_path.clone(),
     };
 
-    let mut new_staged: Vec<StagedFileRecord> = Vec::new();
-
+    // (origin, target, size) for every file to hash.
+    let walk = trace::span("stage.walk");
+    let mut sources: Vec<(PathBuf, PathBuf, u64)> = Vec::new();
     for path in paths {
         let origin = path.canonicalize().unwrap_or_else(|_| path.to_path_buf());
         if origin.is_file() {
-            let hash = manifest::compute_file_hash(&origin)?;
             let target = dst.join(origin.file_name().unwrap());
-            new_staged.push(StagedFileRecord {
-                origin_path: origin.to_string_lossy().into_owned(),
-                target_path: target.to_string_lossy().into_owned(),
-                hash,
-            });
+            let size = fs::metadata(&origin)?.len();
+            sources.push((origin, target, size));
         } else if origin.is_dir() {
             for entry in walkdir::WalkDir::new(&origin)
                 .into_iter()
@@ -389,13 +669,8 @@ pub fn stage_mission_files(
             {
                 let file = entry.path();
                 let rel = file.strip_prefix(&origin).unwrap();
-                let target = dst.join(rel);
-                let hash = manifest::compute_file_hash(file)?;
-                new_staged.push(StagedFileRecord {
-                    origin_path: file.to_string_lossy().into_owned(),
-                    target_path: target.to_string_lossy().into_owned(),
-                    hash,
-                });
+                let size = entry.metadata().map(|m| m.len()).unwrap_or(0);
+                sources.push((file.to_path_buf(), dst.join(rel), size));
             }
         } else {
             return Err(E4EError::Runtime(format!(
@@ -404,17 +679,35 @@ pub fn stage_mission_files(
             )));
         }
     }
+    drop(walk);
+
+    let bytes_total = sources.iter().map(|(_, _, size)| size).sum();
+    progress.start_phase(Phase::Hash, sources.len() as u64, bytes_total);
+    let mut new_staged: Vec<StagedFileRecord> = Vec::with_capacity(sources.len());
+    for (origin, target, size) in &sources {
+        let hash = {
+            let _span = trace::span("stage.hash");
+            manifest::compute_file_hash_cancellable(origin, progress.cancel_token())?
+        };
+        new_staged.push(StagedFileRecord {
+            origin_path: origin.to_string_lossy().into_owned(),
+            target_path: target.to_string_lossy().into_owned(),
+            hash,
+            size: *size,
+        });
+        progress.advance(1, *size);
+    }
 
     // Merge new staged files with existing ones (dedup on target_path)
-    let existing = &mut state.missions[mission_idx].staged_files;
+    let existing = &mut Arc::make_mut(&mut state.missions[mission_idx]).staged_files;
     for sf in &new_staged {
         if !existing.iter().any(|e| e.target_path == sf.target_path) {
             existing.push(sf.clone());
         }
     }
 
-    let db = DatasetDb::open(&state.root)?;
-    db.set_mission_staged_files(mission_name, &state.missions[mission_idx].staged_files)?;
+    save_dataset_state(state)?;
+    progress.finish();
 
     Ok(new_staged)
 }
@@ -424,6 +717,20 @@ pub fn commit_mission_files(
     state: &mut DatasetState,
     mission_name: &str,
 ) -> Result<Vec<PathBuf>> {
+    commit_mission_files_with_progress(state, mission_name, &Progress::new())
+}
+
+/// `commit_mission_files`, reporting the copy as a `Copy` phase to `progress`.
+///
+/// If the operation is cancelled, the files copied so far are committed, the
+/// rest stay staged, and `E4EError::Cancelled` is returned.
+pub fn commit_mission_files_with_progress(
+    state: &mut DatasetState,
+    mission_name: &str,
+    progress: &Progress,
+) -> Result<Vec<PathBuf>> {
+    let _lock = DatasetLock::mission(&state.root, mission_name)?;
+    state.refresh()?;
     let mission_idx = state
         .missions
         .iter()
@@ -433,28 +740,44 @@ pub fn commit_mission_files(
     let mission_path = PathBuf::from(state.missions[mission_idx].record.path.clone());
     let staged = state.missions[mission_idx].staged_files.clone();
 
+    let sizes: Vec<u64> = staged
+        .iter()
+        .map(|sf| fs::metadata(&sf.origin_path).map(|m| m.len()).unwrap_or(0))
+        .collect();
+    progress.start_phase(Phase::Copy, staged.len() as u64, sizes.iter().sum());
+    let cancel = progress.cancel_token();
+
     let mut committed: Vec<PathBuf> = Vec::new();
     let mut committed_with_hashes: Vec<(PathBuf, String)> = Vec::new();
-    for sf in &staged {
+    let mut cancelled = false;
+    for (sf, size) in staged.iter().zip(&sizes) {
         let src = PathBuf::from(&sf.origin_path);
         let dst = PathBuf::from(&sf.target_path);
         if let Some(parent) = dst.parent() {
+            let _span = trace::span("commit.create_dirs");
             fs::create_dir_all(parent)?;
         }
-        fs::copy(&src, &dst)?;
-        // Verify the copy is intact by recomputing the hash of the destination.
-        let actual_hash = manifest::compute_file_hash(&dst)?;
-        if actual_hash != sf.hash {
-            return Err(E4EError::Runtime(format!(
-                "Hash mismatch after copy: {}",
-                src.display()
-            )));
+        // Hash while copying so each file is read once (and throttled once).
+        let copy = trace::span("commit.copy");
+        let copied = manifest::copy_and_verify_synced(&src, &dst, &sf.hash, false, cancel);
+        drop(copy);
+        match copied {
+            Err(E4EError::Cancelled) => {
+                cancelled = true;
+                break;
+            }
+            result => result?,
         }
         committed.push(dst.clone());
         committed_with_hashes.push((dst, sf.hash.clone()));
+        progress.advance(1, *size);
+    }
+    if cancelled && committed.is_empty() {
+        return Err(E4EError::Cancelled);
     }
 
     // Update mission manifest using pre-computed hashes (no re-read of file contents)
+    let manifest_span = trace::span("commit.manifest");
     let mission_manifest_path = mission_path.join(MANIFEST_NAME);
     manifest::update_manifest_with_known_hashes(
         &mission_manifest_path,
@@ -467,11 +790,9 @@ pub fn commit_mission_files(
     let mission_manifest_hash = manifest::compute_file_hash(&mission_manifest_path)?;
     let mut dataset_update = committed_with_hashes;
     dataset_update.push((mission_manifest_path, mission_manifest_hash));
-    manifest::update_manifest_with_known_hashes(
-        &state.root.join(MANIFEST_NAME),
-        &state.root,
-        &dataset_update,
-    )?;
+    let dataset_entries = manifest::entries_with_known_hashes(&state.root, &dataset_update)?;
+    DatasetDb::open(&state.root)?.upsert_manifest_entries(&dataset_entries)?;
+    drop(manifest_span);
 
     // Update state
     let relative_committed: Vec<String> = committed
@@ -482,38 +803,38 @@ pub fn commit_mission_files(
                 .unwrap_or_else(|_| p.to_string_lossy().into_owned())
         })
         .collect();
-    state.missions[mission_idx]
-        .committed_files
-        .extend(relative_committed.clone());
-    state.missions[mission_idx].staged_files.clear();
+    state
+        .mission_committed_files(mission_idx)?
+        .extend(relative_committed);
+    let mission = Arc::make_mut(&mut state.missions[mission_idx]);
+    mission.staged_files = staged[committed.len()..].to_vec();
 
     // Persist
-    let db = DatasetDb::open(&state.root)?;
-    db.clear_mission_staged_files(mission_name)?;
-    db.add_mission_committed_files(mission_name, &relative_committed)?;
+    save_dataset_state(state)?;
 
+    if cancelled {
+        return Err(E4EError::Cancelled);
+    }
+    progress.finish();
     Ok(committed)
 }
 
 /// Stage files at the dataset level (readme files).
 pub fn stage_dataset_files(state: &mut DatasetState, paths: &[PathBuf]) -> Result<()> {
+    let _lock = DatasetLock::readme(&state.root)?;
+    state.refresh()?;
     for p in paths {
         if !state.staged_files.contains(p) {
             state.staged_files.push(p.clone());
         }
     }
-    let strs: Vec<String> = state
-        .staged_files
-        .iter()
-        .map(|p| p.to_string_lossy().into_owned())
-        .collect();
-    let db = DatasetDb::open(&state.root)?;
-    db.set_dataset_staged_files(&strs)?;
-    Ok(())
+    save_dataset_state(state)
 }
 
 /// Commit dataset-level staged files (readme).
 pub fn commit_dataset_files(state: &mut DatasetState) -> Result<Vec<PathBuf>> {
+    let _lock = DatasetLock::readme(&state.root)?;
+    state.refresh()?;
     let staged = state.staged_files.clone();
     let mut committed: Vec<PathBuf> = Vec::new();
 
@@ -564,49 +885,226 @@ pub fn commit_dataset_files(state: &mut DatasetState) -> Result<Vec<PathBuf>> {
     }
 
     // Update dataset manifest
-    let dataset_manifest_path = state.root.join(MANIFEST_NAME);
-    manifest::update_manifest(&dataset_manifest_path, &state.root, &committed)?;
+    let new_entries = manifest::compute_hashes(&state.root, &committed)?;
+    DatasetDb::open(&state.root)?.upsert_manifest_entries(&new_entries)?;
 
     // Update state
     let committed_strs: Vec<String> = committed
         .iter()
         .map(|p| p.to_string_lossy().into_owned())
         .collect();
-    state.committed_files.extend(committed_strs.clone());
+    state.committed_files.extend(committed_strs);
     state.staged_files.clear();
 
-    let db = DatasetDb::open(&state.root)?;
-    db.clear_dataset_staged_files()?;
-    db.add_dataset_committed_files(&committed_strs)?;
+    save_dataset_state(state)?;
+
+    Ok(committed)
+}
+
+// ── Ingest ───────────────────────────────────────────────────────
 
+/// Files for one mission of an ingest, e.g. one card reader's contents.
+#[derive(Clone, Debug)]
+pub struct IngestSource {
+    pub mission_name: String,
+    pub paths: Vec<PathBuf>,
+}
+
+/// The full name of the mission of `state` called `name`: either that full
+/// name ("ED-00 TCM001") or the mission's name within its day, if no other day
+/// has a mission so called.
+#[cfg_attr(not(feature = "python"), allow(dead_code))]
+pub fn find_mission_name(state: &DatasetState, name: &str) -> Result<String> {
+    if state.missions.iter().any(|m| m.record.name == name) {
+        return Ok(name.to_string());
+    }
+    let matches: Vec<&str> = state
+        .missions
+        .iter()
+        .filter(|m| m.record.metadata.mission_name == name)
+        .map(|m| m.record.name.as_str())
+        .collect();
+    match matches.as_slice() {
+        [full_name] => Ok(full_name.to_string()),
+        [] => Err(E4EError::Runtime(format!("Mission not found: {}", name))),
+        _ => Err(E4EError::Runtime(format!(
+            "Mission name is ambiguous, include its day (e.g. ED-00): {}",
+            name
+        ))),
+    }
+}
+
+/// Stage and commit `sources` into their missions of the dataset, one thread
+/// (I/O lane) per mission, so that several card readers are read at once.
+/// Each lane works on its own copy of `state` and holds only its mission's
+/// lock; the dataset manifest and `.e4edm.db` are updated row by row, so the
+/// lanes' updates merge.  Sources for the same mission share its lane.  Each
+/// lane's mission is then taken into `state`, whether or not the lane failed.
+///
+/// Every lane stages (the `hash` phase of `progress`) before any commits
+/// (`copy`), so the lanes report as one progress.  A lane that fails does not
+/// stop the others; the error then names each mission that failed.  Returns
+/// the files committed.
+#[cfg_attr(not(feature = "python"), allow(dead_code))]
+pub fn ingest_missions(
+    state: &mut DatasetState,
+    sources: &[IngestSource],
+    progress: &Progress,
+) -> Result<Vec<PathBuf>> {
+    let mut lanes: Vec<(&str, Vec<PathBuf>)> = Vec::new();
+    for source in sources {
+        match lanes.iter_mut().find(|(name, _)| *name == source.mission_name) {
+            Some((_, paths)) => paths.extend(source.paths.iter().cloned()),
+            None => lanes.push((source.mission_name.as_str(), source.paths.clone())),
+        }
+    }
+    let mut failures: Vec<(&str, E4EError)> = Vec::new();
+    let mut lane_states: Vec<DatasetState> = lanes.iter().map(|_| state.clone()).collect();
+
+    progress.start_phase(Phase::Hash, 0, 0);
+    let staged = run_lanes(&mut lane_states, &lanes, progress, |ds, name, paths, lane| {
+        stage_mission_files_with_progress(ds, name, paths, None, lane).map(|_| ())
+    });
+    let mut ready: Vec<(&str, Vec<PathBuf>)> = Vec::new();
+    let mut ready_states = Vec::new();
+    for ((lane, ds), result) in lanes.into_iter().zip(lane_states).zip(staged) {
+        match result {
+            Ok(()) => {
+                ready.push(lane);
+                ready_states.push(ds);
+            }
+            Err(e) => {
+                take_mission(state, &ds, lane.0);
+                failures.push((lane.0, e));
+            }
+        }
+    }
+
+    progress.start_phase(Phase::Copy, 0, 0);
+    let results = run_lanes(&mut ready_states, &ready, progress, |ds, name, _, lane| {
+        commit_mission_files_with_progress(ds, name, lane)
+    });
+    let mut committed = Vec::new();
+    for ((&(name, _), ds), result) in ready.iter().zip(&ready_states).zip(results) {
+        take_mission(state, ds, name);
+        match result {
+            Ok(files) => committed.extend(files),
+            Err(e) => failures.push((name, e)),
+        }
+    }
+
+    if failures.iter().any(|(_, e)| matches!(e, E4EError::Cancelled)) {
+        return Err(E4EError::Cancelled);
+    }
+    if !failures.is_empty() {
+        let reasons: Vec<String> = failures
+            .iter()
+            .map(|(name, e)| match e {
+                E4EError::Runtime(msg) => format!("{}: {}", name, msg),
+                e => format!("{}: {}", name, e),
+            })
+            .collect();
+        return Err(E4EError::Runtime(format!("Ingest failed for {}", reasons.join("; "))));
+    }
+    progress.finish();
     Ok(committed)
 }
 
+/// Run `work` for each `(mission, paths)` lane on a thread of its own, with
+/// the lane's copy of the state in `states` and a lane of `progress`; returns
+/// the results in order.
+fn run_lanes<T: Send>(
+    states: &mut [DatasetState],
+    lanes: &[(&str, Vec<PathBuf>)],
+    progress: &Progress,
+    work: impl Fn(&mut DatasetState, &str, &[PathBuf], &Progress) -> Result<T> + Sync,
+) -> Vec<Result<T>> {
+    let work = &work;
+    std::thread::scope(|scope| {
+        let workers: Vec<_> = lanes
+            .iter()
+            .zip(states.iter_mut())
+            .map(|((name, paths), ds)| {
+                scope.spawn(move || {
+                    throttle::mark_worker_thread();
+                    work(ds, *name, paths.as_slice(), &progress.lane())
+                })
+            })
+            .collect();
+        workers
+            .into_iter()
+            .map(|worker| {
+                worker.join().unwrap_or_else(|_| {
+                    Err(E4EError::Runtime("Worker thread panicked".to_string()))
+                })
+            })
+            .collect()
+    })
+}
+
+/// Replace the mission `name` of `state` with the one of `lane`, the copy of
+/// the state a lane staged or committed it in.  Other lanes' writes have left
+/// `state` stale, so it still refreshes before its next change.
+fn take_mission(state: &mut DatasetState, lane: &DatasetState, name: &str) {
+    let Some(mission) = lane.missions.iter().find(|m| m.record.name == name) else {
+        return;
+    };
+    if let Some(slot) = state.missions.iter_mut().find(|m| m.record.name == name) {
+        *slot = Arc::clone(mission);
+    }
+}
+
+/// Regenerate the dataset's `manifest.json` from `.e4edm.db`, where the
+/// manifest is kept, and return its entries.  Done before the file is needed:
+/// on push, archive and export.
+pub fn export_manifest(root: &Path) -> Result<manifest::ManifestData> {
+    let _lock = DatasetLock::manifest(root)?;
+    DatasetDb::open(root)?.export_manifest(&root.join(MANIFEST_NAME))
+}
+
+/// The manifest of the dataset at `root`: the one kept in `.e4edm.db`, or for
+/// a root without one (such as a push destination) its `manifest.json`.  Never
+/// creates a database.
+pub fn read_dataset_manifest(root: &Path) -> Result<manifest::ManifestData> {
+    match DatasetDb::open_existing(root)? {
+        Some(db) => db.get_manifest(),
+        None => manifest::read_manifest(&root.join(MANIFEST_NAME)),
+    }
+}
+
 /// Validate the dataset against its manifest (hash check).
+#[cfg_attr(not(feature = "python"), allow(dead_code))]
 pub fn validate_dataset(root: &Path) -> Result<bool> {
     Ok(validate_dataset_failures(root)?.is_empty())
 }
 
-/// Return a list of validation failure messages for the dataset, calling
-/// `progress(current, total)` after each file is hashed.
-pub fn validate_dataset_failures_with_progress<F>(root: &Path, progress: F) -> Result<Vec<String>>
-where
-    F: Fn(u64, u64) + Send + Sync,
-{
-    let manifest_path = root.join(MANIFEST_NAME);
-    let manifest_data = manifest::read_manifest(&manifest_path)?;
+/// Return a list of validation failure messages for the dataset, reporting each
+/// hashed file to `progress`.
+pub fn validate_dataset_failures_with_progress(root: &Path, progress: &Progress) -> Result<Vec<String>> {
+    let load = trace::span("validate.load");
+    let manifest_data = read_dataset_manifest(root)?;
     let files = get_dataset_files(root);
-    manifest::collect_validation_failures_with_progress(&manifest_data, root, &files, "hash", progress)
+    drop(load);
+    let failures = manifest::collect_validation_failures_with_progress(
+        &manifest_data,
+        root,
+        &files,
+        "hash",
+        progress,
+    )?;
+    progress.finish();
+    Ok(failures)
 }
 
 /// Return a list of validation failure messages for the dataset.
 /// An empty list means the dataset is valid.
 pub fn validate_dataset_failures(root: &Path) -> Result<Vec<String>> {
-    validate_dataset_failures_with_progress(root, |_, _| {})
+    validate_dataset_failures_with_progress(root, &Progress::new())
 }
 
-/// Check that dataset is complete and ready to push.
-pub fn check_complete(state: &DatasetState) -> Result<()> {
+/// Check that the dataset is ready to push: nothing is staged and it has a readme.
+/// The hashing is left to `check_plan_integrity`.
+pub fn check_ready(state: &DatasetState) -> Result<()> {
     // 1. Any mission has staged files?
     if state.missions.iter().any(|m| !m.staged_files.is_empty()) {
         return Err(E4EError::MissionFilesInStaging);
@@ -646,29 +1144,59 @@ pub fn check_complete(state: &DatasetState) -> Result<()> {
         ));
     }
 
-    // 4. Validate integrity
-    if !validate_dataset(&state.root)? {
+    Ok(())
+}
+
+/// Integrity check of the dataset before a push of `plan`.  An incremental plan
+/// hashes only its pending entries: files the push ledger vouches for are not
+/// listed, stat'ed or hashed.
+fn check_plan_integrity(root: &Path, plan: &PushPlan, progress: &Progress) -> Result<()> {
+    if !plan.incremental {
+        return check_integrity(root, progress);
+    }
+    let pending: manifest::ManifestData =
+        plan.pending_entries().map(|(k, e)| (k.clone(), e.clone())).collect();
+    let files: Vec<PathBuf> = plan
+        .pending
+        .iter()
+        .map(|k| root.join(k))
+        .filter(|p| p.is_file())
+        .collect();
+    let failures = manifest::collect_validation_failures_with_progress(
+        &pending, root, &files, "hash", progress,
+    )?;
+    if !failures.is_empty() {
         return Err(E4EError::CorruptedDataset);
     }
+    Ok(())
+}
 
+/// Hash every file of the dataset at `root` against its manifest.
+fn check_integrity(root: &Path, progress: &Progress) -> Result<()> {
+    let manifest_data = read_dataset_manifest(root)?;
+    let files = get_dataset_files(root);
+    let failures = manifest::collect_validation_failures_with_progress(
+        &manifest_data,
+        root,
+        &files,
+        "hash",
+        progress,
+    )?;
+    if !failures.is_empty() {
+        return Err(E4EError::CorruptedDataset);
+    }
     Ok(())
 }
 
-/// Verify that the dataset at `dest` (if it exists) is a subset of the source dataset.
-///
-/// Every file recorded in the destination's `manifest.json` must also appear in
-/// `source_manifest` with an identical SHA-256 hash.  Returns `Ok(())` when it is
-/// safe to push (destination absent, empty, or a compatible partial copy).  Returns
-/// an error describing the first conflict found.
-pub fn check_destination_is_subset(
+/// Verify that every entry of `dest_manifest` appears in `source_manifest` with the
+/// same hash, i.e. that it is safe to push over a destination (absent, empty, or a
+/// compatible partial copy).  Shared by local and object-store destinations;
+/// returns an error describing the first conflict found.
+pub fn check_manifest_is_subset(
     source_manifest: &manifest::ManifestData,
-    dest: &Path,
+    dest_manifest: &manifest::ManifestData,
 ) -> Result<()> {
-    if !dest.exists() {
-        return Ok(());
-    }
-    let dest_manifest = manifest::read_manifest(&dest.join(MANIFEST_NAME))?;
-    for (rel_path, dest_entry) in &dest_manifest {
+    for (rel_path, dest_entry) in dest_manifest {
         match source_manifest.get(rel_path) {
             Some(src_entry) if src_entry.sha256sum == dest_entry.sha256sum => {}
             Some(_) => {
@@ -688,187 +1216,591 @@ pub fn check_destination_is_subset(
     Ok(())
 }
 
-/// Return all data files in a dataset root (excluding manifest.json and .e4edm.db).
+/// Return all data files in a dataset root (excluding manifest.json, .e4edm.db
+/// and its WAL sidecar files).
 pub fn get_dataset_files(root: &Path) -> Vec<PathBuf> {
-    let excluded = [root.join(MANIFEST_NAME), root.join(DB_NAME)];
-    let mut files = Vec::new();
-    let walker = walkdir::WalkDir::new(root).into_iter();
-    for entry in walker.filter_map(|e| e.ok()) {
-        let path = entry.path().to_path_buf();
-        if !path.is_file() {
-            continue;
-        }
-        if excluded.contains(&path) {
-            continue;
+    dataset_entries(root)
+        .map(|entry| entry.into_path())
+        .filter(|path| path.is_file())
+        .collect()
+}
+
+/// The entries under `root` that `get_dataset_files` considers, unfiltered by
+/// type: the walk reads directory entries only and stats nothing.
+fn dataset_entries(root: &Path) -> impl Iterator<Item = walkdir::DirEntry> {
+    dataset_entries_walk(root, walkdir::WalkDir::new(root))
+}
+
+/// The files directly in `dir`, a directory under `root`, that `dataset_entries`
+/// yields.
+fn dataset_entries_in(root: &Path, dir: &Path) -> impl Iterator<Item = walkdir::DirEntry> {
+    dataset_entries_walk(root, walkdir::WalkDir::new(dir).max_depth(1))
+}
+
+fn dataset_entries_walk(
+    root: &Path,
+    walk: walkdir::WalkDir,
+) -> impl Iterator<Item = walkdir::DirEntry> {
+    let excluded = [
+        root.join(MANIFEST_NAME),
+        root.join(DB_NAME),
+        root.join(format!("{}-wal", DB_NAME)),
+        root.join(format!("{}-shm", DB_NAME)),
+    ];
+    walk.into_iter()
+        .filter_map(|e| e.ok())
+        .filter(move |e| !e.file_type().is_dir() && !excluded.iter().any(|p| p == e.path()))
+}
+
+/// How a push or duplicate writes to a local destination.
+#[derive(Clone, Copy, Debug, Default)]
+pub struct PushOptions {
+    /// Ignore the push ledger and re-check the whole destination.
+    pub full: bool,
+    /// When written files are flushed to stable storage.
+    pub durability: Durability,
+    /// Re-hash every written file from the medium after it is flushed.
+    pub readback: bool,
+}
+
+impl PushOptions {
+    /// The durability level actually used.  Read-back needs clean pages to evict,
+    /// so it raises `none` to `batched`.
+    pub fn effective_durability(&self) -> Durability {
+        if self.readback && self.durability == Durability::None {
+            Durability::Batched
+        } else {
+            self.durability
         }
-        files.push(path);
     }
-    files
 }
 
-/// Duplicate the dataset to each destination, calling `progress(current, total)` as
-/// files are copied and then verified.  Progress runs 1..N during the copy phase and
-/// N+1..2N during the destination validation phase.
-pub fn duplicate_dataset_with_progress<F>(
+/// Duplicate the dataset to each destination, reporting the `Copy` and `Verify`
+/// phases of each one to `progress`.
+#[cfg_attr(not(feature = "python"), allow(dead_code))]
+pub fn duplicate_dataset_with_progress(
     state: &DatasetState,
     destinations: &[PathBuf],
-    progress: F,
-) -> Result<()>
-where
-    F: Fn(u64, u64) + Send + Sync,
-{
-    let manifest_path = state.root.join(MANIFEST_NAME);
-    let manifest_data = manifest::read_manifest(&manifest_path)?;
-    let file_count = manifest_data.len() as u64;
-    let total = file_count * 2;
-
-    let entries: Vec<(&String, &manifest::ManifestEntry)> = manifest_data.iter().collect();
+    options: PushOptions,
+    progress: &Progress,
+) -> Result<()> {
+    let manifest_span = trace::span("duplicate.manifest");
+    let manifest_data = export_manifest(&state.root)?;
+    let keys: Vec<&String> = manifest_data.keys().collect();
+    let content = manifest::manifest_to_string(&manifest_data)?;
+    drop(manifest_span);
 
     for dest in destinations {
         fs::create_dir_all(dest)?;
+        copy_entries_to(state, &manifest_data, &keys, dest, false, options, progress)?;
+        write_dest_manifest(&dest.join(MANIFEST_NAME), &content, options)?;
+    }
+    progress.finish();
+    Ok(())
+}
 
-        // Clear any leftover temp files from a previous interrupted push.
-        manifest::cleanup_temp_files(dest)?;
+/// Write the destination `manifest.json`, durably unless `options` ask for no
+/// flushing.  It is written after the data so it only ever lists files that
+/// are in place.
+fn write_dest_manifest(path: &Path, content: &str, options: PushOptions) -> Result<()> {
+    match options.effective_durability() {
+        Durability::None => Ok(fs::write(path, content)?),
+        Durability::Batched | Durability::Full => durability::write_durably(path, content.as_bytes()),
+    }
+}
 
-        // Phase 1: copy files in parallel, verifying hash during the write.
-        // Each file is hashed as it is streamed to the destination, so no
-        // separate re-read of the destination is needed for copied files.
-        let counter = AtomicU64::new(0);
-        let first_error: std::sync::Mutex<Option<E4EError>> = std::sync::Mutex::new(None);
+/// Copy the manifest entries named by `keys` into `dest`, verifying each hash while
+/// it is written.  Reports a `Copy` phase over `keys` and then a `Verify` phase.
+///
+/// `dest` is walked for unlisted files at the end, reading directory entries
+/// only.  A full copy (`incremental == false`) first clears leftover temp files
+/// and hashes destination files that already exist, skipping those that
+/// match.  An incremental copy comes from a push plan whose `keys` are known to
+/// be missing or stale, so it clears only their temp files, copies them without
+/// reading the destination first, and checks only the directories holding them
+/// for unlisted files.
+///
+/// Files written here are flushed according to `options.durability` (see
+/// `durability`) and, with `options.readback`, re-hashed from the medium before
+/// the walk for unlisted files.
+fn copy_entries_to(
+    state: &DatasetState,
+    manifest_data: &manifest::ManifestData,
+    keys: &[&String],
+    dest: &Path,
+    incremental: bool,
+    options: PushOptions,
+    progress: &Progress,
+) -> Result<()> {
+    let file_count = keys.len() as u64;
+    let level = options.effective_durability();
 
-        entries.par_iter().for_each(|(rel_path, entry)| {
-            // Stop early if a previous iteration already failed.
-            if first_error.lock().unwrap().is_some() {
-                return;
+    // Clear any leftover temp files from a previous interrupted push.
+    {
+        let _span = trace::span("push.cleanup");
+        if incremental {
+            for rel_path in keys {
+                let tmp = manifest::temp_path_for(&dest.join(rel_path.as_str()));
+                if tmp.is_file() {
+                    fs::remove_file(tmp)?;
+                }
             }
+        } else {
+            manifest::cleanup_temp_files(dest)?;
+        }
+    }
 
-            let src = state.root.join(rel_path);
-            let dst = dest.join(rel_path.as_str());
+    // Phase 1: copy files in parallel, verifying hash during the write.
+    // Each file is hashed as it is streamed to the destination, so no
+    // separate re-read of the destination is needed for copied files.
+    let bytes_total = keys.iter().map(|k| manifest_data[k.as_str()].size).sum();
+    progress.start_phase(Phase::Copy, file_count, bytes_total);
+    let cancel = progress.cancel_token();
+    let first_error: std::sync::Mutex<Option<E4EError>> = std::sync::Mutex::new(None);
+    let written: std::sync::Mutex<Vec<(&String, PathBuf)>> = std::sync::Mutex::new(Vec::new());
 
-            let result = (|| -> Result<()> {
-                if let Some(parent) = dst.parent() {
-                    fs::create_dir_all(parent).map_err(|e| {
-                        if e.kind() == std::io::ErrorKind::AlreadyExists {
-                            E4EError::Runtime(format!(
-                                "Cannot create directory '{}': path exists as a file",
-                                parent.display()
-                            ))
-                        } else {
-                            E4EError::Io(e)
-                        }
-                    })?;
-                }
+    keys.par_iter().for_each(|rel_path| {
+        // Stop early if a previous iteration already failed.
+        if first_error.lock().unwrap().is_some() {
+            return;
+        }
+
+        let entry = &manifest_data[rel_path.as_str()];
+        let src = state.root.join(rel_path.as_str());
+        let dst = dest.join(rel_path.as_str());
 
-                // Skip if the destination file already has the correct hash.
-                let already_correct = dst.exists()
-                    && manifest::compute_file_hash(&dst)
-                        .map(|h| h == entry.sha256sum)
-                        .unwrap_or(false);
-
-                if !already_correct {
-                    if dst.is_dir() {
-                        return Err(E4EError::Runtime(format!(
-                            "Cannot copy '{}': destination path '{}' exists as a directory",
-                            rel_path,
-                            dst.display()
-                        )));
+        let result = (|| -> Result<()> {
+            cancel.check()?;
+            if let Some(parent) = dst.parent() {
+                let _span = trace::span("push.create_dirs");
+                fs::create_dir_all(parent).map_err(|e| {
+                    if e.kind() == std::io::ErrorKind::AlreadyExists {
+                        E4EError::Runtime(format!(
+                            "Cannot create directory '{}': path exists as a file",
+                            parent.display()
+                        ))
+                    } else {
+                        E4EError::Io(e)
                     }
-                    // Copy and verify the hash inline — no second read needed.
-                    manifest::copy_and_verify(&src, &dst, &entry.sha256sum)?;
+                })?;
+            }
+
+            // Skip if the destination file already has the correct hash.
+            let already_correct = !incremental && dst.exists() && {
+                let _span = trace::span("push.hash_existing");
+                manifest::compute_file_hash_cancellable(&dst, cancel)
+                    .map(|h| h == entry.sha256sum)
+                    .unwrap_or(false)
+            };
+
+            if !already_correct {
+                if dst.is_dir() {
+                    return Err(E4EError::Runtime(format!(
+                        "Cannot copy '{}': destination path '{}' exists as a directory",
+                        rel_path,
+                        dst.display()
+                    )));
                 }
-                Ok(())
-            })();
+                // Copy and verify the hash inline — no second read needed.
+                let _span = trace::span("push.copy");
+                manifest::copy_and_verify_synced(
+                    &src,
+                    &dst,
+                    &entry.sha256sum,
+                    level == Durability::Full,
+                    cancel,
+                )?;
+                written.lock().unwrap().push((*rel_path, dst));
+            }
+            Ok(())
+        })();
+
+        if let Err(e) = result {
+            let mut guard = first_error.lock().unwrap();
+            if guard.is_none() {
+                *guard = Some(e);
+            }
+        }
+
+        progress.advance(1, entry.size);
+    });
+
+    if let Some(e) = first_error.into_inner().unwrap() {
+        return Err(e);
+    }
+
+    // Flush the batch: one sync for `batched`; `full` already synced each file and
+    // its directory, leaving only directories created along the way.
+    let written = written.into_inner().unwrap();
+    let written_paths: Vec<PathBuf> = written.iter().map(|(_, p)| p.clone()).collect();
+    {
+        let _span = trace::span("push.sync");
+        match level {
+            Durability::None => {}
+            Durability::Batched => durability::sync_batch(dest, &written_paths)?,
+            Durability::Full => durability::sync_dirs_under(dest, &written_paths)?,
+        }
+    }
 
-            if let Err(e) = result {
-                let mut guard = first_error.lock().unwrap();
-                if guard.is_none() {
-                    *guard = Some(e);
+    // Read-back: hash what the medium returns rather than what was streamed.
+    let readback_bytes = if options.readback {
+        written.iter().map(|(k, _)| manifest_data[k.as_str()].size).sum()
+    } else {
+        0
+    };
+    progress.start_phase(Phase::Verify, file_count, readback_bytes);
+    if options.readback {
+        let mismatched: Vec<String> = written
+            .par_iter()
+            .filter_map(|(rel_path, dst)| {
+                let entry = &manifest_data[rel_path.as_str()];
+                let readback = trace::span("push.readback");
+                let failure = match durability::readback_hash(dst, cancel) {
+                    Ok(h) if h == entry.sha256sum => None,
+                    Ok(_) => Some(format!("hash mismatch: {}", rel_path)),
+                    Err(e) => Some(format!("{}: {}", rel_path, e)),
+                };
+                drop(readback);
+                progress.advance(1, entry.size);
+                failure
+            })
+            .collect();
+        cancel.check()?;
+        if !mismatched.is_empty() {
+            return Err(E4EError::Runtime(format!(
+                "Read-back verification failed at destination {}:\n  {}",
+                dest.display(),
+                mismatched.join("\n  ")
+            )));
+        }
+    }
+
+    // Phase 2: check for unlisted files at the destination.
+    // Hashes were already verified inline during copy, so only a directory
+    // walk is needed here — no re-hashing, and no stat of files in place.
+    let walk = trace::span("push.walk");
+    let entries: Vec<walkdir::DirEntry> = if incremental {
+        pending_dirs(keys.iter().copied())
+            .into_iter()
+            .flat_map(|dir| dataset_entries_in(dest, &dest.join(dir)))
+            .collect()
+    } else {
+        dataset_entries(dest).collect()
+    };
+    let unlisted: Vec<String> = entries
+        .into_iter()
+        .map(|entry| entry.into_path())
+        .filter_map(|file| {
+            let rel = file.strip_prefix(dest).ok()?;
+            let rel_posix = rel
+                .components()
+                .map(|c| c.as_os_str().to_string_lossy().into_owned())
+                .collect::<Vec<_>>()
+                .join("/");
+            if !manifest_data.contains_key(&rel_posix)
+                && !manifest::is_temp_file(&file)
+            {
+                Some(format!("unlisted file: {}", rel_posix))
+            } else {
+                None
+            }
+        })
+        .collect();
+    drop(walk);
+
+    let verified = if options.readback { written.len() as u64 } else { 0 };
+    progress.advance(file_count - verified, 0);
+
+    if !unlisted.is_empty() {
+        return Err(E4EError::Runtime(format!(
+            "Unlisted files at destination {}:\n  {}",
+            dest.display(),
+            unlisted.join("\n  ")
+        )));
+    }
+    Ok(())
+}
+
+// ── Push planning ──────────────────────────────────────────────
+
+/// The directories holding the manifest `keys`, as relative prefixes ending in
+/// `/`; the dataset root is `""`.  An incremental push checks only these for
+/// unlisted files.
+pub fn pending_dirs<'a>(keys: impl Iterator<Item = &'a String>) -> BTreeSet<&'a str> {
+    keys.map(|key| key.rfind('/').map_or("", |i| &key[..=i])).collect()
+}
+
+/// What a push has to transfer to one destination.
+pub struct PushPlan {
+    /// The source manifest being pushed.
+    pub manifest: manifest::ManifestData,
+    /// Manifest keys to transfer and verify.
+    pub pending: Vec<String>,
+    /// True when the push ledger proves the other entries are already at the
+    /// destination, i.e. only `pending` is touched.
+    pub incremental: bool,
+}
+
+impl PushPlan {
+    /// Plan a full push of `source`.  An existing destination manifest must be a
+    /// subset of `source`.
+    pub fn full(
+        source: manifest::ManifestData,
+        dest_manifest: Option<&[u8]>,
+    ) -> Result<PushPlan> {
+        if let Some(body) = dest_manifest {
+            let dest: manifest::ManifestData = serde_json::from_slice(body)?;
+            check_manifest_is_subset(&source, &dest)?;
+        }
+        let pending = source.keys().cloned().collect();
+        Ok(PushPlan {
+            manifest: source,
+            pending,
+            incremental: false,
+        })
+    }
+
+    /// Plan a push of `source` to a destination whose `manifest.json` currently
+    /// reads `dest_manifest`.
+    ///
+    /// If that manifest is byte-for-byte the one recorded in `ledger`, the
+    /// destination has not changed since our last push: ledger entries are trusted
+    /// and only new entries, plus mission `manifest.json` files that changed
+    /// because files were committed to an existing mission, are pending.
+    /// Otherwise this falls back to `PushPlan::full`.
+    pub fn with_ledger(
+        source: manifest::ManifestData,
+        dest_manifest: Option<&[u8]>,
+        ledger: Option<PushLedger>,
+    ) -> Result<PushPlan> {
+        let ledger = match (dest_manifest, ledger) {
+            (Some(body), Some(ledger)) if manifest::hash_bytes(body) == ledger.manifest_sha256 => {
+                ledger
+            }
+            _ => return PushPlan::full(source, dest_manifest),
+        };
+
+        let mut trusted = manifest::ManifestData::new();
+        for (rel_path, pushed) in ledger.entries {
+            match source.get(&rel_path) {
+                Some(entry) if entry.sha256sum == pushed.sha256sum => {
+                    trusted.insert(rel_path, pushed);
+                }
+                // Re-pushed below with the other entries missing from `trusted`.
+                Some(_) if is_manifest_path(&rel_path) => {}
+                Some(_) => {
+                    return Err(E4EError::Runtime(format!(
+                        "File '{}' at destination has a different hash from the source dataset",
+                        rel_path
+                    )));
+                }
+                None => {
+                    return Err(E4EError::Runtime(format!(
+                        "File '{}' exists at destination but is not in the source dataset",
+                        rel_path
+                    )));
                 }
             }
-
-            let i = counter.fetch_add(1, Ordering::Relaxed);
-            progress(i + 1, total);
-        });
-
-        if let Some(e) = first_error.into_inner().unwrap() {
-            return Err(e);
         }
+        let pending = source.keys().filter(|k| !trusted.contains_key(*k)).cloned().collect();
+        Ok(PushPlan { manifest: source, pending, incremental: true })
+    }
 
-        // Phase 2: check for unlisted files at the destination.
-        // Hashes were already verified inline during copy, so only a directory
-        // walk is needed here — no re-hashing.
-        let all_dest_files = get_dataset_files(dest);
-        let unlisted: Vec<String> = all_dest_files
-            .iter()
-            .filter_map(|file| {
-                let rel = file.strip_prefix(dest.as_path()).ok()?;
-                let rel_posix = rel
-                    .components()
-                    .map(|c| c.as_os_str().to_string_lossy().into_owned())
-                    .collect::<Vec<_>>()
-                    .join("/");
-                if !manifest_data.contains_key(&rel_posix)
-                    && !manifest::is_temp_file(file)
-                {
-                    Some(format!("unlisted file: {}", rel_posix))
-                } else {
-                    None
-                }
-            })
-            .collect();
+    /// The entries this plan transfers, for recording in the ledger.
+    pub fn pending_entries(&self) -> impl Iterator<Item = (&String, &manifest::ManifestEntry)> {
+        self.pending.iter().map(move |k| (k, &self.manifest[k]))
+    }
+}
 
-        for i in 0..all_dest_files.len() as u64 {
-            progress(file_count + i + 1, total);
-        }
+fn is_manifest_path(rel_path: &str) -> bool {
+    rel_path == MANIFEST_NAME || rel_path.ends_with(&format!("/{}", MANIFEST_NAME))
+}
 
-        if !unlisted.is_empty() {
-            return Err(E4EError::Runtime(format!(
-                "Unlisted files at destination {}:\n  {}",
-                dest.display(),
-                unlisted.join("\n  ")
-            )));
-        }
+/// Push the dataset into `dest_root`, reporting the `Hash` phase of the source
+/// integrity check and the `Copy` and `Verify` phases to `progress`.  The copy lands
+/// in `dest_root/<dataset name>`.
+///
+/// `dest_root` is either a local directory or an `s3://bucket/prefix` URL.  An
+/// existing copy at the destination must be a subset of this dataset, which lets a
+/// push resume after an interruption without overwriting a different dataset.
+///
+/// Each destination has a push ledger in `.e4edm.db`.  When the destination's
+/// `manifest.json` is still the one the last push wrote, only entries that were not
+/// pushed before are hashed, transferred and verified; set `options.full` to ignore
+/// the ledger and re-check everything.  `options.durability` and `options.readback`
+/// apply to local destinations only; an object store acknowledges a PUT once the
+/// object is stored.  Runs `check_ready` and then `check_plan_integrity` first; the
+/// caller is responsible for marking the dataset pushed.
+///
+/// The dataset is locked against changes from other processes for the whole
+/// push, and `state` is read afresh if it is stale.
+pub fn push_dataset_with_progress(
+    state: &DatasetState,
+    dest_root: &str,
+    options: PushOptions,
+    progress: &Progress,
+) -> Result<()> {
+    let _lock = DatasetLock::exclusive(&state.root)?;
+    let fresh;
+    let state = if state.is_stale()? {
+        fresh = load_dataset_state(&state.root)?;
+        &fresh
+    } else {
+        state
+    };
+    check_ready(state)?;
+
+    let ds_name = state
+        .root
+        .file_name()
+        .map(|n| n.to_string_lossy().into_owned())
+        .unwrap_or_default();
+    let source = export_manifest(&state.root)?;
+    let db = DatasetDb::open(&state.root)?;
 
-        manifest::write_manifest(&dest.join(MANIFEST_NAME), &manifest_data)?;
+    if objstore::is_object_store_url(dest_root) {
+        let destination = objstore::S3Destination::from_url(dest_root)?.join(&ds_name);
+        let ledger_key = destination.url();
+        let dest_manifest = objstore::read_manifest_bytes(&destination)?;
+        let plan = plan_push(&db, &ledger_key, source, dest_manifest.as_deref(), options.full)?;
+        check_plan_integrity(&state.root, &plan, progress)?;
+        let manifest_sha256 =
+            objstore::push_plan_with_progress(state, &destination, &plan, progress)?;
+        db.record_push(&ledger_key, &manifest_sha256, plan.pending_entries(), !plan.incremental)?;
+        progress.finish();
+        return Ok(());
     }
+
+    let destination = PathBuf::from(dest_root).join(&ds_name);
+    let ledger_key = fs::canonicalize(dest_root)
+        .map(|p| p.join(&ds_name))
+        .unwrap_or_else(|_| destination.clone())
+        .to_string_lossy()
+        .into_owned();
+    let dest_manifest_path = destination.join(MANIFEST_NAME);
+    let dest_manifest = if dest_manifest_path.is_file() {
+        Some(fs::read(&dest_manifest_path)?)
+    } else {
+        None
+    };
+    let plan = plan_push(&db, &ledger_key, source, dest_manifest.as_deref(), options.full)?;
+    check_plan_integrity(&state.root, &plan, progress)?;
+
+    fs::create_dir_all(&destination).map_err(|e| {
+        if e.kind() == io::ErrorKind::AlreadyExists {
+            E4EError::Runtime(format!(
+                "Cannot create destination directory '{}': path already exists but is not a directory",
+                destination.display()
+            ))
+        } else {
+            E4EError::Io(e)
+        }
+    })?;
+    let keys: Vec<&String> = plan.pending.iter().collect();
+    copy_entries_to(state, &plan.manifest, &keys, &destination, plan.incremental, options, progress)?;
+
+    let content = manifest::manifest_to_string(&plan.manifest)?;
+    write_dest_manifest(&dest_manifest_path, &content, options)?;
+    db.record_push(
+        &ledger_key,
+        &manifest::hash_bytes(content.as_bytes()),
+        plan.pending_entries(),
+        !plan.incremental,
+    )?;
+    progress.finish();
     Ok(())
 }
 
-/// Duplicate the dataset to each destination.
-#[cfg_attr(not(feature = "python"), allow(dead_code))]
-pub fn duplicate_dataset(state: &DatasetState, destinations: &[PathBuf]) -> Result<()> {
-    duplicate_dataset_with_progress(state, destinations, |_, _| {})
+fn plan_push(
+    db: &DatasetDb,
+    ledger_key: &str,
+    source: manifest::ManifestData,
+    dest_manifest: Option<&[u8]>,
+    full: bool,
+) -> Result<PushPlan> {
+    if full {
+        return PushPlan::full(source, dest_manifest);
+    }
+    PushPlan::with_ledger(source, dest_manifest, db.get_push_ledger(ledger_key)?)
 }
 
-/// Create a zip archive of the dataset.
+/// Duplicate the dataset to each destination.  Destinations given as
+/// `s3://bucket/prefix` URLs receive the dataset contents directly under the prefix;
+/// `options` only affect local destinations.
 #[cfg_attr(not(feature = "python"), allow(dead_code))]
-pub fn create_zip(state: &DatasetState, zip_path: &Path) -> Result<()> {
-    let manifest_path = state.root.join(MANIFEST_NAME);
-    let manifest_data = manifest::read_manifest(&manifest_path)?;
+pub fn duplicate_dataset_to(
+    state: &DatasetState,
+    destinations: &[String],
+    options: PushOptions,
+    progress: &Progress,
+) -> Result<()> {
+    let _lock = DatasetLock::shared(&state.root)?;
+    let mut local: Vec<PathBuf> = Vec::new();
+    for dest in destinations {
+        if objstore::is_object_store_url(dest) {
+            let destination = objstore::S3Destination::from_url(dest)?;
+            let source = export_manifest(&state.root)?;
+            let dest_manifest = objstore::read_manifest_bytes(&destination)?;
+            let plan = PushPlan::full(source, dest_manifest.as_deref())?;
+            objstore::push_plan_with_progress(state, &destination, &plan, progress)?;
+        } else {
+            local.push(PathBuf::from(dest));
+        }
+    }
+    duplicate_dataset_with_progress(state, &local, options, progress)
+}
 
-    use std::io::Write;
-    let file = fs::File::create(zip_path)?;
-    let mut zip = zip::ZipWriter::new(file);
-    let options = zip::write::SimpleFileOptions::default()
-        .compression_method(zip::CompressionMethod::Deflated);
+// ─────────────────────────────────────────────────────────────
+// Status
+// ─────────────────────────────────────────────────────────────
 
-    let dataset_name = state
-        .root
-        .file_name()
-        .unwrap_or_default()
-        .to_string_lossy()
-        .into_owned();
+/// What `status` reports of a dataset, read from `.e4edm.db` without loading
+/// the dataset's state: the counters kept by its `file_stats` triggers and the
+/// staged readme files.
+#[cfg(any(test, feature = "python"))]
+pub struct DatasetStatus {
+    pub missions: Vec<MissionRecord>,
+    pub stats: Vec<FileStats>,
+    pub staged_readmes: Vec<String>,
+    pub staged_readme_bytes: u64,
+}
 
-    for rel_path in manifest_data.keys() {
-        let src = state.root.join(rel_path);
-        let arc_path = format!("{}/{}", dataset_name, rel_path);
-        zip.start_file(&arc_path, options)
-            .map_err(|e| crate::errors::E4EError::Runtime(e.to_string()))?;
-        let data = fs::read(&src)?;
-        zip.write_all(&data)?;
-    }
-    zip.finish().map_err(|e| crate::errors::E4EError::Runtime(e.to_string()))?;
-    Ok(())
+#[cfg(any(test, feature = "python"))]
+impl DatasetStatus {
+    /// Files and bytes of `mission` (or, for '', of the dataset outside its
+    /// missions) in `state`, over every destination.
+    pub fn totals(&self, mission: &str, state: &str) -> (u64, u64) {
+        if mission.is_empty() && state == "staged" {
+            return (self.staged_readmes.len() as u64, self.staged_readme_bytes);
+        }
+        self.stats
+            .iter()
+            .filter(|s| s.mission == mission && s.state == state)
+            .fold((0, 0), |(files, bytes), s| (files + s.files, bytes + s.bytes))
+    }
+
+    /// Files and bytes of `mission` pushed to each destination.
+    pub fn pushed(&self, mission: &str) -> Vec<&FileStats> {
+        self.stats.iter().filter(|s| s.mission == mission && s.state == "pushed").collect()
+    }
+}
+
+/// Read the status of the dataset at `root`.
+#[cfg(any(test, feature = "python"))]
+pub fn dataset_status(root: &Path) -> Result<DatasetStatus> {
+    let db = DatasetDb::open(root)?;
+    let staged_readmes = db.get_dataset_staged_files()?;
+    let staged_readme_bytes = staged_readmes
+        .iter()
+        .filter_map(|p| fs::metadata(p).ok())
+        .map(|m| m.len())
+        .sum();
+    Ok(DatasetStatus {
+        missions: db.get_missions()?,
+        stats: db.file_stats()?,
+        staged_readmes,
+        staged_readme_bytes,
+    })
 }
 
 // ─────────────────────────────────────────────────────────────
@@ -922,7 +1854,7 @@ fn date_to_days(date: &str) -> Result<i64> {
     Ok(jdn)
 }
 
-fn days_to_date(jdn: i64) -> String {
+pub(crate) fn days_to_date(jdn: i64) -> String {
     // Convert Julian Day Number back to calendar date
     let l = jdn + 68569;
     let n = (4 * l) / 146097;
@@ -940,6 +1872,8 @@ fn days_to_date(jdn: i64) -> String {
 #[cfg(test)]
 mod tests {
     use super::*;
+    use crate::cancel::CancelToken;
+    use std::time::Duration;
     use tempfile::tempdir;
 
     fn meta(timestamp: &str, mission: &str) -> MetadataRecord {
@@ -955,6 +1889,10 @@ mod tests {
         }
     }
 
+    fn dataset_manifest(root: &Path) -> manifest::ManifestData {
+        DatasetDb::open(root).unwrap().get_manifest().unwrap()
+    }
+
     // ── Date helpers ─────────────────────────────────────────────
 
     #[test]
@@ -1052,10 +1990,25 @@ mod tests {
         let root = tmp.path().join("ds");
         let mut state = create_dataset(&root, "2023-03-02").unwrap();
         add_mission(&mut state, &meta("2023-03-02T10:00:00+00:00", "M1")).unwrap();
-        let manifest = manifest::read_manifest(&root.join("manifest.json")).unwrap();
+        let manifest = dataset_manifest(&root);
         assert!(manifest.keys().any(|k| k.contains("metadata.json")));
     }
 
+    #[test]
+    fn export_manifest_regenerates_manifest_json_from_the_database() {
+        let tmp = tempdir().unwrap();
+        let root = tmp.path().join("ds");
+        let mut state = create_dataset(&root, "2023-03-02").unwrap();
+        add_mission(&mut state, &meta("2023-03-02T10:00:00+00:00", "M1")).unwrap();
+        // The mission's entries only went to the database.
+        assert!(manifest::read_manifest(&root.join(MANIFEST_NAME)).unwrap().is_empty());
+
+        let exported = export_manifest(&root).unwrap();
+        assert_eq!(exported.len(), 2);
+        let written = fs::read_to_string(root.join(MANIFEST_NAME)).unwrap();
+        assert_eq!(written, manifest::manifest_to_string(&dataset_manifest(&root)).unwrap());
+    }
+
     // ── stage / commit mission files ──────────────────────────────
 
     #[test]
@@ -1070,11 +2023,11 @@ mod tests {
 
         stage_mission_files(&mut state, "ED-00 M1", &[src], None).unwrap();
         assert_eq!(state.missions[0].staged_files.len(), 1);
-        assert_eq!(state.missions[0].committed_files.len(), 0);
+        assert_eq!(state.mission_committed_files(0).unwrap().len(), 0);
 
         commit_mission_files(&mut state, "ED-00 M1").unwrap();
         assert_eq!(state.missions[0].staged_files.len(), 0);
-        assert_eq!(state.missions[0].committed_files.len(), 1);
+        assert_eq!(state.mission_committed_files(0).unwrap().len(), 1);
 
         let dest = root.join("ED-00").join("M1").join("data.bin");
         assert!(dest.exists());
@@ -1114,10 +2067,115 @@ mod tests {
         assert!(mission_manifest.contains_key("data.bin"));
 
         // Dataset manifest should also be updated
-        let ds_manifest = manifest::read_manifest(&root.join("manifest.json")).unwrap();
+        let ds_manifest = dataset_manifest(&root);
         assert!(ds_manifest.keys().any(|k| k.ends_with("data.bin")));
     }
 
+    #[test]
+    fn status_counts_staged_then_committed_files() {
+        let tmp = tempdir().unwrap();
+        let root = tmp.path().join("ds");
+        let mut state = create_dataset(&root, "2023-03-02").unwrap();
+        add_mission(&mut state, &meta("2023-03-02T10:00:00+00:00", "M1")).unwrap();
+        let src = tmp.path().join("data.bin");
+        fs::write(&src, b"0123456789").unwrap();
+        let readme = tmp.path().join("readme.md");
+        fs::write(&readme, b"notes").unwrap();
+
+        stage_mission_files(&mut state, "ED-00 M1", &[src], None).unwrap();
+        stage_dataset_files(&mut state, &[readme]).unwrap();
+        let status = dataset_status(&root).unwrap();
+        assert_eq!(status.missions.len(), 1);
+        assert_eq!(status.totals("ED-00 M1", "staged"), (1, 10));
+        assert_eq!(status.totals("", "staged"), (1, 5));
+
+        commit_mission_files(&mut state, "ED-00 M1").unwrap();
+        let status = dataset_status(&root).unwrap();
+        assert_eq!(status.totals("ED-00 M1", "staged"), (0, 0));
+        let (files, bytes) = DatasetDb::open(&root).unwrap().manifest_stats(Some("ED-00/M1")).unwrap();
+        assert_eq!(status.totals("ED-00 M1", "committed"), (files as u64, bytes));
+        assert!(files >= 1 && bytes >= 10);
+        assert!(status.pushed("ED-00 M1").is_empty());
+    }
+
+    #[test]
+    fn cancelled_commit_keeps_uncopied_files_staged() {
+        let tmp = tempdir().unwrap();
+        let root = tmp.path().join("ds");
+        let mut state = create_dataset(&root, "2023-03-02").unwrap();
+        add_mission(&mut state, &meta("2023-03-02T10:00:00+00:00", "M1")).unwrap();
+        let srcs: Vec<PathBuf> = (0..3)
+            .map(|i| {
+                let src = tmp.path().join(format!("{}.bin", i));
+                fs::write(&src, format!("file {}", i)).unwrap();
+                src
+            })
+            .collect();
+        stage_mission_files(&mut state, "ED-00 M1", &srcs, None).unwrap();
+
+        // Cancel as soon as the first file is in place.
+        let cancel = CancelToken::new();
+        let trigger = cancel.clone();
+        let progress = Progress::with_callback(Duration::ZERO, move |s| {
+            if s.phase == Phase::Copy && s.files_done == 1 {
+                trigger.cancel();
+            }
+        })
+        .with_cancel(cancel);
+        let result = commit_mission_files_with_progress(&mut state, "ED-00 M1", &progress);
+        assert!(matches!(result, Err(E4EError::Cancelled)));
+        assert_eq!(state.mission_committed_files(0).unwrap().len(), 1);
+        assert_eq!(state.missions[0].staged_files.len(), 2);
+
+        // The database and manifests agree with the in-memory state.
+        let mut reloaded = load_dataset_state(&root).unwrap();
+        reloaded.load_committed_files().unwrap();
+        assert_eq!(reloaded.missions[0].committed_files, state.missions[0].committed_files);
+        assert_eq!(reloaded.missions[0].staged_files.len(), 2);
+        assert!(validate_dataset(&root).unwrap());
+
+        commit_mission_files(&mut state, "ED-00 M1").unwrap();
+        assert_eq!(state.mission_committed_files(0).unwrap().len(), 3);
+    }
+
+    #[test]
+    fn committed_files_are_loaded_on_first_use() {
+        let tmp = tempdir().unwrap();
+        let root = tmp.path().join("ds");
+        let mut state = create_dataset(&root, "2023-03-02").unwrap();
+        add_mission(&mut state, &meta("2023-03-02T10:00:00+00:00", "M1")).unwrap();
+        add_mission(&mut state, &meta("2023-03-02T11:00:00+00:00", "M2")).unwrap();
+        for (name, file) in [("ED-00 M1", "a.bin"), ("ED-00 M2", "b.bin")] {
+            let src = tmp.path().join(file);
+            fs::write(&src, file).unwrap();
+            stage_mission_files(&mut state, name, &[src], None).unwrap();
+            commit_mission_files(&mut state, name).unwrap();
+        }
+
+        let mut reloaded = load_dataset_state(&root).unwrap();
+        assert!(reloaded.missions.iter().all(|m| m.committed_files.is_none()));
+
+        // Committing into one mission reads only that mission's files and
+        // appends to them without rewriting the others.
+        let src = tmp.path().join("c.bin");
+        fs::write(&src, "c").unwrap();
+        stage_mission_files(&mut reloaded, "ED-00 M1", &[src], None).unwrap();
+        commit_mission_files(&mut reloaded, "ED-00 M1").unwrap();
+        assert_eq!(
+            reloaded.missions[0].committed_files,
+            Some(vec!["a.bin".to_string(), "c.bin".to_string()])
+        );
+        assert!(reloaded.missions[1].committed_files.is_none());
+
+        reloaded.load_committed_files().unwrap();
+        assert_eq!(reloaded.missions[1].committed_files, Some(vec!["b.bin".to_string()]));
+
+        let mut again = load_dataset_state(&root).unwrap();
+        again.load_committed_files().unwrap();
+        assert_eq!(again.missions[0].committed_files, reloaded.missions[0].committed_files);
+        assert_eq!(again.missions[1].committed_files, reloaded.missions[1].committed_files);
+    }
+
     // ── stage / commit dataset files (readme) ────────────────────
 
     #[test]
@@ -1171,10 +2229,10 @@ mod tests {
         assert!(!validate_dataset(&root).unwrap());
     }
 
-    // ── check_complete ────────────────────────────────────────────
+    // ── check_ready ───────────────────────────────────────────────
 
     #[test]
-    fn check_complete_errors_when_mission_files_staged() {
+    fn check_ready_errors_when_mission_files_staged() {
         let tmp = tempdir().unwrap();
         let root = tmp.path().join("ds");
         let mut state = create_dataset(&root, "2023-03-02").unwrap();
@@ -1185,13 +2243,13 @@ mod tests {
         stage_mission_files(&mut state, "ED-00 M1", &[src], None).unwrap();
 
         assert!(matches!(
-            check_complete(&state).unwrap_err(),
+            check_ready(&state).unwrap_err(),
             E4EError::MissionFilesInStaging
         ));
     }
 
     #[test]
-    fn check_complete_errors_when_dataset_files_staged() {
+    fn check_ready_errors_when_dataset_files_staged() {
         let tmp = tempdir().unwrap();
         let root = tmp.path().join("ds");
         let mut state = create_dataset(&root, "2023-03-02").unwrap();
@@ -1201,36 +2259,36 @@ mod tests {
         stage_dataset_files(&mut state, &[readme]).unwrap();
 
         assert!(matches!(
-            check_complete(&state).unwrap_err(),
+            check_ready(&state).unwrap_err(),
             E4EError::ReadmeFilesInStaging
         ));
     }
 
     #[test]
-    fn check_complete_errors_when_no_readme_present() {
+    fn check_ready_errors_when_no_readme_present() {
         let tmp = tempdir().unwrap();
         let root = tmp.path().join("ds");
         let state = create_dataset(&root, "2023-03-02").unwrap();
         assert!(matches!(
-            check_complete(&state).unwrap_err(),
+            check_ready(&state).unwrap_err(),
             E4EError::ReadmeNotFound(_)
         ));
     }
 
     #[test]
-    fn check_complete_errors_for_unacceptable_readme_extension() {
+    fn check_ready_errors_for_unacceptable_readme_extension() {
         let tmp = tempdir().unwrap();
         let root = tmp.path().join("ds");
         let state = create_dataset(&root, "2023-03-02").unwrap();
         fs::write(root.join("readme.xyz"), b"readme").unwrap();
         assert!(matches!(
-            check_complete(&state).unwrap_err(),
+            check_ready(&state).unwrap_err(),
             E4EError::ReadmeNotFound(_)
         ));
     }
 
     #[test]
-    fn check_complete_passes_with_txt_readme() {
+    fn check_ready_passes_with_txt_readme() {
         let tmp = tempdir().unwrap();
         let root = tmp.path().join("ds");
         let mut state = create_dataset(&root, "2023-03-02").unwrap();
@@ -1238,11 +2296,11 @@ mod tests {
         fs::write(&readme, b"readme").unwrap();
         stage_dataset_files(&mut state, &[readme]).unwrap();
         commit_dataset_files(&mut state).unwrap();
-        assert!(check_complete(&state).is_ok());
+        assert!(check_ready(&state).is_ok());
     }
 
     #[test]
-    fn check_complete_passes_with_pdf_readme() {
+    fn check_ready_passes_with_pdf_readme() {
         let tmp = tempdir().unwrap();
         let root = tmp.path().join("ds");
         let mut state = create_dataset(&root, "2023-03-02").unwrap();
@@ -1250,11 +2308,11 @@ mod tests {
         fs::write(&readme, b"%PDF-1.4").unwrap();
         stage_dataset_files(&mut state, &[readme]).unwrap();
         commit_dataset_files(&mut state).unwrap();
-        assert!(check_complete(&state).is_ok());
+        assert!(check_ready(&state).is_ok());
     }
 
     #[test]
-    fn check_complete_passes_with_committed_readme() {
+    fn check_ready_and_integrity_pass_with_committed_readme() {
         let tmp = tempdir().unwrap();
         let root = tmp.path().join("ds");
         let mut state = create_dataset(&root, "2023-03-02").unwrap();
@@ -1264,10 +2322,12 @@ mod tests {
         stage_dataset_files(&mut state, &[readme]).unwrap();
         commit_dataset_files(&mut state).unwrap();
 
-        check_complete(&state).unwrap();
+        check_ready(&state).unwrap();
+        let plan = PushPlan::full(export_manifest(&root).unwrap(), None).unwrap();
+        check_plan_integrity(&root, &plan, &Progress::new()).unwrap();
     }
 
-    // ── duplicate_dataset ─────────────────────────────────────────
+    // ── duplicate_dataset_with_progress ───────────────────────────
 
     #[test]
     fn duplicate_copies_all_manifest_files_to_destination() {
@@ -1282,7 +2342,13 @@ mod tests {
         commit_mission_files(&mut state, "ED-00 M1").unwrap();
 
         let dest = tmp.path().join("dest");
-        duplicate_dataset(&state, &[dest.clone()]).unwrap();
+        duplicate_dataset_with_progress(
+            &state,
+            &[dest.clone()],
+            PushOptions::default(),
+            &Progress::new(),
+        )
+        .unwrap();
 
         assert!(dest.join("manifest.json").exists());
         assert!(dest.join("ED-00").join("M1").join("data.bin").exists());
@@ -1293,34 +2359,6 @@ mod tests {
         );
     }
 
-    // ── create_zip ────────────────────────────────────────────────
-
-    #[test]
-    fn create_zip_produces_non_empty_archive_with_correct_paths() {
-        let tmp = tempdir().unwrap();
-        let root = tmp.path().join("2023.03.02.Test.SD");
-        let mut state = create_dataset(&root, "2023-03-02").unwrap();
-        let readme = tmp.path().join("readme.md");
-        fs::write(&readme, b"readme").unwrap();
-        stage_dataset_files(&mut state, &[readme]).unwrap();
-        commit_dataset_files(&mut state).unwrap();
-
-        let zip_path = tmp.path().join("archive.zip");
-        create_zip(&state, &zip_path).unwrap();
-        assert!(zip_path.exists());
-
-        let zip_file = fs::File::open(&zip_path).unwrap();
-        let mut archive = zip::ZipArchive::new(zip_file).unwrap();
-        let names: Vec<String> =
-            (0..archive.len()).map(|i| archive.by_index(i).unwrap().name().to_string()).collect();
-        assert!(
-            names.iter().any(|n| n.contains("readme.md")),
-            "readme.md not found in zip; entries: {names:?}"
-        );
-        // Paths should be prefixed with the dataset name
-        assert!(names.iter().all(|n| n.starts_with("2023.03.02.Test.SD/")));
-    }
-
     // ── load_dataset_state ────────────────────────────────────────
 
     #[test]
@@ -1352,6 +2390,172 @@ mod tests {
         assert_eq!(loaded.missions[0].staged_files.len(), 1);
     }
 
+    #[test]
+    fn save_dataset_state_writes_only_what_changed() {
+        let tmp = tempdir().unwrap();
+        let root = tmp.path().join("ds");
+        let mut state = create_dataset(&root, "2023-03-02").unwrap();
+        add_mission(&mut state, &meta("2023-03-02T10:00:00+00:00", "M1")).unwrap();
+        let files: Vec<PathBuf> = ["a.bin", "b.bin"]
+            .iter()
+            .map(|name| {
+                let path = tmp.path().join(name);
+                fs::write(&path, name.as_bytes()).unwrap();
+                path
+            })
+            .collect();
+        stage_mission_files(&mut state, "ED-00 M1", &files, None).unwrap();
+
+        // Unchanged rows are not rewritten: a row removed behind the state's
+        // back stays removed.
+        DatasetDb::open(&root).unwrap().delete_mission("ED-00 M1").unwrap();
+        save_dataset_state(&mut state).unwrap();
+        assert!(load_dataset_state(&root).unwrap().missions.is_empty());
+
+        // Changed rows are; the staged file that was kept is still not rewritten.
+        let mission = Arc::make_mut(&mut state.missions[0]);
+        mission.record.metadata.notes = "changed".to_string();
+        mission.staged_files.remove(0);
+        save_dataset_state(&mut state).unwrap();
+        let loaded = load_dataset_state(&root).unwrap();
+        assert_eq!(loaded.missions[0].record.metadata.notes, "changed");
+        assert_eq!(loaded.missions[0].staged_files.len(), 0);
+    }
+
+    #[test]
+    fn copies_of_a_state_share_missions_until_one_changes() {
+        let tmp = tempdir().unwrap();
+        let root = tmp.path().join("ds");
+        let mut state = create_dataset(&root, "2023-03-02").unwrap();
+        add_mission(&mut state, &meta("2023-03-02T10:00:00+00:00", "M1")).unwrap();
+        add_mission(&mut state, &meta("2023-03-02T11:00:00+00:00", "M2")).unwrap();
+        let path = tmp.path().join("a.bin");
+        fs::write(&path, b"a").unwrap();
+
+        let copy = state.clone();
+        stage_mission_files(&mut state, "ED-00 M1", &[path], None).unwrap();
+        assert!(!Arc::ptr_eq(&state.missions[0], &copy.missions[0]));
+        assert!(copy.missions[0].staged_files.is_empty());
+        // The unchanged mission is still shared, saving did not copy it.
+        assert!(Arc::ptr_eq(&state.missions[1], &copy.missions[1]));
+    }
+
+    // ── Concurrent use ───────────────────────────────────────────
+
+    #[test]
+    fn state_is_stale_after_another_writer_and_refresh_reloads_it() {
+        let tmp = tempdir().unwrap();
+        let root = tmp.path().join("ds");
+        let mut state = create_dataset(&root, "2023-03-02").unwrap();
+        add_mission(&mut state, &meta("2023-03-02T10:00:00+00:00", "M1")).unwrap();
+        assert!(!state.is_stale().unwrap());
+
+        let mut other = load_dataset_state(&root).unwrap();
+        add_mission(&mut other, &meta("2023-03-02T11:00:00+00:00", "M2")).unwrap();
+        assert!(!other.is_stale().unwrap());
+        assert!(state.is_stale().unwrap());
+
+        state.refresh().unwrap();
+        assert!(!state.is_stale().unwrap());
+        assert_eq!(state.missions.len(), 2);
+    }
+
+    #[test]
+    fn missions_commit_in_parallel() {
+        let tmp = tempdir().unwrap();
+        let root = tmp.path().join("ds");
+        let mut state = create_dataset(&root, "2023-03-02").unwrap();
+        for mission in ["M1", "M2"] {
+            add_mission(&mut state, &meta("2023-03-02T10:00:00+00:00", mission)).unwrap();
+        }
+
+        let workers: Vec<_> = ["M1", "M2"]
+            .into_iter()
+            .map(|mission| {
+                let root = root.clone();
+                let src = tmp.path().join(format!("{}.bin", mission));
+                fs::write(&src, mission.as_bytes()).unwrap();
+                std::thread::spawn(move || {
+                    let mut state = load_dataset_state(&root).unwrap();
+                    let name = format!("ED-00 {}", mission);
+                    stage_mission_files(&mut state, &name, &[src], None).unwrap();
+                    commit_mission_files(&mut state, &name).unwrap();
+                })
+            })
+            .collect();
+        for worker in workers {
+            worker.join().unwrap();
+        }
+
+        let mut loaded = load_dataset_state(&root).unwrap();
+        loaded.load_committed_files().unwrap();
+        for mission in &loaded.missions {
+            assert_eq!(mission.committed_files.as_ref().map(Vec::len), Some(1));
+            assert!(mission.staged_files.is_empty());
+        }
+        let manifest_data = dataset_manifest(&root);
+        assert!(manifest_data.contains_key("ED-00/M1/M1.bin"));
+        assert!(manifest_data.contains_key("ED-00/M2/M2.bin"));
+    }
+
+    #[test]
+    fn ingest_stages_and_commits_each_mission_in_its_own_lane() {
+        let tmp = tempdir().unwrap();
+        let root = tmp.path().join("ds");
+        let mut state = create_dataset(&root, "2023-03-02").unwrap();
+        for mission in ["M1", "M2"] {
+            add_mission(&mut state, &meta("2023-03-02T10:00:00+00:00", mission)).unwrap();
+        }
+        let sources: Vec<IngestSource> = ["M1", "M2"]
+            .into_iter()
+            .map(|mission| {
+                let card = tmp.path().join(format!("card-{}", mission));
+                fs::create_dir_all(card.join("DCIM")).unwrap();
+                fs::write(card.join("DCIM").join("a.bin"), b"a").unwrap();
+                fs::write(card.join("b.bin"), b"bb").unwrap();
+                IngestSource {
+                    mission_name: find_mission_name(&state, mission).unwrap(),
+                    paths: vec![card],
+                }
+            })
+            .collect();
+
+        let progress = Progress::new();
+        let committed = ingest_missions(&mut state, &sources, &progress).unwrap();
+        assert_eq!(committed.len(), 4);
+        let s = progress.snapshot();
+        assert_eq!((s.phase, s.files_done, s.files_total, s.bytes_total), (Phase::Done, 4, 4, 6));
+
+        let manifest_data = dataset_manifest(&root);
+        assert!(manifest_data.contains_key("ED-00/M1/DCIM/a.bin"));
+        assert!(manifest_data.contains_key("ED-00/M2/b.bin"));
+        for mission in &state.missions {
+            assert!(mission.staged_files.is_empty());
+            assert_eq!(mission.committed_files.as_ref().map(Vec::len), Some(2));
+        }
+        assert!(state.is_stale().unwrap());
+    }
+
+    #[test]
+    fn ingest_reports_the_missions_that_failed() {
+        let tmp = tempdir().unwrap();
+        let root = tmp.path().join("ds");
+        let mut state = create_dataset(&root, "2023-03-02").unwrap();
+        add_mission(&mut state, &meta("2023-03-02T10:00:00+00:00", "M1")).unwrap();
+        let src = tmp.path().join("a.bin");
+        fs::write(&src, b"a").unwrap();
+        let sources = [
+            IngestSource { mission_name: "ED-00 M1".to_string(), paths: vec![src] },
+            IngestSource { mission_name: "ED-00 M2".to_string(), paths: Vec::new() },
+        ];
+
+        let err = ingest_missions(&mut state, &sources, &Progress::new()).unwrap_err();
+        assert!(err.to_string().contains("ED-00 M2: Mission not found"));
+        let mut loaded = load_dataset_state(&root).unwrap();
+        assert_eq!(loaded.mission_committed_files(0).unwrap().len(), 1);
+        assert!(find_mission_name(&loaded, "M2").is_err());
+    }
+
     // ── remove_mission ───────────────────────────────────────────
 
     #[test]
@@ -1378,7 +2582,7 @@ mod tests {
 
         remove_mission(&mut state, "ED-00 M1").unwrap();
 
-        let manifest_data = manifest::read_manifest(&root.join("manifest.json")).unwrap();
+        let manifest_data = dataset_manifest(&root);
         assert!(manifest_data.keys().all(|k| !k.starts_with("ED-00/M1/")));
     }
 
@@ -1418,7 +2622,7 @@ mod tests {
 
         remove_mission(&mut state, "ED-00 M1").unwrap();
 
-        let manifest_data = manifest::read_manifest(&root.join("manifest.json")).unwrap();
+        let manifest_data = dataset_manifest(&root);
         assert!(manifest_data.keys().any(|k| k.starts_with("ED-00/M2/")));
         assert!(manifest_data.keys().all(|k| !k.starts_with("ED-00/M1/")));
     }
@@ -1450,12 +2654,12 @@ mod tests {
         commit_mission_files(&mut state, "ED-00 M1").unwrap();
 
         // Confirm the committed file is in the dataset manifest before removal
-        let before = manifest::read_manifest(&root.join("manifest.json")).unwrap();
+        let before = dataset_manifest(&root);
         assert!(before.keys().any(|k| k.ends_with("data.bin")));
 
         remove_mission(&mut state, "ED-00 M1").unwrap();
 
-        let after = manifest::read_manifest(&root.join("manifest.json")).unwrap();
+        let after = dataset_manifest(&root);
         assert!(after.keys().all(|k| !k.ends_with("data.bin")));
     }
 
@@ -1469,7 +2673,7 @@ mod tests {
         assert!(err.to_string().contains("Mission not found"));
     }
 
-    // ── check_destination_is_subset ──────────────────────────────
+    // ── check_manifest_is_subset ──────────────────────────────────
 
     fn make_committed_dataset(tmp: &tempfile::TempDir, name: &str) -> DatasetState {
         let root = tmp.path().join(name);
@@ -1482,38 +2686,45 @@ mod tests {
         state
     }
 
+    fn read_dest_manifest(dest: &Path) -> manifest::ManifestData {
+        manifest::read_manifest(&dest.join(MANIFEST_NAME)).unwrap()
+    }
+
     #[test]
     fn subset_check_passes_when_destination_does_not_exist() {
         let tmp = tempdir().unwrap();
         let state = make_committed_dataset(&tmp, "ds");
-        let src_manifest =
-            manifest::read_manifest(&state.root.join("manifest.json")).unwrap();
+        let src_manifest = dataset_manifest(&state.root);
         let nonexistent = tmp.path().join("nowhere");
-        check_destination_is_subset(&src_manifest, &nonexistent).unwrap();
+        check_manifest_is_subset(&src_manifest, &read_dest_manifest(&nonexistent)).unwrap();
     }
 
     #[test]
     fn subset_check_passes_when_destination_has_empty_manifest() {
         let tmp = tempdir().unwrap();
         let state = make_committed_dataset(&tmp, "ds");
-        let src_manifest =
-            manifest::read_manifest(&state.root.join("manifest.json")).unwrap();
+        let src_manifest = dataset_manifest(&state.root);
         // Destination exists but has no files
         let dest = tmp.path().join("dest");
         fs::create_dir_all(&dest).unwrap();
-        check_destination_is_subset(&src_manifest, &dest).unwrap();
+        check_manifest_is_subset(&src_manifest, &read_dest_manifest(&dest)).unwrap();
     }
 
     #[test]
     fn subset_check_passes_when_destination_is_partial_copy() {
         let tmp = tempdir().unwrap();
         let state = make_committed_dataset(&tmp, "ds");
-        let src_manifest =
-            manifest::read_manifest(&state.root.join("manifest.json")).unwrap();
+        let src_manifest = dataset_manifest(&state.root);
 
         // Duplicate to dest then delete some files from the dest manifest
         let dest = tmp.path().join("dest");
-        duplicate_dataset(&state, &[dest.clone()]).unwrap();
+        duplicate_dataset_with_progress(
+            &state,
+            &[dest.clone()],
+            PushOptions::default(),
+            &Progress::new(),
+        )
+        .unwrap();
 
         // Remove one entry from dest manifest to simulate a partial push
         let dest_manifest_path = dest.join("manifest.json");
@@ -1522,30 +2733,40 @@ mod tests {
         dest_manifest.remove(&first_key);
         manifest::write_manifest(&dest_manifest_path, &dest_manifest).unwrap();
 
-        check_destination_is_subset(&src_manifest, &dest).unwrap();
+        check_manifest_is_subset(&src_manifest, &read_dest_manifest(&dest)).unwrap();
     }
 
     #[test]
     fn subset_check_passes_when_destination_is_full_copy() {
         let tmp = tempdir().unwrap();
         let state = make_committed_dataset(&tmp, "ds");
-        let src_manifest =
-            manifest::read_manifest(&state.root.join("manifest.json")).unwrap();
+        let src_manifest = dataset_manifest(&state.root);
         let dest = tmp.path().join("dest");
-        duplicate_dataset(&state, &[dest.clone()]).unwrap();
-        check_destination_is_subset(&src_manifest, &dest).unwrap();
+        duplicate_dataset_with_progress(
+            &state,
+            &[dest.clone()],
+            PushOptions::default(),
+            &Progress::new(),
+        )
+        .unwrap();
+        check_manifest_is_subset(&src_manifest, &read_dest_manifest(&dest)).unwrap();
     }
 
     #[test]
     fn subset_check_fails_when_destination_has_extra_file() {
         let tmp = tempdir().unwrap();
         let state = make_committed_dataset(&tmp, "ds");
-        let src_manifest =
-            manifest::read_manifest(&state.root.join("manifest.json")).unwrap();
+        let src_manifest = dataset_manifest(&state.root);
 
         // Destination has a file not in source
         let dest = tmp.path().join("dest");
-        duplicate_dataset(&state, &[dest.clone()]).unwrap();
+        duplicate_dataset_with_progress(
+            &state,
+            &[dest.clone()],
+            PushOptions::default(),
+            &Progress::new(),
+        )
+        .unwrap();
         let dest_manifest_path = dest.join("manifest.json");
         let mut dest_manifest = manifest::read_manifest(&dest_manifest_path).unwrap();
         dest_manifest.insert(
@@ -1554,7 +2775,7 @@ mod tests {
         );
         manifest::write_manifest(&dest_manifest_path, &dest_manifest).unwrap();
 
-        let err = check_destination_is_subset(&src_manifest, &dest).unwrap_err();
+        let err = check_manifest_is_subset(&src_manifest, &read_dest_manifest(&dest)).unwrap_err();
         assert!(err.to_string().contains("not in the source dataset"));
     }
 
@@ -1562,11 +2783,16 @@ mod tests {
     fn subset_check_fails_when_destination_file_has_different_hash() {
         let tmp = tempdir().unwrap();
         let state = make_committed_dataset(&tmp, "ds");
-        let src_manifest =
-            manifest::read_manifest(&state.root.join("manifest.json")).unwrap();
+        let src_manifest = dataset_manifest(&state.root);
 
         let dest = tmp.path().join("dest");
-        duplicate_dataset(&state, &[dest.clone()]).unwrap();
+        duplicate_dataset_with_progress(
+            &state,
+            &[dest.clone()],
+            PushOptions::default(),
+            &Progress::new(),
+        )
+        .unwrap();
 
         // Corrupt one entry in the dest manifest
         let dest_manifest_path = dest.join("manifest.json");
@@ -1575,7 +2801,222 @@ mod tests {
         dest_manifest.get_mut(&first_key).unwrap().sha256sum = "deadbeef".to_string();
         manifest::write_manifest(&dest_manifest_path, &dest_manifest).unwrap();
 
-        let err = check_destination_is_subset(&src_manifest, &dest).unwrap_err();
+        let err = check_manifest_is_subset(&src_manifest, &read_dest_manifest(&dest)).unwrap_err();
+        assert!(err.to_string().contains("different hash"));
+    }
+
+    // ── push ledger / incremental push ───────────────────────────
+
+    fn make_pushable_dataset(tmp: &tempfile::TempDir) -> DatasetState {
+        let mut state = make_committed_dataset(tmp, "ds");
+        let readme = tmp.path().join("readme.md");
+        fs::write(&readme, b"# readme").unwrap();
+        stage_dataset_files(&mut state, &[readme]).unwrap();
+        commit_dataset_files(&mut state).unwrap();
+        state
+    }
+
+    fn add_second_mission(tmp: &tempfile::TempDir, state: &mut DatasetState) {
+        add_mission(state, &meta("2023-03-03T10:00:00+00:00", "M2")).unwrap();
+        let src = tmp.path().join("day2.bin");
+        fs::write(&src, b"second day").unwrap();
+        stage_mission_files(state, "ED-01 M2", &[src], None).unwrap();
+        commit_mission_files(state, "ED-01 M2").unwrap();
+    }
+
+    #[test]
+    fn push_records_ledger_for_destination() {
+        let tmp = tempdir().unwrap();
+        let state = make_pushable_dataset(&tmp);
+        let nas = tmp.path().join("nas");
+        fs::create_dir(&nas).unwrap();
+        push_dataset_with_progress(&state, &nas.to_string_lossy(), PushOptions::default(), &Progress::new()).unwrap();
+
+        let key = fs::canonicalize(&nas).unwrap().join("ds").to_string_lossy().into_owned();
+        let ledger = DatasetDb::open(&state.root).unwrap().get_push_ledger(&key).unwrap().unwrap();
+        let src_manifest = dataset_manifest(&state.root);
+        assert_eq!(ledger.entries.len(), src_manifest.len());
+        let written = fs::read(nas.join("ds").join(MANIFEST_NAME)).unwrap();
+        assert_eq!(ledger.manifest_sha256, manifest::hash_bytes(&written));
+    }
+
+    #[test]
+    fn validating_a_push_destination_reads_its_manifest_json() {
+        let tmp = tempdir().unwrap();
+        let mut state = make_pushable_dataset(&tmp);
+        let nas = tmp.path().join("nas");
+        fs::create_dir(&nas).unwrap();
+        let nas_str = nas.to_string_lossy().into_owned();
+        let dest = nas.join("ds");
+        push_dataset_with_progress(&state, &nas_str, PushOptions::default(), &Progress::new()).unwrap();
+
+        for _ in 0..2 {
+            assert!(validate_dataset_failures(&dest).unwrap().is_empty());
+            assert!(!dest.join(DB_NAME).exists());
+            load_dataset_state(&dest).unwrap();
+        }
+
+        add_second_mission(&tmp, &mut state);
+        push_dataset_with_progress(&state, &nas_str, PushOptions::default(), &Progress::new()).unwrap();
+        assert!(validate_dataset_failures(&dest).unwrap().is_empty());
+        assert!(!dest.join(DB_NAME).exists());
+        fs::write(dest.join("ED-01").join("M2").join("day2.bin"), b"tampered").unwrap();
+        assert_eq!(validate_dataset_failures(&dest).unwrap().len(), 1);
+    }
+
+    #[test]
+    fn repeated_push_transfers_only_the_delta() {
+        let tmp = tempdir().unwrap();
+        let mut state = make_pushable_dataset(&tmp);
+        let nas = tmp.path().join("nas");
+        fs::create_dir(&nas).unwrap();
+        let nas_str = nas.to_string_lossy().into_owned();
+        push_dataset_with_progress(&state, &nas_str, PushOptions::default(), &Progress::new()).unwrap();
+
+        // Tamper with an already-pushed file without touching the manifest, and
+        // move its source away: an incremental push trusts the ledger and must
+        // not look at either.
+        let pushed = nas.join("ds").join("ED-00").join("M1").join("data.bin");
+        fs::write(&pushed, b"tampered").unwrap();
+        let source = state.root.join("ED-00").join("M1").join("data.bin");
+        let moved = tmp.path().join("data.bin.moved");
+        fs::rename(&source, &moved).unwrap();
+
+        let before = dataset_manifest(&state.root);
+        add_second_mission(&tmp, &mut state);
+        let after = dataset_manifest(&state.root);
+        let mut delta: Vec<&String> = after
+            .iter()
+            .filter(|(k, e)| before.get(*k).map(|b| &b.sha256sum) != Some(&e.sha256sum))
+            .map(|(k, _)| k)
+            .collect();
+        delta.sort();
+        assert!(delta.iter().any(|k| k.ends_with("day2.bin")));
+
+        let phases: std::sync::Mutex<Vec<(Phase, u64)>> = std::sync::Mutex::new(Vec::new());
+        let progress = Progress::with_callback(Duration::from_secs(3600), |s: &crate::progress::Snapshot| {
+            let mut phases = phases.lock().unwrap();
+            if phases.last().map(|(p, _)| *p) != Some(s.phase) {
+                phases.push((s.phase, s.files_total));
+            }
+        });
+        push_dataset_with_progress(&state, &nas_str, PushOptions::default(), &progress).unwrap();
+        fs::rename(&moved, &source).unwrap();
+
+        let dest = nas.join("ds");
+        assert_eq!(fs::read(dest.join("ED-01").join("M2").join("day2.bin")).unwrap(), b"second day");
+        assert_eq!(fs::read(&pushed).unwrap(), b"tampered");
+        // Exactly the new and changed entries are hashed, copied and verified.
+        let n = delta.len() as u64;
+        drop(progress);
+        let phases = phases.into_inner().unwrap();
+        assert_eq!(
+            phases[..3],
+            [(Phase::Hash, n), (Phase::Copy, n), (Phase::Verify, n)]
+        );
+        let total = after.len() as u64;
+        assert_eq!(
+            manifest::read_manifest(&dest.join(MANIFEST_NAME)).unwrap().len() as u64,
+            total
+        );
+
+        // A full push ignores the ledger and repairs the tampered file.
+        let full = PushOptions { full: true, ..PushOptions::default() };
+        push_dataset_with_progress(&state, &nas_str, full, &Progress::new()).unwrap();
+        assert_eq!(fs::read(&pushed).unwrap(), b"payload");
+    }
+
+    #[test]
+    fn durable_push_with_readback_writes_verified_copy() {
+        let tmp = tempdir().unwrap();
+        let state = make_pushable_dataset(&tmp);
+        let nas = tmp.path().join("nas");
+        fs::create_dir(&nas).unwrap();
+        for level in [Durability::Batched, Durability::Full] {
+            let options = PushOptions { full: true, durability: level, readback: true };
+            push_dataset_with_progress(&state, &nas.to_string_lossy(), options, &Progress::new())
+                .unwrap();
+        }
+        let dest = nas.join("ds");
+        assert_eq!(fs::read(dest.join("ED-00").join("M1").join("data.bin")).unwrap(), b"payload");
+        assert!(validate_dataset(&dest).unwrap());
+    }
+
+    #[test]
+    fn readback_raises_none_to_batched() {
+        let options = PushOptions { readback: true, ..PushOptions::default() };
+        assert_eq!(options.effective_durability(), Durability::Batched);
+        assert_eq!(PushOptions::default().effective_durability(), Durability::None);
+    }
+
+    #[test]
+    fn cancelled_push_writes_no_manifest_or_ledger() {
+        let tmp = tempdir().unwrap();
+        let state = make_pushable_dataset(&tmp);
+        let nas = tmp.path().join("nas");
+        fs::create_dir(&nas).unwrap();
+        let progress = Progress::new();
+        progress.cancel_token().cancel();
+        let result =
+            push_dataset_with_progress(&state, &nas.to_string_lossy(), PushOptions::default(), &progress);
+        assert!(matches!(result, Err(E4EError::Cancelled)));
+        assert!(!nas.join("ds").join(MANIFEST_NAME).exists());
+        let db = DatasetDb::open(&state.root).unwrap();
+        let key = fs::canonicalize(&nas).unwrap().join("ds").to_string_lossy().into_owned();
+        assert!(db.get_push_ledger(&key).unwrap().is_none());
+    }
+
+    #[test]
+    fn plan_falls_back_to_full_when_destination_manifest_changed() {
+        let mut source = manifest::ManifestData::new();
+        source.insert(
+            "a.bin".to_string(),
+            manifest::ManifestEntry { sha256sum: "aa".to_string(), size: 1 },
+        );
+        let written = manifest::manifest_to_string(&source).unwrap();
+        let ledger = PushLedger {
+            manifest_sha256: manifest::hash_bytes(written.as_bytes()),
+            entries: source.clone(),
+        };
+
+        let plan =
+            PushPlan::with_ledger(source.clone(), Some(written.as_bytes()), Some(ledger.clone()))
+                .unwrap();
+        assert!(plan.incremental);
+        assert!(plan.pending.is_empty());
+
+        let edited = format!("{}\n", written);
+        let plan = PushPlan::with_ledger(source, Some(edited.as_bytes()), Some(ledger)).unwrap();
+        assert!(!plan.incremental);
+        assert_eq!(plan.pending, vec!["a.bin".to_string()]);
+    }
+
+    #[test]
+    fn plan_repushes_changed_mission_manifest_but_rejects_changed_data() {
+        let entry = |h: &str| manifest::ManifestEntry { sha256sum: h.to_string(), size: 1 };
+        let mut pushed = manifest::ManifestData::new();
+        pushed.insert("ED-00/M1/manifest.json".to_string(), entry("m1"));
+        pushed.insert("ED-00/M1/a.bin".to_string(), entry("aa"));
+        let written = manifest::manifest_to_string(&pushed).unwrap();
+        let ledger = PushLedger {
+            manifest_sha256: manifest::hash_bytes(written.as_bytes()),
+            entries: pushed.clone(),
+        };
+
+        let mut source = pushed.clone();
+        source.insert("ED-00/M1/manifest.json".to_string(), entry("m2"));
+        source.insert("ED-00/M1/b.bin".to_string(), entry("bb"));
+        let plan =
+            PushPlan::with_ledger(source.clone(), Some(written.as_bytes()), Some(ledger.clone()))
+                .unwrap();
+        let mut pending = plan.pending.clone();
+        pending.sort();
+        assert_eq!(pending, vec!["ED-00/M1/b.bin", "ED-00/M1/manifest.json"]);
+
+        source.insert("ED-00/M1/a.bin".to_string(), entry("changed"));
+        let err = PushPlan::with_ledger(source, Some(written.as_bytes()), Some(ledger))
+            .err()
+            .unwrap();
         assert!(err.to_string().contains("different hash"));
     }
 }
@@ -1,29 +1,56 @@
-use std::path::Path;
-
+use std::collections::HashMap;
+#[cfg(any(test, feature = "python"))]
+use std::collections::{BTreeSet, HashSet};
+use std::fs::File;
+use std::io::{BufWriter, Write};
+use std::path::{Path, PathBuf};
+use std::sync::atomic::{AtomicUsize, Ordering};
+use std::sync::{Arc, Mutex, OnceLock, PoisonError, Weak};
+use std::time::Duration;
+
+use parking_lot::ReentrantMutex;
 use rusqlite::{Connection, OptionalExtension, params};
+#[cfg(any(test, feature = "python"))]
+use rusqlite::params_from_iter;
 
-use crate::errors::Result;
+use crate::errors::{E4EError, Result};
+use crate::manifest::{self, read_manifest, ManifestData, ManifestEntry};
 use crate::metadata::MetadataRecord;
+use crate::trace;
 
 // ─────────────────────────────────────────────────────────────
 // Shared record types
 // ─────────────────────────────────────────────────────────────
 
-#[derive(Clone, Debug)]
+#[derive(Clone, Debug, PartialEq)]
 pub struct MissionRecord {
     pub name: String,
     pub path: String,
     pub metadata: MetadataRecord,
 }
 
-#[derive(Clone, Debug)]
+#[derive(Clone, Debug, PartialEq, Eq, Hash)]
 pub struct StagedFileRecord {
     pub origin_path: String,
     pub target_path: String,
     pub hash: String,
+    pub size: u64,
 }
 
-#[derive(Clone, Debug)]
+/// Files and bytes of one mission in one state; see `DatasetDb::file_stats`.
+#[derive(Clone, Debug, PartialEq, Eq)]
+#[cfg(any(test, feature = "python"))]
+pub struct FileStats {
+    pub mission: String,
+    /// `staged`, `committed` or `pushed`.
+    pub state: String,
+    /// The push destination, '' for other states.
+    pub destination: String,
+    pub files: u64,
+    pub bytes: u64,
+}
+
+#[derive(Clone, Debug, PartialEq)]
 pub struct DatasetMeta {
     pub day_0: String,
     pub pushed: bool,
@@ -33,132 +60,643 @@ pub struct DatasetMeta {
     pub last_site: Option<String>,
 }
 
+/// What was pushed to one destination: the verified manifest entries and the
+/// SHA-256 of the `manifest.json` written there.
+#[derive(Clone, Debug)]
+pub struct PushLedger {
+    pub manifest_sha256: String,
+    pub entries: ManifestData,
+}
+
+// ─────────────────────────────────────────────────────────────
+// Connection cache
+// ─────────────────────────────────────────────────────────────
+//
+// While a `Session` is open, each database file has one connection per process.
+// It is opened, tuned and migrated the first time the file is used, then
+// shared by every handle opened on it; statements go through rusqlite's
+// prepared-statement cache.  When the last session ends the connections are
+// checkpointed and closed, so no WAL files are left next to an idle database.
+// Outside a session every handle opens a connection of its own.
+//
+// The connection lock is re-entrant, so handles opened on the same thread inside
+// a `transaction` join that transaction, while other threads wait for it to end.
+
+const DATASET_DB_NAME: &str = ".e4edm.db";
+const MANIFEST_NAME: &str = "manifest.json";
+const MANAGER_DB_NAME: &str = "config.db";
+/// How long a statement waits for another process's write lock.
+const BUSY_TIMEOUT: Duration = Duration::from_secs(10);
+const STATEMENT_CACHE_CAPACITY: usize = 64;
+
+type SharedConnection = Arc<ReentrantMutex<Connection>>;
+
+static SESSIONS: AtomicUsize = AtomicUsize::new(0);
+
+fn connections() -> &'static Mutex<HashMap<PathBuf, SharedConnection>> {
+    static CONNECTIONS: OnceLock<Mutex<HashMap<PathBuf, SharedConnection>>> = OnceLock::new();
+    CONNECTIONS.get_or_init(Default::default)
+}
+
+/// The cached connection to `db_path`, opened and migrated if there is none yet
+/// or its file was deleted since.  The new connection is only cached while a
+/// session is open.
+fn shared_connection(db_path: &Path, migrations: &[Migration]) -> Result<SharedConnection> {
+    let mut cache = connections().lock().unwrap_or_else(PoisonError::into_inner);
+    if let Some(conn) = cache.get(db_path) {
+        if db_path.exists() {
+            return Ok(conn.clone());
+        }
+        cache.remove(db_path);
+    }
+    let conn = Connection::open(db_path)?;
+    conn.busy_timeout(BUSY_TIMEOUT)?;
+    conn.set_prepared_statement_cache_capacity(STATEMENT_CACHE_CAPACITY);
+    // WAL makes a commit a single append; NORMAL syncs it only at checkpoints,
+    // which can lose the last commits on power loss but never corrupts the file.
+    conn.execute_batch("PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;")?;
+    migrate(&conn, migrations)?;
+    let conn = Arc::new(ReentrantMutex::new(conn));
+    if SESSIONS.load(Ordering::SeqCst) > 0 {
+        cache.insert(db_path.to_path_buf(), conn.clone());
+    }
+    Ok(conn)
+}
+
+// ─────────────────────────────────────────────────────────────
+// Migrations
+// ─────────────────────────────────────────────────────────────
+//
+// Each database's schema is a list of migrations applied in order.
+// `PRAGMA user_version` holds how many have been applied, so a migration never
+// runs twice; new ones are appended, never edited.
+
+/// One step of a schema.
+enum Migration {
+    Sql(&'static str),
+    /// For what SQL alone cannot do, e.g. importing a file beside the database.
+    Code(fn(&Connection) -> Result<()>),
+}
+
+/// Apply the migrations `conn` has not had yet, in one transaction.  The
+/// version is read inside it, so processes opening the same database at once
+/// cannot both apply a migration.
+fn migrate(conn: &Connection, migrations: &[Migration]) -> Result<()> {
+    let version = |conn: &Connection| -> rusqlite::Result<usize> {
+        conn.query_row("PRAGMA user_version", [], |row| row.get::<_, i64>(0))
+            .map(|v| v as usize)
+    };
+    if version(conn)? == migrations.len() {
+        return Ok(());
+    }
+    let _span = trace::span("db.migrate");
+    conn.execute_batch("BEGIN IMMEDIATE")?;
+    let result = version(conn).map_err(E4EError::from).and_then(|applied| {
+        if applied > migrations.len() {
+            return Err(E4EError::Runtime(format!(
+                "Database schema version {} is newer than this version of e4edm supports ({})",
+                applied,
+                migrations.len()
+            )));
+        }
+        for migration in &migrations[applied..] {
+            match migration {
+                Migration::Sql(sql) => conn.execute_batch(sql)?,
+                Migration::Code(apply) => apply(conn)?,
+            }
+        }
+        conn.pragma_update(None, "user_version", migrations.len() as i64)?;
+        conn.execute_batch("COMMIT")?;
+        Ok(())
+    });
+    if result.is_err() {
+        let _ = conn.execute_batch("ROLLBACK");
+    }
+    result
+}
+
+fn checkpoint(conn: &SharedConnection) {
+    // Best effort: a reader in another process can keep the WAL from being reset.
+    let _ = conn.lock().execute_batch("PRAGMA wal_checkpoint(TRUNCATE);");
+}
+
+/// Checkpoint and close the cached connection to the dataset database in
+/// `root`, e.g. before its directory is deleted.  Handles that are still open
+/// keep working.
+pub fn release_dataset(root: &Path) {
+    let conn = connections()
+        .lock()
+        .unwrap_or_else(PoisonError::into_inner)
+        .remove(&root.join(DATASET_DB_NAME));
+    if let Some(conn) = conn {
+        checkpoint(&conn);
+    }
+}
+
+/// Checkpoint and close every cached connection, folding each WAL back into its
+/// database.
+fn release_all() {
+    let conns: Vec<SharedConnection> = connections()
+        .lock()
+        .unwrap_or_else(PoisonError::into_inner)
+        .drain()
+        .map(|(_, conn)| conn)
+        .collect();
+    for conn in &conns {
+        checkpoint(conn);
+    }
+}
+
+/// Keeps database connections open and cached until dropped; sessions may
+/// overlap and nest.  Open one around each command.
+pub struct Session(());
+
+impl Session {
+    pub fn begin() -> Self {
+        SESSIONS.fetch_add(1, Ordering::SeqCst);
+        Session(())
+    }
+}
+
+impl Drop for Session {
+    fn drop(&mut self) {
+        if SESSIONS.fetch_sub(1, Ordering::SeqCst) == 1 {
+            release_all();
+        }
+    }
+}
+
+/// Run `f` in a transaction on `conn`: committed if `f` succeeds, rolled back
+/// otherwise.  A transaction started inside `f` becomes a savepoint of this one.
+fn in_transaction<T>(conn: &SharedConnection, f: impl FnOnce() -> Result<T>) -> Result<T> {
+    let guard = conn.lock();
+    let outermost = guard.is_autocommit();
+    let _span = if outermost { trace::span("db.transaction") } else { None };
+    // IMMEDIATE takes the write lock up front, so a busy database is waited for
+    // at the start instead of failing the first write.
+    let (begin, commit, rollback) = if outermost {
+        ("BEGIN IMMEDIATE", "COMMIT", "ROLLBACK")
+    } else {
+        ("SAVEPOINT nested", "RELEASE nested", "ROLLBACK TO nested; RELEASE nested")
+    };
+    guard.execute_batch(begin)?;
+    let result = f().and_then(|value| {
+        guard.execute_batch(commit)?;
+        Ok(value)
+    });
+    if result.is_err() {
+        let _ = guard.execute_batch(rollback);
+    }
+    result
+}
+
+// ─────────────────────────────────────────────────────────────
+// Change detection
+// ─────────────────────────────────────────────────────────────
+//
+// Every write of a dataset's state bumps `dataset_meta.revision`, so a copy of
+// the state can tell whether anyone else has written it since it was read.
+// While the connection it was read on is still open, that is answered without
+// reading the database: `PRAGMA data_version` changes only when another
+// connection (in practice, another process) commits, and `total_changes()`
+// whenever this one writes.
+
+/// A dataset database's state as of some read of it.
+#[derive(Clone, Debug)]
+pub struct Snapshot {
+    conn: Weak<ReentrantMutex<Connection>>,
+    data_version: i64,
+    total_changes: i64,
+    revision: i64,
+}
+
+impl Snapshot {
+    pub fn revision(&self) -> i64 {
+        self.revision
+    }
+}
+
+/// The connection's `(data_version, total_changes())`.
+fn change_counters(conn: &Connection) -> rusqlite::Result<(i64, i64)> {
+    let data_version = conn.query_row("PRAGMA data_version", [], |row| row.get(0))?;
+    let total_changes = conn.query_row("SELECT total_changes()", [], |row| row.get(0))?;
+    Ok((data_version, total_changes))
+}
+
+fn revision(conn: &Connection) -> rusqlite::Result<i64> {
+    conn.prepare_cached("SELECT revision FROM dataset_meta WHERE id = 1")?
+        .query_row([], |row| row.get(0))
+        .optional()
+        .map(Option::unwrap_or_default)
+}
+
 // ─────────────────────────────────────────────────────────────
 // DatasetDb  –  .e4edm.db in the dataset root
 // ─────────────────────────────────────────────────────────────
 
 pub struct DatasetDb {
-    conn: Connection,
+    conn: SharedConnection,
+}
+
+const DATASET_MIGRATIONS: &[Migration] = &[
+    // 1: the original schema (databases from before migrations have all of it).
+    Migration::Sql("
+        CREATE TABLE IF NOT EXISTS dataset_meta (
+            id              INTEGER PRIMARY KEY CHECK (id = 1),
+            day_0           TEXT NOT NULL,
+            pushed          INTEGER NOT NULL DEFAULT 0,
+            version         INTEGER NOT NULL DEFAULT 2,
+            last_country    TEXT,
+            last_region     TEXT,
+            last_site       TEXT
+        );
+
+        CREATE TABLE IF NOT EXISTS missions (
+            name            TEXT PRIMARY KEY,
+            path            TEXT NOT NULL,
+            timestamp       TEXT NOT NULL,
+            device          TEXT NOT NULL,
+            country         TEXT NOT NULL,
+            region          TEXT NOT NULL,
+            site            TEXT NOT NULL,
+            mission_name    TEXT NOT NULL,
+            properties      TEXT NOT NULL DEFAULT '{}',
+            notes           TEXT NOT NULL DEFAULT ''
+        );
+
+        CREATE TABLE IF NOT EXISTS mission_staged_files (
+            id              INTEGER PRIMARY KEY AUTOINCREMENT,
+            mission_name    TEXT NOT NULL,
+            origin_path     TEXT NOT NULL,
+            target_path     TEXT NOT NULL,
+            hash            TEXT NOT NULL,
+            UNIQUE(origin_path, target_path)
+        );
+
+        CREATE TABLE IF NOT EXISTS mission_committed_files (
+            id              INTEGER PRIMARY KEY AUTOINCREMENT,
+            mission_name    TEXT NOT NULL,
+            path            TEXT NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS dataset_staged_files (
+            id              INTEGER PRIMARY KEY AUTOINCREMENT,
+            path            TEXT NOT NULL UNIQUE
+        );
+
+        CREATE TABLE IF NOT EXISTS dataset_committed_files (
+            id              INTEGER PRIMARY KEY AUTOINCREMENT,
+            path            TEXT NOT NULL UNIQUE
+        );
+
+        CREATE TABLE IF NOT EXISTS push_destinations (
+            destination     TEXT PRIMARY KEY,
+            manifest_sha256 TEXT NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS push_ledger (
+            destination     TEXT NOT NULL,
+            path            TEXT NOT NULL,
+            sha256          TEXT NOT NULL,
+            size            INTEGER NOT NULL,
+            PRIMARY KEY (destination, path)
+        );
+    "),
+    // 2: committed files were never unique, so every save could duplicate them,
+    // and neither file table could be looked up by mission without a scan.
+    Migration::Sql("
+        DELETE FROM mission_committed_files WHERE id NOT IN (
+            SELECT MIN(id) FROM mission_committed_files GROUP BY mission_name, path
+        );
+        CREATE UNIQUE INDEX IF NOT EXISTS mission_committed_files_mission_path
+            ON mission_committed_files (mission_name, path);
+        CREATE INDEX IF NOT EXISTS mission_staged_files_mission
+            ON mission_staged_files (mission_name);
+    "),
+    // 3: the dataset manifest moves out of manifest.json.  The table is keyed
+    // (and clustered) by path, so everything under a directory is one range.
+    Migration::Sql("
+        CREATE TABLE IF NOT EXISTS manifest (
+            path            TEXT PRIMARY KEY,
+            sha256          TEXT NOT NULL,
+            size            INTEGER NOT NULL
+        ) WITHOUT ROWID;
+    "),
+    // 4: fill it from the manifest.json the dataset had so far.
+    Migration::Code(import_manifest_json),
+    // 5: counts writes to the dataset's state, for telling when a copy of it
+    // loaded by another process has gone stale.
+    Migration::Sql("
+        ALTER TABLE dataset_meta ADD COLUMN revision INTEGER NOT NULL DEFAULT 0;
+    "),
+    // 6: file counts and bytes per mission and state, kept by triggers.
+    Migration::Code(add_file_stats),
+    // 7: manifest entries by size, for finding files the dataset already holds.
+    Migration::Sql("
+        CREATE INDEX IF NOT EXISTS manifest_size ON manifest (size);
+    "),
+];
+
+/// The mission whose directory holds the dataset path `path`, or '' for files
+/// outside every mission.  Missions are found by their `prefix` (their
+/// directory with a trailing `/`): the nearest at or before `path` normally
+/// holds it, so the scan of `missions_prefix` stops at the first row.
+fn mission_of(path: &str) -> String {
+    format!(
+        "COALESCE((SELECT name FROM missions \
+           WHERE prefix <= {path} AND substr({path}, 1, length(prefix)) = prefix \
+           ORDER BY prefix DESC LIMIT 1), '')"
+    )
+}
+
+/// SQL adding `files` and `bytes` to one row of `file_stats`.
+fn bump_file_stats(
+    mission: &str,
+    state: &str,
+    destination: &str,
+    files: &str,
+    bytes: &str,
+) -> String {
+    format!(
+        "INSERT INTO file_stats (mission, state, destination, files, bytes) \
+         VALUES ({mission}, '{state}', {destination}, {files}, {bytes}) \
+         ON CONFLICT (mission, state, destination) DO UPDATE \
+         SET files = files + excluded.files, bytes = bytes + excluded.bytes;"
+    )
+}
+
+/// SQL moving the committed and pushed counts of `mission` to the files
+/// outside every mission.
+fn release_file_stats(mission: &str) -> String {
+    format!(
+        "INSERT INTO file_stats (mission, state, destination, files, bytes) \
+             SELECT '', state, destination, files, bytes FROM file_stats \
+              WHERE mission = {mission} AND state != 'staged' \
+             ON CONFLICT (mission, state, destination) DO UPDATE \
+             SET files = files + excluded.files, bytes = bytes + excluded.bytes; \
+         DELETE FROM file_stats WHERE mission = {mission} AND state != 'staged';"
+    )
+}
+
+/// Record the size of staged files, give missions their directory prefix,
+/// and count the files and bytes each mission has staged, committed (in the
+/// manifest) and pushed (in each destination's ledger) in `file_stats`.
+/// Triggers keep the counts as the tables change, whoever writes them.
+fn add_file_stats(conn: &Connection) -> Result<()> {
+    conn.execute_batch(
+        "ALTER TABLE mission_staged_files ADD COLUMN size INTEGER NOT NULL DEFAULT 0;
+         ALTER TABLE missions ADD COLUMN prefix TEXT;
+         UPDATE missions
+            SET prefix = substr(name, 1, instr(name, ' ') - 1) || '/'
+                         || substr(name, instr(name, ' ') + 1) || '/'
+          WHERE instr(name, ' ') > 0;
+         CREATE INDEX IF NOT EXISTS missions_prefix ON missions (prefix);
+         CREATE TABLE IF NOT EXISTS file_stats (
+             mission         TEXT NOT NULL,
+             state           TEXT NOT NULL,
+             destination     TEXT NOT NULL DEFAULT '',
+             files           INTEGER NOT NULL DEFAULT 0,
+             bytes           INTEGER NOT NULL DEFAULT 0,
+             PRIMARY KEY (mission, state, destination)
+         ) WITHOUT ROWID;",
+    )?;
+
+    let staged: Vec<(i64, String)> = conn
+        .prepare("SELECT id, origin_path FROM mission_staged_files")?
+        .query_map([], |row| Ok((row.get(0)?, row.get(1)?)))?
+        .collect::<rusqlite::Result<_>>()?;
+    let mut set_size = conn.prepare("UPDATE mission_staged_files SET size=?2 WHERE id=?1")?;
+    for (id, origin) in staged {
+        if let Ok(meta) = std::fs::metadata(&origin) {
+            set_size.execute(params![id, meta.len() as i64])?;
+        }
+    }
+
+    let new_path = mission_of("NEW.path");
+    let old_path = mission_of("OLD.path");
+    conn.execute_batch(&format!(
+        "INSERT INTO file_stats (mission, state, files, bytes)
+             SELECT mission_name, 'staged', COUNT(*), SUM(size)
+               FROM mission_staged_files GROUP BY mission_name;
+         INSERT INTO file_stats (mission, state, files, bytes)
+             SELECT mission, 'committed', COUNT(*), SUM(size)
+               FROM (SELECT {manifest_mission} AS mission, size FROM manifest)
+              GROUP BY mission;
+         INSERT INTO file_stats (mission, state, destination, files, bytes)
+             SELECT mission, 'pushed', destination, COUNT(*), SUM(size)
+               FROM (SELECT {ledger_mission} AS mission, destination, size FROM push_ledger)
+              GROUP BY mission, destination;
+
+         CREATE TRIGGER IF NOT EXISTS staged_insert AFTER INSERT ON mission_staged_files
+         BEGIN {staged_insert} END;
+         CREATE TRIGGER IF NOT EXISTS staged_delete AFTER DELETE ON mission_staged_files
+         BEGIN {staged_delete} END;
+         CREATE TRIGGER IF NOT EXISTS manifest_insert AFTER INSERT ON manifest
+         BEGIN {manifest_insert} END;
+         CREATE TRIGGER IF NOT EXISTS manifest_update AFTER UPDATE OF size ON manifest
+         BEGIN {manifest_update} END;
+         CREATE TRIGGER IF NOT EXISTS manifest_delete AFTER DELETE ON manifest
+         BEGIN {manifest_delete} END;
+         CREATE TRIGGER IF NOT EXISTS ledger_insert AFTER INSERT ON push_ledger
+         BEGIN {ledger_insert} END;
+         CREATE TRIGGER IF NOT EXISTS ledger_update AFTER UPDATE OF size ON push_ledger
+         BEGIN {ledger_update} END;
+         CREATE TRIGGER IF NOT EXISTS ledger_delete AFTER DELETE ON push_ledger
+         BEGIN {ledger_delete} END;
+
+         -- Files may be committed under a mission's directory before its row
+         -- is written (or rewritten), and stay in push ledgers after it is
+         -- deleted, so missions take over and hand back their counts.
+         CREATE TRIGGER IF NOT EXISTS mission_insert AFTER INSERT ON missions
+         WHEN NEW.prefix IS NOT NULL
+         BEGIN
+             {release_new}
+             INSERT INTO file_stats (mission, state, destination, files, bytes)
+                 SELECT NEW.name, 'committed', '', COUNT(*), COALESCE(SUM(size), 0)
+                   FROM manifest WHERE {in_new};
+             INSERT INTO file_stats (mission, state, destination, files, bytes)
+                 SELECT NEW.name, 'pushed', destination, COUNT(*), SUM(size)
+                   FROM push_ledger WHERE {in_new} GROUP BY destination;
+             INSERT INTO file_stats (mission, state, destination, files, bytes)
+                 SELECT '', state, destination, -files, -bytes FROM file_stats
+                  WHERE mission = NEW.name AND state != 'staged'
+                 ON CONFLICT (mission, state, destination) DO UPDATE
+                 SET files = files + excluded.files, bytes = bytes + excluded.bytes;
+         END;
+         CREATE TRIGGER IF NOT EXISTS mission_delete AFTER DELETE ON missions
+         BEGIN
+             {release_old}
+             DELETE FROM file_stats WHERE mission = OLD.name;
+         END;",
+        manifest_mission = mission_of("manifest.path"),
+        ledger_mission = mission_of("push_ledger.path"),
+        staged_insert = bump_file_stats("NEW.mission_name", "staged", "''", "1", "NEW.size"),
+        staged_delete = bump_file_stats("OLD.mission_name", "staged", "''", "-1", "-OLD.size"),
+        manifest_insert = bump_file_stats(&new_path, "committed", "''", "1", "NEW.size"),
+        manifest_update =
+            bump_file_stats(&new_path, "committed", "''", "0", "NEW.size - OLD.size"),
+        manifest_delete = bump_file_stats(&old_path, "committed", "''", "-1", "-OLD.size"),
+        ledger_insert = bump_file_stats(&new_path, "pushed", "NEW.destination", "1", "NEW.size"),
+        ledger_update =
+            bump_file_stats(&new_path, "pushed", "NEW.destination", "0", "NEW.size - OLD.size"),
+        ledger_delete = bump_file_stats(&old_path, "pushed", "OLD.destination", "-1", "-OLD.size"),
+        release_new = release_file_stats("NEW.name"),
+        release_old = release_file_stats("OLD.name"),
+        in_new = "path >= NEW.prefix AND path < substr(NEW.prefix, 1, length(NEW.prefix) - 1) || '0'",
+    ))?;
+    Ok(())
+}
+
+/// The directory prefix `add_file_stats` gives a mission: `DAY/NAME/` for a
+/// mission named `DAY NAME`.
+fn mission_prefix(mission_name: &str) -> Option<String> {
+    mission_name.split_once(' ').map(|(day, name)| format!("{}/{}/", day, name))
+}
+
+/// Copy the `manifest.json` beside the database, if any, into the manifest table.
+fn import_manifest_json(conn: &Connection) -> Result<()> {
+    let db_path = match conn.path() {
+        Some(path) if !path.is_empty() => Path::new(path),
+        _ => return Ok(()),
+    };
+    let entries = read_manifest(&db_path.with_file_name(MANIFEST_NAME))?;
+    let mut stmt = conn.prepare(
+        "INSERT OR REPLACE INTO manifest (path, sha256, size) VALUES (?1, ?2, ?3)",
+    )?;
+    for (path, entry) in &entries {
+        stmt.execute(params![path, entry.sha256sum, entry.size as i64])?;
+    }
+    Ok(())
 }
 
 impl DatasetDb {
-    /// Opens `.e4edm.db` in `root`, creating tables if they don't exist.
+    /// Opens `.e4edm.db` in `root`, creating tables if they don't exist.  The
+    /// connection is shared with every other handle on the same database.
     pub fn open(root: &Path) -> Result<Self> {
-        let db_path = root.join(".e4edm.db");
-        let conn = Connection::open(&db_path)?;
-        let db = DatasetDb { conn };
-        db.create_tables()?;
-        Ok(db)
-    }
-
-    fn create_tables(&self) -> Result<()> {
-        self.conn.execute_batch("
-            PRAGMA journal_mode=WAL;
-
-            CREATE TABLE IF NOT EXISTS dataset_meta (
-                id              INTEGER PRIMARY KEY CHECK (id = 1),
-                day_0           TEXT NOT NULL,
-                pushed          INTEGER NOT NULL DEFAULT 0,
-                version         INTEGER NOT NULL DEFAULT 2,
-                last_country    TEXT,
-                last_region     TEXT,
-                last_site       TEXT
-            );
-
-            CREATE TABLE IF NOT EXISTS missions (
-                name            TEXT PRIMARY KEY,
-                path            TEXT NOT NULL,
-                timestamp       TEXT NOT NULL,
-                device          TEXT NOT NULL,
-                country         TEXT NOT NULL,
-                region          TEXT NOT NULL,
-                site            TEXT NOT NULL,
-                mission_name    TEXT NOT NULL,
-                properties      TEXT NOT NULL DEFAULT '{}',
-                notes           TEXT NOT NULL DEFAULT ''
-            );
-
-            CREATE TABLE IF NOT EXISTS mission_staged_files (
-                id              INTEGER PRIMARY KEY AUTOINCREMENT,
-                mission_name    TEXT NOT NULL,
-                origin_path     TEXT NOT NULL,
-                target_path     TEXT NOT NULL,
-                hash            TEXT NOT NULL,
-                UNIQUE(origin_path, target_path)
-            );
-
-            CREATE TABLE IF NOT EXISTS mission_committed_files (
-                id              INTEGER PRIMARY KEY AUTOINCREMENT,
-                mission_name    TEXT NOT NULL,
-                path            TEXT NOT NULL
-            );
-
-            CREATE TABLE IF NOT EXISTS dataset_staged_files (
-                id              INTEGER PRIMARY KEY AUTOINCREMENT,
-                path            TEXT NOT NULL UNIQUE
-            );
-
-            CREATE TABLE IF NOT EXISTS dataset_committed_files (
-                id              INTEGER PRIMARY KEY AUTOINCREMENT,
-                path            TEXT NOT NULL UNIQUE
-            );
-        ")?;
-        Ok(())
+        let _span = trace::span("db.open");
+        let conn = shared_connection(&root.join(DATASET_DB_NAME), DATASET_MIGRATIONS)?;
+        Ok(DatasetDb { conn })
+    }
+
+    /// Opens `.e4edm.db` in `root` if there is one; for reading a dataset, such
+    /// as a push destination, without creating a database in it.
+    pub fn open_existing(root: &Path) -> Result<Option<Self>> {
+        if !root.join(DATASET_DB_NAME).exists() {
+            return Ok(None);
+        }
+        Self::open(root).map(Some)
+    }
+
+    /// Run `f` in one transaction, committed only if it succeeds.  Handles
+    /// opened on this database inside `f` take part in the same transaction.
+    pub fn transaction<T>(&self, f: impl FnOnce(&Self) -> Result<T>) -> Result<T> {
+        in_transaction(&self.conn, || f(self))
+    }
+
+    // ── change detection ──────────────────────────────────────
+
+    /// The database's state as of now; take it before reading what it should
+    /// vouch for.
+    pub fn snapshot(&self) -> Result<Snapshot> {
+        let conn = self.conn.lock();
+        let (data_version, total_changes) = change_counters(&conn)?;
+        Ok(Snapshot {
+            conn: Arc::downgrade(&self.conn),
+            data_version,
+            total_changes,
+            revision: revision(&conn)?,
+        })
+    }
+
+    /// Whether the dataset's state has been written since `snapshot`, other
+    /// than by writes that moved the snapshot along.
+    pub fn changed_since(&self, snapshot: &Snapshot) -> Result<bool> {
+        let conn = self.conn.lock();
+        let same_conn = snapshot.conn.upgrade().is_some_and(|c| Arc::ptr_eq(&c, &self.conn));
+        if same_conn
+            && change_counters(&conn)? == (snapshot.data_version, snapshot.total_changes)
+        {
+            return Ok(false);
+        }
+        Ok(revision(&conn)? != snapshot.revision)
+    }
+
+    /// Count a write of the dataset's state; call it in the transaction that
+    /// makes the write.  Returns the revision it replaces.
+    pub fn bump_revision(&self) -> Result<i64> {
+        let previous = self
+            .conn
+            .lock()
+            .prepare_cached(
+                "UPDATE dataset_meta SET revision = revision + 1 WHERE id = 1 \
+                 RETURNING revision - 1",
+            )?
+            .query_row([], |row| row.get(0))
+            .optional()?;
+        Ok(previous.unwrap_or_default())
     }
 
     // ── dataset_meta ──────────────────────────────────────────
 
     pub fn init_dataset(&self, day_0: &str, version: i32) -> Result<()> {
-        self.conn.execute(
-            "INSERT OR IGNORE INTO dataset_meta (id, day_0, pushed, version) VALUES (1, ?1, 0, ?2)",
-            params![day_0, version],
-        )?;
+        self.conn
+            .lock()
+            .prepare_cached(
+                "INSERT OR IGNORE INTO dataset_meta (id, day_0, pushed, version) VALUES (1, ?1, 0, ?2)",
+            )?
+            .execute(params![day_0, version])?;
         Ok(())
     }
 
     pub fn get_dataset_meta(&self) -> Result<DatasetMeta> {
-        let meta = self.conn.query_row(
+        let conn = self.conn.lock();
+        let mut stmt = conn.prepare_cached(
             "SELECT day_0, pushed, version, last_country, last_region, last_site \
              FROM dataset_meta WHERE id = 1",
-            [],
-            |row| {
-                Ok(DatasetMeta {
-                    day_0: row.get(0)?,
-                    pushed: row.get::<_, i32>(1)? != 0,
-                    version: row.get(2)?,
-                    last_country: row.get(3)?,
-                    last_region: row.get(4)?,
-                    last_site: row.get(5)?,
-                })
-            },
         )?;
+        let meta = stmt.query_row([], |row| {
+            Ok(DatasetMeta {
+                day_0: row.get(0)?,
+                pushed: row.get::<_, i32>(1)? != 0,
+                version: row.get(2)?,
+                last_country: row.get(3)?,
+                last_region: row.get(4)?,
+                last_site: row.get(5)?,
+            })
+        })?;
         Ok(meta)
     }
 
     pub fn update_dataset_meta(&self, meta: &DatasetMeta) -> Result<()> {
-        self.conn.execute(
-            "UPDATE dataset_meta SET day_0=?1, pushed=?2, version=?3, \
-             last_country=?4, last_region=?5, last_site=?6 WHERE id=1",
-            params![
+        self.conn
+            .lock()
+            .prepare_cached(
+                "UPDATE dataset_meta SET day_0=?1, pushed=?2, version=?3, \
+                 last_country=?4, last_region=?5, last_site=?6 WHERE id=1",
+            )?
+            .execute(params![
                 meta.day_0,
                 meta.pushed as i32,
                 meta.version,
                 meta.last_country,
                 meta.last_region,
                 meta.last_site,
-            ],
-        )?;
+            ])?;
         Ok(())
     }
 
     // ── missions ──────────────────────────────────────────────
 
     pub fn insert_mission(&self, mission: &MissionRecord) -> Result<()> {
-        self.conn.execute(
-            "INSERT OR REPLACE INTO missions \
-             (name, path, timestamp, device, country, region, site, mission_name, properties, notes) \
-             VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9, ?10)",
-            params![
+        self.conn
+            .lock()
+            .prepare_cached(
+                "INSERT OR REPLACE INTO missions \
+                 (name, path, timestamp, device, country, region, site, mission_name, properties, notes, \
+                  prefix) \
+                 VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9, ?10, ?11)",
+            )?
+            .execute(params![
                 mission.name,
                 mission.path,
                 mission.metadata.timestamp,
@@ -169,13 +707,14 @@ impl DatasetDb {
                 mission.metadata.mission_name,
                 mission.metadata.properties,
                 mission.metadata.notes,
-            ],
-        )?;
+                mission_prefix(&mission.name),
+            ])?;
         Ok(())
     }
 
     pub fn get_missions(&self) -> Result<Vec<MissionRecord>> {
-        let mut stmt = self.conn.prepare(
+        let conn = self.conn.lock();
+        let mut stmt = conn.prepare_cached(
             "SELECT name, path, timestamp, device, country, region, site, mission_name, properties, notes \
              FROM missions",
         )?;
@@ -205,39 +744,47 @@ impl DatasetDb {
 
     // ── mission staged files ───────────────────────────────────
 
-    pub fn set_mission_staged_files(
-        &self,
-        mission_name: &str,
-        files: &[StagedFileRecord],
-    ) -> Result<()> {
-        let tx = self.conn.unchecked_transaction()?;
-        tx.execute(
-            "DELETE FROM mission_staged_files WHERE mission_name=?1",
-            params![mission_name],
+    /// The staged files of every mission, keyed by mission name, in one query.
+    pub fn get_all_mission_staged_files(&self) -> Result<HashMap<String, Vec<StagedFileRecord>>> {
+        let conn = self.conn.lock();
+        let mut stmt = conn.prepare_cached(
+            "SELECT mission_name, origin_path, target_path, hash, size \
+             FROM mission_staged_files ORDER BY id",
         )?;
-        for f in files {
-            tx.execute(
-                "INSERT OR IGNORE INTO mission_staged_files \
-                 (mission_name, origin_path, target_path, hash) VALUES (?1, ?2, ?3, ?4)",
-                params![mission_name, f.origin_path, f.target_path, f.hash],
-            )?;
+        let rows =
+            stmt.query_map([], |row| Ok((row.get::<_, String>(0)?, staged_file_row(row, 1)?)))?;
+        let mut files: HashMap<String, Vec<StagedFileRecord>> = HashMap::new();
+        for r in rows {
+            let (mission_name, file) = r?;
+            files.entry(mission_name).or_default().push(file);
         }
-        tx.commit()?;
-        Ok(())
+        Ok(files)
     }
 
-    pub fn get_mission_staged_files(&self, mission_name: &str) -> Result<Vec<StagedFileRecord>> {
-        let mut stmt = self.conn.prepare(
-            "SELECT origin_path, target_path, hash FROM mission_staged_files \
-             WHERE mission_name=?1",
+    /// Up to `limit` of a mission's staged files in staging order, skipping
+    /// `offset`; with `pattern`, only those whose target path below
+    /// `target_dir` matches that glob.
+    #[cfg(any(test, feature = "python"))]
+    pub fn find_mission_staged_files(
+        &self,
+        mission_name: &str,
+        target_dir: &str,
+        pattern: Option<&str>,
+        offset: usize,
+        limit: usize,
+    ) -> Result<Vec<StagedFileRecord>> {
+        let pattern = pattern
+            .map(|p| format!("{}{}{}", glob_escape(target_dir), std::path::MAIN_SEPARATOR, p));
+        let conn = self.conn.lock();
+        let mut stmt = conn.prepare_cached(
+            "SELECT origin_path, target_path, hash, size FROM mission_staged_files
+             WHERE mission_name=?1 AND (?2 IS NULL OR target_path GLOB ?2)
+             ORDER BY id LIMIT ?3 OFFSET ?4",
+        )?;
+        let rows = stmt.query_map(
+            params![mission_name, pattern, limit as i64, offset as i64],
+            |row| staged_file_row(row, 0),
         )?;
-        let rows = stmt.query_map(params![mission_name], |row| {
-            Ok(StagedFileRecord {
-                origin_path: row.get(0)?,
-                target_path: row.get(1)?,
-                hash: row.get(2)?,
-            })
-        })?;
         let mut files = Vec::new();
         for r in rows {
             files.push(r?);
@@ -245,12 +792,46 @@ impl DatasetDb {
         Ok(files)
     }
 
-    pub fn clear_mission_staged_files(&self, mission_name: &str) -> Result<()> {
-        self.conn.execute(
-            "DELETE FROM mission_staged_files WHERE mission_name=?1",
-            params![mission_name],
-        )?;
-        Ok(())
+    pub fn add_mission_staged_files<'a>(
+        &self,
+        mission_name: &str,
+        files: impl IntoIterator<Item = &'a StagedFileRecord>,
+    ) -> Result<()> {
+        self.transaction(|db| {
+            let conn = db.conn.lock();
+            let mut stmt = conn.prepare_cached(
+                "INSERT OR IGNORE INTO mission_staged_files \
+                 (mission_name, origin_path, target_path, hash, size) VALUES (?1, ?2, ?3, ?4, ?5)",
+            )?;
+            for f in files {
+                stmt.execute(params![
+                    mission_name,
+                    f.origin_path,
+                    f.target_path,
+                    f.hash,
+                    f.size as i64
+                ])?;
+            }
+            Ok(())
+        })
+    }
+
+    pub fn remove_mission_staged_files<'a>(
+        &self,
+        mission_name: &str,
+        files: impl IntoIterator<Item = &'a StagedFileRecord>,
+    ) -> Result<()> {
+        self.transaction(|db| {
+            let conn = db.conn.lock();
+            let mut stmt = conn.prepare_cached(
+                "DELETE FROM mission_staged_files \
+                 WHERE mission_name=?1 AND origin_path=?2 AND target_path=?3",
+            )?;
+            for f in files {
+                stmt.execute(params![mission_name, f.origin_path, f.target_path])?;
+            }
+            Ok(())
+        })
     }
 
     // ── mission committed files ────────────────────────────────
@@ -260,20 +841,22 @@ impl DatasetDb {
         mission_name: &str,
         files: &[String],
     ) -> Result<()> {
-        let tx = self.conn.unchecked_transaction()?;
-        for f in files {
-            tx.execute(
+        self.transaction(|db| {
+            let conn = db.conn.lock();
+            let mut stmt = conn.prepare_cached(
                 "INSERT OR IGNORE INTO mission_committed_files (mission_name, path) VALUES (?1, ?2)",
-                params![mission_name, f],
             )?;
-        }
-        tx.commit()?;
-        Ok(())
+            for f in files {
+                stmt.execute(params![mission_name, f])?;
+            }
+            Ok(())
+        })
     }
 
     pub fn get_mission_committed_files(&self, mission_name: &str) -> Result<Vec<String>> {
-        let mut stmt = self.conn.prepare(
-            "SELECT path FROM mission_committed_files WHERE mission_name=?1",
+        let conn = self.conn.lock();
+        let mut stmt = conn.prepare_cached(
+            "SELECT path FROM mission_committed_files WHERE mission_name=?1 ORDER BY id",
         )?;
         let rows = stmt.query_map(params![mission_name], |row| row.get(0))?;
         let mut files = Vec::new();
@@ -283,38 +866,58 @@ impl DatasetDb {
         Ok(files)
     }
 
-    pub fn delete_mission(&self, mission_name: &str) -> Result<()> {
-        let tx = self.conn.unchecked_transaction()?;
-        tx.execute("DELETE FROM missions WHERE name=?1", params![mission_name])?;
-        tx.execute(
-            "DELETE FROM mission_staged_files WHERE mission_name=?1",
-            params![mission_name],
+    /// The committed files of every mission, keyed by mission name, in one query.
+    pub fn get_all_mission_committed_files(&self) -> Result<HashMap<String, Vec<String>>> {
+        let conn = self.conn.lock();
+        let mut stmt = conn.prepare_cached(
+            "SELECT mission_name, path FROM mission_committed_files ORDER BY id",
         )?;
-        tx.execute(
-            "DELETE FROM mission_committed_files WHERE mission_name=?1",
-            params![mission_name],
-        )?;
-        tx.commit()?;
-        Ok(())
+        let rows = stmt.query_map([], |row| Ok((row.get::<_, String>(0)?, row.get(1)?)))?;
+        let mut files: HashMap<String, Vec<String>> = HashMap::new();
+        for r in rows {
+            let (mission_name, path) = r?;
+            files.entry(mission_name).or_default().push(path);
+        }
+        Ok(files)
     }
 
-    // ── dataset staged files ───────────────────────────────────
-
-    pub fn set_dataset_staged_files(&self, files: &[String]) -> Result<()> {
-        let tx = self.conn.unchecked_transaction()?;
-        tx.execute("DELETE FROM dataset_staged_files", [])?;
-        for f in files {
-            tx.execute(
-                "INSERT OR IGNORE INTO dataset_staged_files (path) VALUES (?1)",
-                params![f],
-            )?;
+    /// How many files each mission has committed, keyed by mission name.
+    pub fn count_mission_committed_files(&self) -> Result<HashMap<String, usize>> {
+        let conn = self.conn.lock();
+        let mut stmt = conn.prepare_cached(
+            "SELECT mission_name, COUNT(*) FROM mission_committed_files GROUP BY mission_name",
+        )?;
+        let rows = stmt.query_map([], |row| {
+            Ok((row.get::<_, String>(0)?, row.get::<_, i64>(1)? as usize))
+        })?;
+        let mut counts = HashMap::new();
+        for r in rows {
+            let (mission_name, count) = r?;
+            counts.insert(mission_name, count);
         }
-        tx.commit()?;
-        Ok(())
+        Ok(counts)
     }
 
+    pub fn delete_mission(&self, mission_name: &str) -> Result<()> {
+        self.transaction(|db| {
+            let conn = db.conn.lock();
+            // The mission goes last, so the `file_stats` triggers of its
+            // staged files still find it.
+            conn.prepare_cached("DELETE FROM mission_staged_files WHERE mission_name=?1")?
+                .execute(params![mission_name])?;
+            conn.prepare_cached("DELETE FROM mission_committed_files WHERE mission_name=?1")?
+                .execute(params![mission_name])?;
+            conn.prepare_cached("DELETE FROM missions WHERE name=?1")?
+                .execute(params![mission_name])?;
+            Ok(())
+        })
+    }
+
+    // ── dataset staged files ───────────────────────────────────
+
     pub fn get_dataset_staged_files(&self) -> Result<Vec<String>> {
-        let mut stmt = self.conn.prepare("SELECT path FROM dataset_staged_files")?;
+        let conn = self.conn.lock();
+        let mut stmt = conn.prepare_cached("SELECT path FROM dataset_staged_files")?;
         let rows = stmt.query_map([], |row| row.get(0))?;
         let mut files = Vec::new();
         for r in rows {
@@ -323,27 +926,52 @@ impl DatasetDb {
         Ok(files)
     }
 
-    pub fn clear_dataset_staged_files(&self) -> Result<()> {
-        self.conn.execute("DELETE FROM dataset_staged_files", [])?;
-        Ok(())
+    pub fn add_dataset_staged_files<'a>(
+        &self,
+        files: impl IntoIterator<Item = &'a String>,
+    ) -> Result<()> {
+        self.transaction(|db| {
+            let conn = db.conn.lock();
+            let mut stmt =
+                conn.prepare_cached("INSERT OR IGNORE INTO dataset_staged_files (path) VALUES (?1)")?;
+            for f in files {
+                stmt.execute(params![f])?;
+            }
+            Ok(())
+        })
+    }
+
+    pub fn remove_dataset_staged_files<'a>(
+        &self,
+        files: impl IntoIterator<Item = &'a String>,
+    ) -> Result<()> {
+        self.transaction(|db| {
+            let conn = db.conn.lock();
+            let mut stmt = conn.prepare_cached("DELETE FROM dataset_staged_files WHERE path=?1")?;
+            for f in files {
+                stmt.execute(params![f])?;
+            }
+            Ok(())
+        })
     }
 
     // ── dataset committed files ────────────────────────────────
 
     pub fn add_dataset_committed_files(&self, files: &[String]) -> Result<()> {
-        let tx = self.conn.unchecked_transaction()?;
-        for f in files {
-            tx.execute(
-                "INSERT OR IGNORE INTO dataset_committed_files (path) VALUES (?1)",
-                params![f],
-            )?;
-        }
-        tx.commit()?;
-        Ok(())
+        self.transaction(|db| {
+            let conn = db.conn.lock();
+            let mut stmt = conn
+                .prepare_cached("INSERT OR IGNORE INTO dataset_committed_files (path) VALUES (?1)")?;
+            for f in files {
+                stmt.execute(params![f])?;
+            }
+            Ok(())
+        })
     }
 
     pub fn get_dataset_committed_files(&self) -> Result<Vec<String>> {
-        let mut stmt = self.conn.prepare("SELECT path FROM dataset_committed_files")?;
+        let conn = self.conn.lock();
+        let mut stmt = conn.prepare_cached("SELECT path FROM dataset_committed_files")?;
         let rows = stmt.query_map([], |row| row.get(0))?;
         let mut files = Vec::new();
         for r in rows {
@@ -351,13 +979,345 @@ impl DatasetDb {
         }
         Ok(files)
     }
+
+    // ── manifest ───────────────────────────────────────────────
+
+    /// Every manifest entry, keyed by posix path relative to the dataset root.
+    pub fn get_manifest(&self) -> Result<ManifestData> {
+        let conn = self.conn.lock();
+        let mut stmt = conn.prepare_cached("SELECT path, sha256, size FROM manifest")?;
+        let rows = stmt.query_map([], manifest_row)?;
+        let mut entries = ManifestData::new();
+        for r in rows {
+            let (path, entry) = r?;
+            entries.insert(path, entry);
+        }
+        Ok(entries)
+    }
+
+    pub fn get_manifest_entry(&self, path: &str) -> Result<Option<ManifestEntry>> {
+        let entry = self
+            .conn
+            .lock()
+            .prepare_cached("SELECT path, sha256, size FROM manifest WHERE path=?1")?
+            .query_row(params![path], manifest_row)
+            .optional()?;
+        Ok(entry.map(|(_, entry)| entry))
+    }
+
+    /// Insert or replace manifest entries.  Entries are updated in place rather
+    /// than replaced, so the `file_stats` triggers see the change in size.
+    pub fn upsert_manifest_entries<'a, I>(&self, entries: I) -> Result<()>
+    where
+        I: IntoIterator<Item = (&'a String, &'a ManifestEntry)>,
+    {
+        self.transaction(|db| {
+            let conn = db.conn.lock();
+            let mut stmt = conn.prepare_cached(
+                "INSERT INTO manifest (path, sha256, size) VALUES (?1, ?2, ?3) \
+                 ON CONFLICT (path) DO UPDATE SET sha256=excluded.sha256, size=excluded.size",
+            )?;
+            for (path, entry) in entries {
+                stmt.execute(params![path, entry.sha256sum, entry.size as i64])?;
+            }
+            Ok(())
+        })
+    }
+
+    /// Delete every manifest entry under the directory `dir` (a posix path
+    /// relative to the dataset root) and return how many there were.
+    pub fn delete_manifest_dir(&self, dir: &str) -> Result<usize> {
+        let deleted = self
+            .conn
+            .lock()
+            .prepare_cached("DELETE FROM manifest WHERE path >= ?1 AND path < ?2")?
+            .execute(dir_range(dir))?;
+        Ok(deleted)
+    }
+
+    /// The manifest entries under the directory `dir`, found by the same range
+    /// as `delete_manifest_dir`.
+    pub fn get_manifest_dir(&self, dir: &str) -> Result<ManifestData> {
+        let conn = self.conn.lock();
+        let mut stmt = conn
+            .prepare_cached("SELECT path, sha256, size FROM manifest WHERE path >= ?1 AND path < ?2")?;
+        let rows = stmt.query_map(dir_range(dir), manifest_row)?;
+        let mut entries = ManifestData::new();
+        for r in rows {
+            let (path, entry) = r?;
+            entries.insert(path, entry);
+        }
+        Ok(entries)
+    }
+
+    /// The distinct hashes of the manifest entries of `size` bytes.
+    #[cfg(any(test, feature = "python"))]
+    pub fn get_manifest_hashes_of_size(&self, size: u64) -> Result<HashSet<String>> {
+        let conn = self.conn.lock();
+        let mut stmt = conn.prepare_cached("SELECT DISTINCT sha256 FROM manifest WHERE size=?1")?;
+        let hashes = stmt
+            .query_map(params![size as i64], |row| row.get(0))?
+            .collect::<rusqlite::Result<_>>()?;
+        Ok(hashes)
+    }
+
+    /// Up to `limit` manifest entries after the path `after`, in path order,
+    /// under the directory `dir` or in the whole manifest; for reading it a
+    /// page at a time.
+    #[cfg(any(test, feature = "python"))]
+    pub fn get_manifest_page(
+        &self,
+        dir: Option<&str>,
+        after: &str,
+        limit: usize,
+    ) -> Result<Vec<(String, ManifestEntry)>> {
+        let conn = self.conn.lock();
+        let mut entries = Vec::new();
+        match dir {
+            None => {
+                let mut stmt = conn.prepare_cached(
+                    "SELECT path, sha256, size FROM manifest WHERE path > ?1 ORDER BY path LIMIT ?2",
+                )?;
+                for r in stmt.query_map(params![after, limit as i64], manifest_row)? {
+                    entries.push(r?);
+                }
+            }
+            Some(dir) => {
+                let (lower, upper) = dir_range(dir);
+                let mut stmt = conn.prepare_cached(
+                    "SELECT path, sha256, size FROM manifest
+                     WHERE path > ?1 AND path >= ?2 AND path < ?3 ORDER BY path LIMIT ?4",
+                )?;
+                for r in stmt.query_map(params![after, lower, upper, limit as i64], manifest_row)? {
+                    entries.push(r?);
+                }
+            }
+        }
+        Ok(entries)
+    }
+
+    /// The number of manifest entries under the directory `dir`, or in the
+    /// whole manifest, and their total size in bytes.
+    #[cfg(any(test, feature = "python"))]
+    pub fn manifest_stats(&self, dir: Option<&str>) -> Result<(usize, u64)> {
+        let conn = self.conn.lock();
+        let stats = match dir {
+            None => conn
+                .prepare_cached("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM manifest")?
+                .query_row([], manifest_stats_row)?,
+            Some(dir) => conn
+                .prepare_cached(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM manifest
+                     WHERE path >= ?1 AND path < ?2",
+                )?
+                .query_row(dir_range(dir), manifest_stats_row)?,
+        };
+        Ok(stats)
+    }
+
+    /// Up to `limit` manifest entries under the directory `dir` whose path
+    /// below it matches the glob `pattern`, in path order, skipping `offset`.
+    #[cfg(any(test, feature = "python"))]
+    pub fn find_manifest_entries(
+        &self,
+        dir: &str,
+        pattern: Option<&str>,
+        offset: usize,
+        limit: usize,
+    ) -> Result<Vec<(String, ManifestEntry)>> {
+        let (lower, upper) = dir_range(dir);
+        let pattern = pattern.map(|p| format!("{}{}", glob_escape(&lower), p));
+        let conn = self.conn.lock();
+        let mut stmt = conn.prepare_cached(
+            "SELECT path, sha256, size FROM manifest
+             WHERE path >= ?1 AND path < ?2 AND (?3 IS NULL OR path GLOB ?3)
+             ORDER BY path LIMIT ?4 OFFSET ?5",
+        )?;
+        let rows = stmt.query_map(
+            params![lower, upper, pattern, limit as i64, offset as i64],
+            manifest_row,
+        )?;
+        let mut entries = Vec::new();
+        for r in rows {
+            entries.push(r?);
+        }
+        Ok(entries)
+    }
+
+    // ── file stats ─────────────────────────────────────────────
+
+    /// The files and bytes each mission has staged, committed and pushed to
+    /// each destination, as kept by the `file_stats` triggers.  Files outside
+    /// every mission are counted under the mission ''.
+    #[cfg(any(test, feature = "python"))]
+    pub fn file_stats(&self) -> Result<Vec<FileStats>> {
+        let conn = self.conn.lock();
+        let mut stmt = conn.prepare_cached(
+            "SELECT mission, state, destination, files, bytes FROM file_stats
+             WHERE files != 0 ORDER BY mission, state, destination",
+        )?;
+        let rows = stmt.query_map([], |row| {
+            Ok(FileStats {
+                mission: row.get(0)?,
+                state: row.get(1)?,
+                destination: row.get(2)?,
+                files: row.get::<_, i64>(3)? as u64,
+                bytes: row.get::<_, i64>(4)? as u64,
+            })
+        })?;
+        let mut stats = Vec::new();
+        for r in rows {
+            stats.push(r?);
+        }
+        Ok(stats)
+    }
+
+    /// Write the manifest to `path` as `manifest.json`, sorted by path, one
+    /// entry at a time, and return its entries.  The file is replaced atomically.
+    pub fn export_manifest(&self, path: &Path) -> Result<ManifestData> {
+        let conn = self.conn.lock();
+        let mut stmt =
+            conn.prepare_cached("SELECT path, sha256, size FROM manifest ORDER BY path")?;
+        let mut entries = ManifestData::new();
+        let rows = stmt.query_map([], manifest_row)?.map(|row| -> Result<_> {
+            let (path, entry) = row?;
+            entries.insert(path.clone(), entry.clone());
+            Ok((path, entry))
+        });
+        let tmp = manifest::temp_path_for(path);
+        let result = (|| -> Result<()> {
+            let mut out = BufWriter::new(File::create(&tmp)?);
+            manifest::write_manifest_entries(&mut out, rows)?;
+            out.flush()?;
+            drop(out);
+            std::fs::rename(&tmp, path)?;
+            Ok(())
+        })();
+        if result.is_err() {
+            let _ = std::fs::remove_file(&tmp);
+        }
+        result?;
+        Ok(entries)
+    }
+
+    // ── push ledger ────────────────────────────────────────────
+
+    /// Returns the ledger for `destination`, or None if nothing was pushed there.
+    pub fn get_push_ledger(&self, destination: &str) -> Result<Option<PushLedger>> {
+        let conn = self.conn.lock();
+        let manifest_sha256: Option<String> = conn
+            .prepare_cached("SELECT manifest_sha256 FROM push_destinations WHERE destination=?1")?
+            .query_row(params![destination], |row| row.get(0))
+            .optional()?;
+        let manifest_sha256 = match manifest_sha256 {
+            Some(h) => h,
+            None => return Ok(None),
+        };
+        let mut stmt = conn.prepare_cached(
+            "SELECT path, sha256, size FROM push_ledger WHERE destination=?1",
+        )?;
+        let rows = stmt.query_map(params![destination], |row| {
+            Ok((
+                row.get::<_, String>(0)?,
+                ManifestEntry { sha256sum: row.get(1)?, size: row.get::<_, i64>(2)? as u64 },
+            ))
+        })?;
+        let mut entries = ManifestData::new();
+        for r in rows {
+            let (path, entry) = r?;
+            entries.insert(path, entry);
+        }
+        Ok(Some(PushLedger { manifest_sha256, entries }))
+    }
+
+    /// Record a completed push.  With `replace`, the ledger for `destination` becomes
+    /// exactly `entries`; otherwise `entries` are upserted into the existing ledger.
+    pub fn record_push<'a, I>(
+        &self,
+        destination: &str,
+        manifest_sha256: &str,
+        entries: I,
+        replace: bool,
+    ) -> Result<()>
+    where
+        I: IntoIterator<Item = (&'a String, &'a ManifestEntry)>,
+    {
+        self.transaction(|db| {
+            let conn = db.conn.lock();
+            if replace {
+                conn.prepare_cached("DELETE FROM push_ledger WHERE destination=?1")?
+                    .execute(params![destination])?;
+            }
+            let mut stmt = conn.prepare_cached(
+                "INSERT INTO push_ledger (destination, path, sha256, size)
+                 VALUES (?1, ?2, ?3, ?4)
+                 ON CONFLICT (destination, path) DO UPDATE
+                 SET sha256=excluded.sha256, size=excluded.size",
+            )?;
+            for (path, entry) in entries {
+                stmt.execute(params![destination, path, entry.sha256sum, entry.size as i64])?;
+            }
+            conn.prepare_cached(
+                "INSERT OR REPLACE INTO push_destinations (destination, manifest_sha256) VALUES (?1, ?2)",
+            )?
+            .execute(params![destination, manifest_sha256])?;
+            Ok(())
+        })
+    }
+}
+
+/// A `StagedFileRecord` from the columns `origin_path, target_path, hash, size`
+/// starting at `first`.
+fn staged_file_row(row: &rusqlite::Row, first: usize) -> rusqlite::Result<StagedFileRecord> {
+    Ok(StagedFileRecord {
+        origin_path: row.get(first)?,
+        target_path: row.get(first + 1)?,
+        hash: row.get(first + 2)?,
+        size: row.get::<_, i64>(first + 3)? as u64,
+    })
+}
+
+fn manifest_row(row: &rusqlite::Row) -> rusqlite::Result<(String, ManifestEntry)> {
+    Ok((
+        row.get(0)?,
+        ManifestEntry { sha256sum: row.get(1)?, size: row.get::<_, i64>(2)? as u64 },
+    ))
+}
+
+#[cfg(any(test, feature = "python"))]
+fn manifest_stats_row(row: &rusqlite::Row) -> rusqlite::Result<(usize, u64)> {
+    Ok((row.get::<_, i64>(0)? as usize, row.get::<_, i64>(1)? as u64))
+}
+
+/// The bounds of the manifest paths under the directory `dir`.  They sort from
+/// `dir/` up to `dir0`, '0' being the character after '/', so a range on the
+/// primary key finds them directly.
+fn dir_range(dir: &str) -> (String, String) {
+    (format!("{}/", dir), format!("{}0", dir))
+}
+
+/// `text` as a GLOB pattern matching only itself.
+#[cfg(any(test, feature = "python"))]
+fn glob_escape(text: &str) -> String {
+    let mut escaped = String::with_capacity(text.len());
+    for c in text.chars() {
+        match c {
+            '*' | '?' | '[' => {
+                escaped.push('[');
+                escaped.push(c);
+                escaped.push(']');
+            }
+            _ => escaped.push(c),
+        }
+    }
+    escaped
 }
 
 // ─────────────────────────────────────────────────────────────
 // ManagerDb  –  config.db in the app config dir
 // ─────────────────────────────────────────────────────────────
 
-#[derive(Clone, Debug)]
+#[derive(Clone, Debug, PartialEq)]
 pub struct DatasetInfo {
     pub name: String,
     pub root_path: String,
@@ -368,41 +1328,190 @@ pub struct DatasetInfo {
     pub day_0: Option<String>,
 }
 
+/// A registered dataset as `config.db` describes it.  The counts are `None`
+/// until the dataset has been catalogued and `last_validated` (UTC, ISO 8601)
+/// until it first passes validation.
+#[derive(Clone, Debug)]
+#[cfg(any(test, feature = "python"))]
+pub struct DatasetSummary {
+    pub info: DatasetInfo,
+    pub mission_count: Option<u64>,
+    pub file_count: Option<u64>,
+    pub total_bytes: Option<u64>,
+    pub last_validated: Option<String>,
+    /// `None` until the dataset has been catalogued.
+    pub missions: Option<MissionAggregates>,
+}
+
+/// The distinct metadata values across a dataset's missions.
+#[derive(Clone, Debug, Default, PartialEq)]
+#[cfg(any(test, feature = "python"))]
+pub struct MissionAggregates {
+    pub sites: BTreeSet<String>,
+    pub devices: BTreeSet<String>,
+    pub countries: BTreeSet<String>,
+    pub regions: BTreeSet<String>,
+}
+
+/// Conditions on the catalog; every one that is set must hold.
+///
+/// `start` and `end` bound the mission timestamp inclusively: a bare date
+/// (`YYYY-MM-DD`) is compared with the mission's local date, anything else
+/// with its time in UTC.  `properties` values are compared with the mission's
+/// JSON properties as text.  `sha256` and `path` (a GLOB pattern) select
+/// files; for missions they select those holding a matching file.
+#[derive(Clone, Debug, Default)]
+#[cfg(any(test, feature = "python"))]
+pub struct CatalogFilter {
+    pub dataset: Option<String>,
+    pub site: Option<String>,
+    pub device: Option<String>,
+    pub country: Option<String>,
+    pub region: Option<String>,
+    pub start: Option<String>,
+    pub end: Option<String>,
+    pub properties: Vec<(String, String)>,
+    pub sha256: Option<String>,
+    pub path: Option<String>,
+}
+
+#[derive(Clone, Debug, PartialEq)]
+#[cfg(any(test, feature = "python"))]
+pub struct CatalogMission {
+    pub dataset: String,
+    pub record: MissionRecord,
+}
+
+#[derive(Clone, Debug)]
+#[cfg(any(test, feature = "python"))]
+pub struct CatalogFile {
+    pub dataset: String,
+    /// The mission whose directory holds the file, if any.
+    pub mission: Option<String>,
+    /// Posix path relative to the dataset root.
+    pub path: String,
+    pub entry: ManifestEntry,
+}
+
 pub struct ManagerDb {
-    conn: Connection,
+    conn: SharedConnection,
 }
 
+const MANAGER_MIGRATIONS: &[Migration] = &[
+    // 1: the original schema.
+    Migration::Sql("
+        CREATE TABLE IF NOT EXISTS config (
+            key     TEXT PRIMARY KEY,
+            value   TEXT NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS datasets (
+            name            TEXT PRIMARY KEY,
+            root_path       TEXT NOT NULL,
+            pushed          INTEGER NOT NULL DEFAULT 0,
+            last_country    TEXT,
+            last_region     TEXT,
+            last_site       TEXT,
+            day_0           TEXT
+        );
+    "),
+    // 2: the catalog of missions and manifest entries across datasets.  `day`
+    // is the mission's local date and `utc` its timestamp in UTC, as SQLite
+    // `datetime()` text; files outside any mission have a NULL `mission`.
+    Migration::Sql("
+        CREATE TABLE catalog_datasets (
+            dataset         TEXT PRIMARY KEY
+        ) WITHOUT ROWID;
+
+        CREATE TABLE catalog_missions (
+            dataset         TEXT NOT NULL,
+            name            TEXT NOT NULL,
+            path            TEXT NOT NULL,
+            timestamp       TEXT NOT NULL,
+            day             TEXT NOT NULL,
+            utc             TEXT,
+            device          TEXT NOT NULL,
+            country         TEXT NOT NULL,
+            region          TEXT NOT NULL,
+            site            TEXT NOT NULL,
+            mission_name    TEXT NOT NULL,
+            properties      TEXT NOT NULL DEFAULT '{}',
+            notes           TEXT NOT NULL DEFAULT '',
+            PRIMARY KEY (dataset, name)
+        );
+        CREATE INDEX catalog_missions_site ON catalog_missions (site, device, day);
+        CREATE INDEX catalog_missions_device ON catalog_missions (device, day);
+        CREATE INDEX catalog_missions_place ON catalog_missions (country, region, site);
+        CREATE INDEX catalog_missions_day ON catalog_missions (day);
+        CREATE INDEX catalog_missions_utc ON catalog_missions (utc);
+
+        CREATE TABLE catalog_files (
+            dataset         TEXT NOT NULL,
+            path            TEXT NOT NULL,
+            mission         TEXT,
+            sha256          TEXT NOT NULL,
+            size            INTEGER NOT NULL,
+            PRIMARY KEY (dataset, path)
+        ) WITHOUT ROWID;
+        CREATE INDEX catalog_files_mission ON catalog_files (dataset, mission);
+        CREATE INDEX catalog_files_sha256 ON catalog_files (sha256);
+    "),
+    // 3: per-dataset summaries for listing without opening each dataset; NULL
+    // until the dataset has been catalogued or validated.
+    Migration::Sql("
+        ALTER TABLE datasets ADD COLUMN mission_count INTEGER;
+        ALTER TABLE datasets ADD COLUMN file_count INTEGER;
+        ALTER TABLE datasets ADD COLUMN total_bytes INTEGER;
+        ALTER TABLE datasets ADD COLUMN last_validated TEXT;
+    "),
+    // 4: triggers keep the summary counts as the catalog changes.  The counts
+    // stay NULL, and NULL plus anything stays NULL, until the first full
+    // catalog of the dataset sets them.
+    Migration::Sql("
+        UPDATE datasets SET
+            mission_count = (SELECT COUNT(*) FROM catalog_missions WHERE dataset = name),
+            file_count = (SELECT COUNT(*) FROM catalog_files WHERE dataset = name),
+            total_bytes = (SELECT COALESCE(SUM(size), 0) FROM catalog_files WHERE dataset = name)
+        WHERE name IN (SELECT dataset FROM catalog_datasets);
+
+        CREATE TRIGGER catalog_missions_insert AFTER INSERT ON catalog_missions
+        BEGIN
+            UPDATE datasets SET mission_count = mission_count + 1 WHERE name = NEW.dataset;
+        END;
+        CREATE TRIGGER catalog_missions_delete AFTER DELETE ON catalog_missions
+        BEGIN
+            UPDATE datasets SET mission_count = mission_count - 1 WHERE name = OLD.dataset;
+        END;
+        CREATE TRIGGER catalog_files_insert AFTER INSERT ON catalog_files
+        BEGIN
+            UPDATE datasets SET file_count = file_count + 1, total_bytes = total_bytes + NEW.size
+             WHERE name = NEW.dataset;
+        END;
+        CREATE TRIGGER catalog_files_update AFTER UPDATE OF size ON catalog_files
+        BEGIN
+            UPDATE datasets SET total_bytes = total_bytes + NEW.size - OLD.size
+             WHERE name = NEW.dataset;
+        END;
+        CREATE TRIGGER catalog_files_delete AFTER DELETE ON catalog_files
+        BEGIN
+            UPDATE datasets SET file_count = file_count - 1, total_bytes = total_bytes - OLD.size
+             WHERE name = OLD.dataset;
+        END;
+    "),
+];
+
 impl ManagerDb {
     /// Opens `config.db` in `config_dir`, creating tables if they don't exist.
+    /// The connection is shared with every other handle on the same database.
     pub fn open(config_dir: &Path) -> Result<Self> {
         std::fs::create_dir_all(config_dir)?;
-        let db_path = config_dir.join("config.db");
-        let conn = Connection::open(&db_path)?;
-        let db = ManagerDb { conn };
-        db.create_tables()?;
-        Ok(db)
-    }
-
-    fn create_tables(&self) -> Result<()> {
-        self.conn.execute_batch("
-            PRAGMA journal_mode=WAL;
-
-            CREATE TABLE IF NOT EXISTS config (
-                key     TEXT PRIMARY KEY,
-                value   TEXT NOT NULL
-            );
-
-            CREATE TABLE IF NOT EXISTS datasets (
-                name            TEXT PRIMARY KEY,
-                root_path       TEXT NOT NULL,
-                pushed          INTEGER NOT NULL DEFAULT 0,
-                last_country    TEXT,
-                last_region     TEXT,
-                last_site       TEXT,
-                day_0           TEXT
-            );
-        ")?;
-        Ok(())
+        let conn = shared_connection(&config_dir.join(MANAGER_DB_NAME), MANAGER_MIGRATIONS)?;
+        Ok(ManagerDb { conn })
+    }
+
+    /// Run `f` in one transaction, committed only if it succeeds.
+    pub fn transaction<T>(&self, f: impl FnOnce(&Self) -> Result<T>) -> Result<T> {
+        in_transaction(&self.conn, || f(self))
     }
 
     // ── config key/value ───────────────────────────────────────
@@ -410,27 +1519,26 @@ impl ManagerDb {
     pub fn get_config(&self, key: &str) -> Result<Option<String>> {
         let val = self
             .conn
-            .query_row(
-                "SELECT value FROM config WHERE key=?1",
-                params![key],
-                |row| row.get(0),
-            )
+            .lock()
+            .prepare_cached("SELECT value FROM config WHERE key=?1")?
+            .query_row(params![key], |row| row.get(0))
             .optional()?;
         Ok(val)
     }
 
     pub fn set_config(&self, key: &str, value: &str) -> Result<()> {
-        self.conn.execute(
-            "INSERT OR REPLACE INTO config (key, value) VALUES (?1, ?2)",
-            params![key, value],
-        )?;
+        self.conn
+            .lock()
+            .prepare_cached("INSERT OR REPLACE INTO config (key, value) VALUES (?1, ?2)")?
+            .execute(params![key, value])?;
         Ok(())
     }
 
     // ── datasets ──────────────────────────────────────────────
 
     pub fn get_all_datasets(&self) -> Result<Vec<DatasetInfo>> {
-        let mut stmt = self.conn.prepare(
+        let conn = self.conn.lock();
+        let mut stmt = conn.prepare_cached(
             "SELECT name, root_path, pushed, last_country, last_region, last_site, day_0 \
              FROM datasets",
         )?;
@@ -445,35 +1553,365 @@ impl ManagerDb {
                 day_0: row.get(6)?,
             })
         })?;
-        let mut infos = Vec::new();
+        let mut infos = Vec::new();
+        for r in rows {
+            infos.push(r?);
+        }
+        Ok(infos)
+    }
+
+    pub fn upsert_dataset(&self, info: &DatasetInfo) -> Result<()> {
+        self.conn
+            .lock()
+            .prepare_cached(
+                "INSERT INTO datasets \
+                 (name, root_path, pushed, last_country, last_region, last_site, day_0) \
+                 VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7) \
+                 ON CONFLICT (name) DO UPDATE SET root_path=excluded.root_path, \
+                 pushed=excluded.pushed, last_country=excluded.last_country, \
+                 last_region=excluded.last_region, last_site=excluded.last_site, \
+                 day_0=excluded.day_0",
+            )?
+            .execute(params![
+                info.name,
+                info.root_path,
+                info.pushed as i32,
+                info.last_country,
+                info.last_region,
+                info.last_site,
+                info.day_0,
+            ])?;
+        Ok(())
+    }
+
+    pub fn remove_dataset(&self, name: &str) -> Result<()> {
+        self.conn
+            .lock()
+            .prepare_cached("DELETE FROM datasets WHERE name=?1")?
+            .execute(params![name])?;
+        Ok(())
+    }
+
+    // ── dataset summaries ─────────────────────────────────────
+
+    /// Every registered dataset with its summary, read from `config.db` alone.
+    #[cfg(any(test, feature = "python"))]
+    pub fn get_dataset_summaries(&self) -> Result<Vec<DatasetSummary>> {
+        let catalogued = self.get_catalog_datasets()?;
+        let conn = self.conn.lock();
+        let mut aggregates: HashMap<String, [BTreeSet<String>; 4]> = HashMap::new();
+        let mut stmt =
+            conn.prepare_cached("SELECT dataset, site, device, country, region FROM catalog_missions")?;
+        let rows = stmt.query_map([], |row| {
+            let values: [String; 4] = [row.get(1)?, row.get(2)?, row.get(3)?, row.get(4)?];
+            Ok((row.get::<_, String>(0)?, values))
+        })?;
+        for r in rows {
+            let (dataset, values) = r?;
+            let sets = aggregates.entry(dataset).or_default();
+            for (set, value) in sets.iter_mut().zip(values) {
+                set.insert(value);
+            }
+        }
+        let mut stmt = conn.prepare_cached(
+            "SELECT name, root_path, pushed, last_country, last_region, last_site, day_0, \
+             mission_count, file_count, total_bytes, last_validated FROM datasets",
+        )?;
+        let rows = stmt.query_map([], |row| {
+            Ok(DatasetSummary {
+                info: DatasetInfo {
+                    name: row.get(0)?,
+                    root_path: row.get(1)?,
+                    pushed: row.get::<_, i32>(2)? != 0,
+                    last_country: row.get(3)?,
+                    last_region: row.get(4)?,
+                    last_site: row.get(5)?,
+                    day_0: row.get(6)?,
+                },
+                mission_count: row.get::<_, Option<i64>>(7)?.map(|n| n as u64),
+                file_count: row.get::<_, Option<i64>>(8)?.map(|n| n as u64),
+                total_bytes: row.get::<_, Option<i64>>(9)?.map(|n| n as u64),
+                last_validated: row.get(10)?,
+                missions: None,
+            })
+        })?;
+        let mut summaries = Vec::new();
+        for r in rows {
+            let mut summary = r?;
+            if catalogued.contains(&summary.info.name) {
+                let [sites, devices, countries, regions] =
+                    aggregates.remove(&summary.info.name).unwrap_or_default();
+                summary.missions = Some(MissionAggregates { sites, devices, countries, regions });
+            }
+            summaries.push(summary);
+        }
+        Ok(summaries)
+    }
+
+    /// Zero the missions, files and bytes of `dataset`, so that the catalog
+    /// triggers count what is catalogued from now on.  For a dataset whose
+    /// catalog is empty, before it is catalogued in full.
+    pub fn reset_dataset_summary(&self, dataset: &str) -> Result<()> {
+        self.conn
+            .lock()
+            .prepare_cached(
+                "UPDATE datasets SET mission_count = 0, file_count = 0, total_bytes = 0 \
+                 WHERE name=?1",
+            )?
+            .execute(params![dataset])?;
+        Ok(())
+    }
+
+    /// Record that `dataset` passed validation just now.
+    pub fn mark_dataset_validated(&self, dataset: &str) -> Result<()> {
+        self.conn
+            .lock()
+            .prepare_cached(
+                "UPDATE datasets SET last_validated = strftime('%Y-%m-%dT%H:%M:%SZ', 'now') \
+                 WHERE name=?1",
+            )?
+            .execute(params![dataset])?;
+        Ok(())
+    }
+
+    // ── catalog ───────────────────────────────────────────────
+
+    /// Names of the datasets the catalog has indexed in full.
+    #[cfg(any(test, feature = "python"))]
+    pub fn get_catalog_datasets(&self) -> Result<HashSet<String>> {
+        let conn = self.conn.lock();
+        let mut stmt = conn.prepare_cached("SELECT dataset FROM catalog_datasets")?;
+        let rows = stmt.query_map([], |row| row.get(0))?;
+        let mut names = HashSet::new();
+        for r in rows {
+            names.insert(r?);
+        }
+        Ok(names)
+    }
+
+    pub fn mark_catalog_dataset(&self, dataset: &str) -> Result<()> {
+        self.conn
+            .lock()
+            .prepare_cached("INSERT OR IGNORE INTO catalog_datasets (dataset) VALUES (?1)")?
+            .execute(params![dataset])?;
+        Ok(())
+    }
+
+    /// Drop everything the catalog holds for `dataset`.
+    pub fn remove_catalog_dataset(&self, dataset: &str) -> Result<()> {
+        let conn = self.conn.lock();
+        for sql in [
+            "DELETE FROM catalog_files WHERE dataset=?1",
+            "DELETE FROM catalog_missions WHERE dataset=?1",
+            "DELETE FROM catalog_datasets WHERE dataset=?1",
+        ] {
+            conn.prepare_cached(sql)?.execute(params![dataset])?;
+        }
+        Ok(())
+    }
+
+    /// Insert or replace a mission of `dataset`, whose directory is `path`.
+    pub fn upsert_catalog_mission(&self, dataset: &str, record: &MissionRecord, path: &str) -> Result<()> {
+        let m = &record.metadata;
+        self.conn
+            .lock()
+            .prepare_cached(
+                "INSERT INTO catalog_missions \
+                 (dataset, name, path, timestamp, day, utc, device, country, region, site, \
+                  mission_name, properties, notes) \
+                 VALUES (?1, ?2, ?3, ?4, substr(?4, 1, 10), datetime(?4), ?5, ?6, ?7, ?8, ?9, ?10, ?11) \
+                 ON CONFLICT (dataset, name) DO UPDATE SET path=excluded.path, \
+                 timestamp=excluded.timestamp, day=excluded.day, utc=excluded.utc, \
+                 device=excluded.device, country=excluded.country, region=excluded.region, \
+                 site=excluded.site, mission_name=excluded.mission_name, \
+                 properties=excluded.properties, notes=excluded.notes",
+            )?
+            .execute(params![
+                dataset,
+                record.name,
+                path,
+                m.timestamp,
+                m.device,
+                m.country,
+                m.region,
+                m.site,
+                m.mission_name,
+                m.properties,
+                m.notes,
+            ])?;
+        Ok(())
+    }
+
+    /// Drop a mission of `dataset` and the files recorded under it.
+    pub fn remove_catalog_mission(&self, dataset: &str, mission: &str) -> Result<()> {
+        let conn = self.conn.lock();
+        conn.prepare_cached("DELETE FROM catalog_files WHERE dataset=?1 AND mission=?2")?
+            .execute(params![dataset, mission])?;
+        conn.prepare_cached("DELETE FROM catalog_missions WHERE dataset=?1 AND name=?2")?
+            .execute(params![dataset, mission])?;
+        Ok(())
+    }
+
+    /// Insert or replace manifest entries of `dataset`, each with the mission
+    /// holding it.
+    pub fn upsert_catalog_files<'a>(
+        &self,
+        dataset: &str,
+        files: impl IntoIterator<Item = (&'a str, &'a ManifestEntry, Option<&'a str>)>,
+    ) -> Result<()> {
+        let conn = self.conn.lock();
+        let mut stmt = conn.prepare_cached(
+            "INSERT INTO catalog_files (dataset, path, mission, sha256, size) \
+             VALUES (?1, ?2, ?3, ?4, ?5) \
+             ON CONFLICT (dataset, path) DO UPDATE SET mission=excluded.mission, \
+             sha256=excluded.sha256, size=excluded.size",
+        )?;
+        for (path, entry, mission) in files {
+            stmt.execute(params![dataset, path, mission, entry.sha256sum, entry.size as i64])?;
+        }
+        Ok(())
+    }
+
+    /// Catalogued missions matching `filter`, in timestamp order.
+    #[cfg(any(test, feature = "python"))]
+    pub fn query_catalog_missions(&self, filter: &CatalogFilter) -> Result<Vec<CatalogMission>> {
+        let (mut clauses, mut values) = catalog_mission_conditions(filter);
+        let mut file_clauses = Vec::new();
+        catalog_file_conditions(filter, &mut file_clauses, &mut values);
+        if !file_clauses.is_empty() {
+            clauses.push(format!(
+                "EXISTS (SELECT 1 FROM catalog_files f \
+                 WHERE f.dataset = m.dataset AND f.mission = m.name AND {})",
+                file_clauses.join(" AND ")
+            ));
+        }
+        let sql = format!(
+            "SELECT m.dataset, m.name, m.path, m.timestamp, m.device, m.country, m.region, \
+             m.site, m.mission_name, m.properties, m.notes \
+             FROM catalog_missions m{} ORDER BY m.utc, m.dataset, m.name",
+            where_clause(&clauses)
+        );
+        let conn = self.conn.lock();
+        let mut stmt = conn.prepare_cached(&sql)?;
+        let rows = stmt.query_map(params_from_iter(&values), |row| {
+            Ok(CatalogMission {
+                dataset: row.get(0)?,
+                record: MissionRecord {
+                    name: row.get(1)?,
+                    path: row.get(2)?,
+                    metadata: MetadataRecord {
+                        timestamp: row.get(3)?,
+                        device: row.get(4)?,
+                        country: row.get(5)?,
+                        region: row.get(6)?,
+                        site: row.get(7)?,
+                        mission_name: row.get(8)?,
+                        properties: row.get(9)?,
+                        notes: row.get(10)?,
+                    },
+                },
+            })
+        })?;
+        let mut missions = Vec::new();
+        for r in rows {
+            missions.push(r?);
+        }
+        Ok(missions)
+    }
+
+    /// Catalogued files matching `filter`, by dataset and path.  Conditions on
+    /// missions leave out files outside any mission.
+    #[cfg(any(test, feature = "python"))]
+    pub fn query_catalog_files(&self, filter: &CatalogFilter) -> Result<Vec<CatalogFile>> {
+        let (mut clauses, mut values) = catalog_mission_conditions(filter);
+        catalog_file_conditions(filter, &mut clauses, &mut values);
+        let sql = format!(
+            "SELECT f.dataset, f.mission, f.path, f.sha256, f.size FROM catalog_files f \
+             LEFT JOIN catalog_missions m ON m.dataset = f.dataset AND m.name = f.mission{} \
+             ORDER BY f.dataset, f.path",
+            where_clause(&clauses)
+        );
+        let conn = self.conn.lock();
+        let mut stmt = conn.prepare_cached(&sql)?;
+        let rows = stmt.query_map(params_from_iter(&values), |row| {
+            Ok(CatalogFile {
+                dataset: row.get(0)?,
+                mission: row.get(1)?,
+                path: row.get(2)?,
+                entry: ManifestEntry { sha256sum: row.get(3)?, size: row.get::<_, i64>(4)? as u64 },
+            })
+        })?;
+        let mut files = Vec::new();
         for r in rows {
-            infos.push(r?);
+            files.push(r?);
         }
-        Ok(infos)
+        Ok(files)
     }
+}
 
-    pub fn upsert_dataset(&self, info: &DatasetInfo) -> Result<()> {
-        self.conn.execute(
-            "INSERT OR REPLACE INTO datasets \
-             (name, root_path, pushed, last_country, last_region, last_site, day_0) \
-             VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7)",
-            params![
-                info.name,
-                info.root_path,
-                info.pushed as i32,
-                info.last_country,
-                info.last_region,
-                info.last_site,
-                info.day_0,
-            ],
-        )?;
-        Ok(())
+/// The conditions `filter` puts on `catalog_missions m`, and their parameters.
+#[cfg(any(test, feature = "python"))]
+fn catalog_mission_conditions(filter: &CatalogFilter) -> (Vec<String>, Vec<String>) {
+    let mut clauses = Vec::new();
+    let mut values = Vec::new();
+    let columns = [
+        ("m.dataset", &filter.dataset),
+        ("m.site", &filter.site),
+        ("m.device", &filter.device),
+        ("m.country", &filter.country),
+        ("m.region", &filter.region),
+    ];
+    for (column, value) in columns {
+        if let Some(value) = value {
+            clauses.push(format!("{} = ?", column));
+            values.push(value.clone());
+        }
+    }
+    // A bare date bounds the mission's local date, so a day's missions match
+    // whatever their UTC offset.
+    let is_date = |bound: &str| bound.len() == 10 && !bound.contains('T');
+    if let Some(start) = &filter.start {
+        clauses.push(if is_date(start.as_str()) { "m.day >= ?" } else { "m.utc >= datetime(?)" }.to_string());
+        values.push(start.clone());
+    }
+    if let Some(end) = &filter.end {
+        clauses.push(if is_date(end.as_str()) { "m.day <= ?" } else { "m.utc <= datetime(?)" }.to_string());
+        values.push(end.clone());
+    }
+    // The key is matched against `json_each` rather than spliced into a JSON
+    // path, which has no way to quote every key.
+    for (key, value) in &filter.properties {
+        clauses.push(
+            "EXISTS (SELECT 1 FROM json_each(CASE WHEN json_valid(m.properties) \
+             THEN m.properties ELSE '{}' END) p \
+             WHERE p.key = ? AND CAST(p.value AS TEXT) = ?)"
+                .to_string(),
+        );
+        values.push(key.clone());
+        values.push(value.clone());
     }
+    (clauses, values)
+}
 
-    pub fn remove_dataset(&self, name: &str) -> Result<()> {
-        self.conn
-            .execute("DELETE FROM datasets WHERE name=?1", params![name])?;
-        Ok(())
+/// Append the conditions `filter` puts on `catalog_files f` and their parameters.
+#[cfg(any(test, feature = "python"))]
+fn catalog_file_conditions(filter: &CatalogFilter, clauses: &mut Vec<String>, values: &mut Vec<String>) {
+    if let Some(sha256) = &filter.sha256 {
+        clauses.push("f.sha256 = ?".to_string());
+        values.push(sha256.clone());
+    }
+    if let Some(path) = &filter.path {
+        clauses.push("f.path GLOB ?".to_string());
+        values.push(path.clone());
+    }
+}
+
+#[cfg(any(test, feature = "python"))]
+fn where_clause(clauses: &[String]) -> String {
+    if clauses.is_empty() {
+        String::new()
+    } else {
+        format!(" WHERE {}", clauses.join(" AND "))
     }
 }
 
@@ -491,6 +1929,22 @@ mod tests {
         DatasetDb::open(root).unwrap()
     }
 
+    impl DatasetDb {
+        fn get_mission_staged_files(&self, mission_name: &str) -> Result<Vec<StagedFileRecord>> {
+            let conn = self.conn.lock();
+            let mut stmt = conn.prepare_cached(
+                "SELECT origin_path, target_path, hash, size FROM mission_staged_files \
+                 WHERE mission_name=?1",
+            )?;
+            let rows = stmt.query_map(params![mission_name], |row| staged_file_row(row, 0))?;
+            let mut files = Vec::new();
+            for r in rows {
+                files.push(r?);
+            }
+            Ok(files)
+        }
+    }
+
     fn mission(name: &str) -> MissionRecord {
         MissionRecord {
             name: name.to_string(),
@@ -508,6 +1962,10 @@ mod tests {
         }
     }
 
+    fn entry(hash: &str, size: u64) -> ManifestEntry {
+        ManifestEntry { sha256sum: hash.to_string(), size }
+    }
+
     // ── dataset_meta ────────────────────────────────────────────
 
     #[test]
@@ -581,12 +2039,13 @@ mod tests {
         let db = open(tmp.path());
         db.insert_mission(&mission("ED-00 M1")).unwrap();
 
-        db.set_mission_staged_files(
+        db.add_mission_staged_files(
             "ED-00 M1",
             &[StagedFileRecord {
                 origin_path: "/src/a.bin".to_string(),
                 target_path: "/ds/ED-00/M1/a.bin".to_string(),
                 hash: "abc".to_string(),
+                size: 1,
             }],
         )
         .unwrap();
@@ -623,7 +2082,7 @@ mod tests {
     // ── mission staged files ─────────────────────────────────────
 
     #[test]
-    fn staged_files_set_and_get_roundtrip() {
+    fn staged_files_add_and_get_roundtrip() {
         let tmp = tempdir().unwrap();
         let db = open(tmp.path());
         let files = vec![
@@ -631,57 +2090,47 @@ mod tests {
                 origin_path: "/src/a.bin".to_string(),
                 target_path: "/ds/a.bin".to_string(),
                 hash: "aaa".to_string(),
+                size: 1,
             },
             StagedFileRecord {
                 origin_path: "/src/b.bin".to_string(),
                 target_path: "/ds/b.bin".to_string(),
                 hash: "bbb".to_string(),
+                size: 1,
             },
         ];
-        db.set_mission_staged_files("ED-00 M1", &files).unwrap();
+        db.add_mission_staged_files("ED-00 M1", &files).unwrap();
         let loaded = db.get_mission_staged_files("ED-00 M1").unwrap();
         assert_eq!(loaded.len(), 2);
         assert!(loaded.iter().any(|f| f.hash == "aaa"));
     }
 
     #[test]
-    fn set_staged_files_replaces_previous_entries() {
+    fn remove_staged_files_deletes_only_given_entries() {
         let tmp = tempdir().unwrap();
         let db = open(tmp.path());
-        let first = vec![StagedFileRecord {
-            origin_path: "/src/a.bin".to_string(),
-            target_path: "/ds/a.bin".to_string(),
-            hash: "aaa".to_string(),
-        }];
-        db.set_mission_staged_files("ED-00 M1", &first).unwrap();
-
-        let second = vec![StagedFileRecord {
-            origin_path: "/src/b.bin".to_string(),
-            target_path: "/ds/b.bin".to_string(),
-            hash: "bbb".to_string(),
-        }];
-        db.set_mission_staged_files("ED-00 M1", &second).unwrap();
+        let files = vec![
+            StagedFileRecord {
+                origin_path: "/src/a.bin".to_string(),
+                target_path: "/ds/a.bin".to_string(),
+                hash: "aaa".to_string(),
+                size: 1,
+            },
+            StagedFileRecord {
+                origin_path: "/src/b.bin".to_string(),
+                target_path: "/ds/b.bin".to_string(),
+                hash: "bbb".to_string(),
+                size: 1,
+            },
+        ];
+        db.add_mission_staged_files("ED-00 M1", &files).unwrap();
+        db.add_mission_staged_files("ED-00 M2", &files[..1]).unwrap();
+        db.remove_mission_staged_files("ED-00 M1", &files[..1]).unwrap();
 
         let loaded = db.get_mission_staged_files("ED-00 M1").unwrap();
         assert_eq!(loaded.len(), 1);
         assert_eq!(loaded[0].hash, "bbb");
-    }
-
-    #[test]
-    fn clear_staged_files_leaves_empty() {
-        let tmp = tempdir().unwrap();
-        let db = open(tmp.path());
-        db.set_mission_staged_files(
-            "ED-00 M1",
-            &[StagedFileRecord {
-                origin_path: "/src/a.bin".to_string(),
-                target_path: "/ds/a.bin".to_string(),
-                hash: "aaa".to_string(),
-            }],
-        )
-        .unwrap();
-        db.clear_mission_staged_files("ED-00 M1").unwrap();
-        assert!(db.get_mission_staged_files("ED-00 M1").unwrap().is_empty());
+        assert_eq!(db.get_mission_staged_files("ED-00 M2").unwrap().len(), 1);
     }
 
     // ── mission committed files ──────────────────────────────────
@@ -718,17 +2167,44 @@ mod tests {
         );
     }
 
+    #[test]
+    fn grouped_queries_return_every_mission_in_insertion_order() {
+        let tmp = tempdir().unwrap();
+        let db = open(tmp.path());
+        db.add_mission_committed_files("ED-00 M1", &["b.bin".to_string(), "a.bin".to_string()])
+            .unwrap();
+        db.add_mission_committed_files("ED-00 M2", &["c.bin".to_string()])
+            .unwrap();
+        let staged = StagedFileRecord {
+            origin_path: "/src/d.bin".to_string(),
+            target_path: "d.bin".to_string(),
+            hash: "abc".to_string(),
+            size: 1,
+        };
+        db.add_mission_staged_files("ED-00 M2", [&staged]).unwrap();
+
+        let committed = db.get_all_mission_committed_files().unwrap();
+        assert_eq!(committed["ED-00 M1"], vec!["b.bin".to_string(), "a.bin".to_string()]);
+        assert_eq!(committed["ED-00 M2"], vec!["c.bin".to_string()]);
+        let counts = db.count_mission_committed_files().unwrap();
+        assert_eq!(counts["ED-00 M1"], 2);
+        assert_eq!(counts["ED-00 M2"], 1);
+        let staged_by_mission = db.get_all_mission_staged_files().unwrap();
+        assert_eq!(staged_by_mission["ED-00 M2"], vec![staged]);
+        assert!(!staged_by_mission.contains_key("ED-00 M1"));
+    }
+
     // ── dataset staged / committed files ────────────────────────
 
     #[test]
-    fn dataset_staged_files_set_and_clear() {
+    fn dataset_staged_files_add_and_remove() {
         let tmp = tempdir().unwrap();
         let db = open(tmp.path());
-        db.set_dataset_staged_files(&["/ds/readme.md".to_string()])
-            .unwrap();
-        assert_eq!(db.get_dataset_staged_files().unwrap().len(), 1);
-        db.clear_dataset_staged_files().unwrap();
-        assert!(db.get_dataset_staged_files().unwrap().is_empty());
+        let files = ["/ds/readme.md".to_string(), "/ds/readme.docx".to_string()];
+        db.add_dataset_staged_files(&files).unwrap();
+        assert_eq!(db.get_dataset_staged_files().unwrap().len(), 2);
+        db.remove_dataset_staged_files(&files[..1]).unwrap();
+        assert_eq!(db.get_dataset_staged_files().unwrap(), vec!["/ds/readme.docx".to_string()]);
     }
 
     #[test]
@@ -755,6 +2231,67 @@ mod tests {
         assert_eq!(db.get_dataset_committed_files().unwrap().len(), 1);
     }
 
+    // ── push ledger ──────────────────────────────────────────────
+
+    #[test]
+    fn push_ledger_is_none_for_unknown_destination() {
+        let tmp = tempdir().unwrap();
+        let db = open(tmp.path());
+        assert!(db.get_push_ledger("/nas/ds").unwrap().is_none());
+    }
+
+    #[test]
+    fn record_push_roundtrips_entries_and_manifest_hash() {
+        let tmp = tempdir().unwrap();
+        let db = open(tmp.path());
+        let mut entries = ManifestData::new();
+        entries.insert("a.bin".to_string(), entry("aa", 1));
+        entries.insert("m/b.bin".to_string(), entry("bb", 2));
+        db.record_push("/nas/ds", "h1", &entries, true).unwrap();
+
+        let ledger = db.get_push_ledger("/nas/ds").unwrap().unwrap();
+        assert_eq!(ledger.manifest_sha256, "h1");
+        assert_eq!(ledger.entries.len(), 2);
+        assert_eq!(ledger.entries["m/b.bin"].sha256sum, "bb");
+        assert_eq!(ledger.entries["m/b.bin"].size, 2);
+    }
+
+    #[test]
+    fn record_push_without_replace_upserts_delta() {
+        let tmp = tempdir().unwrap();
+        let db = open(tmp.path());
+        let mut first = ManifestData::new();
+        first.insert("a.bin".to_string(), entry("aa", 1));
+        db.record_push("/nas/ds", "h1", &first, true).unwrap();
+
+        let mut delta = ManifestData::new();
+        delta.insert("b.bin".to_string(), entry("bb", 2));
+        db.record_push("/nas/ds", "h2", &delta, false).unwrap();
+
+        let ledger = db.get_push_ledger("/nas/ds").unwrap().unwrap();
+        assert_eq!(ledger.manifest_sha256, "h2");
+        assert_eq!(ledger.entries.len(), 2);
+    }
+
+    #[test]
+    fn record_push_with_replace_drops_old_entries_and_keeps_other_destinations() {
+        let tmp = tempdir().unwrap();
+        let db = open(tmp.path());
+        let mut first = ManifestData::new();
+        first.insert("a.bin".to_string(), entry("aa", 1));
+        db.record_push("/nas/ds", "h1", &first, true).unwrap();
+        db.record_push("s3://bucket/ds", "h1", &first, true).unwrap();
+
+        let mut second = ManifestData::new();
+        second.insert("b.bin".to_string(), entry("bb", 2));
+        db.record_push("/nas/ds", "h2", &second, true).unwrap();
+
+        let nas = db.get_push_ledger("/nas/ds").unwrap().unwrap();
+        assert_eq!(nas.entries.keys().collect::<Vec<_>>(), vec!["b.bin"]);
+        let s3 = db.get_push_ledger("s3://bucket/ds").unwrap().unwrap();
+        assert!(s3.entries.contains_key("a.bin"));
+    }
+
     // ── ManagerDb ────────────────────────────────────────────────
 
     fn open_manager(config_dir: &std::path::Path) -> ManagerDb {
@@ -857,4 +2394,509 @@ mod tests {
         db.remove_dataset("does_not_exist").unwrap();
         assert!(db.get_all_datasets().unwrap().is_empty());
     }
+
+    // ── catalog ─────────────────────────────────────────────────
+
+    fn catalog_mission(name: &str, timestamp: &str, site: &str, properties: &str) -> MissionRecord {
+        let mut record = mission(name);
+        record.metadata.timestamp = timestamp.to_string();
+        record.metadata.site = site.to_string();
+        record.metadata.properties = properties.to_string();
+        record
+    }
+
+    fn mission_names(missions: &[CatalogMission]) -> Vec<&str> {
+        missions.iter().map(|m| m.record.name.as_str()).collect()
+    }
+
+    fn open_catalog(config_dir: &std::path::Path) -> ManagerDb {
+        let db = open_manager(config_dir);
+        fill_catalog(&db);
+        db
+    }
+
+    fn fill_catalog(db: &ManagerDb) {
+        for (dataset, record) in [
+            ("A", catalog_mission("ED-00 M1", "2023-03-02T22:00:00-08:00", "SD", r#"{"depth": 5}"#)),
+            ("A", catalog_mission("ED-01 M2", "2023-03-03T09:00:00-08:00", "LA", r#"{"depth": 9}"#)),
+            ("B", catalog_mission("ED-00 M1", "2023-03-03T01:00:00+00:00", "SD", r#"{"tag": "reef", "diver's \"id\"": 7}"#)),
+        ] {
+            db.upsert_catalog_mission(dataset, &record, &record.path).unwrap();
+        }
+        let (a, b) = (entry("aa", 1), entry("bb", 2));
+        db.upsert_catalog_files("A", [
+            ("ED-00/M1/a.bin", &a, Some("ED-00 M1")),
+            ("ED-01/M2/b.bin", &b, Some("ED-01 M2")),
+            ("readme.md", &a, None),
+        ]).unwrap();
+        db.upsert_catalog_files("B", [("ED-00/M1/a.bin", &a, Some("ED-00 M1"))]).unwrap();
+    }
+
+    #[test]
+    fn catalog_query_filters_missions_across_datasets() {
+        let tmp = tempdir().unwrap();
+        let db = open_catalog(tmp.path());
+        let filter = CatalogFilter { site: Some("SD".to_string()), ..Default::default() };
+        let found = db.query_catalog_missions(&filter).unwrap();
+        let datasets: Vec<&str> = found.iter().map(|m| m.dataset.as_str()).collect();
+        // In UTC order: B's mission is at 01:00, A's at 06:00.
+        assert_eq!(datasets, ["B", "A"]);
+        assert_eq!(found[1].record.metadata.properties, r#"{"depth": 5}"#);
+    }
+
+    #[test]
+    fn catalog_query_bounds_dates_locally_and_times_in_utc() {
+        let tmp = tempdir().unwrap();
+        let db = open_catalog(tmp.path());
+        // A's M1 is on 2023-03-02 locally but on 2023-03-03 in UTC.
+        let by_date = CatalogFilter {
+            start: Some("2023-03-02".to_string()),
+            end: Some("2023-03-02".to_string()),
+            ..Default::default()
+        };
+        assert_eq!(mission_names(&db.query_catalog_missions(&by_date).unwrap()), ["ED-00 M1"]);
+        let by_time = CatalogFilter {
+            start: Some("2023-03-03T00:00:00+00:00".to_string()),
+            end: Some("2023-03-03T06:30:00Z".to_string()),
+            ..Default::default()
+        };
+        let found = db.query_catalog_missions(&by_time).unwrap();
+        assert_eq!(found.len(), 2);
+        assert!(found.iter().all(|m| m.record.name == "ED-00 M1"));
+    }
+
+    #[test]
+    fn catalog_query_matches_json_properties() {
+        let tmp = tempdir().unwrap();
+        let db = open_catalog(tmp.path());
+        let depth = CatalogFilter {
+            properties: vec![("depth".to_string(), "9".to_string())],
+            ..Default::default()
+        };
+        assert_eq!(mission_names(&db.query_catalog_missions(&depth).unwrap()), ["ED-01 M2"]);
+        let tag = CatalogFilter {
+            properties: vec![("tag".to_string(), "reef".to_string())],
+            ..Default::default()
+        };
+        let found = db.query_catalog_missions(&tag).unwrap();
+        assert_eq!(found.len(), 1);
+        assert_eq!(found[0].dataset, "B");
+        let quoted = CatalogFilter {
+            properties: vec![("diver's \"id\"".to_string(), "7".to_string())],
+            ..Default::default()
+        };
+        assert_eq!(db.query_catalog_missions(&quoted).unwrap().len(), 1);
+    }
+
+    #[test]
+    fn catalog_query_files_by_hash_and_mission() {
+        let tmp = tempdir().unwrap();
+        let db = open_catalog(tmp.path());
+        let by_hash = CatalogFilter { sha256: Some("aa".to_string()), ..Default::default() };
+        let paths: Vec<(String, String)> = db
+            .query_catalog_files(&by_hash)
+            .unwrap()
+            .into_iter()
+            .map(|f| (f.dataset, f.path))
+            .collect();
+        assert_eq!(paths.len(), 3);
+        assert!(paths.contains(&("A".to_string(), "readme.md".to_string())));
+
+        // Mission conditions leave out files outside any mission.
+        let sd = CatalogFilter { site: Some("SD".to_string()), ..by_hash.clone() };
+        assert_eq!(db.query_catalog_files(&sd).unwrap().len(), 2);
+
+        // For missions, file conditions select those holding a match.
+        let glob = CatalogFilter { path: Some("*/b.bin".to_string()), ..Default::default() };
+        assert_eq!(mission_names(&db.query_catalog_missions(&glob).unwrap()), ["ED-01 M2"]);
+    }
+
+    #[test]
+    fn catalog_remove_mission_and_dataset() {
+        let tmp = tempdir().unwrap();
+        let db = open_catalog(tmp.path());
+        db.remove_catalog_mission("A", "ED-00 M1").unwrap();
+        let all = CatalogFilter::default();
+        assert_eq!(db.query_catalog_missions(&all).unwrap().len(), 2);
+        assert_eq!(db.query_catalog_files(&all).unwrap().len(), 3);
+
+        db.mark_catalog_dataset("A").unwrap();
+        db.remove_catalog_dataset("A").unwrap();
+        let found = db.query_catalog_missions(&all).unwrap();
+        assert!(found.iter().all(|m| m.dataset == "B"));
+        assert_eq!(db.query_catalog_files(&all).unwrap().len(), 1);
+        assert!(db.get_catalog_datasets().unwrap().is_empty());
+    }
+
+    #[test]
+    fn dataset_summary_counts_only_catalogued_datasets() {
+        let tmp = tempdir().unwrap();
+        let db = open_manager(tmp.path());
+        db.upsert_dataset(&dataset_info("A")).unwrap();
+        db.upsert_dataset(&dataset_info("B")).unwrap();
+        db.reset_dataset_summary("A").unwrap();
+        fill_catalog(&db);
+        db.mark_catalog_dataset("A").unwrap();
+
+        let summaries = db.get_dataset_summaries().unwrap();
+        let a = summaries.iter().find(|s| s.info.name == "A").unwrap();
+        assert_eq!((a.mission_count, a.file_count, a.total_bytes), (Some(2), Some(3), Some(4)));
+        let sites = &a.missions.as_ref().unwrap().sites;
+        assert_eq!(sites.iter().map(String::as_str).collect::<Vec<_>>(), ["LA", "SD"]);
+        let b = summaries.iter().find(|s| s.info.name == "B").unwrap();
+        assert_eq!(b.mission_count, None);
+        assert_eq!(b.file_count, None);
+        assert!(b.missions.is_none());
+    }
+
+    #[test]
+    fn dataset_summary_follows_catalog_changes() {
+        let tmp = tempdir().unwrap();
+        let db = open_manager(tmp.path());
+        db.upsert_dataset(&dataset_info("A")).unwrap();
+        db.reset_dataset_summary("A").unwrap();
+        fill_catalog(&db);
+        let counts = || {
+            let s = db.get_dataset_summaries().unwrap().remove(0);
+            (s.mission_count, s.file_count, s.total_bytes)
+        };
+
+        // Replacing an entry changes only the bytes; re-upserting a mission nothing.
+        db.upsert_catalog_files("A", [("readme.md", &entry("cc", 5), None)]).unwrap();
+        let record = catalog_mission("ED-00 M1", "2023-03-02T22:00:00-08:00", "SD", "{}");
+        db.upsert_catalog_mission("A", &record, &record.path).unwrap();
+        assert_eq!(counts(), (Some(2), Some(3), Some(8)));
+
+        db.remove_catalog_mission("A", "ED-01 M2").unwrap();
+        assert_eq!(counts(), (Some(1), Some(2), Some(6)));
+        db.remove_catalog_dataset("A").unwrap();
+        assert_eq!(counts(), (Some(0), Some(0), Some(0)));
+    }
+
+    #[test]
+    fn dataset_summary_survives_upsert_and_records_validation() {
+        let tmp = tempdir().unwrap();
+        let db = open_manager(tmp.path());
+        db.upsert_dataset(&dataset_info("A")).unwrap();
+        db.reset_dataset_summary("A").unwrap();
+        fill_catalog(&db);
+        db.mark_catalog_dataset("A").unwrap();
+        db.mark_dataset_validated("A").unwrap();
+
+        let mut info = dataset_info("A");
+        info.pushed = true;
+        db.upsert_dataset(&info).unwrap();
+        let summary = db.get_dataset_summaries().unwrap().remove(0);
+        assert!(summary.info.pushed);
+        assert_eq!(summary.mission_count, Some(2));
+        assert!(summary.last_validated.unwrap().ends_with('Z'));
+    }
+
+    // ── migrations ──────────────────────────────────────────────
+
+    #[test]
+    fn upgrade_deduplicates_committed_files_and_makes_them_unique() {
+        let tmp = tempdir().unwrap();
+        {
+            // A database from before migrations: original schema, user_version 0.
+            let conn = Connection::open(tmp.path().join(DATASET_DB_NAME)).unwrap();
+            match &DATASET_MIGRATIONS[0] {
+                Migration::Sql(sql) => conn.execute_batch(sql).unwrap(),
+                Migration::Code(_) => unreachable!(),
+            }
+            for _ in 0..3 {
+                conn.execute(
+                    "INSERT INTO mission_committed_files (mission_name, path) VALUES ('ED-00 M1', 'a.bin')",
+                    [],
+                )
+                .unwrap();
+            }
+        }
+        let db = open(tmp.path());
+        assert_eq!(db.get_mission_committed_files("ED-00 M1").unwrap(), vec!["a.bin".to_string()]);
+        db.add_mission_committed_files("ED-00 M1", &["a.bin".to_string()]).unwrap();
+        assert_eq!(db.get_mission_committed_files("ED-00 M1").unwrap().len(), 1);
+        assert_eq!(schema_version(&db), DATASET_MIGRATIONS.len());
+    }
+
+    #[test]
+    fn upgrade_imports_manifest_json() {
+        let tmp = tempdir().unwrap();
+        {
+            // A database from before the manifest table.
+            let conn = Connection::open(tmp.path().join(DATASET_DB_NAME)).unwrap();
+            for migration in &DATASET_MIGRATIONS[..2] {
+                if let Migration::Sql(sql) = migration {
+                    conn.execute_batch(sql).unwrap();
+                }
+            }
+            conn.pragma_update(None, "user_version", 2).unwrap();
+        }
+        let mut data = ManifestData::new();
+        data.insert("ED-00/M1/a.bin".to_string(), entry("aa", 1));
+        manifest::write_manifest(&tmp.path().join(MANIFEST_NAME), &data).unwrap();
+
+        let db = open(tmp.path());
+        assert_eq!(db.get_manifest().unwrap().len(), 1);
+        assert_eq!(db.get_manifest_entry("ED-00/M1/a.bin").unwrap().unwrap().sha256sum, "aa");
+    }
+
+    #[test]
+    fn newer_schema_version_is_rejected() {
+        let tmp = tempdir().unwrap();
+        {
+            let conn = Connection::open(tmp.path().join(DATASET_DB_NAME)).unwrap();
+            conn.pragma_update(None, "user_version", DATASET_MIGRATIONS.len() as i64 + 1)
+                .unwrap();
+        }
+        assert!(DatasetDb::open(tmp.path()).is_err());
+    }
+
+    fn schema_version(db: &DatasetDb) -> usize {
+        let version: i64 = db
+            .conn
+            .lock()
+            .query_row("PRAGMA user_version", [], |row| row.get(0))
+            .unwrap();
+        version as usize
+    }
+
+    // ── manifest ────────────────────────────────────────────────
+
+    #[test]
+    fn delete_manifest_dir_removes_only_that_directory() {
+        let tmp = tempdir().unwrap();
+        let db = open(tmp.path());
+        let paths = ["ED-00/M1/a.bin", "ED-00/M1/sub/b.bin", "ED-00/M10/c.bin", "ED-00/M1.txt"];
+        let mut data = ManifestData::new();
+        for path in paths {
+            data.insert(path.to_string(), entry("aa", 1));
+        }
+        db.upsert_manifest_entries(&data).unwrap();
+
+        assert_eq!(db.delete_manifest_dir("ED-00/M1").unwrap(), 2);
+        let left = db.get_manifest().unwrap();
+        assert_eq!(left.len(), 2);
+        assert!(left.contains_key("ED-00/M10/c.bin"));
+        assert!(left.contains_key("ED-00/M1.txt"));
+    }
+
+    #[test]
+    fn manifest_pages_and_stats_cover_one_directory() {
+        let tmp = tempdir().unwrap();
+        let db = open(tmp.path());
+        let paths = ["ED-00/M1/a.bin", "ED-00/M1/b.bin", "ED-00/M1/c.bin", "ED-00/M10/d.bin"];
+        let mut data = ManifestData::new();
+        for (size, path) in paths.iter().enumerate() {
+            data.insert(path.to_string(), entry("aa", size as u64 + 1));
+        }
+        db.upsert_manifest_entries(&data).unwrap();
+
+        let first = db.get_manifest_page(Some("ED-00/M1"), "", 2).unwrap();
+        let names: Vec<&str> = first.iter().map(|(path, _)| path.as_str()).collect();
+        assert_eq!(names, ["ED-00/M1/a.bin", "ED-00/M1/b.bin"]);
+        let rest = db.get_manifest_page(Some("ED-00/M1"), &first[1].0, 2).unwrap();
+        assert_eq!(rest.len(), 1);
+        assert_eq!(rest[0].0, "ED-00/M1/c.bin");
+        assert_eq!(db.get_manifest_page(None, "ED-00/M1/c.bin", 10).unwrap().len(), 1);
+
+        assert_eq!(db.manifest_stats(Some("ED-00/M1")).unwrap(), (3, 6));
+        assert_eq!(db.manifest_stats(None).unwrap(), (4, 10));
+        assert_eq!(db.manifest_stats(Some("ED-01")).unwrap(), (0, 0));
+    }
+
+    #[test]
+    fn export_manifest_writes_sorted_json() {
+        let tmp = tempdir().unwrap();
+        let db = open(tmp.path());
+        let mut data = ManifestData::new();
+        data.insert("b.bin".to_string(), entry("bb", 2));
+        data.insert("a.bin".to_string(), entry("aa", 1));
+        db.upsert_manifest_entries(&data).unwrap();
+        data.insert("a.bin".to_string(), entry("a2", 3));
+        db.upsert_manifest_entries(&data).unwrap();
+
+        let path = tmp.path().join(MANIFEST_NAME);
+        let exported = db.export_manifest(&path).unwrap();
+        assert_eq!(exported["a.bin"].sha256sum, "a2");
+        assert_eq!(
+            std::fs::read_to_string(&path).unwrap(),
+            manifest::manifest_to_string(&exported).unwrap()
+        );
+    }
+
+    // ── file stats ─────────────────────────────────────────────
+
+    fn stats(db: &DatasetDb) -> Vec<(String, String, String, u64, u64)> {
+        db.file_stats()
+            .unwrap()
+            .into_iter()
+            .map(|s| (s.mission, s.state, s.destination, s.files, s.bytes))
+            .collect()
+    }
+
+    fn stat(mission: &str, state: &str, dest: &str, files: u64, bytes: u64)
+        -> (String, String, String, u64, u64) {
+        (mission.to_string(), state.to_string(), dest.to_string(), files, bytes)
+    }
+
+    #[test]
+    fn file_stats_follow_staged_committed_and_pushed_files() {
+        let tmp = tempdir().unwrap();
+        let db = open(tmp.path());
+        db.insert_mission(&mission("ED-00 M1")).unwrap();
+        let staged: Vec<StagedFileRecord> = (0..3)
+            .map(|i| StagedFileRecord {
+                origin_path: format!("/src/{}.bin", i),
+                target_path: format!("/ds/ED-00/M1/{}.bin", i),
+                hash: "abc".to_string(),
+                size: 10,
+            })
+            .collect();
+        db.add_mission_staged_files("ED-00 M1", &staged).unwrap();
+        assert_eq!(stats(&db), vec![stat("ED-00 M1", "staged", "", 3, 30)]);
+
+        db.remove_mission_staged_files("ED-00 M1", &staged[..1]).unwrap();
+        let mut data = ManifestData::new();
+        data.insert("ED-00/M1/a.bin".to_string(), entry("aa", 5));
+        data.insert("ED-00/M10/b.bin".to_string(), entry("bb", 7));
+        data.insert("readme.md".to_string(), entry("cc", 1));
+        db.upsert_manifest_entries(&data).unwrap();
+        data.insert("ED-00/M1/a.bin".to_string(), entry("a2", 6));
+        db.upsert_manifest_entries(&data).unwrap();
+        db.record_push("/backup", "m", &data, false).unwrap();
+        assert_eq!(
+            stats(&db),
+            vec![
+                stat("", "committed", "", 2, 8),
+                stat("", "pushed", "/backup", 2, 8),
+                stat("ED-00 M1", "committed", "", 1, 6),
+                stat("ED-00 M1", "pushed", "/backup", 1, 6),
+                stat("ED-00 M1", "staged", "", 2, 20),
+            ]
+        );
+
+        // A mission written after its files takes them over, and hands its
+        // pushed files back when it is deleted.
+        db.insert_mission(&mission("ED-00 M10")).unwrap();
+        db.delete_manifest_dir("ED-00/M1").unwrap();
+        db.delete_mission("ED-00 M1").unwrap();
+        assert_eq!(
+            stats(&db),
+            vec![
+                stat("", "committed", "", 1, 1),
+                stat("", "pushed", "/backup", 2, 7),
+                stat("ED-00 M10", "committed", "", 1, 7),
+                stat("ED-00 M10", "pushed", "/backup", 1, 7),
+            ]
+        );
+    }
+
+    #[test]
+    fn find_files_pages_and_filters() {
+        let tmp = tempdir().unwrap();
+        let db = open(tmp.path());
+        let staged: Vec<StagedFileRecord> = ["a.bin", "b.txt", "c.bin"]
+            .iter()
+            .map(|name| StagedFileRecord {
+                origin_path: format!("/src/{}", name),
+                target_path: format!("/ds/ED-00/M[1]/{}", name),
+                hash: "abc".to_string(),
+                size: 1,
+            })
+            .collect();
+        db.add_mission_staged_files("ED-00 M[1]", &staged).unwrap();
+        let names = |files: Vec<StagedFileRecord>| {
+            files.into_iter().map(|f| f.origin_path).collect::<Vec<_>>()
+        };
+        assert_eq!(
+            names(db.find_mission_staged_files("ED-00 M[1]", "/ds/ED-00/M[1]", None, 1, 5).unwrap()),
+            vec!["/src/b.txt", "/src/c.bin"]
+        );
+        if std::path::MAIN_SEPARATOR == '/' {
+            let staged = db
+                .find_mission_staged_files("ED-00 M[1]", "/ds/ED-00/M[1]", Some("*.bin"), 0, 5)
+                .unwrap();
+            assert_eq!(names(staged), vec!["/src/a.bin", "/src/c.bin"]);
+        }
+
+        let mut data = ManifestData::new();
+        for path in ["ED-00/M1/a.bin", "ED-00/M1/sub/b.bin", "ED-00/M1/c.txt", "ED-00/M2/d.bin"] {
+            data.insert(path.to_string(), entry("aa", 1));
+        }
+        db.upsert_manifest_entries(&data).unwrap();
+        let paths = |entries: Vec<(String, ManifestEntry)>| {
+            entries.into_iter().map(|(p, _)| p).collect::<Vec<_>>()
+        };
+        assert_eq!(
+            paths(db.find_manifest_entries("ED-00/M1", Some("*.bin"), 0, 10).unwrap()),
+            vec!["ED-00/M1/a.bin", "ED-00/M1/sub/b.bin"]
+        );
+        assert_eq!(
+            paths(db.find_manifest_entries("ED-00/M1", None, 2, 10).unwrap()),
+            vec!["ED-00/M1/sub/b.bin"]
+        );
+    }
+
+    // ── connections and transactions ────────────────────────────
+
+    #[test]
+    fn handles_in_a_session_share_one_connection() {
+        let tmp = tempdir().unwrap();
+        let session = Session::begin();
+        let a = open(tmp.path());
+        let b = open(tmp.path());
+        assert!(Arc::ptr_eq(&a.conn, &b.conn));
+        drop((a, b, session));
+        assert!(!tmp.path().join(".e4edm.db-wal").exists());
+    }
+
+    #[test]
+    fn snapshot_notices_writes_by_other_connections() {
+        let tmp = tempdir().unwrap();
+        let session = Session::begin();
+        let db = open(tmp.path());
+        db.init_dataset("2023-03-02", 2).unwrap();
+        let seen = db.snapshot().unwrap();
+        db.get_missions().unwrap();
+        assert!(!db.changed_since(&seen).unwrap());
+
+        let other = Connection::open(tmp.path().join(".e4edm.db")).unwrap();
+        other.execute("UPDATE dataset_meta SET revision = revision + 1", []).unwrap();
+        assert!(db.changed_since(&seen).unwrap());
+
+        assert_eq!(db.bump_revision().unwrap(), 1);
+        assert_eq!(db.snapshot().unwrap().revision(), 2);
+        drop((db, other, session));
+    }
+
+    #[test]
+    fn transaction_rolls_back_on_error() {
+        let tmp = tempdir().unwrap();
+        let db = open(tmp.path());
+        let result: Result<()> = db.transaction(|db| {
+            db.insert_mission(&mission("ED-00 M1"))?;
+            Err(crate::errors::E4EError::Runtime("boom".to_string()))
+        });
+        assert!(result.is_err());
+        assert!(db.get_missions().unwrap().is_empty());
+    }
+
+    #[test]
+    fn failed_nested_transaction_keeps_outer_writes() {
+        let tmp = tempdir().unwrap();
+        let db = open(tmp.path());
+        db.transaction(|db| {
+            db.insert_mission(&mission("ED-00 M1"))?;
+            let inner: Result<()> = db.transaction(|db| {
+                db.insert_mission(&mission("ED-00 M2"))?;
+                Err(crate::errors::E4EError::Runtime("boom".to_string()))
+            });
+            assert!(inner.is_err());
+            Ok(())
+        })
+        .unwrap();
+        let names: Vec<String> = db.get_missions().unwrap().into_iter().map(|m| m.name).collect();
+        assert_eq!(names, vec!["ED-00 M1".to_string()]);
+    }
 }
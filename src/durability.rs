@@ -0,0 +1,239 @@
+// durability.rs – getting pushed bytes onto stable storage.
+//
+// `copy_and_verify` hashes what it writes, but the bytes may still sit in the
+// page cache when a push reports success.  A push or duplicate can ask for one
+// of three durability levels:
+//
+//   none     – rely on the OS to write back eventually (previous behaviour)
+//   batched  – one flush for the whole batch once every file is copied:
+//              `syncfs` on Linux, otherwise an fsync per written file followed
+//              by one fsync per directory they were written into
+//   full     – fsync each temp file before its rename and the parent directory
+//              after it, so every file is durable before the next one starts
+//
+// Read-back verification re-hashes each written file after evicting it from the
+// page cache (`posix_fadvise(DONTNEED)` on Linux, `F_NOCACHE` on macOS) so the
+// hash reflects what the medium returns.  Eviction only drops clean pages, so
+// read-back implies at least `batched`.
+
+use std::collections::BTreeSet;
+use std::fs;
+use std::path::{Path, PathBuf};
+
+use crate::cancel::CancelToken;
+use crate::errors::{E4EError, Result};
+use crate::manifest;
+
+#[derive(Clone, Copy, Debug, Default, PartialEq, Eq)]
+pub enum Durability {
+    #[default]
+    None,
+    Batched,
+    Full,
+}
+
+impl Durability {
+    #[cfg_attr(not(feature = "python"), allow(dead_code))]
+    pub fn parse(s: &str) -> Option<Durability> {
+        match s.to_ascii_lowercase().as_str() {
+            "" | "none" => Some(Durability::None),
+            "batched" => Some(Durability::Batched),
+            "full" => Some(Durability::Full),
+            _ => None,
+        }
+    }
+
+    #[cfg_attr(not(test), allow(dead_code))]
+    pub fn as_str(&self) -> &'static str {
+        match self {
+            Durability::None => "none",
+            Durability::Batched => "batched",
+            Durability::Full => "full",
+        }
+    }
+}
+
+// ─────────────────────────────────────────────────────────────
+// Flushing
+// ─────────────────────────────────────────────────────────────
+
+/// fsync a directory so renames and new entries inside it are durable.
+/// Windows cannot open directories as files; NTFS journals the metadata instead.
+pub fn sync_dir(dir: &Path) -> Result<()> {
+    #[cfg(unix)]
+    {
+        fs::File::open(dir)
+            .and_then(|d| d.sync_all())
+            .map_err(|e| E4EError::Runtime(format!("Cannot sync '{}': {}", dir.display(), e)))?;
+    }
+    #[cfg(not(unix))]
+    let _ = dir;
+    Ok(())
+}
+
+/// Flush everything written under `root` in one go (the `batched` level).
+///
+/// `written` lists the files copied in this batch; it is only needed where the
+/// filesystem cannot be flushed as a whole.
+pub fn sync_batch(root: &Path, written: &[PathBuf]) -> Result<()> {
+    #[cfg(target_os = "linux")]
+    {
+        use std::os::unix::io::AsRawFd;
+        let _ = written;
+        let dir = fs::File::open(root)?;
+        if unsafe { libc::syncfs(dir.as_raw_fd()) } != 0 {
+            return Err(E4EError::Runtime(format!(
+                "Cannot sync '{}': {}",
+                root.display(),
+                std::io::Error::last_os_error()
+            )));
+        }
+        Ok(())
+    }
+    #[cfg(not(target_os = "linux"))]
+    {
+        use rayon::prelude::*;
+
+        written.par_iter().try_for_each(|file| -> Result<()> {
+            fs::OpenOptions::new()
+                .write(true)
+                .open(file)
+                .and_then(|f| f.sync_all())
+                .map_err(|e| E4EError::Runtime(format!("Cannot sync '{}': {}", file.display(), e)))
+        })?;
+        sync_dirs_under(root, written)
+    }
+}
+
+/// fsync every directory between `root` and the parent of each of `files`,
+/// including `root`, once each.  Makes renames and newly created directories
+/// durable after the files themselves have been synced.
+pub fn sync_dirs_under(root: &Path, files: &[PathBuf]) -> Result<()> {
+    let mut dirs: BTreeSet<&Path> = BTreeSet::new();
+    dirs.insert(root);
+    for file in files {
+        let mut dir = file.parent();
+        while let Some(d) = dir {
+            if !d.starts_with(root) || !dirs.insert(d) {
+                break;
+            }
+            dir = d.parent();
+        }
+    }
+    for dir in dirs {
+        sync_dir(dir)?;
+    }
+    Ok(())
+}
+
+/// Write `content` to `path` through a temp file, fsyncing the file before the
+/// rename and the directory after it.  Used for the destination `manifest.json`,
+/// which must only become visible once it (and the data before it) is durable.
+pub fn write_durably(path: &Path, content: &[u8]) -> Result<()> {
+    use std::io::Write;
+
+    let tmp = manifest::temp_path_for(path);
+    let result = (|| -> Result<()> {
+        let mut file = fs::File::create(&tmp)?;
+        file.write_all(content)?;
+        file.sync_all()?;
+        fs::rename(&tmp, path)?;
+        if let Some(parent) = path.parent() {
+            sync_dir(parent)?;
+        }
+        Ok(())
+    })();
+    if result.is_err() {
+        let _ = fs::remove_file(&tmp);
+    }
+    result
+}
+
+// ─────────────────────────────────────────────────────────────
+// Read-back
+// ─────────────────────────────────────────────────────────────
+
+/// Hash `path` after asking the OS to drop it from the page cache, so the bytes
+/// come from the medium rather than from memory.  Eviction is best effort: it is
+/// a no-op on Windows and cannot drop pages that are still dirty.
+pub fn readback_hash(path: &Path, cancel: &CancelToken) -> Result<String> {
+    let mut file = fs::File::open(path)
+        .map_err(|e| E4EError::Runtime(format!("Cannot open '{}': {}", path.display(), e)))?;
+    evict_from_cache(&file);
+    manifest::hash_open_file(&mut file, cancel)
+}
+
+#[cfg(target_os = "linux")]
+fn evict_from_cache(file: &fs::File) {
+    use std::os::unix::io::AsRawFd;
+    unsafe {
+        libc::posix_fadvise(file.as_raw_fd(), 0, 0, libc::POSIX_FADV_DONTNEED);
+    }
+}
+
+#[cfg(target_os = "macos")]
+fn evict_from_cache(file: &fs::File) {
+    use std::os::unix::io::AsRawFd;
+    unsafe {
+        libc::fcntl(file.as_raw_fd(), libc::F_NOCACHE, 1);
+    }
+}
+
+#[cfg(not(any(target_os = "linux", target_os = "macos")))]
+fn evict_from_cache(_file: &fs::File) {}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use tempfile::tempdir;
+
+    #[test]
+    fn durability_round_trips_through_strings() {
+        for d in [Durability::None, Durability::Batched, Durability::Full] {
+            assert_eq!(Durability::parse(d.as_str()), Some(d));
+        }
+        assert_eq!(Durability::parse("eventually"), None);
+    }
+
+    #[test]
+    fn write_durably_replaces_file_and_leaves_no_temp() {
+        let dir = tempdir().unwrap();
+        let path = dir.path().join("manifest.json");
+        fs::write(&path, b"old").unwrap();
+        write_durably(&path, b"new").unwrap();
+        assert_eq!(fs::read(&path).unwrap(), b"new");
+        assert_eq!(fs::read_dir(dir.path()).unwrap().count(), 1);
+    }
+
+    #[test]
+    fn sync_batch_accepts_written_files() {
+        let dir = tempdir().unwrap();
+        let sub = dir.path().join("sub");
+        fs::create_dir(&sub).unwrap();
+        let file = sub.join("a.bin");
+        fs::write(&file, b"data").unwrap();
+        sync_batch(dir.path(), &[file]).unwrap();
+    }
+
+    #[test]
+    fn sync_dirs_under_stops_at_root() {
+        let dir = tempdir().unwrap();
+        let nested = dir.path().join("a").join("b");
+        fs::create_dir_all(&nested).unwrap();
+        let file = nested.join("c.bin");
+        fs::write(&file, b"data").unwrap();
+        sync_dirs_under(&dir.path().join("a"), &[file]).unwrap();
+    }
+
+    #[test]
+    fn readback_hash_matches_compute_file_hash() {
+        let dir = tempdir().unwrap();
+        let file = dir.path().join("a.bin");
+        fs::write(&file, b"payload").unwrap();
+        sync_batch(dir.path(), std::slice::from_ref(&file)).unwrap();
+        assert_eq!(
+            readback_hash(&file, &CancelToken::new()).unwrap(),
+            manifest::compute_file_hash(&file).unwrap()
+        );
+    }
+}
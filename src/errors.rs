@@ -23,6 +23,9 @@ pub enum E4EError {
     #[error("JSON error: {0}")]
     Json(#[from] serde_json::Error),
 
+    #[error("Operation cancelled")]
+    Cancelled,
+
     #[error("Runtime error: {0}")]
     Runtime(String),
 }
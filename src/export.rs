@@ -0,0 +1,530 @@
+// export.rs – streaming a dataset as a tar or zstd-compressed tar archive.
+//
+// Unlike `archive::create_zip_with_progress`, the export writes strictly sequentially, so it
+// can go to stdout or a pipe.  The dataset manifest comes first, then every
+// manifest entry in sorted order, each hashed as it is read.  A file that does
+// not match its manifest entry aborts the stream before the end-of-archive
+// blocks (and, with zstd, mid-frame), so the receiver sees a truncated archive
+// rather than a complete one holding a bad file.
+//
+// With zstd, the tar stream is cut into independent frames of about
+// `FRAME_SIZE` at entry boundaries, all compressed on one reused context.  The
+// index records each entry's data offset
+// in the tar stream and, for zstd, the output offset of the frame holding it,
+// so a single file can be read back by decompressing one frame.
+
+use std::collections::BTreeMap;
+use std::fs;
+use std::io::{self, Read, Seek, SeekFrom, Write};
+use std::path::Path;
+use std::time::UNIX_EPOCH;
+
+use serde::{Deserialize, Serialize};
+use sha2::{Digest, Sha256};
+use zstd::stream::raw::{self, Operation};
+use zstd::stream::zio;
+
+use crate::archive;
+use crate::cancel::CancelToken;
+use crate::dataset::{self, DatasetState};
+use crate::errors::{E4EError, Result};
+use crate::lock::DatasetLock;
+use crate::manifest::{self, ManifestEntry};
+use crate::progress::{Phase, Progress};
+use crate::throttle;
+
+const MANIFEST_NAME: &str = "manifest.json";
+/// Uncompressed bytes after which the next entry starts a new zstd frame.
+const FRAME_SIZE: u64 = 8 * 1024 * 1024;
+const BLOCK_SIZE: u64 = 512;
+
+/// Container format of an export.
+#[derive(Clone, Copy, Debug, Default, PartialEq, Eq)]
+pub enum TarFormat {
+    #[default]
+    Tar,
+    TarZst,
+}
+
+impl TarFormat {
+    pub fn parse(s: &str) -> Option<TarFormat> {
+        match s {
+            "tar" => Some(TarFormat::Tar),
+            "tar.zst" => Some(TarFormat::TarZst),
+            _ => None,
+        }
+    }
+
+    pub fn as_str(&self) -> &'static str {
+        match self {
+            TarFormat::Tar => "tar",
+            TarFormat::TarZst => "tar.zst",
+        }
+    }
+}
+
+/// How an export is written.
+#[derive(Clone, Copy, Debug)]
+pub struct ExportOptions {
+    pub format: TarFormat,
+    /// zstd compression level.
+    pub level: i32,
+    /// zstd worker threads; 0 uses one per core.
+    pub threads: u32,
+}
+
+impl Default for ExportOptions {
+    fn default() -> Self {
+        ExportOptions { format: TarFormat::Tar, level: 3, threads: 0 }
+    }
+}
+
+/// Where one file lives in an export.
+#[derive(Serialize, Deserialize, Clone, Debug, PartialEq, Eq)]
+pub struct IndexEntry {
+    /// Offset of the file's data in the uncompressed tar stream.
+    pub offset: u64,
+    pub size: u64,
+    pub sha256sum: String,
+    /// Output offset of the zstd frame holding the file (zstd only).
+    #[serde(default, skip_serializing_if = "Option::is_none")]
+    pub frame_offset: Option<u64>,
+    /// Offset in the uncompressed tar stream at which that frame starts.
+    #[serde(default, skip_serializing_if = "Option::is_none")]
+    pub frame_start: Option<u64>,
+}
+
+/// Sidecar index of an export, keyed by archive member name.
+#[derive(Serialize, Deserialize, Clone, Debug)]
+pub struct ExportIndex {
+    pub format: String,
+    pub entries: BTreeMap<String, IndexEntry>,
+}
+
+// ─────────────────────────────────────────────────────────────
+// Output
+// ─────────────────────────────────────────────────────────────
+
+/// Counts the bytes written to the final output.
+struct Counter<W> {
+    inner: W,
+    count: u64,
+}
+
+impl<W: Write> Write for Counter<W> {
+    fn write(&mut self, buf: &[u8]) -> io::Result<usize> {
+        let n = self.inner.write(buf)?;
+        self.count += n as u64;
+        Ok(n)
+    }
+
+    fn flush(&mut self) -> io::Result<()> {
+        self.inner.flush()
+    }
+}
+
+/// The tar builder's output: counts the uncompressed tar bytes and, for zstd,
+/// compresses them into frames that end between entries.
+struct TarSink<W: Write> {
+    out: Option<Counter<W>>,
+    /// The frame being written (zstd only).
+    encoder: Option<zio::Writer<Counter<W>, raw::Encoder<'static>>>,
+    /// The zstd context between frames, kept so its workers are started once.
+    context: Option<raw::Encoder<'static>>,
+    options: ExportOptions,
+    /// Uncompressed tar bytes written so far.
+    raw: u64,
+    /// Output offset and tar offset of the current zstd frame.
+    frame: (u64, u64),
+    /// Set when the export fails, so the builder cannot append the
+    /// end-of-archive blocks when it is dropped.
+    failed: bool,
+}
+
+fn closed() -> io::Error {
+    io::Error::other("Export output closed")
+}
+
+impl<W: Write> TarSink<W> {
+    fn new(out: W, options: ExportOptions) -> Self {
+        TarSink {
+            out: Some(Counter { inner: out, count: 0 }),
+            encoder: None,
+            context: None,
+            options,
+            raw: 0,
+            frame: (0, 0),
+            failed: false,
+        }
+    }
+
+    fn writer(&mut self) -> io::Result<&mut dyn Write> {
+        if self.failed {
+            return Err(io::Error::other("Export aborted"));
+        }
+        if self.options.format == TarFormat::TarZst && self.encoder.is_none() {
+            let mut context = match self.context.take() {
+                Some(context) => context,
+                None => self.new_context()?,
+            };
+            context.reinit()?;
+            let out = self.out.take().ok_or_else(closed)?;
+            self.frame = (out.count, self.raw);
+            self.encoder = Some(zio::Writer::new(out, context));
+        }
+        match (self.encoder.as_mut(), self.out.as_mut()) {
+            (Some(encoder), _) => Ok(encoder),
+            (None, Some(out)) => Ok(out),
+            (None, None) => Err(closed()),
+        }
+    }
+
+    fn new_context(&self) -> io::Result<raw::Encoder<'static>> {
+        let mut context = raw::Encoder::new(self.options.level)?;
+        let threads = match self.options.threads {
+            0 => rayon::current_num_threads() as u32,
+            n => n,
+        };
+        if threads > 1 {
+            context.set_parameter(raw::CParameter::NbWorkers(threads))?;
+        }
+        Ok(context)
+    }
+
+    /// End the current zstd frame, keeping its context for the next one.
+    fn end_frame(&mut self) -> io::Result<()> {
+        if let Some(mut encoder) = self.encoder.take() {
+            encoder.finish()?;
+            let (out, context) = encoder.into_inner();
+            self.out = Some(out);
+            self.context = Some(context);
+        }
+        Ok(())
+    }
+
+    /// End the current zstd frame if it holds at least `FRAME_SIZE` bytes; the
+    /// next write starts a new one.
+    fn end_full_frame(&mut self) -> io::Result<()> {
+        if self.raw - self.frame.1 >= FRAME_SIZE {
+            self.end_frame()?;
+        }
+        Ok(())
+    }
+
+    fn finish(mut self) -> io::Result<W> {
+        self.end_frame()?;
+        let mut out = self.out.take().ok_or_else(closed)?;
+        out.flush()?;
+        Ok(out.inner)
+    }
+}
+
+impl<W: Write> Write for TarSink<W> {
+    fn write(&mut self, buf: &[u8]) -> io::Result<usize> {
+        let n = self.writer()?.write(buf)?;
+        self.raw += n as u64;
+        Ok(n)
+    }
+
+    fn flush(&mut self) -> io::Result<()> {
+        self.writer()?.flush()
+    }
+}
+
+/// Hashes what is read through it, honouring the I/O limits and cancellation.
+struct HashingReader<'a, R> {
+    inner: R,
+    hasher: Sha256,
+    bytes_read: u64,
+    cancel: &'a CancelToken,
+}
+
+impl<R: Read> Read for HashingReader<'_, R> {
+    fn read(&mut self, buf: &mut [u8]) -> io::Result<usize> {
+        if self.cancel.is_cancelled() {
+            return Err(io::Error::other("Operation cancelled"));
+        }
+        let n = self.inner.read(buf)?;
+        throttle::acquire_bytes(n as u64);
+        self.hasher.update(&buf[..n]);
+        self.bytes_read += n as u64;
+        Ok(n)
+    }
+}
+
+// ─────────────────────────────────────────────────────────────
+// Export
+// ─────────────────────────────────────────────────────────────
+
+fn append_entry<W: Write>(
+    builder: &mut tar::Builder<TarSink<W>>,
+    index: &mut ExportIndex,
+    name: String,
+    data: impl Read,
+    entry: &ManifestEntry,
+    mtime: u64,
+    cancel: &CancelToken,
+) -> Result<()> {
+    builder.get_mut().end_full_frame()?;
+    let mut header = tar::Header::new_gnu();
+    header.set_size(entry.size);
+    header.set_mode(0o644);
+    header.set_mtime(mtime);
+    header.set_entry_type(tar::EntryType::Regular);
+
+    let mut reader = HashingReader {
+        inner: data.take(entry.size),
+        hasher: Sha256::new(),
+        bytes_read: 0,
+        cancel,
+    };
+    if let Err(e) = builder.append_data(&mut header, &name, &mut reader) {
+        return Err(if cancel.is_cancelled() { E4EError::Cancelled } else { e.into() });
+    }
+    if reader.bytes_read != entry.size || hex::encode(reader.hasher.finalize()) != entry.sha256sum {
+        return Err(E4EError::CorruptedDataset);
+    }
+
+    let sink = builder.get_mut();
+    let compressed = sink.options.format == TarFormat::TarZst;
+    index.entries.insert(
+        name,
+        IndexEntry {
+            offset: sink.raw - entry.size.div_ceil(BLOCK_SIZE) * BLOCK_SIZE,
+            size: entry.size,
+            sha256sum: entry.sha256sum.clone(),
+            frame_offset: compressed.then_some(sink.frame.0),
+            frame_start: compressed.then_some(sink.frame.1),
+        },
+    );
+    Ok(())
+}
+
+fn mtime_of(metadata: &fs::Metadata) -> u64 {
+    metadata
+        .modified()
+        .ok()
+        .and_then(|t| t.duration_since(UNIX_EPOCH).ok())
+        .map(|d| d.as_secs())
+        .unwrap_or(0)
+}
+
+/// Write the dataset and its manifest to `out` as a tar stream, with entries
+/// under the dataset's directory name, reporting the exported files as a
+/// `Copy` phase to `progress`.  The dataset must be complete (see
+/// `dataset::check_ready`).  Returns the output and the entry index.
+pub fn export_tar_with_progress<W: Write>(
+    state: &DatasetState,
+    out: W,
+    options: ExportOptions,
+    progress: &Progress,
+) -> Result<(W, ExportIndex)> {
+    let _lock = DatasetLock::shared(&state.root)?;
+    dataset::check_ready(state)?;
+    let manifest_data = dataset::export_manifest(&state.root)?;
+    let manifest_path = state.root.join(MANIFEST_NAME);
+    let manifest_bytes = fs::read(&manifest_path)?;
+    archive::check_file_list(state, &manifest_data)?;
+
+    let dataset_name = state
+        .root
+        .file_name()
+        .unwrap_or_default()
+        .to_string_lossy()
+        .into_owned();
+    let mut keys: Vec<&String> = manifest_data.keys().collect();
+    keys.sort();
+
+    let mut builder = tar::Builder::new(TarSink::new(out, options));
+    let mut index = ExportIndex { format: options.format.as_str().to_string(), entries: BTreeMap::new() };
+    let cancel = progress.cancel_token();
+    let bytes_total = manifest_data.values().map(|e| e.size).sum();
+    progress.start_phase(Phase::Copy, keys.len() as u64, bytes_total);
+
+    let mut write_all = || -> Result<()> {
+        let manifest_entry = ManifestEntry {
+            sha256sum: manifest::hash_bytes(&manifest_bytes),
+            size: manifest_bytes.len() as u64,
+        };
+        append_entry(
+            &mut builder,
+            &mut index,
+            format!("{}/{}", dataset_name, MANIFEST_NAME),
+            manifest_bytes.as_slice(),
+            &manifest_entry,
+            mtime_of(&fs::metadata(&manifest_path)?),
+            cancel,
+        )?;
+        for rel_path in &keys {
+            cancel.check()?;
+            let entry = &manifest_data[rel_path.as_str()];
+            let path = state.root.join(rel_path.as_str());
+            throttle::acquire_file();
+            let file = fs::File::open(&path)
+                .map_err(|e| E4EError::Runtime(format!("Cannot open '{}': {}", path.display(), e)))?;
+            let metadata = file.metadata()?;
+            if metadata.len() != entry.size {
+                return Err(E4EError::CorruptedDataset);
+            }
+            append_entry(
+                &mut builder,
+                &mut index,
+                format!("{}/{}", dataset_name, rel_path),
+                file,
+                entry,
+                mtime_of(&metadata),
+                cancel,
+            )?;
+            progress.advance(1, entry.size);
+        }
+        Ok(())
+    };
+    if let Err(e) = write_all() {
+        builder.get_mut().failed = true;
+        return Err(e);
+    }
+    let out = builder.into_inner()?.finish()?;
+    progress.finish();
+    Ok((out, index))
+}
+
+/// Copy the member `entry` of the export at `archive_path` to `out`, reading
+/// only the zstd frame that holds it, and check its hash.
+pub fn read_indexed_entry(archive_path: &Path, entry: &IndexEntry, out: &mut impl Write) -> Result<()> {
+    let mut file = fs::File::open(archive_path)?;
+    let data: Box<dyn Read> = match (entry.frame_offset, entry.frame_start) {
+        (Some(frame_offset), Some(frame_start)) => {
+            file.seek(SeekFrom::Start(frame_offset))?;
+            let mut decoder = zstd::stream::read::Decoder::new(file)?.single_frame();
+            io::copy(&mut (&mut decoder).take(entry.offset - frame_start), &mut io::sink())?;
+            Box::new(decoder)
+        }
+        _ => {
+            file.seek(SeekFrom::Start(entry.offset))?;
+            Box::new(file)
+        }
+    };
+    let cancel = CancelToken::new();
+    let mut reader = HashingReader { inner: data.take(entry.size), hasher: Sha256::new(), bytes_read: 0, cancel: &cancel };
+    io::copy(&mut reader, out)?;
+    if reader.bytes_read != entry.size || hex::encode(reader.hasher.finalize()) != entry.sha256sum {
+        return Err(E4EError::CorruptedDataset);
+    }
+    Ok(())
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::dataset::{commit_dataset_files, create_dataset, stage_dataset_files};
+    use tempfile::tempdir;
+
+    fn export_tar<W: Write>(state: &DatasetState, out: W, options: ExportOptions) -> Result<(W, ExportIndex)> {
+        export_tar_with_progress(state, out, options, &Progress::new())
+    }
+
+    fn dataset_with(tmp: &tempfile::TempDir, files: &[(&str, Vec<u8>)]) -> DatasetState {
+        let root = tmp.path().join("2023.03.02.Test.SD");
+        let mut state = create_dataset(&root, "2023-03-02").unwrap();
+        let mut paths = Vec::new();
+        for (name, content) in files {
+            let path = tmp.path().join(name);
+            fs::write(&path, content).unwrap();
+            paths.push(path);
+        }
+        stage_dataset_files(&mut state, &paths).unwrap();
+        commit_dataset_files(&mut state).unwrap();
+        state
+    }
+
+    fn sample_files() -> Vec<(&'static str, Vec<u8>)> {
+        vec![
+            ("readme.md", b"readme".to_vec()),
+            ("a.bin", (0..20_000u32).map(|i| (i % 251) as u8).collect()),
+            ("b.csv", b"t,v\n".repeat(5000)),
+        ]
+    }
+
+    #[test]
+    fn tar_export_lists_manifest_first_then_sorted_entries() {
+        let tmp = tempdir().unwrap();
+        let state = dataset_with(&tmp, &sample_files());
+        let (bytes, index) = export_tar(&state, Vec::new(), ExportOptions::default()).unwrap();
+
+        let mut archive = tar::Archive::new(bytes.as_slice());
+        let names: Vec<String> = archive
+            .entries()
+            .unwrap()
+            .map(|e| e.unwrap().path().unwrap().to_string_lossy().into_owned())
+            .collect();
+        assert_eq!(
+            names,
+            vec![
+                "2023.03.02.Test.SD/manifest.json",
+                "2023.03.02.Test.SD/a.bin",
+                "2023.03.02.Test.SD/b.csv",
+                "2023.03.02.Test.SD/readme.md",
+            ]
+        );
+        let entry = &index.entries["2023.03.02.Test.SD/b.csv"];
+        let start = entry.offset as usize;
+        assert_eq!(&bytes[start..start + entry.size as usize], b"t,v\n".repeat(5000).as_slice());
+        assert!(entry.frame_offset.is_none());
+    }
+
+    #[test]
+    fn zstd_entries_can_be_read_back_through_the_index() {
+        let tmp = tempdir().unwrap();
+        let files = sample_files();
+        let state = dataset_with(&tmp, &files);
+        let out_path = tmp.path().join("export.tar.zst");
+        let options = ExportOptions { format: TarFormat::TarZst, level: 3, threads: 2 };
+        let (_, index) = export_tar(&state, fs::File::create(&out_path).unwrap(), options).unwrap();
+
+        for (name, content) in &files {
+            let entry = &index.entries[&format!("2023.03.02.Test.SD/{}", name)];
+            assert!(entry.frame_offset.is_some());
+            let mut data = Vec::new();
+            read_indexed_entry(&out_path, entry, &mut data).unwrap();
+            assert_eq!(&data, content);
+        }
+
+        // The whole stream is still a valid tar once decompressed.
+        let decoded = zstd::decode_all(fs::File::open(&out_path).unwrap()).unwrap();
+        assert_eq!(tar::Archive::new(decoded.as_slice()).entries().unwrap().count(), 4);
+    }
+
+    #[test]
+    fn large_exports_are_split_into_frames_on_one_context() {
+        let tmp = tempdir().unwrap();
+        let big: Vec<u8> = (0..FRAME_SIZE as u32).map(|i| (i % 251) as u8).collect();
+        let files = vec![("a.bin", big.clone()), ("b.bin", big.clone()), ("c.bin", big)];
+        let state = dataset_with(&tmp, &files);
+        let out_path = tmp.path().join("export.tar.zst");
+        let options = ExportOptions { format: TarFormat::TarZst, level: 1, threads: 2 };
+        let (_, index) = export_tar(&state, fs::File::create(&out_path).unwrap(), options).unwrap();
+
+        let frames: std::collections::BTreeSet<u64> =
+            index.entries.values().filter_map(|e| e.frame_offset).collect();
+        assert_eq!(frames.len(), 3);
+        for (name, content) in &files {
+            let entry = &index.entries[&format!("2023.03.02.Test.SD/{}", name)];
+            let mut data = Vec::new();
+            read_indexed_entry(&out_path, entry, &mut data).unwrap();
+            assert_eq!(&data, content);
+        }
+    }
+
+    #[test]
+    fn corrupted_file_aborts_without_end_of_archive() {
+        let tmp = tempdir().unwrap();
+        let state = dataset_with(&tmp, &sample_files());
+        fs::write(state.root.join("a.bin"), vec![7u8; 20_000]).unwrap();
+
+        let mut out = Vec::new();
+        let result = export_tar(&state, &mut out, ExportOptions::default());
+        assert!(matches!(result, Err(E4EError::CorruptedDataset)));
+        // Nothing past the bad entry, and no trailing zero blocks.
+        assert!(!out.ends_with(&[0u8; 1024]));
+    }
+}
@@ -11,15 +11,17 @@ use std::cell::RefCell;
 use std::ffi::{CStr, CString};
 use std::os::raw::c_char;
 use std::path::PathBuf;
+use std::time::Duration;
 
 use serde::Serialize;
 
-use crate::dataset::{self, DatasetState};
-use crate::db::{DatasetDb, DatasetInfo, DatasetMeta};
+use crate::dataset::{self, DatasetState, PushOptions};
+use crate::db::{self, DatasetDb, DatasetInfo};
 use crate::errors::E4EError;
 use crate::manager::{self, DataManagerState};
 use crate::metadata::MetadataRecord;
-use crate::manifest;
+use crate::progress::{self, Progress, Snapshot};
+use crate::throttle::{self, IoPriority};
 
 // ─────────────────────────────────────────────────────────────────────────────
 // Thread-local last-error storage
@@ -86,12 +88,30 @@ impl FfiDataManager {
                     }
                 }
             }
+        } else if let Some(ds) = self.active_dataset.as_mut() {
+            ds.refresh()?;
         }
         self.active_dataset
             .as_mut()
             .ok_or_else(|| E4EError::Runtime("Dataset not active".to_string()))
     }
 
+    /// Catalog mission `mission_name` of the active dataset.
+    fn catalog_active_mission(&self, mission_name: &str) -> crate::errors::Result<()> {
+        match (&self.active_dataset, &self.inner.active_dataset_name) {
+            (Some(ds), Some(name)) => self.inner.catalog_mission(name, ds, mission_name),
+            _ => Err(E4EError::Runtime("Dataset not active".to_string())),
+        }
+    }
+
+    /// Catalog the files just committed to the active dataset.
+    fn catalog_active_committed(&self, committed: &[PathBuf]) -> crate::errors::Result<()> {
+        match (&self.active_dataset, &self.inner.active_dataset_name) {
+            (Some(ds), Some(name)) => self.inner.catalog_committed(name, ds, committed),
+            _ => Err(E4EError::Runtime("Dataset not active".to_string())),
+        }
+    }
+
     /// Sync the active dataset's metadata back into the manager's dataset_infos.
     fn sync_active_dataset_info(&mut self) {
         if let (Some(ds), Some(name)) =
@@ -123,9 +143,13 @@ impl FfiDataManager {
     /// Build a DatasetInfoJson for a given dataset info + loaded state (optional).
     fn dataset_info_to_json(&self, info: &DatasetInfo, active_mission: Option<&str>) -> DatasetInfoJson {
         // Try to load fresh state; fall back to info fields if unavailable.
-        let state_result = dataset::load_dataset_state(&PathBuf::from(&info.root_path));
+        let root = PathBuf::from(&info.root_path);
+        let state_result = dataset::load_dataset_state(&root).and_then(|state| {
+            let counts = DatasetDb::open(&root)?.count_mission_committed_files()?;
+            Ok((state, counts))
+        });
         let missions = match &state_result {
-            Ok(state) => state
+            Ok((state, counts)) => state
                 .missions
                 .iter()
                 .map(|m| MissionInfoJson {
@@ -137,7 +161,7 @@ impl FfiDataManager {
                     device: m.record.metadata.device.clone(),
                     timestamp: m.record.metadata.timestamp.clone(),
                     staged_files: m.staged_files.len(),
-                    committed_files: m.committed_files.len(),
+                    committed_files: counts.get(&m.record.name).copied().unwrap_or(0),
                 })
                 .collect(),
             Err(_) => Vec::new(),
@@ -245,6 +269,7 @@ pub unsafe extern "C" fn e4e_default_config_dir(out: *mut *mut c_char) -> i32 {
 /// `config_dir` must be a valid, non-null, null-terminated UTF-8 C string.
 #[no_mangle]
 pub unsafe extern "C" fn e4e_dm_load(config_dir: *const c_char) -> *mut FfiDataManager {
+    let _session = db::Session::begin();
     let dir = match cstr_to_str(config_dir, "config_dir") {
         Ok(s) => s,
         Err(_) => return std::ptr::null_mut(),
@@ -252,6 +277,7 @@ pub unsafe extern "C" fn e4e_dm_load(config_dir: *const c_char) -> *mut FfiDataM
 
     match DataManagerState::load(&PathBuf::from(dir)) {
         Ok(state) => {
+            state.apply_io_settings();
             let active_mission_name = state.active_mission_name.clone().filter(|s| !s.is_empty());
             let dm = Box::new(FfiDataManager {
                 inner: state,
@@ -286,6 +312,7 @@ pub unsafe extern "C" fn e4e_dm_free(dm: *mut FfiDataManager) {
 /// `dm` and `out` must be valid non-null pointers.
 #[no_mangle]
 pub unsafe extern "C" fn e4e_status(dm: *mut FfiDataManager, out: *mut *mut c_char) -> i32 {
+    let _session = db::Session::begin();
     let dm = &mut *dm;
 
     let active_ds_name = dm.inner.active_dataset_name.clone().unwrap_or_default();
@@ -342,6 +369,7 @@ pub unsafe extern "C" fn e4e_status(dm: *mut FfiDataManager, out: *mut *mut c_ch
 /// `dm` and `out` must be valid non-null pointers.
 #[no_mangle]
 pub unsafe extern "C" fn e4e_list_datasets(dm: *mut FfiDataManager, out: *mut *mut c_char) -> i32 {
+    let _session = db::Session::begin();
     let dm = &mut *dm;
 
     let active_name = dm.inner.active_dataset_name.clone().unwrap_or_default();
@@ -378,6 +406,7 @@ pub unsafe extern "C" fn e4e_list_datasets(dm: *mut FfiDataManager, out: *mut *m
 /// `dm` and `out` must be valid non-null pointers.
 #[no_mangle]
 pub unsafe extern "C" fn e4e_active_dataset(dm: *mut FfiDataManager, out: *mut *mut c_char) -> i32 {
+    let _session = db::Session::begin();
     let dm = &mut *dm;
 
     let active_name = match dm.inner.active_dataset_name.clone().filter(|s| !s.is_empty()) {
@@ -414,6 +443,7 @@ pub unsafe extern "C" fn e4e_initialize_dataset(
     location: *const c_char,
     directory: *const c_char,
 ) -> i32 {
+    let _session = db::Session::begin();
     let dm = &mut *dm;
 
     let date_str = match cstr_to_str(date, "date") { Ok(s) => s, Err(_) => return -1 };
@@ -444,11 +474,6 @@ pub unsafe extern "C" fn e4e_initialize_dataset(
         Err(e) => { set_last_error(&e.to_string()); return -1; }
     };
 
-    if let Err(e) = dataset::save_dataset_state(&state) {
-        set_last_error(&e.to_string());
-        return -1;
-    }
-
     let info = DatasetInfo {
         name: dataset_name.clone(),
         root_path: dataset_path.to_string_lossy().into_owned(),
@@ -463,6 +488,10 @@ pub unsafe extern "C" fn e4e_initialize_dataset(
         set_last_error(&e.to_string());
         return -1;
     }
+    if let Err(e) = dm.inner.catalog_dataset(&dataset_name, &state) {
+        set_last_error(&e.to_string());
+        return -1;
+    }
 
     dm.inner.active_dataset_name = Some(dataset_name);
     dm.inner.active_mission_name = None;
@@ -492,6 +521,7 @@ pub unsafe extern "C" fn e4e_initialize_mission(
     mission_name: *const c_char,
     notes: *const c_char,
 ) -> i32 {
+    let _session = db::Session::begin();
     let dm = &mut *dm;
 
     let timestamp_str = match cstr_to_str(timestamp, "timestamp") { Ok(s) => s, Err(_) => return -1 };
@@ -541,6 +571,10 @@ pub unsafe extern "C" fn e4e_initialize_mission(
         set_last_error(&e.to_string());
         return -1;
     }
+    if let Err(e) = dm.catalog_active_mission(&new_mission_name) {
+        set_last_error(&e.to_string());
+        return -1;
+    }
 
     dm.active_mission_name = Some(new_mission_name.clone());
     dm.inner.active_mission_name = Some(new_mission_name);
@@ -564,6 +598,7 @@ pub unsafe extern "C" fn e4e_activate(
     dataset: *const c_char,
     mission: *const c_char,
 ) -> i32 {
+    let _session = db::Session::begin();
     let dm = &mut *dm;
 
     let dataset_str = match cstr_to_str(dataset, "dataset") { Ok(s) => s, Err(_) => return -1 };
@@ -620,6 +655,7 @@ pub unsafe extern "C" fn e4e_add_files(
     readme: i32,
     destination: *const c_char,
 ) -> i32 {
+    let _session = db::Session::begin();
     let dm = &mut *dm;
 
     let paths_str = match cstr_to_str(paths_json, "paths_json") { Ok(s) => s, Err(_) => return -1 };
@@ -680,6 +716,7 @@ pub unsafe extern "C" fn e4e_add_files(
 /// `dm` must be a valid non-null pointer.
 #[no_mangle]
 pub unsafe extern "C" fn e4e_commit(dm: *mut FfiDataManager, readme: i32) -> i32 {
+    let _session = db::Session::begin();
     let dm = &mut *dm;
 
     if readme != 0 {
@@ -687,12 +724,16 @@ pub unsafe extern "C" fn e4e_commit(dm: *mut FfiDataManager, readme: i32) -> i32
             Ok(ds) => ds,
             Err(e) => { set_last_error(&e.to_string()); return -1; }
         };
-        if let Err(e) = dataset::commit_dataset_files(ds) {
+        let committed = match dataset::commit_dataset_files(ds) {
+            Ok(committed) => committed,
+            Err(e) => { set_last_error(&e.to_string()); return -1; }
+        };
+        dm.sync_active_dataset_info();
+        if let Err(e) = dm.inner.save() {
             set_last_error(&e.to_string());
             return -1;
         }
-        dm.sync_active_dataset_info();
-        if let Err(e) = dm.inner.save() {
+        if let Err(e) = dm.catalog_active_committed(&committed) {
             set_last_error(&e.to_string());
             return -1;
         }
@@ -712,16 +753,20 @@ pub unsafe extern "C" fn e4e_commit(dm: *mut FfiDataManager, readme: i32) -> i32
         Err(e) => { set_last_error(&e.to_string()); return -1; }
     };
 
-    if let Err(e) = dataset::commit_mission_files(ds, &mission_name) {
-        set_last_error(&e.to_string());
-        return -1;
-    }
+    let committed = match dataset::commit_mission_files(ds, &mission_name) {
+        Ok(committed) => committed,
+        Err(e) => { set_last_error(&e.to_string()); return -1; }
+    };
 
     dm.sync_active_dataset_info();
     if let Err(e) = dm.inner.save() {
         set_last_error(&e.to_string());
         return -1;
     }
+    if let Err(e) = dm.catalog_active_committed(&committed) {
+        set_last_error(&e.to_string());
+        return -1;
+    }
 
     0
 }
@@ -731,55 +776,67 @@ pub unsafe extern "C" fn e4e_commit(dm: *mut FfiDataManager, readme: i32) -> i32
 // ─────────────────────────────────────────────────────────────────────────────
 
 /// Optional C progress callback: called with `(current, total)` files processed.
+/// Calls are throttled to `progress::DEFAULT_INTERVAL`, plus the last file of each
+/// phase.
 pub type ProgressFn = unsafe extern "C" fn(current: u64, total: u64);
 
+/// Snapshot of a progress handle, as filled in by `e4e_progress_poll`.
+///
+/// `phase` is 0 idle, 1 hash, 2 copy, 3 verify, 4 done.  File and byte counts are
+/// per phase; `bytes_per_sec` is smoothed over the whole operation.
+#[repr(C)]
+pub struct E4EProgressSnapshot {
+    pub phase: u32,
+    pub files_done: u64,
+    pub files_total: u64,
+    pub bytes_done: u64,
+    pub bytes_total: u64,
+    pub bytes_per_sec: f64,
+    pub elapsed_secs: f64,
+}
+
+impl From<Snapshot> for E4EProgressSnapshot {
+    fn from(s: Snapshot) -> Self {
+        E4EProgressSnapshot {
+            phase: s.phase.to_u8() as u32,
+            files_done: s.files_done,
+            files_total: s.files_total,
+            bytes_done: s.bytes_done,
+            bytes_total: s.bytes_total,
+            bytes_per_sec: s.bytes_per_sec,
+            elapsed_secs: s.elapsed_secs,
+        }
+    }
+}
+
+/// Optional C snapshot callback for a progress handle.
+pub type SnapshotFn = unsafe extern "C" fn(snapshot: *const E4EProgressSnapshot);
+
+/// Opaque progress handle shared between the thread running an operation and
+/// the threads polling it.
+pub type FfiProgress = Progress<'static>;
+
+fn file_progress(cb: Option<ProgressFn>) -> Progress<'static> {
+    match cb {
+        Some(f) => Progress::with_file_callback(progress::DEFAULT_INTERVAL, move |current, total| {
+            unsafe { f(current, total) }
+        }),
+        None => Progress::new(),
+    }
+}
+
 // ─────────────────────────────────────────────────────────────────────────────
 // Shared push / validate implementation
 // ─────────────────────────────────────────────────────────────────────────────
 
-unsafe fn push_impl<F: Fn(u64, u64) + Send + Sync>(
-    dm: &mut FfiDataManager,
-    dest_str: &str,
-    progress: F,
-) -> i32 {
-    let dest_root = PathBuf::from(dest_str);
-
+unsafe fn push_impl(dm: &mut FfiDataManager, dest_str: &str, progress: &Progress) -> i32 {
+    let _session = db::Session::begin();
     let ds = match dm.ensure_active_dataset() {
         Ok(ds) => ds,
         Err(e) => { set_last_error(&e.to_string()); return -1; }
     };
 
-    if let Err(e) = dataset::check_complete(ds) {
-        set_last_error(&e.to_string());
-        return -1;
-    }
-
-    let ds_root = ds.root.clone();
-    let ds_name = ds_root
-        .file_name()
-        .map(|n| n.to_string_lossy().into_owned())
-        .unwrap_or_default();
-    let destination = dest_root.join(&ds_name);
-
-    if destination.exists() {
-        let manifest_path = ds_root.join("manifest.json");
-        match manifest::read_manifest(&manifest_path) {
-            Ok(src_manifest) => {
-                if let Err(e) = dataset::check_destination_is_subset(&src_manifest, &destination) {
-                    set_last_error(&e.to_string());
-                    return -1;
-                }
-            }
-            Err(e) => { set_last_error(&e.to_string()); return -1; }
-        }
-    }
-
-    if let Err(e) = std::fs::create_dir_all(&destination) {
-        set_last_error(&e.to_string());
-        return -1;
-    }
-
-    if let Err(e) = dataset::duplicate_dataset_with_progress(ds, &[destination], progress) {
+    if let Err(e) = dataset::push_dataset_with_progress(ds, dest_str, PushOptions::default(), progress) {
         set_last_error(&e.to_string());
         return -1;
     }
@@ -791,23 +848,9 @@ unsafe fn push_impl<F: Fn(u64, u64) + Send + Sync>(
     };
 
     ds.pushed = true;
-    let db_result = DatasetDb::open(&ds.root.clone());
-    match db_result {
-        Ok(db) => {
-            let meta = DatasetMeta {
-                day_0: ds.day_0.clone(),
-                pushed: true,
-                version: ds.version,
-                last_country: ds.last_country.clone(),
-                last_region: ds.last_region.clone(),
-                last_site: ds.last_site.clone(),
-            };
-            if let Err(e) = db.update_dataset_meta(&meta) {
-                set_last_error(&e.to_string());
-                return -1;
-            }
-        }
-        Err(e) => { set_last_error(&e.to_string()); return -1; }
+    if let Err(e) = dataset::save_dataset_state(ds) {
+        set_last_error(&e.to_string());
+        return -1;
     }
 
     dm.sync_active_dataset_info();
@@ -819,11 +862,8 @@ unsafe fn push_impl<F: Fn(u64, u64) + Send + Sync>(
     0
 }
 
-unsafe fn validate_impl<F: Fn(u64, u64) + Send + Sync>(
-    dm: &mut FfiDataManager,
-    out: *mut *mut c_char,
-    progress: F,
-) -> i32 {
+unsafe fn validate_impl(dm: &mut FfiDataManager, out: *mut *mut c_char, progress: &Progress) -> i32 {
+    let _session = db::Session::begin();
     let ds = match dm.ensure_active_dataset() {
         Ok(ds) => ds,
         Err(e) => { set_last_error(&e.to_string()); return -1; }
@@ -834,6 +874,14 @@ unsafe fn validate_impl<F: Fn(u64, u64) + Send + Sync>(
         Ok(f) => f,
         Err(e) => { set_last_error(&e.to_string()); return -1; }
     };
+    if failures.is_empty() {
+        if let Some(name) = dm.inner.active_dataset_name.as_deref().filter(|n| !n.is_empty()) {
+            if let Err(e) = dm.inner.mark_validated(name) {
+                set_last_error(&e.to_string());
+                return -1;
+            }
+        }
+    }
 
     match serde_json::to_string(&failures) {
         Ok(s) => write_string_out(s, out),
@@ -853,7 +901,7 @@ unsafe fn validate_impl<F: Fn(u64, u64) + Send + Sync>(
 pub unsafe extern "C" fn e4e_push(dm: *mut FfiDataManager, path: *const c_char) -> i32 {
     let dm = &mut *dm;
     let dest_str = match cstr_to_str(path, "path") { Ok(s) => s, Err(_) => return -1 };
-    push_impl(dm, dest_str, |_, _| {})
+    push_impl(dm, dest_str, &Progress::new())
 }
 
 /// Push with a progress callback `cb(current, total)`.  Pass NULL for no progress reporting.
@@ -868,11 +916,24 @@ pub unsafe extern "C" fn e4e_push_with_progress(
 ) -> i32 {
     let dm = &mut *dm;
     let dest_str = match cstr_to_str(path, "path") { Ok(s) => s, Err(_) => return -1 };
-    push_impl(dm, dest_str, move |current, total| {
-        if let Some(f) = cb {
-            f(current, total);
-        }
-    })
+    push_impl(dm, dest_str, &file_progress(cb))
+}
+
+/// Push, reporting to a handle from `e4e_progress_new` that another thread may
+/// poll while this call runs.
+///
+/// # Safety
+/// `dm`, `path` and `progress` must be valid non-null pointers; `progress` must
+/// outlive the call.
+#[no_mangle]
+pub unsafe extern "C" fn e4e_push_with_progress_handle(
+    dm: *mut FfiDataManager,
+    path: *const c_char,
+    progress: *const FfiProgress,
+) -> i32 {
+    let dm = &mut *dm;
+    let dest_str = match cstr_to_str(path, "path") { Ok(s) => s, Err(_) => return -1 };
+    push_impl(dm, dest_str, &*progress)
 }
 
 /// Validate the active dataset and return a JSON array of failure strings.
@@ -883,7 +944,7 @@ pub unsafe extern "C" fn e4e_push_with_progress(
 #[no_mangle]
 pub unsafe extern "C" fn e4e_validate(dm: *mut FfiDataManager, out: *mut *mut c_char) -> i32 {
     let dm = &mut *dm;
-    validate_impl(dm, out, |_, _| {})
+    validate_impl(dm, out, &Progress::new())
 }
 
 /// Validate with a progress callback `cb(current, total)`.  Pass NULL for no progress reporting.
@@ -897,11 +958,90 @@ pub unsafe extern "C" fn e4e_validate_with_progress(
     cb: Option<ProgressFn>,
 ) -> i32 {
     let dm = &mut *dm;
-    validate_impl(dm, out, move |current, total| {
-        if let Some(f) = cb {
-            f(current, total);
-        }
-    })
+    validate_impl(dm, out, &file_progress(cb))
+}
+
+/// Validate, reporting to a handle from `e4e_progress_new`.
+///
+/// # Safety
+/// `dm`, `out` and `progress` must be valid non-null pointers; `progress` must
+/// outlive the call.
+#[no_mangle]
+pub unsafe extern "C" fn e4e_validate_with_progress_handle(
+    dm: *mut FfiDataManager,
+    out: *mut *mut c_char,
+    progress: *const FfiProgress,
+) -> i32 {
+    let dm = &mut *dm;
+    validate_impl(dm, out, &*progress)
+}
+
+// ─────────────────────────────────────────────────────────────────────────────
+// Progress handles
+// ─────────────────────────────────────────────────────────────────────────────
+
+/// Create a progress handle.  If `cb` is non-null it is called with a snapshot at
+/// most once every `interval_ms` milliseconds, at each phase change and when a
+/// phase's last file is done.  Free with `e4e_progress_free`.
+///
+/// # Safety
+/// `cb`, if non-null, must be safe to call from any thread.
+#[no_mangle]
+pub unsafe extern "C" fn e4e_progress_new(interval_ms: u64, cb: Option<SnapshotFn>) -> *mut FfiProgress {
+    let progress = match cb {
+        Some(f) => Progress::with_callback(Duration::from_millis(interval_ms), move |s| {
+            let snapshot = E4EProgressSnapshot::from(*s);
+            unsafe { f(&snapshot) }
+        }),
+        None => Progress::new(),
+    };
+    Box::into_raw(Box::new(progress))
+}
+
+/// Free a progress handle.  Passing null is a no-op.
+///
+/// # Safety
+/// `progress` must be null or a handle from `e4e_progress_new` that no running
+/// operation still uses.
+#[no_mangle]
+pub unsafe extern "C" fn e4e_progress_free(progress: *mut FfiProgress) {
+    if !progress.is_null() {
+        drop(Box::from_raw(progress));
+    }
+}
+
+/// Copy the current state of `progress` into `*out`.  Safe to call from any
+/// thread while an operation is running.
+///
+/// # Safety
+/// `progress` and `out` must be valid non-null pointers.
+#[no_mangle]
+pub unsafe extern "C" fn e4e_progress_poll(
+    progress: *const FfiProgress,
+    out: *mut E4EProgressSnapshot,
+) -> i32 {
+    if progress.is_null() || out.is_null() {
+        set_last_error("progress and out must not be null");
+        return -1;
+    }
+    *out = (*progress).snapshot().into();
+    0
+}
+
+/// Ask the operation using `progress` to stop.  It returns -1 with the last
+/// error "Operation cancelled" once its workers reach the next file or chunk;
+/// temp files are removed and no destination manifest is written.
+///
+/// # Safety
+/// `progress` must be a valid non-null pointer.
+#[no_mangle]
+pub unsafe extern "C" fn e4e_progress_cancel(progress: *const FfiProgress) -> i32 {
+    if progress.is_null() {
+        set_last_error("progress must not be null");
+        return -1;
+    }
+    (*progress).cancel_token().cancel();
+    0
 }
 
 /// Remove a mission from a named dataset.
@@ -914,6 +1054,7 @@ pub unsafe extern "C" fn e4e_remove_mission(
     dataset: *const c_char,
     mission: *const c_char,
 ) -> i32 {
+    let _session = db::Session::begin();
     let dm = &mut *dm;
 
     let dataset_str = match cstr_to_str(dataset, "dataset") { Ok(s) => s, Err(_) => return -1 };
@@ -936,6 +1077,10 @@ pub unsafe extern "C" fn e4e_remove_mission(
         set_last_error(&e.to_string());
         return -1;
     }
+    if let Err(e) = dm.inner.uncatalog_mission(dataset_str, mission_str) {
+        set_last_error(&e.to_string());
+        return -1;
+    }
 
     if dm.inner.active_dataset_name.as_deref() == Some(dataset_str) {
         if dm.active_mission_name.as_deref() == Some(mission_str) {
@@ -960,6 +1105,7 @@ pub unsafe extern "C" fn e4e_remove_mission(
 /// `dm` and `out` must be valid non-null pointers.
 #[no_mangle]
 pub unsafe extern "C" fn e4e_prune(dm: *mut FfiDataManager, out: *mut *mut c_char) -> i32 {
+    let _session = db::Session::begin();
     let dm = &mut *dm;
 
     let mut to_remove: Vec<String> = Vec::new();
@@ -984,6 +1130,7 @@ pub unsafe extern "C" fn e4e_prune(dm: *mut FfiDataManager, out: *mut *mut c_cha
         if let Some(info) = dm.inner.find_dataset(name).cloned() {
             let root = PathBuf::from(&info.root_path);
             if root.exists() {
+                db::release_dataset(&root);
                 if let Err(e) = std::fs::remove_dir_all(&root) {
                     set_last_error(&e.to_string());
                     return -1;
@@ -1006,3 +1153,60 @@ pub unsafe extern "C" fn e4e_prune(dm: *mut FfiDataManager, out: *mut *mut c_cha
         Err(e) => { set_last_error(&e.to_string()); -1 }
     }
 }
+
+/// Set the process-wide I/O limits (0 = unlimited) and priority hint without
+/// persisting them.  Safe to call from a progress callback while an operation
+/// is running; the new rates apply from the next chunk read.
+/// `priority` is one of "normal", "low", "idle", or NULL to leave it unchanged.
+///
+/// # Safety
+/// `priority` must be a valid null-terminated UTF-8 C string or null.
+#[no_mangle]
+pub unsafe extern "C" fn e4e_set_io_limits(
+    bytes_per_sec: u64,
+    files_per_sec: u64,
+    priority: *const c_char,
+) -> i32 {
+    if let Some(p) = cstr_to_opt_str(priority) {
+        match IoPriority::parse(p) {
+            Some(p) => throttle::set_priority(p),
+            None => {
+                set_last_error(&format!("Unknown I/O priority: {}", p));
+                return -1;
+            }
+        }
+    }
+    throttle::set_limits(bytes_per_sec, files_per_sec);
+    0
+}
+
+/// Persist I/O limits and priority in the manager config and apply them.
+///
+/// # Safety
+/// `dm` must be a valid non-null pointer; `priority` as for `e4e_set_io_limits`.
+#[no_mangle]
+pub unsafe extern "C" fn e4e_dm_set_io_config(
+    dm: *mut FfiDataManager,
+    bytes_per_sec: u64,
+    files_per_sec: u64,
+    priority: *const c_char,
+) -> i32 {
+    let dm = &mut *dm;
+    if let Some(p) = cstr_to_opt_str(priority) {
+        match IoPriority::parse(p) {
+            Some(p) => dm.inner.io_priority = p,
+            None => {
+                set_last_error(&format!("Unknown I/O priority: {}", p));
+                return -1;
+            }
+        }
+    }
+    dm.inner.io_bytes_per_sec = bytes_per_sec;
+    dm.inner.io_files_per_sec = files_per_sec;
+    dm.inner.apply_io_settings();
+    if let Err(e) = dm.inner.save() {
+        set_last_error(&e.to_string());
+        return -1;
+    }
+    0
+}
@@ -1,11 +1,37 @@
+#[cfg(any(test, feature = "python"))]
+pub(crate) mod archive;
+pub(crate) mod cancel;
 pub(crate) mod db;
 pub(crate) mod dataset;
+pub(crate) mod durability;
 pub(crate) mod errors;
+#[cfg(any(test, feature = "python"))]
+pub(crate) mod export;
 pub(crate) mod ffi;
+#[cfg(any(test, feature = "python"))]
+pub(crate) mod listing;
+pub(crate) mod lock;
 pub(crate) mod manifest;
 pub(crate) mod metadata;
+pub(crate) mod objstore;
+pub(crate) mod progress;
 pub(crate) mod manager;
+pub(crate) mod throttle;
+pub(crate) mod trace;
 pub(crate) mod utils;
 
 #[cfg(feature = "python")]
 mod python;
+
+/// The internals measured by the criterion benchmarks in `benches/`.
+#[cfg(feature = "bench")]
+#[doc(hidden)]
+pub mod bench {
+    pub use crate::dataset::{load_dataset_state, save_dataset_state, DatasetState, MissionState};
+    pub use crate::db::MissionRecord;
+    pub use crate::manifest::{
+        compute_file_hash, copy_and_verify, read_manifest, write_manifest, ManifestData,
+        ManifestEntry,
+    };
+    pub use crate::metadata::MetadataRecord;
+}
@@ -0,0 +1,427 @@
+// listing.rs – directory listings annotated with what the active dataset holds.
+//
+// `e4edm ls` shows each entry of a directory with its size, whether the active
+// mission has it staged or the dataset has it committed, and whether the
+// dataset already holds a file with the same content.  The entries of each
+// directory are stat'ed in parallel in one pass; with `recursive` or `totals`
+// the walk descends into subdirectories, each of which is walked in parallel
+// too, and sums the bytes and files below every directory.
+//
+// Content is compared without reading files where possible: a file whose size
+// matches a manifest entry is a duplicate if its hash is already known (from
+// its staging record) and is one of the hashes of that size, and a possible
+// duplicate otherwise.  With `hash` the possible duplicates are read to decide.
+// Only the manifest entries under the listed directory are loaded; the hashes
+// of each size are looked up (by the manifest's size index) as sizes come up.
+//
+// An entry that cannot be stat'ed or read, or a directory that cannot be
+// walked, is listed as unreadable rather than failing the whole listing.
+
+use std::collections::hash_map::Entry;
+use std::collections::{HashMap, HashSet};
+use std::fs;
+use std::path::{Path, PathBuf};
+use std::time::UNIX_EPOCH;
+
+use parking_lot::Mutex;
+use rayon::prelude::*;
+
+use crate::dataset::DatasetState;
+use crate::db::DatasetDb;
+use crate::errors::Result;
+use crate::manifest::{self, ManifestData};
+
+/// Where a listed file stands in the active dataset.
+#[derive(Clone, Copy, Debug, PartialEq, Eq)]
+pub enum Tracked {
+    /// Staged in the active mission, or as a readme.
+    Staged,
+    /// In the dataset manifest at this path.
+    Committed,
+}
+
+impl Tracked {
+    pub fn as_str(&self) -> &'static str {
+        match self {
+            Tracked::Staged => "staged",
+            Tracked::Committed => "committed",
+        }
+    }
+}
+
+/// How a listed file matches a file already in the dataset.
+#[derive(Clone, Copy, Debug, PartialEq, Eq)]
+pub enum ContentMatch {
+    /// Same size and hash.
+    Hash,
+    /// Same size; the hash is not known.
+    Size,
+}
+
+impl ContentMatch {
+    pub fn as_str(&self) -> &'static str {
+        match self {
+            ContentMatch::Hash => "hash",
+            ContentMatch::Size => "size",
+        }
+    }
+}
+
+#[derive(Clone, Copy, Debug, Default)]
+pub struct ListOptions {
+    /// List the contents of subdirectories too.
+    pub recursive: bool,
+    /// Sum the bytes and files below each directory, even if not listed.
+    pub totals: bool,
+    /// Hash files whose size matches a dataset file but whose hash is unknown.
+    pub hash: bool,
+}
+
+#[derive(Clone, Debug)]
+pub struct ListEntry {
+    /// Posix path relative to the listed directory.
+    pub path: String,
+    /// 0 for entries of the listed directory itself.
+    pub depth: usize,
+    pub is_dir: bool,
+    /// The file size, or the bytes below a directory; `None` for a directory
+    /// that was not walked.
+    pub size: Option<u64>,
+    /// The files below a directory that was walked.
+    pub files: Option<u64>,
+    /// Modification time, in seconds since the epoch.
+    pub mtime: f64,
+    pub tracked: Option<Tracked>,
+    pub content: Option<ContentMatch>,
+    /// The entry could not be stat'ed or read, or the directory walked.
+    pub unreadable: bool,
+}
+
+/// What the listed entries are compared against: the active dataset's
+/// manifest and the active mission's staged files.  Empty without an active
+/// dataset.
+#[derive(Default)]
+pub struct ListContext {
+    root: Option<PathBuf>,
+    db: Option<DatasetDb>,
+    /// The manifest entries under the listed directory.
+    manifest: ManifestData,
+    /// The manifest hashes of each file size looked up so far.
+    hashes_by_size: Mutex<HashMap<u64, HashSet<String>>>,
+    /// Staged origin paths, canonicalized, with their hashes if known.
+    staged: HashMap<PathBuf, Option<String>>,
+}
+
+impl ListContext {
+    /// Reads the manifest entries of `state` under `dir`, the directory to be
+    /// listed, and the staged files of `mission_name`.
+    pub fn new(state: &DatasetState, mission_name: Option<&str>, dir: &Path) -> Result<Self> {
+        let db = DatasetDb::open(&state.root)?;
+        let root = canonical(&state.root);
+        let manifest = match canonical(dir).strip_prefix(&root) {
+            Ok(rel) if rel.as_os_str().is_empty() => db.get_manifest()?,
+            Ok(rel) => db.get_manifest_dir(&posix(rel))?,
+            Err(_) => ManifestData::new(),
+        };
+        let mut staged: HashMap<PathBuf, Option<String>> = state
+            .missions
+            .iter()
+            .filter(|m| Some(m.record.name.as_str()) == mission_name)
+            .flat_map(|m| m.staged_files.iter())
+            .map(|f| (canonical(Path::new(&f.origin_path)), Some(f.hash.clone())))
+            .collect();
+        staged.extend(state.staged_files.iter().map(|p| (canonical(p), None)));
+        Ok(ListContext {
+            root: Some(root),
+            db: Some(db),
+            manifest,
+            hashes_by_size: Mutex::default(),
+            staged,
+        })
+    }
+
+    /// Whether the manifest has a file of `size`, and if so whether one of
+    /// them has the hash `sha256`.
+    fn has_size(&self, size: u64, sha256: Option<&str>) -> Result<bool> {
+        let Some(db) = &self.db else {
+            return Ok(false);
+        };
+        let mut cache = self.hashes_by_size.lock();
+        let hashes = match cache.entry(size) {
+            Entry::Occupied(e) => e.into_mut(),
+            Entry::Vacant(e) => e.insert(db.get_manifest_hashes_of_size(size)?),
+        };
+        Ok(!hashes.is_empty() && sha256.is_none_or(|h| hashes.contains(h)))
+    }
+
+    fn tracked(&self, path: &Path) -> Option<Tracked> {
+        if self.staged.contains_key(path) {
+            return Some(Tracked::Staged);
+        }
+        let rel = path.strip_prefix(self.root.as_ref()?).ok()?;
+        self.manifest.contains_key(&posix(rel)).then_some(Tracked::Committed)
+    }
+
+    fn content(&self, path: &Path, size: u64, hash: bool) -> Result<Option<ContentMatch>> {
+        if !self.has_size(size, None)? {
+            return Ok(None);
+        }
+        let known = match self.staged.get(path) {
+            Some(Some(h)) => Some(h.clone()),
+            _ if hash => Some(manifest::compute_file_hash(path)?),
+            _ => None,
+        };
+        Ok(match known {
+            Some(h) if self.has_size(size, Some(&h))? => Some(ContentMatch::Hash),
+            Some(_) => None,
+            None => Some(ContentMatch::Size),
+        })
+    }
+}
+
+/// List `dir`: directories first, then files, each sorted by name, with the
+/// contents of a directory following it when `options.recursive` is set.
+pub fn list_dir(
+    dir: &Path,
+    context: &ListContext,
+    options: ListOptions,
+) -> Result<Vec<ListEntry>> {
+    let (entries, _) = walk(&canonical(dir), "", 0, context, options)?;
+    Ok(entries)
+}
+
+/// Bytes and files below a directory.
+type Totals = (u64, u64);
+
+fn walk(
+    dir: &Path,
+    prefix: &str,
+    depth: usize,
+    context: &ListContext,
+    options: ListOptions,
+) -> Result<(Vec<ListEntry>, Totals)> {
+    // Entries that vanish or cannot be read while the directory is read are
+    // left out; the directory itself failing is the caller's to report.
+    let mut names: Vec<_> = fs::read_dir(dir)?
+        .filter_map(|entry| entry.ok().map(|e| e.file_name()))
+        .collect();
+    names.sort();
+    let listed = names
+        .par_iter()
+        .map(|name| {
+            let rel = if prefix.is_empty() {
+                name.to_string_lossy().into_owned()
+            } else {
+                format!("{}/{}", prefix, name.to_string_lossy())
+            };
+            list_entry(&dir.join(name), rel, depth, context, options)
+        })
+        .collect::<Vec<_>>();
+
+    let mut totals = (0, 0);
+    let mut dirs = Vec::new();
+    let mut files = Vec::new();
+    for (entry, children) in listed {
+        if entry.is_dir {
+            totals.0 += entry.size.unwrap_or(0);
+            totals.1 += entry.files.unwrap_or(0);
+            dirs.push(entry);
+            dirs.extend(children);
+        } else {
+            totals.0 += entry.size.unwrap_or(0);
+            totals.1 += 1;
+            files.push(entry);
+        }
+    }
+    dirs.extend(files);
+    Ok((dirs, totals))
+}
+
+/// Stat one entry and, for a directory that is walked, list what is below it.
+/// What cannot be stat'ed, read or walked is marked unreadable.
+fn list_entry(
+    path: &Path,
+    rel: String,
+    depth: usize,
+    context: &ListContext,
+    options: ListOptions,
+) -> (ListEntry, Vec<ListEntry>) {
+    let mut entry = ListEntry {
+        path: rel,
+        depth,
+        is_dir: false,
+        size: None,
+        files: None,
+        mtime: 0.0,
+        tracked: None,
+        content: None,
+        unreadable: false,
+    };
+    // Symbolic links are described by their targets but never descended into.
+    let Ok(link) = fs::symlink_metadata(path) else {
+        entry.unreadable = true;
+        return (entry, Vec::new());
+    };
+    let is_link = link.file_type().is_symlink();
+    let meta = if is_link { fs::metadata(path).unwrap_or(link) } else { link };
+    let mtime = meta
+        .modified()
+        .ok()
+        .and_then(|t| t.duration_since(UNIX_EPOCH).ok())
+        .map(|d| d.as_secs_f64())
+        .unwrap_or(0.0);
+    entry.is_dir = meta.is_dir();
+    entry.mtime = mtime;
+    let mut children = Vec::new();
+    if entry.is_dir {
+        if (options.recursive || options.totals) && !is_link {
+            match walk(path, &entry.path, depth + 1, context, options) {
+                Ok((below, (bytes, files))) => {
+                    entry.size = Some(bytes);
+                    entry.files = Some(files);
+                    if options.recursive {
+                        children = below;
+                    }
+                }
+                Err(_) => entry.unreadable = true,
+            }
+        }
+    } else {
+        entry.size = Some(meta.len());
+        entry.tracked = context.tracked(path);
+        if entry.tracked != Some(Tracked::Committed) {
+            match context.content(path, meta.len(), options.hash) {
+                Ok(content) => entry.content = content,
+                Err(_) => entry.unreadable = true,
+            }
+        }
+    }
+    (entry, children)
+}
+
+fn canonical(path: &Path) -> PathBuf {
+    fs::canonicalize(path)
+        .or_else(|_| std::path::absolute(path))
+        .unwrap_or_else(|_| path.to_path_buf())
+}
+
+fn posix(rel: &Path) -> String {
+    rel.components()
+        .map(|c| c.as_os_str().to_string_lossy().into_owned())
+        .collect::<Vec<_>>()
+        .join("/")
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::dataset::{add_mission, commit_mission_files, create_dataset, stage_mission_files};
+    use crate::metadata::MetadataRecord;
+    use tempfile::tempdir;
+
+    fn meta(timestamp: &str, mission: &str) -> MetadataRecord {
+        MetadataRecord {
+            timestamp: timestamp.to_string(),
+            device: "Device1".to_string(),
+            country: "USA".to_string(),
+            region: "California".to_string(),
+            site: "SD".to_string(),
+            mission_name: mission.to_string(),
+            properties: "{}".to_string(),
+            notes: String::new(),
+        }
+    }
+
+    fn find<'a>(entries: &'a [ListEntry], path: &str) -> &'a ListEntry {
+        entries.iter().find(|e| e.path == path).unwrap()
+    }
+
+    #[test]
+    fn lists_directories_first_with_totals() {
+        let tmp = tempdir().unwrap();
+        fs::create_dir_all(tmp.path().join("b/c")).unwrap();
+        fs::write(tmp.path().join("a.bin"), b"12345").unwrap();
+        fs::write(tmp.path().join("b/x.bin"), b"123").unwrap();
+        fs::write(tmp.path().join("b/c/y.bin"), b"1234").unwrap();
+        let context = ListContext::default();
+
+        let flat = list_dir(tmp.path(), &context, ListOptions::default()).unwrap();
+        let paths: Vec<&str> = flat.iter().map(|e| e.path.as_str()).collect();
+        assert_eq!(paths, ["b", "a.bin"]);
+        assert_eq!(flat[0].size, None);
+        assert_eq!(flat[1].size, Some(5));
+
+        let options = ListOptions { recursive: true, ..Default::default() };
+        let tree = list_dir(tmp.path(), &context, options).unwrap();
+        let paths: Vec<&str> = tree.iter().map(|e| e.path.as_str()).collect();
+        assert_eq!(paths, ["b", "b/c", "b/c/y.bin", "b/x.bin", "a.bin"]);
+        assert_eq!((find(&tree, "b").size, find(&tree, "b").files), (Some(7), Some(2)));
+        assert_eq!(find(&tree, "b/c/y.bin").depth, 2);
+
+        let options = ListOptions { totals: true, ..Default::default() };
+        let totals = list_dir(tmp.path(), &context, options).unwrap();
+        assert_eq!(totals.len(), 2);
+        assert_eq!(totals[0].size, Some(7));
+    }
+
+    #[cfg(unix)]
+    #[test]
+    fn unreadable_directories_do_not_fail_the_listing() {
+        use std::os::unix::fs::PermissionsExt;
+        // Permissions do not keep root out.
+        if unsafe { libc::geteuid() } == 0 {
+            return;
+        }
+        let tmp = tempdir().unwrap();
+        fs::create_dir_all(tmp.path().join("locked/inner")).unwrap();
+        fs::write(tmp.path().join("a.bin"), b"12345").unwrap();
+        fs::set_permissions(tmp.path().join("locked"), fs::Permissions::from_mode(0o000)).unwrap();
+
+        let options = ListOptions { recursive: true, ..Default::default() };
+        let listed = list_dir(tmp.path(), &ListContext::default(), options);
+        fs::set_permissions(tmp.path().join("locked"), fs::Permissions::from_mode(0o755)).unwrap();
+        let listed = listed.unwrap();
+        let paths: Vec<&str> = listed.iter().map(|e| e.path.as_str()).collect();
+        assert_eq!(paths, ["locked", "a.bin"]);
+        assert!(find(&listed, "locked").unreadable);
+        assert_eq!(find(&listed, "locked").size, None);
+        assert!(!find(&listed, "a.bin").unreadable);
+    }
+
+    #[test]
+    fn annotates_staged_committed_and_duplicate_files() {
+        let tmp = tempdir().unwrap();
+        let root = tmp.path().join("ds");
+        let card = tmp.path().join("card");
+        fs::create_dir_all(&card).unwrap();
+        let mut state = create_dataset(&root, "2023-03-02").unwrap();
+        add_mission(&mut state, &meta("2023-03-02T10:00:00+00:00", "M1")).unwrap();
+        fs::write(card.join("old.bin"), b"committed").unwrap();
+        stage_mission_files(&mut state, "ED-00 M1", &[card.join("old.bin")], None).unwrap();
+        commit_mission_files(&mut state, "ED-00 M1").unwrap();
+        fs::write(card.join("new.bin"), b"fresh").unwrap();
+        fs::write(card.join("copy.bin"), b"committed").unwrap();
+        fs::write(card.join("other.bin"), b"different").unwrap();
+        stage_mission_files(&mut state, "ED-00 M1", &[card.join("new.bin")], None).unwrap();
+
+        let context = ListContext::new(&state, Some("ED-00 M1"), &card).unwrap();
+        let listed = list_dir(&card, &context, ListOptions::default()).unwrap();
+        assert_eq!(find(&listed, "new.bin").tracked, Some(Tracked::Staged));
+        assert_eq!(find(&listed, "new.bin").content, None);
+        assert_eq!(find(&listed, "old.bin").tracked, None);
+        assert_eq!(find(&listed, "copy.bin").content, Some(ContentMatch::Size));
+        assert_eq!(find(&listed, "other.bin").content, Some(ContentMatch::Size));
+
+        let options = ListOptions { hash: true, ..Default::default() };
+        let hashed = list_dir(&card, &context, options).unwrap();
+        assert_eq!(find(&hashed, "copy.bin").content, Some(ContentMatch::Hash));
+        assert_eq!(find(&hashed, "other.bin").content, None);
+
+        let context = ListContext::new(&state, Some("ED-00 M1"), &root.join("ED-00")).unwrap();
+        assert_eq!(context.manifest.len(), 1);
+        let options = ListOptions { recursive: true, ..Default::default() };
+        let in_dataset = list_dir(&root.join("ED-00"), &context, options).unwrap();
+        assert_eq!(find(&in_dataset, "M1/old.bin").tracked, Some(Tracked::Committed));
+        assert_eq!(find(&in_dataset, "M1/old.bin").content, None);
+    }
+}
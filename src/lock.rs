@@ -0,0 +1,197 @@
+// lock.rs – advisory locks for several processes working on one dataset.
+//
+// The CLI, the GUI and scripts may all have a dataset open at once.  SQLite
+// keeps each transaction on `.e4edm.db` consistent, but an operation such as a
+// commit spans file copies, manifest writes and several transactions.  These
+// locks keep such operations from interleaving:
+//
+//   dataset   held shared by every operation on one part of the dataset and by
+//             duplicates; held exclusively by those on all of it (pushing,
+//             removing a mission)
+//   part      one per mission, plus one for the readme files, held exclusively
+//             while that part's files are staged or committed
+//   manifest  held exclusively while `manifest.json` is exported
+//
+// so two processes can ingest into different missions at the same time, while
+// a push waits for both to finish.  The lock files live outside the dataset, in
+// a directory of the user's cache directory named for the dataset's path (see
+// `lock_dir`), and are never deleted.  A lock held elsewhere is waited for up
+// to `LOCK_TIMEOUT`, like SQLite's busy timeout, and then reported as busy.
+//
+// The locks belong to the open file, not the process, so an operation must not
+// take a lock that its caller already holds.  Where the file system does not
+// support locking, operations go ahead unlocked.
+
+use std::fs::{self, File, OpenOptions, TryLockError};
+use std::io;
+use std::path::{Path, PathBuf};
+use std::thread;
+use std::time::{Duration, Instant};
+
+use directories::ProjectDirs;
+use sha2::{Digest, Sha256};
+
+use crate::errors::{E4EError, Result};
+
+/// How long to wait for a lock held by another process.
+const LOCK_TIMEOUT: Duration = Duration::from_secs(10);
+const POLL_INTERVAL: Duration = Duration::from_millis(50);
+
+/// Locks held on a dataset, released when dropped.
+#[must_use]
+pub struct DatasetLock {
+    _files: Vec<File>,
+}
+
+impl DatasetLock {
+    /// The whole dataset, for operations that must not overlap any other.
+    pub fn exclusive(root: &Path) -> Result<Self> {
+        Self::acquire(root, &[("dataset", Mode::Exclusive)], LOCK_TIMEOUT)
+    }
+
+    /// The whole dataset, shared with other readers and with operations on
+    /// single missions.
+    #[cfg_attr(not(feature = "python"), allow(dead_code))]
+    pub fn shared(root: &Path) -> Result<Self> {
+        Self::acquire(root, &[("dataset", Mode::Shared)], LOCK_TIMEOUT)
+    }
+
+    /// One mission, leaving the rest of the dataset to other processes.
+    pub fn mission(root: &Path, mission_name: &str) -> Result<Self> {
+        Self::part(root, &mission_lock_name(mission_name), LOCK_TIMEOUT)
+    }
+
+    /// The dataset-level (readme) files.
+    pub fn readme(root: &Path) -> Result<Self> {
+        Self::part(root, "readme", LOCK_TIMEOUT)
+    }
+
+    /// The exported `manifest.json`.
+    pub fn manifest(root: &Path) -> Result<Self> {
+        Self::acquire(root, &[("manifest", Mode::Exclusive)], LOCK_TIMEOUT)
+    }
+
+    fn part(root: &Path, name: &str, timeout: Duration) -> Result<Self> {
+        Self::acquire(root, &[("dataset", Mode::Shared), (name, Mode::Exclusive)], timeout)
+    }
+
+    fn acquire(root: &Path, locks: &[(&str, Mode)], timeout: Duration) -> Result<Self> {
+        let dir = lock_dir(root);
+        fs::create_dir_all(&dir)?;
+        let mut files = Vec::with_capacity(locks.len());
+        for (name, mode) in locks {
+            let file = OpenOptions::new()
+                .read(true)
+                .write(true)
+                .create(true)
+                .truncate(false)
+                .open(dir.join(name))?;
+            if lock_file(&file, *mode, timeout)? {
+                files.push(file);
+            }
+        }
+        Ok(DatasetLock { _files: files })
+    }
+}
+
+/// The directory holding the lock files of the dataset at `root`, keyed by a hash
+/// of its canonical path so every process working on the dataset finds the same
+/// one, in the user's cache directory (or the temp directory, without a home).
+fn lock_dir(root: &Path) -> PathBuf {
+    let root = fs::canonicalize(root).unwrap_or_else(|_| root.to_path_buf());
+    let key = hex::encode(&Sha256::digest(root.to_string_lossy().as_bytes())[..16]);
+    ProjectDirs::from("", "", "E4EDataManagement")
+        .map(|dirs| dirs.cache_dir().to_path_buf())
+        .unwrap_or_else(std::env::temp_dir)
+        .join("locks")
+        .join(key)
+}
+
+#[derive(Clone, Copy)]
+enum Mode {
+    Shared,
+    Exclusive,
+}
+
+/// Lock `file`, waiting up to `timeout` for other holders.  Returns false if
+/// the file system cannot lock files.
+fn lock_file(file: &File, mode: Mode, timeout: Duration) -> Result<bool> {
+    let deadline = Instant::now() + timeout;
+    loop {
+        let attempt = match mode {
+            Mode::Shared => file.try_lock_shared(),
+            Mode::Exclusive => file.try_lock(),
+        };
+        match attempt {
+            Ok(()) => return Ok(true),
+            Err(TryLockError::Error(e)) if e.kind() == io::ErrorKind::Unsupported => {
+                return Ok(false)
+            }
+            Err(TryLockError::Error(e)) => return Err(e.into()),
+            Err(TryLockError::WouldBlock) if Instant::now() < deadline => {
+                thread::sleep(POLL_INTERVAL)
+            }
+            Err(TryLockError::WouldBlock) => {
+                return Err(E4EError::Runtime(
+                    "Dataset is busy: another e4edm process is working on it; \
+                     try again once it has finished"
+                        .to_string(),
+                ))
+            }
+        }
+    }
+}
+
+/// The lock file name for a mission: its name with anything but letters,
+/// digits, `-` and `.` replaced, so nested mission names stay one file.
+fn mission_lock_name(mission_name: &str) -> String {
+    let safe: String = mission_name
+        .chars()
+        .map(|c| if c.is_ascii_alphanumeric() || c == '-' || c == '.' { c } else { '_' })
+        .collect();
+    format!("mission-{}", safe)
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use tempfile::tempdir;
+
+    #[test]
+    fn missions_lock_independently() {
+        let tmp = tempdir().unwrap();
+        let m1 = DatasetLock::mission(tmp.path(), "ED-00 M1").unwrap();
+        let m2 = DatasetLock::part(tmp.path(), &mission_lock_name("ED-00 M2"), Duration::ZERO);
+        assert!(m2.is_ok());
+        let again = DatasetLock::part(tmp.path(), &mission_lock_name("ED-00 M1"), Duration::ZERO);
+        assert!(matches!(again, Err(E4EError::Runtime(_))));
+        drop(m1);
+    }
+
+    #[test]
+    fn exclusive_lock_waits_for_missions() {
+        let tmp = tempdir().unwrap();
+        let mission = DatasetLock::mission(tmp.path(), "ED-00 M1").unwrap();
+        let exclusive =
+            DatasetLock::acquire(tmp.path(), &[("dataset", Mode::Exclusive)], Duration::ZERO);
+        assert!(exclusive.is_err());
+        drop(mission);
+        let _exclusive = DatasetLock::exclusive(tmp.path()).unwrap();
+        let shared = DatasetLock::acquire(tmp.path(), &[("dataset", Mode::Shared)], Duration::ZERO);
+        assert!(shared.is_err());
+    }
+
+    #[test]
+    fn lock_is_released_on_drop() {
+        let tmp = tempdir().unwrap();
+        drop(DatasetLock::exclusive(tmp.path()).unwrap());
+        let _again = DatasetLock::exclusive(tmp.path()).unwrap();
+        assert!(lock_dir(tmp.path()).join("dataset").is_file());
+        assert_eq!(fs::read_dir(tmp.path()).unwrap().count(), 0);
+    }
+
+    #[test]
+    fn mission_lock_names_are_single_files() {
+        assert_eq!(mission_lock_name("ED-00 reef/right/box"), "mission-ED-00_reef_right_box");
+    }
+}
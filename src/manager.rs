@@ -1,10 +1,15 @@
+use std::collections::{HashMap, HashSet};
 use std::path::{Path, PathBuf};
+use std::sync::Arc;
 
 use directories::ProjectDirs;
 
 use crate::dataset::{self, DatasetState};
-use crate::db::{DatasetInfo, ManagerDb};
+use crate::db::{DatasetDb, DatasetInfo, ManagerDb};
+#[cfg(any(test, feature = "python"))]
+use crate::db::{CatalogFile, CatalogFilter, CatalogMission, DatasetSummary};
 use crate::errors::{E4EError, Result};
+use crate::throttle::{self, IoPriority};
 
 /// Returns the default configuration directory for this application.
 ///
@@ -28,18 +33,36 @@ pub struct DataManagerState {
     #[cfg_attr(not(feature = "python"), allow(dead_code))]
     pub version: i32,
     pub dataset_infos: Vec<DatasetInfo>,
+    /// Persisted I/O limits (0 = unlimited), applied process-wide on load.
+    pub io_bytes_per_sec: u64,
+    pub io_files_per_sec: u64,
+    pub io_priority: IoPriority,
+    /// What `config.db` holds, as of the last load or save.
+    saved: SavedConfig,
+}
+
+/// The config values and dataset rows last read from or written to
+/// `config.db`; `save` writes only those that changed since.
+#[derive(Clone, Debug, Default)]
+struct SavedConfig {
+    values: HashMap<&'static str, String>,
+    dataset_infos: HashMap<String, DatasetInfo>,
 }
 
 impl DataManagerState {
     /// Creates a fresh manager state and persists it to `config.db`.
     pub fn new(config_dir: &Path, default_dataset_dir: &Path) -> Result<Self> {
-        let state = DataManagerState {
+        let mut state = DataManagerState {
             config_dir: config_dir.to_path_buf(),
             active_dataset_name: None,
             active_mission_name: None,
             dataset_dir: default_dataset_dir.to_path_buf(),
             version: VERSION,
             dataset_infos: Vec::new(),
+            io_bytes_per_sec: 0,
+            io_files_per_sec: 0,
+            io_priority: IoPriority::Normal,
+            saved: SavedConfig::default(),
         };
         state.save()?;
         Ok(state)
@@ -61,40 +84,85 @@ impl DataManagerState {
             .get_config("dataset_dir")?
             .map(PathBuf::from)
             .unwrap_or_else(|| config_dir.join("data"));
-
-        Ok(DataManagerState {
+        let io_bytes_per_sec = db
+            .get_config("io_bytes_per_sec")?
+            .and_then(|v| v.parse().ok())
+            .unwrap_or(0);
+        let io_files_per_sec = db
+            .get_config("io_files_per_sec")?
+            .and_then(|v| v.parse().ok())
+            .unwrap_or(0);
+        let io_priority = db
+            .get_config("io_priority")?
+            .and_then(|v| IoPriority::parse(&v))
+            .unwrap_or(IoPriority::Normal);
+
+        let mut state = DataManagerState {
             config_dir: config_dir.to_path_buf(),
             active_dataset_name,
             active_mission_name,
             dataset_dir,
             version: VERSION,
             dataset_infos,
-        })
+            io_bytes_per_sec,
+            io_files_per_sec,
+            io_priority,
+            saved: SavedConfig::default(),
+        };
+        state.mark_saved(state.config_values());
+        Ok(state)
+    }
+
+    /// Make the persisted I/O limits and priority the process-wide defaults.
+    pub fn apply_io_settings(&self) {
+        throttle::set_limits(self.io_bytes_per_sec, self.io_files_per_sec);
+        throttle::set_priority(self.io_priority);
     }
 
-    /// Saves the current state to `config.db`.
-    pub fn save(&self) -> Result<()> {
+    /// The config key/value pairs that make up the state.  No active dataset or
+    /// mission is stored as an empty value.
+    fn config_values(&self) -> HashMap<&'static str, String> {
+        HashMap::from([
+            ("active_dataset", self.active_dataset_name.clone().unwrap_or_default()),
+            ("active_mission", self.active_mission_name.clone().unwrap_or_default()),
+            ("dataset_dir", self.dataset_dir.to_string_lossy().into_owned()),
+            ("io_bytes_per_sec", self.io_bytes_per_sec.to_string()),
+            ("io_files_per_sec", self.io_files_per_sec.to_string()),
+            ("io_priority", self.io_priority.as_str().to_string()),
+        ])
+    }
+
+    fn mark_saved(&mut self, values: HashMap<&'static str, String>) {
+        self.saved = SavedConfig {
+            values,
+            dataset_infos: self
+                .dataset_infos
+                .iter()
+                .map(|info| (info.name.clone(), info.clone()))
+                .collect(),
+        };
+    }
+
+    /// Saves the current state to `config.db`, in one transaction.  Only the
+    /// config values and dataset rows changed since the last load or save are
+    /// written.
+    pub fn save(&mut self) -> Result<()> {
+        let values = self.config_values();
         let db = ManagerDb::open(&self.config_dir)?;
-        // Persist config values
-        if let Some(ref name) = self.active_dataset_name {
-            db.set_config("active_dataset", name)?;
-        } else {
-            // Remove the key if no active dataset
-            db.set_config("active_dataset", "")?;
-        }
-        if let Some(ref name) = self.active_mission_name {
-            db.set_config("active_mission", name)?;
-        } else {
-            db.set_config("active_mission", "")?;
-        }
-        db.set_config(
-            "dataset_dir",
-            &self.dataset_dir.to_string_lossy(),
-        )?;
-        // Persist all dataset infos
-        for info in &self.dataset_infos {
-            db.upsert_dataset(info)?;
-        }
+        db.transaction(|db| {
+            for (key, value) in &values {
+                if self.saved.values.get(key) != Some(value) {
+                    db.set_config(key, value)?;
+                }
+            }
+            for info in &self.dataset_infos {
+                if self.saved.dataset_infos.get(&info.name) != Some(info) {
+                    db.upsert_dataset(info)?;
+                }
+            }
+            Ok(())
+        })?;
+        self.mark_saved(values);
         Ok(())
     }
 
@@ -113,18 +181,179 @@ impl DataManagerState {
         // Persist
         let db = ManagerDb::open(&self.config_dir)?;
         db.upsert_dataset(&info)?;
+        self.saved.dataset_infos.insert(info.name.clone(), info);
         Ok(())
     }
 
-    /// Remove a dataset from the known list.
+    /// Remove a dataset from the known list and from the catalog.
     pub fn remove_dataset_info(&mut self, name: &str) -> Result<()> {
         self.dataset_infos.retain(|d| d.name != name);
         let db = ManagerDb::open(&self.config_dir)?;
-        db.remove_dataset(name)?;
+        db.transaction(|db| {
+            db.remove_dataset(name)?;
+            db.remove_catalog_dataset(name)
+        })?;
+        self.saved.dataset_infos.remove(name);
         Ok(())
     }
 
+    // ── catalog ───────────────────────────────────────────────
+
+    /// Replace what the catalog holds for dataset `name` with the missions and
+    /// manifest of `ds`.
+    pub fn catalog_dataset(&self, name: &str, ds: &DatasetState) -> Result<()> {
+        let manifest = DatasetDb::open(&ds.root)?.get_manifest()?;
+        let mut missions = Vec::with_capacity(ds.missions.len());
+        let mut dirs = HashMap::new();
+        for mission in &ds.missions {
+            let (path, dir) = dataset::mission_dir(ds, &mission.record)?;
+            missions.push((&mission.record, path.to_string_lossy().into_owned()));
+            dirs.insert(dir, mission.record.name.as_str());
+        }
+        let db = ManagerDb::open(&self.config_dir)?;
+        db.transaction(|db| {
+            db.remove_catalog_dataset(name)?;
+            db.reset_dataset_summary(name)?;
+            for (record, path) in &missions {
+                db.upsert_catalog_mission(name, record, path)?;
+            }
+            db.upsert_catalog_files(
+                name,
+                manifest
+                    .iter()
+                    .map(|(path, entry)| (path.as_str(), entry, owning_mission(&dirs, path))),
+            )?;
+            db.mark_catalog_dataset(name)
+        })
+    }
+
+    /// Catalog mission `mission_name` of dataset `name` and the manifest
+    /// entries under its directory.  Committed files are only ever added, so
+    /// entries already catalogued are left as they are.
+    pub fn catalog_mission(&self, name: &str, ds: &DatasetState, mission_name: &str) -> Result<()> {
+        let record = &ds
+            .missions
+            .iter()
+            .find(|m| m.record.name == mission_name)
+            .ok_or_else(|| E4EError::Runtime(format!("Mission not found: {}", mission_name)))?
+            .record;
+        let (path, dir) = dataset::mission_dir(ds, record)?;
+        let files = DatasetDb::open(&ds.root)?.get_manifest_dir(&dir)?;
+        let db = ManagerDb::open(&self.config_dir)?;
+        db.transaction(|db| {
+            db.upsert_catalog_mission(name, record, &path.to_string_lossy())?;
+            db.upsert_catalog_files(
+                name,
+                files.iter().map(|(path, entry)| (path.as_str(), entry, Some(mission_name))),
+            )
+        })
+    }
+
+    /// Catalog the files of dataset `name` that were just committed to `ds`,
+    /// given by their paths, with the `manifest.json` and record of each
+    /// mission they went into.  Only those manifest entries are read, so the
+    /// cost follows the commit rather than the dataset.
+    pub fn catalog_committed(&self, name: &str, ds: &DatasetState, committed: &[PathBuf]) -> Result<()> {
+        let mut dirs = HashMap::new();
+        for mission in &ds.missions {
+            let (_, dir) = dataset::mission_dir(ds, &mission.record)?;
+            dirs.insert(dir, mission.record.name.as_str());
+        }
+        let mut paths: Vec<String> = committed
+            .iter()
+            .filter_map(|p| p.strip_prefix(&ds.root).ok())
+            .map(|rel| {
+                rel.components()
+                    .map(|c| c.as_os_str().to_string_lossy().into_owned())
+                    .collect::<Vec<_>>()
+                    .join("/")
+            })
+            .collect();
+        let mut touched = HashSet::new();
+        for path in &paths {
+            touched.extend(owning_mission(&dirs, path));
+        }
+        let mut missions = Vec::with_capacity(touched.len());
+        for mission in &ds.missions {
+            if touched.contains(mission.record.name.as_str()) {
+                let (path, dir) = dataset::mission_dir(ds, &mission.record)?;
+                missions.push((&mission.record, path.to_string_lossy().into_owned()));
+                paths.push(format!("{}/manifest.json", dir));
+            }
+        }
+
+        let dataset_db = DatasetDb::open(&ds.root)?;
+        let mut entries = Vec::with_capacity(paths.len());
+        for path in paths {
+            if let Some(entry) = dataset_db.get_manifest_entry(&path)? {
+                entries.push((path, entry));
+            }
+        }
+        let db = ManagerDb::open(&self.config_dir)?;
+        db.transaction(|db| {
+            for (record, path) in &missions {
+                db.upsert_catalog_mission(name, record, path)?;
+            }
+            db.upsert_catalog_files(
+                name,
+                entries
+                    .iter()
+                    .map(|(path, entry)| (path.as_str(), entry, owning_mission(&dirs, path))),
+            )
+        })
+    }
 
+    /// Drop mission `mission_name` of dataset `name` from the catalog.
+    pub fn uncatalog_mission(&self, name: &str, mission_name: &str) -> Result<()> {
+        let db = ManagerDb::open(&self.config_dir)?;
+        db.transaction(|db| {
+            db.remove_catalog_mission(name, mission_name)
+        })
+    }
+
+    /// Every registered dataset with its summary, without opening any of them.
+    #[cfg(any(test, feature = "python"))]
+    pub fn dataset_summaries(&self) -> Result<Vec<DatasetSummary>> {
+        ManagerDb::open(&self.config_dir)?.get_dataset_summaries()
+    }
+
+    /// Record that dataset `name` passed validation just now.
+    pub fn mark_validated(&self, name: &str) -> Result<()> {
+        ManagerDb::open(&self.config_dir)?.mark_dataset_validated(name)
+    }
+
+    /// Catalogued missions of every registered dataset that match `filter`.
+    #[cfg(any(test, feature = "python"))]
+    pub fn query_missions(&self, filter: &CatalogFilter) -> Result<Vec<CatalogMission>> {
+        self.open_catalog()?.query_catalog_missions(filter)
+    }
+
+    /// Catalogued files of every registered dataset that match `filter`.
+    #[cfg(any(test, feature = "python"))]
+    pub fn query_files(&self, filter: &CatalogFilter) -> Result<Vec<CatalogFile>> {
+        self.open_catalog()?.query_catalog_files(filter)
+    }
+
+    /// Open `config.db`, first cataloguing any registered dataset on disk the
+    /// catalog has not indexed in full, such as those registered before it
+    /// existed.
+    #[cfg(any(test, feature = "python"))]
+    fn open_catalog(&self) -> Result<ManagerDb> {
+        let db = ManagerDb::open(&self.config_dir)?;
+        let catalogued = db.get_catalog_datasets()?;
+        for info in &self.dataset_infos {
+            let root = PathBuf::from(&info.root_path);
+            if !catalogued.contains(&info.name) && root.is_dir() {
+                self.catalog_dataset(&info.name, &dataset::load_dataset_state(&root)?)?;
+            }
+        }
+        Ok(db)
+    }
+}
+
+/// The mission whose directory, among `dirs`, holds the manifest path `path`.
+fn owning_mission<'a>(dirs: &HashMap<String, &'a str>, path: &str) -> Option<&'a str> {
+    path.match_indices('/').find_map(|(idx, _)| dirs.get(&path[..idx]).copied())
 }
 
 /// Combined state for both the manager and the currently active dataset/mission.
@@ -133,7 +362,9 @@ impl DataManagerState {
 #[cfg_attr(not(feature = "python"), allow(dead_code))]
 pub struct DataManager {
     pub state: DataManagerState,
-    pub active_dataset: Option<DatasetState>,
+    /// Shared with the Python views of the dataset; changing it copies it only
+    /// while a view still holds it.
+    pub active_dataset: Option<Arc<DatasetState>>,
     pub active_mission_name: Option<String>,
 }
 
@@ -142,33 +373,70 @@ impl DataManager {
     /// Creates a fresh DataManager and persists its state.
     pub fn new(config_dir: &Path, default_dataset_dir: &Path) -> Result<Self> {
         let state = DataManagerState::new(config_dir, default_dataset_dir)?;
+        state.apply_io_settings();
         Ok(DataManager { state, active_dataset: None, active_mission_name: None })
     }
 
-    /// Loads an existing DataManager from `config_dir/config.db`.
+    /// Loads an existing DataManager from `config_dir/config.db` and applies its
+    /// persisted I/O limits to the process.
     pub fn load(config_dir: &Path) -> Result<Self> {
         let state = DataManagerState::load(config_dir)?;
+        state.apply_io_settings();
         let active_mission_name = state.active_mission_name.clone().filter(|s| !s.is_empty());
         Ok(DataManager { state, active_dataset: None, active_mission_name })
     }
 
     /// Load or refresh the active dataset state from disk.
     pub fn ensure_active_dataset(&mut self) -> Result<&mut DatasetState> {
+        self.load_active_dataset().map(Arc::make_mut)
+    }
+
+    /// The active dataset state, loaded or refreshed from disk, shared rather
+    /// than copied.  For reading only; see [`Self::ensure_active_dataset`].
+    pub fn shared_active_dataset(&mut self) -> Result<Arc<DatasetState>> {
+        let ds = self.load_active_dataset()?;
+        Ok(Arc::clone(ds))
+    }
+
+    fn load_active_dataset(&mut self) -> Result<&mut Arc<DatasetState>> {
         if self.active_dataset.is_none() {
             if let Some(name) = &self.state.active_dataset_name.clone() {
                 if !name.is_empty() {
                     if let Some(info) = self.state.find_dataset(name).cloned() {
                         let ds = dataset::load_dataset_state(&PathBuf::from(&info.root_path))?;
-                        self.active_dataset = Some(ds);
+                        self.active_dataset = Some(Arc::new(ds));
                     }
                 }
             }
+        } else if let Some(ds) = self.active_dataset.as_mut() {
+            // A stale state is replaced rather than reloaded in place, so views
+            // of it are not copied first.
+            if ds.is_stale()? {
+                *ds = Arc::new(dataset::load_dataset_state(&ds.root)?);
+            }
         }
         self.active_dataset
             .as_mut()
             .ok_or_else(|| E4EError::Runtime("Dataset not active".to_string()))
     }
 
+    /// Catalog mission `mission_name` of the active dataset.
+    pub fn catalog_active_mission(&self, mission_name: &str) -> Result<()> {
+        match (&self.active_dataset, &self.state.active_dataset_name) {
+            (Some(ds), Some(name)) => self.state.catalog_mission(name, ds, mission_name),
+            _ => Err(E4EError::Runtime("Dataset not active".to_string())),
+        }
+    }
+
+    /// Catalog the files just committed to the active dataset; see
+    /// [`DataManagerState::catalog_committed`].
+    pub fn catalog_active_committed(&self, committed: &[PathBuf]) -> Result<()> {
+        match (&self.active_dataset, &self.state.active_dataset_name) {
+            (Some(ds), Some(name)) => self.state.catalog_committed(name, ds, committed),
+            _ => Err(E4EError::Runtime("Dataset not active".to_string())),
+        }
+    }
+
     /// Sync the active dataset's metadata back into the manager's dataset_infos list.
     pub fn sync_active_dataset_info(&mut self) {
         if let (Some(ds), Some(name)) =
@@ -245,6 +513,35 @@ mod tests {
         assert_eq!(loaded.dataset_dir, custom_dir);
     }
 
+    #[test]
+    fn save_and_load_round_trips_io_settings() {
+        let tmp = tempdir().unwrap();
+        let mut state = DataManagerState::new(tmp.path(), &tmp.path().join("data")).unwrap();
+        state.io_bytes_per_sec = 50 * 1024 * 1024;
+        state.io_files_per_sec = 20;
+        state.io_priority = IoPriority::Idle;
+        state.save().unwrap();
+
+        let loaded = DataManagerState::load(tmp.path()).unwrap();
+        assert_eq!(loaded.io_bytes_per_sec, 50 * 1024 * 1024);
+        assert_eq!(loaded.io_files_per_sec, 20);
+        assert_eq!(loaded.io_priority, IoPriority::Idle);
+    }
+
+    #[test]
+    fn save_writes_only_changed_values() {
+        let tmp = tempdir().unwrap();
+        let mut state = DataManagerState::new(tmp.path(), &tmp.path().join("data")).unwrap();
+        // Written behind the state's back; an unchanged save must not overwrite it.
+        ManagerDb::open(tmp.path()).unwrap().set_config("io_priority", "idle").unwrap();
+        state.active_dataset_name = Some("2023.03.02.Test.SD".to_string());
+        state.save().unwrap();
+
+        let loaded = DataManagerState::load(tmp.path()).unwrap();
+        assert_eq!(loaded.active_dataset_name, Some("2023.03.02.Test.SD".to_string()));
+        assert_eq!(loaded.io_priority, IoPriority::Idle);
+    }
+
     #[test]
     fn load_without_existing_db_returns_fresh_state() {
         let tmp = tempdir().unwrap();
@@ -337,4 +634,113 @@ mod tests {
         let state = DataManagerState::new(tmp.path(), &tmp.path().join("data")).unwrap();
         assert!(state.find_dataset("nonexistent").is_none());
     }
+
+    // ── catalog ───────────────────────────────────────────────────
+
+    /// A manager with dataset "ds1" holding mission "ED-00 M1" registered, but
+    /// not catalogued.
+    fn registered_dataset(config_dir: &Path) -> (DataManagerState, DatasetState) {
+        let mut state = DataManagerState::new(config_dir, &config_dir.join("data")).unwrap();
+        let root = config_dir.join("data").join("ds1");
+        let mut ds = dataset::create_dataset(&root, "2023-03-02").unwrap();
+        let meta = crate::metadata::MetadataRecord {
+            timestamp: "2023-03-02T10:00:00-08:00".to_string(),
+            device: "Device1".to_string(),
+            country: "USA".to_string(),
+            region: "California".to_string(),
+            site: "SD".to_string(),
+            mission_name: "M1".to_string(),
+            properties: r#"{"depth": 5}"#.to_string(),
+            notes: String::new(),
+        };
+        dataset::add_mission(&mut ds, &meta).unwrap();
+        let info = DatasetInfo {
+            name: "ds1".to_string(),
+            root_path: root.to_string_lossy().into_owned(),
+            pushed: false,
+            last_country: None,
+            last_region: None,
+            last_site: None,
+            day_0: None,
+        };
+        state.upsert_dataset_info(info).unwrap();
+        (state, ds)
+    }
+
+    #[test]
+    fn query_catalogues_datasets_registered_before_the_catalog() {
+        let tmp = tempdir().unwrap();
+        let (state, _) = registered_dataset(tmp.path());
+
+        let missions = state.query_missions(&CatalogFilter::default()).unwrap();
+        assert_eq!(missions.len(), 1);
+        assert_eq!(missions[0].dataset, "ds1");
+        assert_eq!(missions[0].record.name, "ED-00 M1");
+        let files = state.query_files(&CatalogFilter::default()).unwrap();
+        let metadata = files.iter().find(|f| f.path == "ED-00/M1/metadata.json").unwrap();
+        assert_eq!(metadata.mission.as_deref(), Some("ED-00 M1"));
+    }
+
+    #[test]
+    fn catalog_mission_adds_committed_files() {
+        let tmp = tempdir().unwrap();
+        let (state, mut ds) = registered_dataset(tmp.path());
+        state.catalog_dataset("ds1", &ds).unwrap();
+
+        let src = tmp.path().join("data.bin");
+        std::fs::write(&src, b"file content").unwrap();
+        dataset::stage_mission_files(&mut ds, "ED-00 M1", &[src], None).unwrap();
+        dataset::commit_mission_files(&mut ds, "ED-00 M1").unwrap();
+        state.catalog_mission("ds1", &ds, "ED-00 M1").unwrap();
+
+        let filter = CatalogFilter {
+            sha256: Some(crate::manifest::hash_bytes(b"file content")),
+            ..Default::default()
+        };
+        let files = state.query_files(&filter).unwrap();
+        assert_eq!(files.len(), 1);
+        assert_eq!(files[0].path, "ED-00/M1/data.bin");
+    }
+
+    #[test]
+    fn catalog_committed_adds_only_the_committed_files() {
+        let tmp = tempdir().unwrap();
+        let (state, mut ds) = registered_dataset(tmp.path());
+        state.catalog_dataset("ds1", &ds).unwrap();
+        let before = state.query_files(&CatalogFilter::default()).unwrap();
+
+        let src = tmp.path().join("data.bin");
+        std::fs::write(&src, b"file content").unwrap();
+        dataset::stage_mission_files(&mut ds, "ED-00 M1", &[src], None).unwrap();
+        let committed = dataset::commit_mission_files(&mut ds, "ED-00 M1").unwrap();
+        state.catalog_committed("ds1", &ds, &committed).unwrap();
+
+        let files = state.query_files(&CatalogFilter::default()).unwrap();
+        assert_eq!(files.len(), before.len() + 1);
+        let data = files.iter().find(|f| f.path == "ED-00/M1/data.bin").unwrap();
+        assert_eq!(data.mission.as_deref(), Some("ED-00 M1"));
+        // The mission's manifest.json was rewritten by the commit.
+        let manifest = DatasetDb::open(&ds.root)
+            .unwrap()
+            .get_manifest_entry("ED-00/M1/manifest.json")
+            .unwrap()
+            .unwrap();
+        let catalogued = files.iter().find(|f| f.path == "ED-00/M1/manifest.json").unwrap();
+        assert_eq!(catalogued.entry.sha256sum, manifest.sha256sum);
+    }
+
+    #[test]
+    fn removing_missions_and_datasets_drops_them_from_the_catalog() {
+        let tmp = tempdir().unwrap();
+        let (mut state, ds) = registered_dataset(tmp.path());
+        state.catalog_dataset("ds1", &ds).unwrap();
+
+        state.uncatalog_mission("ds1", "ED-00 M1").unwrap();
+        assert!(state.query_missions(&CatalogFilter::default()).unwrap().is_empty());
+
+        state.catalog_dataset("ds1", &ds).unwrap();
+        state.remove_dataset_info("ds1").unwrap();
+        assert!(state.query_missions(&CatalogFilter::default()).unwrap().is_empty());
+        assert!(state.query_files(&CatalogFilter::default()).unwrap().is_empty());
+    }
 }
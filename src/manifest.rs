@@ -1,15 +1,19 @@
+use std::borrow::Borrow;
 use std::collections::HashMap;
 use std::fs;
 use std::io::{Read, Write};
 use std::path::{Path, PathBuf};
-use std::sync::atomic::{AtomicU64, Ordering};
 
 use rayon::prelude::*;
 use serde::{Deserialize, Serialize};
 use sha2::{Digest, Sha256};
 
+use crate::cancel::CancelToken;
+use crate::durability;
 use crate::errors::{E4EError, Result};
-use crate::utils::convert_to_4space_indent;
+use crate::progress::{Phase, Progress};
+use crate::throttle;
+use crate::trace;
 
 const TMP_SUFFIX: &str = ".e4edm_tmp";
 
@@ -21,15 +25,34 @@ pub struct ManifestEntry {
 
 pub type ManifestData = HashMap<String, ManifestEntry>;
 
-/// Copy `src` to a temp file beside `dst`, verify the hash, then rename into place.
-/// If the hash does not match or the write fails, the temp file is removed.
-pub fn copy_and_verify(src: &Path, dst: &Path, expected_hash: &str) -> Result<()> {
+/// The temp path `copy_and_verify` writes beside `dst` before renaming.
+pub fn temp_path_for(dst: &Path) -> PathBuf {
     let tmp_name = format!(
         "{}{}",
         dst.file_name().unwrap_or_default().to_string_lossy(),
         TMP_SUFFIX
     );
-    let tmp = dst.with_file_name(tmp_name);
+    dst.with_file_name(tmp_name)
+}
+
+/// Copy `src` to a temp file beside `dst`, verify the hash, then rename into place.
+/// If the hash does not match or the write fails, the temp file is removed.
+/// Reads are paced by the process-wide limits in `throttle`.
+pub fn copy_and_verify(src: &Path, dst: &Path, expected_hash: &str) -> Result<()> {
+    copy_and_verify_synced(src, dst, expected_hash, false, &CancelToken::new())
+}
+
+/// `copy_and_verify`, optionally fsyncing the temp file before the rename and the
+/// parent directory after it so `dst` is durable when this returns.  `cancel` is
+/// checked before each chunk; a cancelled copy removes its temp file.
+pub fn copy_and_verify_synced(
+    src: &Path,
+    dst: &Path,
+    expected_hash: &str,
+    sync: bool,
+    cancel: &CancelToken,
+) -> Result<()> {
+    let tmp = temp_path_for(dst);
 
     let result = (|| -> Result<()> {
         let mut src_file = fs::File::open(src).map_err(|e| {
@@ -40,13 +63,16 @@ pub fn copy_and_verify(src: &Path, dst: &Path, expected_hash: &str) -> Result<()
         })?;
         let mut hasher = Sha256::new();
         let mut buf = [0u8; 65536];
+        throttle::acquire_file();
         loop {
+            cancel.check()?;
             let n = src_file.read(&mut buf).map_err(|e| {
                 E4EError::Runtime(format!("Cannot read '{}': {}", src.display(), e))
             })?;
             if n == 0 {
                 break;
             }
+            throttle::acquire_bytes(n as u64);
             hasher.update(&buf[..n]);
             tmp_file.write_all(&buf[..n]).map_err(|e| {
                 E4EError::Runtime(format!("Cannot write '{}': {}", tmp.display(), e))
@@ -61,6 +87,12 @@ pub fn copy_and_verify(src: &Path, dst: &Path, expected_hash: &str) -> Result<()
                 computed
             )));
         }
+        if sync {
+            tmp_file.sync_all().map_err(|e| {
+                E4EError::Runtime(format!("Cannot sync '{}': {}", tmp.display(), e))
+            })?;
+        }
+        drop(tmp_file);
         fs::rename(&tmp, dst).map_err(|e| {
             E4EError::Runtime(format!(
                 "Cannot rename '{}' to '{}': {}",
@@ -69,6 +101,11 @@ pub fn copy_and_verify(src: &Path, dst: &Path, expected_hash: &str) -> Result<()
                 e
             ))
         })?;
+        if sync {
+            if let Some(parent) = dst.parent() {
+                durability::sync_dir(parent)?;
+            }
+        }
         Ok(())
     })();
 
@@ -105,21 +142,41 @@ pub fn is_temp_file(path: &Path) -> bool {
         .unwrap_or(false)
 }
 
-/// Read a file in 4096-byte chunks, compute SHA256, return hex string.
+/// Read a file in 64 KiB chunks, compute SHA256, return hex string.
+/// Reads are paced by the process-wide limits in `throttle`.
 pub fn compute_file_hash(path: &Path) -> Result<String> {
+    compute_file_hash_cancellable(path, &CancelToken::new())
+}
+
+/// `compute_file_hash`, checking `cancel` before each chunk.
+pub fn compute_file_hash_cancellable(path: &Path, cancel: &CancelToken) -> Result<String> {
     let mut file = fs::File::open(path)?;
+    hash_open_file(&mut file, cancel)
+}
+
+/// Hash an already-open file from its current position to the end, checking
+/// `cancel` before each chunk.
+pub fn hash_open_file(file: &mut fs::File, cancel: &CancelToken) -> Result<String> {
     let mut hasher = Sha256::new();
     let mut buf = [0u8; 65536];
+    throttle::acquire_file();
     loop {
+        cancel.check()?;
         let n = file.read(&mut buf)?;
         if n == 0 {
             break;
         }
+        throttle::acquire_bytes(n as u64);
         hasher.update(&buf[..n]);
     }
     Ok(hex::encode(hasher.finalize()))
 }
 
+/// SHA-256 of an in-memory buffer as a hex string.
+pub fn hash_bytes(data: &[u8]) -> String {
+    hex::encode(Sha256::digest(data))
+}
+
 /// For each file, compute relative posix path, hash, and size.
 pub fn compute_hashes(root: &Path, files: &[PathBuf]) -> Result<ManifestData> {
     let mut data = ManifestData::new();
@@ -150,17 +207,53 @@ pub fn read_manifest(path: &Path) -> Result<ManifestData> {
     Ok(data)
 }
 
+/// Serialize a manifest as JSON with 4-space indent, sorted by path.
+pub fn manifest_to_string(data: &ManifestData) -> Result<String> {
+    let mut entries: Vec<(&String, &ManifestEntry)> = data.iter().collect();
+    entries.sort_unstable_by(|a, b| a.0.cmp(b.0));
+    let mut out = Vec::new();
+    write_manifest_entries(&mut out, entries.into_iter().map(Ok))?;
+    Ok(String::from_utf8(out).expect("serialized JSON is UTF-8"))
+}
+
+/// Write `entries`, in the order given, as the same JSON `manifest_to_string`
+/// produces (that of Python's `json.dump(indent=4)`), one entry at a time.
+pub fn write_manifest_entries<W, K, E>(
+    out: &mut W,
+    entries: impl IntoIterator<Item = Result<(K, E)>>,
+) -> Result<()>
+where
+    W: Write,
+    K: AsRef<str>,
+    E: Borrow<ManifestEntry>,
+{
+    out.write_all(b"{")?;
+    let mut empty = true;
+    for item in entries {
+        let (path, entry) = item?;
+        let entry = entry.borrow();
+        out.write_all(if empty { &b"\n"[..] } else { &b",\n"[..] })?;
+        write!(
+            out,
+            "    {}: {{\n        \"sha256sum\": {},\n        \"size\": {}\n    }}",
+            serde_json::to_string(path.as_ref())?,
+            serde_json::to_string(&entry.sha256sum)?,
+            entry.size
+        )?;
+        empty = false;
+    }
+    out.write_all(if empty { &b"}"[..] } else { &b"\n}"[..] })?;
+    Ok(())
+}
+
 /// Write JSON manifest with 4-space indent.
 pub fn write_manifest(path: &Path, data: &ManifestData) -> Result<()> {
-    let content = serde_json::to_string_pretty(data)?;
-    // serde_json::to_string_pretty uses 2-space indent; we need 4-space to match Python
-    // Re-serialize with manual 4-space indent
-    let content4 = convert_to_4space_indent(&content);
-    fs::write(path, content4)?;
+    fs::write(path, manifest_to_string(data)?)?;
     Ok(())
 }
 
 /// Read existing manifest, add new entries, write back.
+#[cfg_attr(not(test), allow(dead_code))]
 pub fn update_manifest(path: &Path, root: &Path, files: &[PathBuf]) -> Result<()> {
     let mut data = read_manifest(path)?;
     let new_entries = compute_hashes(root, files)?;
@@ -177,6 +270,15 @@ pub fn update_manifest_with_known_hashes(
     files: &[(PathBuf, String)], // (abs_path, sha256_hex)
 ) -> Result<()> {
     let mut data = read_manifest(path)?;
+    data.extend(entries_with_known_hashes(root, files)?);
+    write_manifest(path, &data)?;
+    Ok(())
+}
+
+/// Manifest entries for files whose hashes are already known, keyed by their
+/// posix path relative to `root`; only stat()s the files for their size.
+pub fn entries_with_known_hashes(root: &Path, files: &[(PathBuf, String)]) -> Result<ManifestData> {
+    let mut data = ManifestData::new();
     for (file, hash) in files {
         let rel_path = file
             .strip_prefix(root)
@@ -189,12 +291,11 @@ pub fn update_manifest_with_known_hashes(
         let size = fs::metadata(file)?.len();
         data.insert(rel_posix, ManifestEntry { sha256sum: hash.clone(), size });
     }
-    write_manifest(path, &data)?;
-    Ok(())
+    Ok(data)
 }
 
-/// Collect validation failures for manifest entries, calling `progress(current, total)`
-/// after each file is processed.
+/// Collect validation failures for manifest entries, reporting each processed
+/// file to `progress` in the `Hash` phase.
 ///
 /// Returns a list of human-readable failure messages.  An empty list means
 /// the dataset is valid.  Also checks for manifest entries whose files are
@@ -202,32 +303,29 @@ pub fn update_manifest_with_known_hashes(
 ///
 /// For "hash": verify sha256sum matches; for "size": verify file size matches.
 /// Hash checks are performed in parallel across all files.
-pub fn collect_validation_failures_with_progress<F>(
+pub fn collect_validation_failures_with_progress(
     data: &ManifestData,
     root: &Path,
     files: &[PathBuf],
     method: &str,
-    progress: F,
-) -> Result<Vec<String>>
-where
-    F: Fn(u64, u64) + Send + Sync,
-{
-    if method != "hash" && method != "size" {
-        return Err(crate::errors::E4EError::Runtime(format!(
-            "Unknown validation method: {}",
-            method
-        )));
-    }
-
-    let total = files.len() as u64;
-    let counter = AtomicU64::new(0);
+    progress: &Progress,
+) -> Result<Vec<String>> {
+    let unknown_method = || {
+        crate::errors::E4EError::Runtime(format!("Unknown validation method: {}", method))
+    };
+    // Only hashed files count towards the byte total: size checks read no data.
+    let bytes_total = match method {
+        "hash" => data.values().map(|e| e.size).sum(),
+        "size" => 0,
+        _ => return Err(unknown_method()),
+    };
+    progress.start_phase(Phase::Hash, files.len() as u64, bytes_total);
+    let cancel = progress.cancel_token();
 
-    // Process each on-disk file in parallel.  Each thread returns:
-    //   Ok((rel_posix, Option<failure_message>))
-    // or Err(...) on an I/O or strip_prefix error.
     let results: Result<Vec<(String, Option<String>)>> = files
         .par_iter()
         .map(|file| {
+            cancel.check()?;
             let rel_path = file
                 .strip_prefix(root)
                 .map_err(|e| crate::errors::E4EError::Runtime(e.to_string()))?;
@@ -237,11 +335,14 @@ where
                 .collect::<Vec<_>>()
                 .join("/");
 
+            let mut hashed_bytes = 0;
             let failure = match data.get(&rel_posix) {
                 None => Some(format!("unlisted file: {}", rel_posix)),
                 Some(entry) => match method {
                     "hash" => {
-                        let computed = compute_file_hash(file)?;
+                        let _span = trace::span("validate.hash");
+                        let computed = compute_file_hash_cancellable(file, cancel)?;
+                        hashed_bytes = entry.size;
                         if computed != entry.sha256sum {
                             Some(format!(
                                 "hash mismatch: {} (expected {}, got {})",
@@ -252,6 +353,7 @@ where
                         }
                     }
                     "size" => {
+                        let _span = trace::span("validate.size");
                         let size = fs::metadata(file)?.len();
                         if size != entry.size {
                             Some(format!(
@@ -262,12 +364,11 @@ where
                             None
                         }
                     }
-                    _ => unreachable!(),
+                    _ => return Err(unknown_method()),
                 },
             };
 
-            let current = counter.fetch_add(1, Ordering::Relaxed) + 1;
-            progress(current, total);
+            progress.advance(1, hashed_bytes);
 
             Ok((rel_posix, failure))
         })
@@ -299,13 +400,14 @@ pub fn collect_validation_failures(
     files: &[PathBuf],
     method: &str,
 ) -> Result<Vec<String>> {
-    collect_validation_failures_with_progress(data, root, files, method, |_, _| {})
+    collect_validation_failures_with_progress(data, root, files, method, &Progress::new())
 }
 
 
 #[cfg(test)]
 mod tests {
     use super::*;
+    use crate::utils::convert_to_4space_indent;
     use std::fs;
     use tempfile::tempdir;
 
@@ -428,6 +530,30 @@ mod tests {
         }
     }
 
+    #[test]
+    fn manifest_to_string_matches_python_json_dump() {
+        let mut data = ManifestData::new();
+        data.insert(
+            "ED-00/M1/a \"b\".bin".to_string(),
+            ManifestEntry { sha256sum: "abc".to_string(), size: 7 },
+        );
+        let pretty = convert_to_4space_indent(&serde_json::to_string_pretty(&data).unwrap());
+        assert_eq!(manifest_to_string(&data).unwrap(), pretty);
+        assert_eq!(manifest_to_string(&ManifestData::new()).unwrap(), "{}");
+    }
+
+    #[test]
+    fn manifest_to_string_sorts_by_path() {
+        let mut data = ManifestData::new();
+        for key in ["b.bin", "a/z.bin", "a.bin"] {
+            data.insert(key.to_string(), ManifestEntry { sha256sum: "00".to_string(), size: 1 });
+        }
+        let content = manifest_to_string(&data).unwrap();
+        let positions: Vec<usize> =
+            ["\"a.bin\"", "\"a/z.bin\"", "\"b.bin\""].iter().map(|k| content.find(k).unwrap()).collect();
+        assert!(positions.windows(2).all(|w| w[0] < w[1]));
+    }
+
     // ── update_manifest ─────────────────────────────────────────
 
     #[test]
@@ -529,6 +655,21 @@ mod tests {
         assert!(!tmp.exists(), "temp file should be cleaned up");
     }
 
+    #[test]
+    fn cancelled_copy_and_verify_cleans_up() {
+        let dir = tempdir().unwrap();
+        let src = dir.path().join("src.bin");
+        let dst = dir.path().join("dst.bin");
+        write_file(&src, b"real content");
+        let expected = compute_file_hash(&src).unwrap();
+        let cancel = CancelToken::new();
+        cancel.cancel();
+        let result = copy_and_verify_synced(&src, &dst, &expected, false, &cancel);
+        assert!(matches!(result, Err(E4EError::Cancelled)));
+        assert!(!dst.exists());
+        assert!(!temp_path_for(&dst).exists());
+    }
+
     // ── collect_validation_failures ──────────────────────────────
 
     #[test]
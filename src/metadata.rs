@@ -8,7 +8,7 @@ use serde_json::Value;
 use crate::errors::Result;
 use crate::utils::convert_to_4space_indent;
 
-#[derive(Clone, Debug, Serialize, Deserialize)]
+#[derive(Clone, Debug, PartialEq, Serialize, Deserialize)]
 pub struct MetadataRecord {
     /// ISO 8601 string (with timezone, e.g. "2023-03-02T19:38:00-08:00")
     pub timestamp: String,
@@ -0,0 +1,377 @@
+// progress.rs – native progress aggregation for long-running operations.
+//
+// Worker threads only touch atomics: `advance` bumps the file and byte counters
+// and, at most once per `interval`, one of them builds a `Snapshot` and hands it
+// to the callback.  A validate or push over a million files therefore calls back
+// into Python (or C#) a few hundred times instead of once per file, and the
+// counters can also be polled from another thread with `snapshot`.
+//
+// Operations report in phases (hash the source, copy, verify the destination).
+// Each phase sets its own file and byte totals; a throughput EWMA in bytes/sec
+// runs across phases.
+//
+// A `Progress` also carries the operation's `CancelToken`, since it is already
+// threaded through every loop that should check it.
+//
+// An operation split over several workers that each run the same phases (such
+// as an ingest from several card readers) gives each worker a `lane` of its
+// progress: a lane's phase totals add up in the parent and its files and bytes
+// count there, so the caller sees one combined progress.
+
+use std::sync::atomic::{AtomicU64, AtomicU8, Ordering};
+use std::sync::Mutex;
+use std::time::{Duration, Instant};
+
+use crate::cancel::CancelToken;
+
+/// Callback interval used for the `(current, total)` callbacks of the C and
+/// Python APIs.
+pub const DEFAULT_INTERVAL: Duration = Duration::from_millis(100);
+
+/// Time constant of the throughput EWMA.
+const RATE_TAU_SECS: f64 = 3.0;
+/// Polls closer together than this reuse the previous rate.
+const RATE_MIN_SAMPLE_SECS: f64 = 0.05;
+
+#[derive(Clone, Copy, Debug, PartialEq, Eq)]
+pub enum Phase {
+    Idle,
+    /// Hashing files against a manifest (validate, or the pre-push integrity check).
+    Hash,
+    /// Copying or uploading files to a destination.
+    Copy,
+    /// Checking the destination after the copy.
+    Verify,
+    Done,
+}
+
+impl Phase {
+    #[cfg_attr(not(feature = "python"), allow(dead_code))]
+    pub fn as_str(&self) -> &'static str {
+        match self {
+            Phase::Idle => "idle",
+            Phase::Hash => "hash",
+            Phase::Copy => "copy",
+            Phase::Verify => "verify",
+            Phase::Done => "done",
+        }
+    }
+
+    pub fn to_u8(self) -> u8 {
+        match self {
+            Phase::Idle => 0,
+            Phase::Hash => 1,
+            Phase::Copy => 2,
+            Phase::Verify => 3,
+            Phase::Done => 4,
+        }
+    }
+
+    fn from_u8(v: u8) -> Phase {
+        match v {
+            1 => Phase::Hash,
+            2 => Phase::Copy,
+            3 => Phase::Verify,
+            4 => Phase::Done,
+            _ => Phase::Idle,
+        }
+    }
+}
+
+/// A consistent-enough view of a `Progress`; each field is read atomically.
+#[derive(Clone, Copy, Debug)]
+pub struct Snapshot {
+    pub phase: Phase,
+    pub files_done: u64,
+    pub files_total: u64,
+    pub bytes_done: u64,
+    pub bytes_total: u64,
+    /// Smoothed throughput over all phases.
+    pub bytes_per_sec: f64,
+    pub elapsed_secs: f64,
+}
+
+impl Snapshot {
+    /// The `(current, total)` file counts of the original callback API, where a
+    /// copy runs 1..N and the verification after it N+1..2N.  `None` outside a
+    /// phase.
+    pub fn legacy_counts(&self) -> Option<(u64, u64)> {
+        match self.phase {
+            Phase::Copy => Some((self.files_done, self.files_total * 2)),
+            Phase::Verify => Some((self.files_total + self.files_done, self.files_total * 2)),
+            Phase::Hash => Some((self.files_done, self.files_total)),
+            Phase::Idle | Phase::Done => None,
+        }
+    }
+}
+
+struct RateState {
+    last_secs: f64,
+    last_bytes: u64,
+    rate: Option<f64>,
+}
+
+type Callback<'a> = Box<dyn Fn(&Snapshot) + Send + Sync + 'a>;
+
+/// Shared progress counters for one operation.
+pub struct Progress<'a> {
+    phase: AtomicU8,
+    files_done: AtomicU64,
+    files_total: AtomicU64,
+    bytes_done: AtomicU64,
+    bytes_total: AtomicU64,
+    /// Bytes over all phases, for the throughput estimate.
+    bytes_all: AtomicU64,
+    started: Instant,
+    rate: Mutex<RateState>,
+    /// Nanoseconds after `started` of the last callback.
+    last_emit: AtomicU64,
+    interval_ns: u64,
+    callback: Option<Callback<'a>>,
+    cancel: CancelToken,
+    /// The progress this one is a lane of.
+    parent: Option<&'a Progress<'a>>,
+}
+
+impl<'a> Progress<'a> {
+    /// Counters only; read them with `snapshot`.
+    pub fn new() -> Self {
+        Progress {
+            phase: AtomicU8::new(Phase::Idle.to_u8()),
+            files_done: AtomicU64::new(0),
+            files_total: AtomicU64::new(0),
+            bytes_done: AtomicU64::new(0),
+            bytes_total: AtomicU64::new(0),
+            bytes_all: AtomicU64::new(0),
+            started: Instant::now(),
+            rate: Mutex::new(RateState { last_secs: 0.0, last_bytes: 0, rate: None }),
+            last_emit: AtomicU64::new(0),
+            interval_ns: 0,
+            callback: None,
+            cancel: CancelToken::new(),
+            parent: None,
+        }
+    }
+
+    /// Call `callback` at most once per `interval`, plus at every phase change and
+    /// when a phase's last file is done.
+    pub fn with_callback<F>(interval: Duration, callback: F) -> Self
+    where
+        F: Fn(&Snapshot) + Send + Sync + 'a,
+    {
+        Progress {
+            interval_ns: interval.as_nanos() as u64,
+            callback: Some(Box::new(callback)),
+            ..Progress::new()
+        }
+    }
+
+    /// Adapt a `callback(current, total)` of the original API; see
+    /// `Snapshot::legacy_counts`.
+    pub fn with_file_callback<F>(interval: Duration, callback: F) -> Self
+    where
+        F: Fn(u64, u64) + Send + Sync + 'a,
+    {
+        Progress::with_callback(interval, move |s: &Snapshot| {
+            if let Some((current, total)) = s.legacy_counts() {
+                callback(current, total);
+            }
+        })
+    }
+
+    /// Use `token` instead of the private token created with the counters.
+    #[cfg_attr(not(feature = "python"), allow(dead_code))]
+    pub fn with_cancel(self, token: CancelToken) -> Self {
+        Progress { cancel: token, ..self }
+    }
+
+    /// A lane of this progress for one of several workers; see the module
+    /// comment.  The parent enters each phase itself, with no totals, before
+    /// the lanes start it.
+    #[cfg_attr(not(feature = "python"), allow(dead_code))]
+    pub fn lane(&self) -> Progress<'_> {
+        Progress {
+            cancel: self.cancel.clone(),
+            parent: Some(self),
+            ..Progress::new()
+        }
+    }
+
+    /// The token workers check between files and chunks.
+    pub fn cancel_token(&self) -> &CancelToken {
+        &self.cancel
+    }
+
+    /// Enter `phase`, resetting the per-phase counters.
+    pub fn start_phase(&self, phase: Phase, files_total: u64, bytes_total: u64) {
+        if let Some(parent) = self.parent {
+            parent.files_total.fetch_add(files_total, Ordering::Relaxed);
+            parent.bytes_total.fetch_add(bytes_total, Ordering::Relaxed);
+            parent.emit(true);
+            return;
+        }
+        self.files_total.store(files_total, Ordering::Relaxed);
+        self.bytes_total.store(bytes_total, Ordering::Relaxed);
+        self.files_done.store(0, Ordering::Relaxed);
+        self.bytes_done.store(0, Ordering::Relaxed);
+        self.phase.store(phase.to_u8(), Ordering::Release);
+        self.emit(true);
+    }
+
+    /// Count `files` finished files and `bytes` processed bytes.
+    pub fn advance(&self, files: u64, bytes: u64) {
+        if let Some(parent) = self.parent {
+            parent.advance(files, bytes);
+            return;
+        }
+        if bytes > 0 {
+            self.bytes_done.fetch_add(bytes, Ordering::Relaxed);
+            self.bytes_all.fetch_add(bytes, Ordering::Relaxed);
+        }
+        let done = self.files_done.fetch_add(files, Ordering::Relaxed) + files;
+        self.emit(files > 0 && done == self.files_total.load(Ordering::Relaxed));
+    }
+
+    /// Mark the operation complete; a no-op for a lane, whose parent finishes
+    /// once every lane has.
+    pub fn finish(&self) {
+        if self.parent.is_some() {
+            return;
+        }
+        self.phase.store(Phase::Done.to_u8(), Ordering::Release);
+        self.emit(true);
+    }
+
+    pub fn snapshot(&self) -> Snapshot {
+        let elapsed_secs = self.started.elapsed().as_secs_f64();
+        let bytes_all = self.bytes_all.load(Ordering::Relaxed);
+        let bytes_per_sec = {
+            let mut rate = self.rate.lock().unwrap();
+            let dt = elapsed_secs - rate.last_secs;
+            if dt >= RATE_MIN_SAMPLE_SECS {
+                let instant = bytes_all.saturating_sub(rate.last_bytes) as f64 / dt;
+                let alpha = 1.0 - (-dt / RATE_TAU_SECS).exp();
+                rate.rate = Some(match rate.rate {
+                    Some(r) => r + alpha * (instant - r),
+                    None => instant,
+                });
+                rate.last_secs = elapsed_secs;
+                rate.last_bytes = bytes_all;
+            }
+            rate.rate.unwrap_or(0.0)
+        };
+        Snapshot {
+            phase: Phase::from_u8(self.phase.load(Ordering::Acquire)),
+            files_done: self.files_done.load(Ordering::Relaxed),
+            files_total: self.files_total.load(Ordering::Relaxed),
+            bytes_done: self.bytes_done.load(Ordering::Relaxed),
+            bytes_total: self.bytes_total.load(Ordering::Relaxed),
+            bytes_per_sec,
+            elapsed_secs,
+        }
+    }
+
+    /// Run the callback if `force` is set or `interval` has passed since the last
+    /// one.  Only the thread that wins the race for the time slot calls back.
+    fn emit(&self, force: bool) {
+        let Some(callback) = &self.callback else {
+            return;
+        };
+        let now = self.started.elapsed().as_nanos() as u64;
+        if force {
+            self.last_emit.store(now, Ordering::Relaxed);
+        } else {
+            let last = self.last_emit.load(Ordering::Relaxed);
+            if now.saturating_sub(last) < self.interval_ns
+                || self
+                    .last_emit
+                    .compare_exchange(last, now, Ordering::Relaxed, Ordering::Relaxed)
+                    .is_err()
+            {
+                return;
+            }
+        }
+        callback(&self.snapshot());
+    }
+}
+
+impl Default for Progress<'_> {
+    fn default() -> Self {
+        Self::new()
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use rayon::prelude::*;
+
+    #[test]
+    fn counters_reset_per_phase() {
+        let progress = Progress::new();
+        progress.start_phase(Phase::Copy, 3, 300);
+        progress.advance(1, 100);
+        progress.advance(1, 100);
+        let s = progress.snapshot();
+        assert_eq!((s.phase, s.files_done, s.files_total, s.bytes_done), (Phase::Copy, 2, 3, 200));
+
+        progress.start_phase(Phase::Verify, 3, 0);
+        let s = progress.snapshot();
+        assert_eq!((s.phase, s.files_done, s.bytes_done), (Phase::Verify, 0, 0));
+    }
+
+    #[test]
+    fn callback_is_throttled_across_threads() {
+        let calls = AtomicU64::new(0);
+        let progress = Progress::with_callback(Duration::from_secs(3600), |_| {
+            calls.fetch_add(1, Ordering::Relaxed);
+        });
+        progress.start_phase(Phase::Hash, 1_000_000, 0);
+        (0..1_000_000u64).into_par_iter().for_each(|_| progress.advance(1, 0));
+        progress.finish();
+        // Phase start, last file, finish.
+        assert_eq!(calls.load(Ordering::Relaxed), 3);
+    }
+
+    #[test]
+    fn last_file_of_a_phase_is_always_reported() {
+        let last = Mutex::new(None);
+        let progress = Progress::with_file_callback(Duration::from_secs(3600), |current, total| {
+            *last.lock().unwrap() = Some((current, total));
+        });
+        progress.start_phase(Phase::Copy, 4, 0);
+        progress.advance(4, 0);
+        assert_eq!(*last.lock().unwrap(), Some((4, 8)));
+        progress.start_phase(Phase::Verify, 4, 0);
+        progress.advance(4, 0);
+        assert_eq!(*last.lock().unwrap(), Some((8, 8)));
+    }
+
+    #[test]
+    fn lanes_add_up_in_their_parent() {
+        let progress = Progress::new();
+        progress.start_phase(Phase::Copy, 0, 0);
+        let lanes = [progress.lane(), progress.lane()];
+        lanes[0].start_phase(Phase::Copy, 2, 200);
+        lanes[1].start_phase(Phase::Copy, 3, 300);
+        lanes[0].advance(1, 100);
+        lanes[1].advance(2, 200);
+        lanes[1].finish();
+        let s = progress.snapshot();
+        assert_eq!(
+            (s.phase, s.files_done, s.files_total, s.bytes_done, s.bytes_total),
+            (Phase::Copy, 3, 5, 300, 500)
+        );
+        progress.cancel_token().cancel();
+        assert!(lanes[0].cancel_token().is_cancelled());
+    }
+
+    #[test]
+    fn throughput_estimate_follows_bytes() {
+        let progress = Progress::new();
+        progress.start_phase(Phase::Copy, 1, 1 << 20);
+        std::thread::sleep(Duration::from_millis(60));
+        progress.advance(1, 1 << 20);
+        assert!(progress.snapshot().bytes_per_sec > 0.0);
+    }
+}
@@ -11,17 +11,28 @@
 
 use std::fs;
 use std::path::PathBuf;
+use std::sync::Arc;
+use std::time::Duration;
 
 use pyo3::create_exception;
 use pyo3::prelude::*;
 use pyo3::types::PyDict;
 
-use crate::db::{DatasetDb, DatasetInfo, DatasetMeta, StagedFileRecord};
-use crate::dataset::{self, DatasetState, MissionState};
-use crate::errors::E4EError;
+use crate::archive;
+use crate::cancel::CancelToken;
+use crate::db::{self, CatalogFilter, DatasetDb, DatasetInfo, StagedFileRecord};
+use crate::dataset::{self, DatasetState, DatasetStatus, MissionState, PushOptions};
+use crate::durability::Durability;
+use crate::errors::{self, E4EError};
+use crate::export::{self, ExportIndex, ExportOptions, TarFormat};
+use crate::listing::{self, ListContext, ListEntry, ListOptions};
 use crate::manager::{self, DataManager};
+use crate::manifest::{self, ManifestEntry};
 use crate::metadata::MetadataRecord;
-use crate::manifest;
+use crate::progress::{self, Progress, Snapshot};
+use crate::throttle::{self, IoPriority};
+use crate::trace;
+use crate::utils;
 
 // ─────────────────────────────────────────────────────────────
 // Python exceptions
@@ -32,6 +43,7 @@ create_exception!(_core, MissionFilesInStaging, Incomplete);
 create_exception!(_core, ReadmeFilesInStaging, Incomplete);
 create_exception!(_core, ReadmeNotFound, Incomplete);
 create_exception!(_core, CorruptedDataset, pyo3::exceptions::PyException);
+create_exception!(_core, Cancelled, pyo3::exceptions::PyException);
 
 impl From<E4EError> for PyErr {
     fn from(err: E4EError) -> PyErr {
@@ -44,6 +56,7 @@ impl From<E4EError> for PyErr {
             }
             E4EError::ReadmeNotFound(ref msg) => ReadmeNotFound::new_err(msg.clone()),
             E4EError::CorruptedDataset => CorruptedDataset::new_err(err.to_string()),
+            E4EError::Cancelled => Cancelled::new_err(err.to_string()),
             other => pyo3::exceptions::PyRuntimeError::new_err(other.to_string()),
         }
     }
@@ -61,6 +74,8 @@ struct PyStagedFile {
     target_path: String,
     #[pyo3(get)]
     hash: String,
+    #[pyo3(get)]
+    size: u64,
 }
 
 impl From<&StagedFileRecord> for PyStagedFile {
@@ -69,6 +84,7 @@ impl From<&StagedFileRecord> for PyStagedFile {
             origin_path: r.origin_path.clone(),
             target_path: r.target_path.clone(),
             hash: r.hash.clone(),
+            size: r.size,
         }
     }
 }
@@ -77,9 +93,12 @@ impl From<&StagedFileRecord> for PyStagedFile {
 // PyMission
 // ─────────────────────────────────────────────────────────────
 
+/// A view of one mission, sharing its state with the dataset it came from.
 #[pyclass]
 struct PyMission {
-    inner: MissionState,
+    inner: Arc<MissionState>,
+    /// Root of the dataset, for reading committed files on first access.
+    root: PathBuf,
 }
 
 #[pymethods]
@@ -104,8 +123,14 @@ impl PyMission {
     }
 
     #[getter]
-    fn committed_files(&self) -> Vec<String> {
-        self.inner.committed_files.clone()
+    fn committed_files(&mut self) -> PyResult<Vec<String>> {
+        if self.inner.committed_files.is_none() {
+            let _session = db::Session::begin();
+            let files = DatasetDb::open(&self.root)?
+                .get_mission_committed_files(&self.inner.record.name)?;
+            Arc::make_mut(&mut self.inner).committed_files = Some(files);
+        }
+        Ok(self.inner.committed_files.clone().unwrap_or_default())
     }
 
     // Expose metadata fields for Python wrappers
@@ -139,9 +164,11 @@ impl PyMission {
 // PyDataset
 // ─────────────────────────────────────────────────────────────
 
-#[pyclass]
+/// A view of a dataset's state as it was when the view was made.  The state is
+/// shared, not copied, with the manager and with other views.
+#[pyclass(frozen)]
 struct PyDataset {
-    inner: DatasetState,
+    inner: Arc<DatasetState>,
 }
 
 #[pymethods]
@@ -150,7 +177,7 @@ impl PyDataset {
     fn load(_cls: &Bound<'_, pyo3::types::PyType>, root: &str) -> PyResult<Self> {
         let path = PathBuf::from(root);
         let state = dataset::load_dataset_state(&path)?;
-        Ok(PyDataset { inner: state })
+        Ok(PyDataset { inner: Arc::new(state) })
     }
 
     #[getter]
@@ -206,7 +233,10 @@ impl PyDataset {
         self.inner
             .missions
             .iter()
-            .map(|m| PyMission { inner: m.clone() })
+            .map(|m| PyMission {
+                inner: Arc::clone(m),
+                root: self.inner.root.clone(),
+            })
             .collect()
     }
 
@@ -215,8 +245,28 @@ impl PyDataset {
         Ok(result)
     }
 
-    fn validate_failures(&self) -> PyResult<Vec<String>> {
-        Ok(dataset::validate_dataset_failures(&self.inner.root)?)
+    /// Regenerate `manifest.json` from the manifest kept in `.e4edm.db`.
+    fn export_manifest(&self) -> PyResult<()> {
+        dataset::export_manifest(&self.inner.root)?;
+        Ok(())
+    }
+
+    /// The dataset manifest, read from `.e4edm.db` as it is used.
+    #[getter]
+    fn manifest(&self) -> PyManifest {
+        PyManifest { root: self.inner.root.clone(), dir: None }
+    }
+
+    #[pyo3(signature = (progress=None))]
+    fn validate_failures(
+        &self,
+        py: Python<'_>,
+        progress: Option<PyRef<'_, PyProgress>>,
+    ) -> PyResult<Vec<String>> {
+        let root = self.inner.root.clone();
+        let progress = progress_or_default(progress);
+        py.detach(move || dataset::validate_dataset_failures_with_progress(&root, &progress))
+            .map_err(PyErr::from)
     }
 
     fn validate_failures_with_progress(
@@ -225,17 +275,379 @@ impl PyDataset {
         callback: Py<PyAny>,
     ) -> PyResult<Vec<String>> {
         let root = self.inner.root.clone();
-        py.detach(move || {
-            dataset::validate_dataset_failures_with_progress(&root, |current, total| {
+        let progress = file_progress(callback);
+        py.detach(move || dataset::validate_dataset_failures_with_progress(&root, &progress))
+            .map_err(PyErr::from)
+    }
+}
+
+// ─────────────────────────────────────────────────────────────
+// PyManifest
+// ─────────────────────────────────────────────────────────────
+
+/// Manifest entries read per query while iterating.
+const MANIFEST_PAGE: usize = 1000;
+/// How long a finished worker waits before trying again to borrow a manager
+/// that a call on another thread is using.
+const BORROW_RETRY: Duration = Duration::from_millis(10);
+
+/// The manifest of a dataset as a read-only mapping from posix paths, relative
+/// to the dataset root, to `(sha256sum, size)` tuples.  Nothing is held in
+/// memory: lookups query `.e4edm.db` by key and iteration reads it a page at a
+/// time, so the view always reflects the current manifest.  `under` narrows it
+/// to one directory, such as a day or a mission.
+#[pyclass(frozen, mapping)]
+struct PyManifest {
+    root: PathBuf,
+    /// Directory the view is narrowed to, relative to the dataset root.
+    dir: Option<String>,
+}
+
+impl PyManifest {
+    fn entry(&self, path: &str) -> PyResult<Option<(String, u64)>> {
+        let inside = match &self.dir {
+            Some(dir) => path.strip_prefix(dir.as_str()).is_some_and(|rest| rest.starts_with('/')),
+            None => true,
+        };
+        if !inside {
+            return Ok(None);
+        }
+        let _session = db::Session::begin();
+        let entry = match DatasetDb::open_existing(&self.root)? {
+            Some(db) => db.get_manifest_entry(path)?,
+            None => self.json_entries()?.into_iter().find(|(p, _)| p == path).map(|(_, e)| e),
+        };
+        Ok(entry.map(|e| (e.sha256sum, e.size)))
+    }
+
+    /// The view's entries in path order, from the `manifest.json` of a root
+    /// without `.e4edm.db` (such as a push destination), which reading it must
+    /// not create.
+    fn json_entries(&self) -> PyResult<Vec<(String, ManifestEntry)>> {
+        let prefix = self.dir.as_ref().map(|dir| format!("{}/", dir));
+        let mut entries: Vec<(String, ManifestEntry)> =
+            manifest::read_manifest(&self.root.join("manifest.json"))?
+                .into_iter()
+                .filter(|(path, _)| prefix.as_ref().is_none_or(|p| path.starts_with(p.as_str())))
+                .collect();
+        entries.sort_unstable_by(|a, b| a.0.cmp(&b.0));
+        Ok(entries)
+    }
+
+    fn iter(&self, items: ManifestItems) -> PyManifestIter {
+        PyManifestIter {
+            root: self.root.clone(),
+            dir: self.dir.clone(),
+            items,
+            after: String::new(),
+            page: Vec::new().into_iter(),
+            done: false,
+        }
+    }
+
+    fn stats(&self) -> PyResult<(usize, u64)> {
+        let _session = db::Session::begin();
+        match DatasetDb::open_existing(&self.root)? {
+            Some(db) => Ok(db.manifest_stats(self.dir.as_deref())?),
+            None => {
+                let entries = self.json_entries()?;
+                Ok((entries.len(), entries.iter().map(|(_, e)| e.size).sum()))
+            }
+        }
+    }
+}
+
+#[pymethods]
+impl PyManifest {
+    fn __len__(&self) -> PyResult<usize> {
+        Ok(self.stats()?.0)
+    }
+
+    fn __getitem__(&self, path: &str) -> PyResult<(String, u64)> {
+        self.entry(path)?
+            .ok_or_else(|| pyo3::exceptions::PyKeyError::new_err(path.to_string()))
+    }
+
+    fn __contains__(&self, path: &Bound<'_, PyAny>) -> PyResult<bool> {
+        match path.extract::<String>() {
+            Ok(path) => Ok(self.entry(&path)?.is_some()),
+            Err(_) => Ok(false),
+        }
+    }
+
+    fn __iter__(&self) -> PyManifestIter {
+        self.iter(ManifestItems::Keys)
+    }
+
+    #[pyo3(signature = (path, default=None))]
+    fn get(&self, py: Python<'_>, path: &str, default: Option<Py<PyAny>>) -> PyResult<Py<PyAny>> {
+        match self.entry(path)? {
+            Some(entry) => Ok(entry.into_pyobject(py)?.into_any().unbind()),
+            None => Ok(default.unwrap_or_else(|| py.None())),
+        }
+    }
+
+    fn keys(&self) -> PyManifestIter {
+        self.iter(ManifestItems::Keys)
+    }
+
+    fn values(&self) -> PyManifestIter {
+        self.iter(ManifestItems::Values)
+    }
+
+    fn items(&self) -> PyManifestIter {
+        self.iter(ManifestItems::Items)
+    }
+
+    /// The entries under directory `dir`, relative to this view.
+    fn under(&self, dir: &str) -> PyManifest {
+        let dir = dir.replace('\\', "/");
+        let dir = dir.trim_matches('/');
+        PyManifest {
+            root: self.root.clone(),
+            dir: Some(match &self.dir {
+                Some(parent) if !dir.is_empty() => format!("{}/{}", parent, dir),
+                Some(parent) => parent.clone(),
+                None => dir.to_string(),
+            }),
+        }
+    }
+
+    /// Total size in bytes of the files in the view.
+    #[getter]
+    fn total_bytes(&self) -> PyResult<u64> {
+        Ok(self.stats()?.1)
+    }
+
+    /// Path of the dataset's exported `manifest.json`.
+    #[getter]
+    fn path(&self) -> String {
+        self.root.join("manifest.json").to_string_lossy().into_owned()
+    }
+
+    /// Regenerate `manifest.json` from `.e4edm.db`.
+    fn export(&self) -> PyResult<()> {
+        let _session = db::Session::begin();
+        dataset::export_manifest(&self.root)?;
+        Ok(())
+    }
+
+    /// Every entry of the view at once, in the layout of `manifest.json`.
+    fn get_dict<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyDict>> {
+        let _session = db::Session::begin();
+        let entries: Vec<(String, ManifestEntry)> = match DatasetDb::open_existing(&self.root)? {
+            Some(db) => match &self.dir {
+                Some(dir) => db.get_manifest_dir(dir)?.into_iter().collect(),
+                None => db.get_manifest()?.into_iter().collect(),
+            },
+            None => self.json_entries()?,
+        };
+        let dict = PyDict::new(py);
+        for (path, entry) in entries {
+            let d = PyDict::new(py);
+            d.set_item("sha256sum", entry.sha256sum)?;
+            d.set_item("size", entry.size)?;
+            dict.set_item(path, d)?;
+        }
+        Ok(dict)
+    }
+}
+
+#[derive(Clone, Copy)]
+enum ManifestItems {
+    Keys,
+    Values,
+    Items,
+}
+
+/// Iterator over a `PyManifest`, reading `MANIFEST_PAGE` entries at a time in
+/// path order.
+#[pyclass]
+struct PyManifestIter {
+    root: PathBuf,
+    dir: Option<String>,
+    items: ManifestItems,
+    /// Last path read; the next page starts after it.
+    after: String,
+    page: std::vec::IntoIter<(String, ManifestEntry)>,
+    done: bool,
+}
+
+#[pymethods]
+impl PyManifestIter {
+    fn __iter__(slf: PyRef<'_, Self>) -> PyRef<'_, Self> {
+        slf
+    }
+
+    fn __next__(&mut self, py: Python<'_>) -> PyResult<Option<Py<PyAny>>> {
+        if self.page.as_slice().is_empty() && !self.done {
+            let _session = db::Session::begin();
+            let page = match DatasetDb::open_existing(&self.root)? {
+                Some(db) => db.get_manifest_page(self.dir.as_deref(), &self.after, MANIFEST_PAGE)?,
+                None => {
+                    let view = PyManifest { root: self.root.clone(), dir: self.dir.clone() };
+                    view.json_entries()?
+                        .into_iter()
+                        .filter(|(path, _)| *path > self.after)
+                        .take(MANIFEST_PAGE)
+                        .collect()
+                }
+            };
+            self.done = page.len() < MANIFEST_PAGE;
+            if let Some((last, _)) = page.last() {
+                self.after.clone_from(last);
+            }
+            self.page = page.into_iter();
+        }
+        let Some((path, entry)) = self.page.next() else {
+            return Ok(None);
+        };
+        let value = (entry.sha256sum, entry.size);
+        let item = match self.items {
+            ManifestItems::Keys => path.into_pyobject(py)?.into_any(),
+            ManifestItems::Values => value.into_pyobject(py)?.into_any(),
+            ManifestItems::Items => (path, value).into_pyobject(py)?.into_any(),
+        };
+        Ok(Some(item.unbind()))
+    }
+}
+
+// ─────────────────────────────────────────────────────────────
+// PyProgress
+// ─────────────────────────────────────────────────────────────
+
+/// A cancellation flag checked by running operations between files and chunks.
+#[pyclass(frozen)]
+struct PyCancelToken {
+    inner: CancelToken,
+}
+
+#[pymethods]
+impl PyCancelToken {
+    #[new]
+    fn new() -> Self {
+        PyCancelToken { inner: CancelToken::new() }
+    }
+
+    fn cancel(&self) {
+        self.inner.cancel();
+    }
+
+    #[getter]
+    fn cancelled(&self) -> bool {
+        self.inner.is_cancelled()
+    }
+}
+
+/// Progress counters shared with a running push, duplicate or validate.  Poll
+/// them from another thread, or pass a callback that receives the same dict at
+/// most once per `interval` seconds.  The operation stops when `cancel` is
+/// cancelled.
+#[pyclass(frozen)]
+struct PyProgress {
+    inner: Arc<Progress<'static>>,
+}
+
+#[pymethods]
+impl PyProgress {
+    #[new]
+    #[pyo3(signature = (callback=None, interval=0.1, cancel=None))]
+    fn new(
+        callback: Option<Py<PyAny>>,
+        interval: f64,
+        cancel: Option<PyRef<'_, PyCancelToken>>,
+    ) -> PyResult<Self> {
+        let interval = Duration::try_from_secs_f64(interval).map_err(|_| {
+            pyo3::exceptions::PyValueError::new_err(format!("Invalid interval: {}", interval))
+        })?;
+        let inner = match callback {
+            Some(callback) => Progress::with_callback(interval, move |s| {
                 Python::attach(|py| {
-                    let _ = callback.call1(py, (current, total));
+                    if let Ok(snapshot) = snapshot_to_dict(py, s) {
+                        let _span = trace::span("python.callback");
+                        let _ = callback.call1(py, (snapshot,));
+                    }
                 });
-            })
-        })
-        .map_err(PyErr::from)
+            }),
+            None => Progress::new(),
+        };
+        let inner = match cancel {
+            Some(token) => inner.with_cancel(token.inner.clone()),
+            None => inner,
+        };
+        Ok(PyProgress { inner: Arc::new(inner) })
+    }
+
+    /// Current phase, per-phase file and byte counts, throughput and elapsed time.
+    fn poll<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyDict>> {
+        snapshot_to_dict(py, &self.inner.snapshot())
     }
 }
 
+fn snapshot_to_dict<'py>(py: Python<'py>, s: &Snapshot) -> PyResult<Bound<'py, PyDict>> {
+    let d = PyDict::new(py);
+    d.set_item("phase", s.phase.as_str())?;
+    d.set_item("files_done", s.files_done)?;
+    d.set_item("files_total", s.files_total)?;
+    d.set_item("bytes_done", s.bytes_done)?;
+    d.set_item("bytes_total", s.bytes_total)?;
+    d.set_item("bytes_per_sec", s.bytes_per_sec)?;
+    d.set_item("elapsed", s.elapsed_secs)?;
+    Ok(d)
+}
+
+fn progress_or_default(progress: Option<PyRef<'_, PyProgress>>) -> Arc<Progress<'static>> {
+    progress
+        .map(|p| p.inner.clone())
+        .unwrap_or_else(|| Arc::new(Progress::new()))
+}
+
+/// Adapt a `callback(current, total)` of the original API.
+fn file_progress(callback: Py<PyAny>) -> Progress<'static> {
+    Progress::with_file_callback(progress::DEFAULT_INTERVAL, move |current, total| {
+        Python::attach(|py| {
+            let _span = trace::span("python.callback");
+            let _ = callback.call1(py, (current, total));
+        });
+    })
+}
+
+/// Run `work` on a new thread.  When it returns, `finish` applies its result to
+/// `manager` with the GIL held and `done(value, None)` or `done(None, error)` is
+/// called from that thread.  The Python side turns this into an awaitable.
+///
+/// A call on another thread may be using `manager` with the GIL released; the
+/// worker waits for it to return rather than drop the result.
+fn spawn_completion<T, W, F>(manager: Py<PyDataManager>, done: Py<PyAny>, work: W, finish: F)
+where
+    T: Send + 'static,
+    W: FnOnce() -> errors::Result<T> + Send + 'static,
+    F: for<'py> FnOnce(Python<'py>, &mut PyDataManager, errors::Result<T>) -> PyResult<Py<PyAny>>
+        + Send
+        + 'static,
+{
+    std::thread::spawn(move || {
+        throttle::mark_worker_thread();
+        let _session = db::Session::begin();
+        let result = std::panic::catch_unwind(std::panic::AssertUnwindSafe(work))
+            .unwrap_or_else(|_| Err(E4EError::Runtime("Worker thread panicked".to_string())));
+        Python::attach(|py| {
+            let outcome = loop {
+                match manager.bind(py).try_borrow_mut() {
+                    Ok(mut dm) => break finish(py, &mut dm, result),
+                    Err(_) => py.detach(|| std::thread::sleep(BORROW_RETRY)),
+                }
+            };
+            let args = match outcome {
+                Ok(value) => (value, py.None()),
+                Err(err) => (py.None(), err.into_value(py).into_any()),
+            };
+            let _span = trace::span("python.callback");
+            let _ = done.call1(py, args);
+        });
+    });
+}
+
 // ─────────────────────────────────────────────────────────────
 // PyDataManager
 // ─────────────────────────────────────────────────────────────
@@ -249,15 +661,101 @@ impl PyDataManager {
     fn ensure_active_dataset(&mut self) -> crate::errors::Result<&mut DatasetState> {
         self.dm.ensure_active_dataset()
     }
+    fn shared_active_dataset(&mut self) -> crate::errors::Result<Arc<DatasetState>> {
+        self.dm.shared_active_dataset()
+    }
     fn sync_active_dataset_info(&mut self) {
         self.dm.sync_active_dataset_info()
     }
+
+    /// The active dataset's name, root and status, read from `.e4edm.db`
+    /// without loading the dataset.  None if no dataset is active or its
+    /// directory is gone.
+    fn active_dataset_status(&self) -> PyResult<Option<(String, PathBuf, DatasetStatus)>> {
+        let name = match self.dm.state.active_dataset_name.clone() {
+            Some(name) if !name.is_empty() => name,
+            _ => return Ok(None),
+        };
+        let root = match (&self.dm.active_dataset, self.dm.state.find_dataset(&name)) {
+            (Some(ds), _) => ds.root.clone(),
+            (None, Some(info)) => PathBuf::from(&info.root_path),
+            (None, None) => return Ok(None),
+        };
+        if !root.is_dir() {
+            return Ok(None);
+        }
+        let status = dataset::dataset_status(&root)?;
+        Ok(Some((name, root, status)))
+    }
+
+    fn require_active_mission(&self) -> PyResult<String> {
+        self.dm
+            .active_mission_name
+            .clone()
+            .filter(|s| !s.is_empty())
+            .ok_or_else(|| pyo3::exceptions::PyRuntimeError::new_err("Mission not active"))
+    }
+
+    fn is_active_root(&self, root: &std::path::Path) -> bool {
+        self.dm.active_dataset.as_ref().map(|ds| ds.root == root).unwrap_or(false)
+    }
+
+    /// Store `ds`, updated by a worker thread, as the active dataset and persist
+    /// the manager state.  Ignored if another dataset was activated meanwhile.
+    /// If other calls wrote to the dataset while the worker ran, `ds` is stale
+    /// and is reloaded from `.e4edm.db`, which holds both their changes and
+    /// the worker's.
+    fn store_active_dataset(&mut self, mut ds: DatasetState) -> PyResult<()> {
+        if self.is_active_root(&ds.root) {
+            ds.refresh()?;
+            self.dm.active_dataset = Some(Arc::new(ds));
+            self.sync_active_dataset_info();
+            self.dm.state.save()?;
+        }
+        Ok(())
+    }
+
+    /// Record that the active dataset passed validation just now.
+    fn mark_validated(&self) -> PyResult<()> {
+        let name = self.dm.state.active_dataset_name.as_deref();
+        if let Some(name) = name.filter(|n| !n.is_empty()) {
+            self.dm.state.mark_validated(name)?;
+        }
+        Ok(())
+    }
+
+    /// Set and persist the pushed flag on the active dataset.
+    fn mark_pushed(&mut self) -> PyResult<()> {
+        let ds = self.ensure_active_dataset()?;
+        ds.pushed = true;
+        dataset::save_dataset_state(ds)?;
+        self.sync_active_dataset_info();
+        self.dm.state.save()?;
+        Ok(())
+    }
+
+    /// Register and catalog the dataset `name` just restored to `state.root`.
+    fn register_restored(&mut self, name: &str, state: &DatasetState) -> PyResult<()> {
+        let info = DatasetInfo {
+            name: name.to_string(),
+            root_path: state.root.to_string_lossy().into_owned(),
+            pushed: state.pushed,
+            last_country: state.last_country.clone(),
+            last_region: state.last_region.clone(),
+            last_site: state.last_site.clone(),
+            day_0: Some(state.day_0.clone()),
+        };
+        self.dm.state.upsert_dataset_info(info)?;
+        self.dm.state.catalog_dataset(name, state)?;
+        Ok(())
+    }
 }
 
 #[pymethods]
 impl PyDataManager {
     #[new]
     fn new(config_dir: &str, default_dataset_dir: &str) -> PyResult<Self> {
+        let _session = db::Session::begin();
         let dm = DataManager::new(
             &PathBuf::from(config_dir),
             &PathBuf::from(default_dataset_dir),
@@ -270,11 +768,12 @@ impl PyDataManager {
         _cls: &Bound<'_, pyo3::types::PyType>,
         config_dir: &str,
     ) -> PyResult<Self> {
+        let _session = db::Session::begin();
         let dm = DataManager::load(&PathBuf::from(config_dir))?;
         Ok(PyDataManager { dm })
     }
 
-    fn save(&self) -> PyResult<()> {
+    fn save(&mut self) -> PyResult<()> {
         self.dm.state.save()?;
         Ok(())
     }
@@ -283,8 +782,9 @@ impl PyDataManager {
 
     #[getter]
     fn active_dataset(&mut self) -> PyResult<Option<PyDataset>> {
-        match self.ensure_active_dataset() {
-            Ok(ds) => Ok(Some(PyDataset { inner: ds.clone() })),
+        let _session = db::Session::begin();
+        match self.shared_active_dataset() {
+            Ok(ds) => Ok(Some(PyDataset { inner: ds })),
             Err(E4EError::Runtime(_)) => Ok(None),
             Err(e) => Err(e.into()),
         }
@@ -292,17 +792,21 @@ impl PyDataManager {
 
     #[getter]
     fn active_mission(&mut self) -> PyResult<Option<PyMission>> {
+        let _session = db::Session::begin();
         let mission_name = match self.dm.active_mission_name.clone() {
             Some(n) if !n.is_empty() => n,
             _ => return Ok(None),
         };
-        match self.ensure_active_dataset() {
+        match self.shared_active_dataset() {
             Ok(ds) => {
                 let mission = ds
                     .missions
                     .iter()
                     .find(|m| m.record.name == mission_name)
-                    .map(|m| PyMission { inner: m.clone() });
+                    .map(|m| PyMission {
+                        inner: Arc::clone(m),
+                        root: ds.root.clone(),
+                    });
                 Ok(mission)
             }
             Err(E4EError::Runtime(_)) => Ok(None),
@@ -310,36 +814,61 @@ impl PyDataManager {
         }
     }
 
+    /// Summaries of the registered datasets, by name, read from `config.db`
+    /// without opening any dataset; `load_dataset` gives the full state.
     #[getter]
     fn datasets<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyDict>> {
+        let _session = db::Session::begin();
         let dict = PyDict::new(py);
-        for info in &self.dm.state.dataset_infos {
-            // Try to load the dataset state
-            let ds_result = dataset::load_dataset_state(&PathBuf::from(&info.root_path));
-            let state = match ds_result {
-                Ok(s) => s,
-                Err(_) => {
-                    // Dataset might be missing from disk; include a stub
-                    DatasetState {
-                        root: PathBuf::from(&info.root_path),
-                        day_0: info.day_0.clone().unwrap_or_default(),
-                        pushed: info.pushed,
-                        version: 2,
-                        last_country: info.last_country.clone(),
-                        last_region: info.last_region.clone(),
-                        last_site: info.last_site.clone(),
-                        missions: Vec::new(),
-                        staged_files: Vec::new(),
-                        committed_files: Vec::new(),
-                    }
-                }
-            };
-            let py_ds = PyDataset { inner: state };
-            dict.set_item(&info.name, pyo3::Py::new(py, py_ds)?)?;
+        for summary in self.dm.state.dataset_summaries()? {
+            let info = &summary.info;
+            let d = PyDict::new(py);
+            d.set_item("name", &info.name)?;
+            d.set_item("root", &info.root_path)?;
+            d.set_item("pushed", info.pushed)?;
+            d.set_item("last_country", &info.last_country)?;
+            d.set_item("last_region", &info.last_region)?;
+            d.set_item("last_site", &info.last_site)?;
+            d.set_item("mission_count", summary.mission_count)?;
+            d.set_item("file_count", summary.file_count)?;
+            d.set_item("total_bytes", summary.total_bytes)?;
+            d.set_item("last_validated", &summary.last_validated)?;
+            if let Some(missions) = &summary.missions {
+                d.set_item("sites", missions.sites.iter().collect::<Vec<_>>())?;
+                d.set_item("devices", missions.devices.iter().collect::<Vec<_>>())?;
+                d.set_item("countries", missions.countries.iter().collect::<Vec<_>>())?;
+                d.set_item("regions", missions.regions.iter().collect::<Vec<_>>())?;
+            }
+            dict.set_item(&info.name, d)?;
         }
         Ok(dict)
     }
 
+    /// The state of registered dataset `name`, or a stub without missions if
+    /// it cannot be loaded from disk.
+    fn load_dataset(&self, name: &str) -> PyResult<PyDataset> {
+        let _session = db::Session::begin();
+        let info = self.dm.state.find_dataset(name).ok_or_else(|| {
+            pyo3::exceptions::PyKeyError::new_err(name.to_string())
+        })?;
+        let state = match dataset::load_dataset_state(&PathBuf::from(&info.root_path)) {
+            Ok(s) => s,
+            Err(_) => {
+                // Dataset might be missing from disk; include a stub
+                let mut stub = DatasetState::new(
+                    &PathBuf::from(&info.root_path),
+                    &info.day_0.clone().unwrap_or_default(),
+                );
+                stub.pushed = info.pushed;
+                stub.last_country = info.last_country.clone();
+                stub.last_region = info.last_region.clone();
+                stub.last_site = info.last_site.clone();
+                stub
+            }
+        };
+        Ok(PyDataset { inner: Arc::new(state) })
+    }
+
     #[getter]
     fn dataset_dir(&self) -> String {
         self.dm.state.dataset_dir.to_string_lossy().into_owned()
@@ -357,6 +886,45 @@ impl PyDataManager {
         self.dm.state.version
     }
 
+    #[getter]
+    fn io_bytes_per_sec(&self) -> u64 {
+        self.dm.state.io_bytes_per_sec
+    }
+
+    #[setter]
+    fn set_io_bytes_per_sec(&mut self, rate: u64) -> PyResult<()> {
+        self.dm.state.io_bytes_per_sec = rate;
+        self.dm.state.apply_io_settings();
+        self.dm.state.save()?;
+        Ok(())
+    }
+
+    #[getter]
+    fn io_files_per_sec(&self) -> u64 {
+        self.dm.state.io_files_per_sec
+    }
+
+    #[setter]
+    fn set_io_files_per_sec(&mut self, rate: u64) -> PyResult<()> {
+        self.dm.state.io_files_per_sec = rate;
+        self.dm.state.apply_io_settings();
+        self.dm.state.save()?;
+        Ok(())
+    }
+
+    #[getter]
+    fn io_priority(&self) -> &'static str {
+        self.dm.state.io_priority.as_str()
+    }
+
+    #[setter]
+    fn set_io_priority(&mut self, priority: &str) -> PyResult<()> {
+        self.dm.state.io_priority = parse_io_priority(priority)?;
+        self.dm.state.apply_io_settings();
+        self.dm.state.save()?;
+        Ok(())
+    }
+
     // ── Operations ────────────────────────────────────────────
 
     fn initialize_dataset(
@@ -366,6 +934,7 @@ impl PyDataManager {
         location: &str,
         directory: &str,
     ) -> PyResult<()> {
+        let _session = db::Session::begin();
         // Format: {YYYY}.{MM:02}.{DD:02}.{project}.{location}
         let date_parts: Vec<&str> = date_str.split('-').collect();
         if date_parts.len() < 3 {
@@ -389,7 +958,6 @@ impl PyDataManager {
         let day_0 = date_str.to_string();
 
         let state = dataset::create_dataset(&dataset_path, &day_0)?;
-        dataset::save_dataset_state(&state)?;
 
         let info = DatasetInfo {
             name: dataset_name.clone(),
@@ -401,10 +969,11 @@ impl PyDataManager {
             day_0: Some(day_0),
         };
         self.dm.state.upsert_dataset_info(info)?;
+        self.dm.state.catalog_dataset(&dataset_name, &state)?;
         self.dm.state.active_dataset_name = Some(dataset_name);
         self.dm.state.active_mission_name = None;
         self.dm.active_mission_name = None;
-        self.dm.active_dataset = Some(state);
+        self.dm.active_dataset = Some(Arc::new(state));
         self.dm.state.save()?;
         Ok(())
     }
@@ -421,6 +990,7 @@ impl PyDataManager {
         notes: &str,
         properties: &str,
     ) -> PyResult<()> {
+        let _session = db::Session::begin();
         let meta = MetadataRecord {
             timestamp: timestamp.to_string(),
             device: device.to_string(),
@@ -452,6 +1022,7 @@ impl PyDataManager {
         };
 
         self.dm.state.upsert_dataset_info(info)?;
+        self.dm.catalog_active_mission(&mission_name)?;
 
         self.dm.active_mission_name = Some(mission_name.clone());
         self.dm.state.active_mission_name = Some(mission_name);
@@ -459,108 +1030,172 @@ impl PyDataManager {
         Ok(())
     }
 
+    /// The active dataset and mission, with the files and bytes the mission
+    /// has staged, committed and pushed, read from the counters in
+    /// `.e4edm.db`.  Staged readme files are listed; `status_files` lists the
+    /// others a page at a time.
     fn status(&mut self) -> PyResult<String> {
-        let mut output = String::new();
-
-        let active_ds_name = self.dm.state.active_dataset_name.clone().unwrap_or_default();
-        if active_ds_name.is_empty() {
-            return Ok("No dataset active".to_string());
-        }
-
-        let ds = match self.ensure_active_dataset() {
-            Ok(ds) => ds.clone(),
-            Err(_) => return Ok("No dataset active".to_string()),
+        let _session = db::Session::begin();
+        let (name, root, status) = match self.active_dataset_status()? {
+            Some(found) => found,
+            None => return Ok("No dataset active".to_string()),
         };
+        let mut output = format!("Dataset {} at {} activated", name, root.display());
 
-        let ds_path = ds.root.to_string_lossy().into_owned();
-        output.push_str(&format!(
-            "Dataset {} at {} activated",
-            active_ds_name, ds_path
-        ));
-
-        let active_mission_name = self
-            .dm.active_mission_name
-            .clone()
-            .unwrap_or_default();
-        if active_mission_name.is_empty() {
-            output.push('\n');
-            output.push_str("No mission active");
-            return Ok(output);
-        }
-
-        let mission_opt = ds
+        let (files, bytes) = status
             .missions
             .iter()
-            .find(|m| m.record.name == active_mission_name)
-            .cloned();
-
-        let mission = match mission_opt {
-            Some(m) => m,
-            None => {
-                output.push('\n');
-                output.push_str("No mission active");
-                return Ok(output);
-            }
-        };
-
-        let mission_path = &mission.record.path;
-        output.push('\n');
+            .map(|m| status.totals(&m.name, "committed"))
+            .fold((0, 0), |(f, b), (files, bytes)| (f + files, b + bytes));
         output.push_str(&format!(
-            "Mission {} at {} activated",
-            active_mission_name, mission_path
+            "\n{} missions, {} committed files ({})",
+            status.missions.len(),
+            files,
+            utils::format_size(bytes)
         ));
 
-        output.push('\n');
-        if !mission.staged_files.is_empty() {
-            output.push_str(&format!(
-                "{} staged files:\n\t",
-                mission.staged_files.len()
-            ));
-            let mission_root = PathBuf::from(&mission.record.path);
-            let mut sorted_staged = mission.staged_files.clone();
-            sorted_staged.sort_by(|a, b| {
-                let a_name = PathBuf::from(&a.target_path)
-                    .file_name()
-                    .map(|n| n.to_string_lossy().into_owned())
-                    .unwrap_or_default();
-                let b_name = PathBuf::from(&b.target_path)
-                    .file_name()
-                    .map(|n| n.to_string_lossy().into_owned())
-                    .unwrap_or_default();
-                a_name.cmp(&b_name)
-            });
-            let lines: Vec<String> = sorted_staged
-                .iter()
-                .map(|f| {
-                    let target = PathBuf::from(&f.target_path);
-                    let rel = target
-                        .strip_prefix(&mission_root)
-                        .map(|r| r.to_string_lossy().into_owned())
-                        .unwrap_or_else(|_| f.target_path.clone());
-                    // Use forward slashes (posix style)
-                    let rel_posix = rel.replace('\\', "/");
-                    format!("{} -> {}", f.origin_path, rel_posix)
-                })
-                .collect();
-            output.push_str(&lines.join("\n\t"));
+        let active_mission_name = self.dm.active_mission_name.clone().unwrap_or_default();
+        match status.missions.iter().find(|m| m.name == active_mission_name) {
+            Some(mission) => {
+                output.push_str(&format!(
+                    "\nMission {} at {} activated",
+                    mission.name, mission.path
+                ));
+                for state in ["staged", "committed"] {
+                    let (files, bytes) = status.totals(&mission.name, state);
+                    output.push_str(&format!(
+                        "\n{} {} files ({})",
+                        files,
+                        state,
+                        utils::format_size(bytes)
+                    ));
+                }
+                for pushed in status.pushed(&mission.name) {
+                    output.push_str(&format!(
+                        "\n{} files pushed to {} ({})",
+                        pushed.files,
+                        pushed.destination,
+                        utils::format_size(pushed.bytes)
+                    ));
+                }
+            }
+            None => output.push_str("\nNo mission active"),
         }
 
-        if !ds.staged_files.is_empty() {
+        if !status.staged_readmes.is_empty() {
             output.push_str(&format!(
-                "{} staged dataset files:\n\t",
-                ds.staged_files.len()
+                "\n{} staged dataset files:\n\t{}",
+                status.staged_readmes.len(),
+                status.staged_readmes.join("\n\t")
             ));
-            let paths: Vec<String> = ds
-                .staged_files
-                .iter()
-                .map(|p| p.to_string_lossy().into_owned())
-                .collect();
-            output.push_str(&paths.join("\n\t"));
         }
 
         Ok(output)
     }
 
+    /// `status` as a dict: `dataset`, `root`, the active `mission` (or None),
+    /// `missions` mapping each mission name to its counts, `dataset_files`
+    /// with the counts of the files outside every mission, and
+    /// `staged_readmes`.  Counts are a dict with `staged` and `committed` as
+    /// `(files, bytes)` and `pushed` mapping each destination to
+    /// `(files, bytes)`.  None if no dataset is active.
+    fn status_summary<'py>(&mut self, py: Python<'py>) -> PyResult<Option<Bound<'py, PyDict>>> {
+        let _session = db::Session::begin();
+        let (name, root, status) = match self.active_dataset_status()? {
+            Some(found) => found,
+            None => return Ok(None),
+        };
+        let active_mission_name = self.dm.active_mission_name.clone().unwrap_or_default();
+        let d = PyDict::new(py);
+        d.set_item("dataset", name)?;
+        d.set_item("root", root.to_string_lossy())?;
+        d.set_item(
+            "mission",
+            status
+                .missions
+                .iter()
+                .find(|m| m.name == active_mission_name)
+                .map(|m| m.name.clone()),
+        )?;
+        let missions = PyDict::new(py);
+        for mission in &status.missions {
+            missions.set_item(&mission.name, status_counts(py, &status, &mission.name)?)?;
+        }
+        d.set_item("missions", missions)?;
+        d.set_item("dataset_files", status_counts(py, &status, "")?)?;
+        d.set_item("staged_readmes", &status.staged_readmes)?;
+        Ok(Some(d))
+    }
+
+    /// Up to `limit` of the files `mission` (by default the active mission)
+    /// has in `state`, `staged` or `committed`, skipping `offset`; with
+    /// `pattern`, only those whose path in the mission matches that glob.
+    /// Returns a dict per file with its `path` in the mission, `sha256` and
+    /// `size`, and for staged files its `origin_path`.
+    #[pyo3(signature = (state="staged", mission=None, pattern=None, offset=0, limit=100))]
+    fn status_files<'py>(
+        &mut self,
+        py: Python<'py>,
+        state: &str,
+        mission: Option<String>,
+        pattern: Option<&str>,
+        offset: usize,
+        limit: usize,
+    ) -> PyResult<Vec<Bound<'py, PyDict>>> {
+        let _session = db::Session::begin();
+        let mission_name = match mission {
+            Some(name) => name,
+            None => self.require_active_mission()?,
+        };
+        let (_, root, status) = self
+            .active_dataset_status()?
+            .ok_or_else(|| pyo3::exceptions::PyRuntimeError::new_err("Dataset not active"))?;
+        let record = status
+            .missions
+            .iter()
+            .find(|m| m.name == mission_name)
+            .ok_or_else(|| E4EError::Runtime(format!("Mission not found: {}", mission_name)))?;
+        let (mission_path, rel_dir) = dataset::mission_dir_in(&root, record)?;
+        let db = DatasetDb::open(&root)?;
+        let mut rows = Vec::new();
+        match state {
+            "staged" => {
+                let target_dir = mission_path.to_string_lossy();
+                let files =
+                    db.find_mission_staged_files(&mission_name, &target_dir, pattern, offset, limit)?;
+                for file in files {
+                    let path = std::path::Path::new(&file.target_path)
+                        .strip_prefix(&mission_path)
+                        .map(|p| p.to_string_lossy().replace('\\', "/"))
+                        .unwrap_or_else(|_| file.target_path.clone());
+                    let d = PyDict::new(py);
+                    d.set_item("path", path)?;
+                    d.set_item("sha256", file.hash)?;
+                    d.set_item("size", file.size)?;
+                    d.set_item("origin_path", file.origin_path)?;
+                    rows.push(d);
+                }
+            }
+            "committed" => {
+                let prefix = format!("{}/", rel_dir);
+                for (path, entry) in db.find_manifest_entries(&rel_dir, pattern, offset, limit)? {
+                    let d = PyDict::new(py);
+                    d.set_item("path", path.strip_prefix(&prefix).unwrap_or(&path))?;
+                    d.set_item("sha256", entry.sha256sum)?;
+                    d.set_item("size", entry.size)?;
+                    rows.push(d);
+                }
+            }
+            _ => {
+                return Err(pyo3::exceptions::PyValueError::new_err(format!(
+                    "Unknown file state: {}",
+                    state
+                )))
+            }
+        }
+        Ok(rows)
+    }
+
     #[pyo3(signature = (dataset, day=None, mission=None, root_dir=None))]
     fn activate(
         &mut self,
@@ -569,6 +1204,7 @@ impl PyDataManager {
         mission: Option<String>,
         root_dir: Option<String>,
     ) -> PyResult<()> {
+        let _session = db::Session::begin();
         // Find or load the dataset
         let ds_state = if self.dm.state.find_dataset(dataset).is_some() {
             let info = self.dm.state.find_dataset(dataset).cloned().unwrap();
@@ -599,7 +1235,7 @@ impl PyDataManager {
             ));
         };
 
-        self.dm.active_dataset = Some(ds_state);
+        self.dm.active_dataset = Some(Arc::new(ds_state));
         self.dm.state.active_dataset_name = Some(dataset.to_string());
 
         // Activate mission if specified
@@ -639,6 +1275,7 @@ impl PyDataManager {
         readme: bool,
         destination: Option<String>,
     ) -> PyResult<()> {
+        let _session = db::Session::begin();
         let path_bufs: Vec<PathBuf> = paths.iter().map(PathBuf::from).collect();
 
         if readme {
@@ -650,13 +1287,7 @@ impl PyDataManager {
             return Ok(());
         }
 
-        let mission_name = self
-            .dm.active_mission_name
-            .clone()
-            .filter(|s| !s.is_empty())
-            .ok_or_else(|| {
-                pyo3::exceptions::PyRuntimeError::new_err("Mission not active")
-            })?;
+        let mission_name = self.require_active_mission()?;
 
         let dest = destination.as_deref().map(PathBuf::from);
         let ds = self.ensure_active_dataset()?;
@@ -667,45 +1298,113 @@ impl PyDataManager {
     }
 
     fn commit(&mut self, readme: bool) -> PyResult<()> {
+        let _session = db::Session::begin();
         if readme {
             let ds = self.ensure_active_dataset()?;
-            dataset::commit_dataset_files(ds)?;
+            let committed = dataset::commit_dataset_files(ds)?;
             self.sync_active_dataset_info();
             self.dm.state.save()?;
+            self.dm.catalog_active_committed(&committed)?;
             return Ok(());
         }
 
-        let mission_name = self
-            .dm.active_mission_name
-            .clone()
-            .filter(|s| !s.is_empty())
-            .ok_or_else(|| {
-                pyo3::exceptions::PyRuntimeError::new_err("Mission not active")
-            })?;
+        let mission_name = self.require_active_mission()?;
 
         let ds = self.ensure_active_dataset()?;
-        dataset::commit_mission_files(ds, &mission_name)?;
+        let committed = dataset::commit_mission_files(ds, &mission_name)?;
         self.sync_active_dataset_info();
         self.dm.state.save()?;
+        self.dm.catalog_active_committed(&committed)?;
         Ok(())
     }
 
-    fn duplicate(&mut self, paths: Vec<String>) -> PyResult<()> {
-        let dest_paths: Vec<PathBuf> = paths.iter().map(PathBuf::from).collect();
-        let ds = self.ensure_active_dataset()?;
-        dataset::duplicate_dataset(ds, &dest_paths)?;
+    /// Stage and commit into several missions of the active dataset at once;
+    /// see `dataset::ingest_missions`.  `sources` pairs a mission, by full name
+    /// or by its name within its day, with a file or directory.
+    #[pyo3(signature = (sources, progress=None))]
+    fn ingest(
+        &mut self,
+        py: Python<'_>,
+        sources: Vec<(String, String)>,
+        progress: Option<PyRef<'_, PyProgress>>,
+    ) -> PyResult<()> {
+        let _session = db::Session::begin();
+        let mut ds = DatasetState::clone(&self.shared_active_dataset()?);
+        let sources = sources
+            .iter()
+            .map(|(mission, path)| {
+                Ok(dataset::IngestSource {
+                    mission_name: dataset::find_mission_name(&ds, mission)?,
+                    paths: vec![PathBuf::from(path)],
+                })
+            })
+            .collect::<crate::errors::Result<Vec<_>>>()?;
+        let mut missions: Vec<String> = sources.iter().map(|s| s.mission_name.clone()).collect();
+        missions.sort();
+        missions.dedup();
+        let progress = progress_or_default(progress);
+        let (ds, result) = py.detach(move || {
+            let result = dataset::ingest_missions(&mut ds, &sources, &progress);
+            (ds, result)
+        });
+
+        // Record what the lanes committed, even if some of them failed.
+        self.store_active_dataset(ds)?;
+        match &result {
+            Ok(committed) => self.dm.catalog_active_committed(committed)?,
+            // Which files the failed lanes committed is not known.
+            Err(_) => {
+                for mission_name in &missions {
+                    self.dm.catalog_active_mission(mission_name)?;
+                }
+            }
+        }
+        result?;
+        Ok(())
+    }
+
+    #[pyo3(signature = (paths, durability="none", readback=false, progress=None))]
+    fn duplicate(
+        &mut self,
+        py: Python<'_>,
+        paths: Vec<String>,
+        durability: &str,
+        readback: bool,
+        progress: Option<PyRef<'_, PyProgress>>,
+    ) -> PyResult<()> {
+        let _session = db::Session::begin();
+        let options = push_options(false, durability, readback)?;
+        let ds = self.shared_active_dataset()?;
+        let progress = progress_or_default(progress);
+        py.detach(move || dataset::duplicate_dataset_to(&ds, &paths, options, &progress))?;
         Ok(())
     }
 
     fn validate(&mut self) -> PyResult<bool> {
-        let ds = self.ensure_active_dataset()?;
-        let result = dataset::validate_dataset(&ds.root.clone())?;
+        let _session = db::Session::begin();
+        let ds = self.shared_active_dataset()?;
+        let result = dataset::validate_dataset(&ds.root)?;
+        if result {
+            self.mark_validated()?;
+        }
         Ok(result)
     }
 
-    fn validate_failures(&mut self) -> PyResult<Vec<String>> {
-        let ds = self.ensure_active_dataset()?;
-        Ok(dataset::validate_dataset_failures(&ds.root.clone())?)
+    #[pyo3(signature = (progress=None))]
+    fn validate_failures(
+        &mut self,
+        py: Python<'_>,
+        progress: Option<PyRef<'_, PyProgress>>,
+    ) -> PyResult<Vec<String>> {
+        let _session = db::Session::begin();
+        let root = self.shared_active_dataset()?.root.clone();
+        let progress = progress_or_default(progress);
+        let failures =
+            py.detach(move || dataset::validate_dataset_failures_with_progress(&root, &progress))?;
+        if failures.is_empty() {
+            self.mark_validated()?;
+        }
+        Ok(failures)
     }
 
     fn validate_failures_with_progress(
@@ -713,133 +1412,213 @@ impl PyDataManager {
         py: Python<'_>,
         callback: Py<PyAny>,
     ) -> PyResult<Vec<String>> {
-        let ds = self.ensure_active_dataset()?;
-        let root = ds.root.clone();
-        py.detach(move || {
-            dataset::validate_dataset_failures_with_progress(&root, |current, total| {
-                Python::attach(|py| {
-                    let _ = callback.call1(py, (current, total));
-                });
-            })
-        })
-        .map_err(PyErr::from)
+        let _session = db::Session::begin();
+        let root = self.shared_active_dataset()?.root.clone();
+        let progress = file_progress(callback);
+        let failures =
+            py.detach(move || dataset::validate_dataset_failures_with_progress(&root, &progress))?;
+        if failures.is_empty() {
+            self.mark_validated()?;
+        }
+        Ok(failures)
     }
 
-    fn push(&mut self, path: &str) -> PyResult<()> {
-        let dest_root = PathBuf::from(path);
-        let ds = self.ensure_active_dataset()?;
-        dataset::check_complete(ds)?;
-
-        let ds_root = ds.root.clone();
-        let ds_name = ds_root
-            .file_name()
-            .map(|n| n.to_string_lossy().into_owned())
-            .unwrap_or_default();
-        let destination = dest_root.join(&ds_name);
-
-        // If the destination already exists, verify it contains only files that are
-        // also present in the source dataset with the same content.  This allows push
-        // to recover from a previously interrupted push without silently overwriting
-        // data that belongs to a different dataset.
-        if destination.exists() {
-            let src_manifest = manifest::read_manifest(&ds_root.join("manifest.json"))?;
-            dataset::check_destination_is_subset(&src_manifest, &destination)?;
-        }
-
-        fs::create_dir_all(&destination).map_err(|e| {
-            if e.kind() == std::io::ErrorKind::AlreadyExists {
-                PyErr::from(E4EError::Runtime(format!(
-                    "Cannot create destination directory '{}': path already exists but is not a directory",
-                    destination.display()
-                )))
-            } else {
-                PyErr::from(E4EError::Io(e))
-            }
-        })?;
-
-        dataset::duplicate_dataset(ds, std::slice::from_ref(&destination))?;
-
-        // Set pushed flag
-        let ds = self.ensure_active_dataset()?;
-        ds.pushed = true;
-        let db = DatasetDb::open(&ds.root.clone())?;
-        let meta = DatasetMeta {
-            day_0: ds.day_0.clone(),
-            pushed: true,
-            version: ds.version,
-            last_country: ds.last_country.clone(),
-            last_region: ds.last_region.clone(),
-            last_site: ds.last_site.clone(),
-        };
-        db.update_dataset_meta(&meta)?;
-
-        self.sync_active_dataset_info();
-        self.dm.state.save()?;
+    #[pyo3(signature = (path, full=false, durability="none", readback=false, progress=None))]
+    fn push(
+        &mut self,
+        py: Python<'_>,
+        path: &str,
+        full: bool,
+        durability: &str,
+        readback: bool,
+        progress: Option<PyRef<'_, PyProgress>>,
+    ) -> PyResult<()> {
+        let _session = db::Session::begin();
+        let options = push_options(full, durability, readback)?;
+        let ds = self.shared_active_dataset()?;
+        let dest_root = path.to_string();
+        let progress = progress_or_default(progress);
+        py.detach(move || dataset::push_dataset_with_progress(&ds, &dest_root, options, &progress))?;
+        self.mark_pushed()?;
         Ok(())
     }
 
+    #[pyo3(signature = (path, callback, full=false, durability="none", readback=false))]
     fn push_with_progress(
         &mut self,
         py: Python<'_>,
         path: &str,
         callback: Py<PyAny>,
+        full: bool,
+        durability: &str,
+        readback: bool,
     ) -> PyResult<()> {
-        let dest_root = PathBuf::from(path);
-        let ds = self.ensure_active_dataset()?;
-        dataset::check_complete(ds)?;
-
-        let ds_root = ds.root.clone();
-        let ds_clone = ds.clone();
-        let ds_name = ds_root
-            .file_name()
-            .map(|n| n.to_string_lossy().into_owned())
-            .unwrap_or_default();
-        let destination = dest_root.join(&ds_name);
-
-        if destination.exists() {
-            let src_manifest = manifest::read_manifest(&ds_root.join("manifest.json"))?;
-            dataset::check_destination_is_subset(&src_manifest, &destination)?;
-        }
-        fs::create_dir_all(&destination).map_err(|e| {
-            if e.kind() == std::io::ErrorKind::AlreadyExists {
-                PyErr::from(E4EError::Runtime(format!(
-                    "Cannot create destination directory '{}': path already exists but is not a directory",
-                    destination.display()
-                )))
-            } else {
-                PyErr::from(E4EError::Io(e))
-            }
-        })?;
+        let _session = db::Session::begin();
+        let options = push_options(full, durability, readback)?;
+        let ds = self.shared_active_dataset()?;
+        let dest_root = path.to_string();
+        let progress = file_progress(callback);
+        py.detach(move || dataset::push_dataset_with_progress(&ds, &dest_root, options, &progress))
+            .map_err(PyErr::from)?;
+
+        self.mark_pushed()?;
+        Ok(())
+    }
 
-        let dest_clone = destination.clone();
-        py.detach(move || {
-            dataset::duplicate_dataset_with_progress(&ds_clone, &[dest_clone], |current, total| {
-                Python::attach(|py| {
-                    let _ = callback.call1(py, (current, total));
-                });
-            })
-        })
-        .map_err(PyErr::from)?;
+    /// `add` on a worker thread; see `spawn_completion`.
+    #[pyo3(signature = (paths, done, readme=false, destination=None, progress=None))]
+    fn add_async(
+        slf: &Bound<'_, Self>,
+        paths: Vec<String>,
+        done: Py<PyAny>,
+        readme: bool,
+        destination: Option<String>,
+        progress: Option<PyRef<'_, PyProgress>>,
+    ) -> PyResult<()> {
+        let _session = db::Session::begin();
+        let path_bufs: Vec<PathBuf> = paths.iter().map(PathBuf::from).collect();
+        let (mut ds, mission_name) = {
+            let mut this = slf.try_borrow_mut()?;
+            let mission_name = if readme { None } else { Some(this.require_active_mission()?) };
+            (DatasetState::clone(&this.shared_active_dataset()?), mission_name)
+        };
+        let dest = destination.map(PathBuf::from);
+        let progress = progress_or_default(progress);
+        spawn_completion(
+            slf.clone().unbind(),
+            done,
+            move || {
+                let result = match &mission_name {
+                    None => dataset::stage_dataset_files(&mut ds, &path_bufs),
+                    Some(name) => dataset::stage_mission_files_with_progress(
+                        &mut ds,
+                        name,
+                        &path_bufs,
+                        dest.as_deref(),
+                        &progress,
+                    )
+                    .map(|_| ()),
+                };
+                Ok((ds, result))
+            },
+            |py, dm, result| {
+                let (ds, staged) = result?;
+                dm.store_active_dataset(ds)?;
+                staged?;
+                Ok(py.None())
+            },
+        );
+        Ok(())
+    }
 
-        // Set pushed flag
-        let ds = self.ensure_active_dataset()?;
-        ds.pushed = true;
-        let db = DatasetDb::open(&ds.root.clone())?;
-        let meta = DatasetMeta {
-            day_0: ds.day_0.clone(),
-            pushed: true,
-            version: ds.version,
-            last_country: ds.last_country.clone(),
-            last_region: ds.last_region.clone(),
-            last_site: ds.last_site.clone(),
+    /// `commit` on a worker thread; see `spawn_completion`.  A cancelled mission
+    /// commit keeps the files copied so far and leaves the rest staged.
+    #[pyo3(signature = (done, readme=false, progress=None))]
+    fn commit_async(
+        slf: &Bound<'_, Self>,
+        done: Py<PyAny>,
+        readme: bool,
+        progress: Option<PyRef<'_, PyProgress>>,
+    ) -> PyResult<()> {
+        let _session = db::Session::begin();
+        let (mut ds, mission_name) = {
+            let mut this = slf.try_borrow_mut()?;
+            let mission_name = if readme { None } else { Some(this.require_active_mission()?) };
+            (DatasetState::clone(&this.shared_active_dataset()?), mission_name)
         };
-        db.update_dataset_meta(&meta)?;
-        self.sync_active_dataset_info();
-        self.dm.state.save()?;
+        let progress = progress_or_default(progress);
+        spawn_completion(
+            slf.clone().unbind(),
+            done,
+            move || {
+                let result = match &mission_name {
+                    None => dataset::commit_dataset_files(&mut ds),
+                    Some(name) => dataset::commit_mission_files_with_progress(&mut ds, name, &progress),
+                };
+                Ok((ds, mission_name, result))
+            },
+            |py, dm, result| {
+                let (ds, mission_name, committed) = result?;
+                let root = ds.root.clone();
+                dm.store_active_dataset(ds)?;
+                if dm.is_active_root(&root) {
+                    match (&committed, &mission_name) {
+                        (Ok(paths), _) => dm.dm.catalog_active_committed(paths)?,
+                        // A cancelled commit keeps the files copied so far.
+                        (Err(_), Some(name)) => dm.dm.catalog_active_mission(name)?,
+                        // A failed readme commit records nothing in the manifest.
+                        (Err(_), None) => {}
+                    }
+                }
+                committed?;
+                Ok(py.None())
+            },
+        );
+        Ok(())
+    }
+
+    /// `validate_failures` on a worker thread; `done` receives the failure list.
+    #[pyo3(signature = (done, progress=None))]
+    fn validate_failures_async(
+        slf: &Bound<'_, Self>,
+        done: Py<PyAny>,
+        progress: Option<PyRef<'_, PyProgress>>,
+    ) -> PyResult<()> {
+        let _session = db::Session::begin();
+        let root = slf.try_borrow_mut()?.shared_active_dataset()?.root.clone();
+        let validated_root = root.clone();
+        let progress = progress_or_default(progress);
+        spawn_completion(
+            slf.clone().unbind(),
+            done,
+            move || dataset::validate_dataset_failures_with_progress(&root, &progress),
+            move |py, dm, result| {
+                let failures = result?;
+                if failures.is_empty() && dm.is_active_root(&validated_root) {
+                    dm.mark_validated()?;
+                }
+                Ok(failures.into_pyobject(py)?.into_any().unbind())
+            },
+        );
+        Ok(())
+    }
+
+    /// `push` on a worker thread; see `spawn_completion`.
+    #[pyo3(signature = (path, done, full=false, durability="none", readback=false, progress=None))]
+    fn push_async(
+        slf: &Bound<'_, Self>,
+        path: &str,
+        done: Py<PyAny>,
+        full: bool,
+        durability: &str,
+        readback: bool,
+        progress: Option<PyRef<'_, PyProgress>>,
+    ) -> PyResult<()> {
+        let _session = db::Session::begin();
+        let options = push_options(full, durability, readback)?;
+        let ds = slf.try_borrow_mut()?.shared_active_dataset()?;
+        let dest_root = path.to_string();
+        let progress = progress_or_default(progress);
+        spawn_completion(
+            slf.clone().unbind(),
+            done,
+            move || {
+                dataset::push_dataset_with_progress(&ds, &dest_root, options, &progress)?;
+                Ok(ds.root.clone())
+            },
+            |py, dm, result| {
+                let root = result?;
+                if dm.is_active_root(&root) {
+                    dm.mark_pushed()?;
+                }
+                Ok(py.None())
+            },
+        );
         Ok(())
     }
 
     fn remove_mission(&mut self, dataset_name: &str, mission_name: &str) -> PyResult<()> {
+        let _session = db::Session::begin();
         let info = self
             .dm.state
             .find_dataset(dataset_name)
@@ -854,6 +1633,7 @@ impl PyDataManager {
         let mut ds_state =
             dataset::load_dataset_state(&PathBuf::from(&info.root_path))?;
         dataset::remove_mission(&mut ds_state, mission_name)?;
+        self.dm.state.uncatalog_mission(dataset_name, mission_name)?;
 
         // If this is the active dataset, refresh cached state and clear active
         // mission if it was the one that was removed.
@@ -862,16 +1642,23 @@ impl PyDataManager {
                 self.dm.active_mission_name = None;
                 self.dm.state.active_mission_name = None;
             }
-            self.dm.active_dataset = Some(ds_state);
+            self.dm.active_dataset = Some(Arc::new(ds_state));
         }
 
         self.dm.state.save()?;
         Ok(())
     }
 
-    fn zip_dataset(&mut self, output_path: &str) -> PyResult<()> {
+    #[pyo3(signature = (output_path, progress=None))]
+    fn zip_dataset(
+        &mut self,
+        py: Python<'_>,
+        output_path: &str,
+        progress: Option<PyRef<'_, PyProgress>>,
+    ) -> PyResult<()> {
+        let _session = db::Session::begin();
         let mut out = PathBuf::from(output_path);
-        let ds = self.ensure_active_dataset()?;
+        let ds = self.shared_active_dataset()?;
 
         if out.extension().map(|e| e.to_ascii_lowercase()) != Some("zip".into()) {
             let ds_name = ds
@@ -886,13 +1673,96 @@ impl PyDataManager {
             fs::create_dir_all(parent)?;
         }
 
-        let ds_clone = ds.clone();
-        dataset::check_complete(&ds_clone)?;
-        dataset::create_zip(&ds_clone, &out)?;
-        Ok(())
+        let progress = progress_or_default(progress);
+        py.detach(move || archive::create_zip_with_progress(&ds, &out, &progress))
+            .map_err(PyErr::from)
+    }
+
+    /// Stream the active dataset as a tar (`format="tar"`) or zstd-compressed tar
+    /// (`format="tar.zst"`) archive to `output`, or to stdout if `output` is "-".
+    /// If `index` is given, the entry index is written there as JSON.
+    #[pyo3(signature = (output, format="tar", index=None, level=3, threads=0, progress=None))]
+    #[allow(clippy::too_many_arguments)]
+    fn export_dataset(
+        &mut self,
+        py: Python<'_>,
+        output: &str,
+        format: &str,
+        index: Option<String>,
+        level: i32,
+        threads: u32,
+        progress: Option<PyRef<'_, PyProgress>>,
+    ) -> PyResult<()> {
+        let _session = db::Session::begin();
+        let format = TarFormat::parse(format).ok_or_else(|| {
+            pyo3::exceptions::PyValueError::new_err(format!("Unknown export format: {}", format))
+        })?;
+        let options = ExportOptions { format, level, threads };
+        let ds = self.shared_active_dataset()?;
+        let output = output.to_string();
+        let progress = progress_or_default(progress);
+        py.detach(move || -> errors::Result<()> {
+            let export_index = if output == "-" {
+                let mut stdout = std::io::stdout().lock();
+                let raw = std::io::BufWriter::with_capacity(STDOUT_BUFFER, raw_stdout(&mut stdout)?);
+                export::export_tar_with_progress(&ds, raw, options, &progress)?.1
+            } else {
+                let file = std::io::BufWriter::new(fs::File::create(&output)?);
+                match export::export_tar_with_progress(&ds, file, options, &progress) {
+                    Ok((_, export_index)) => export_index,
+                    Err(e) => {
+                        let _ = fs::remove_file(&output);
+                        return Err(e);
+                    }
+                }
+            };
+            if let Some(index) = index {
+                fs::write(&index, serde_json::to_string_pretty(&export_index)?)?;
+            }
+            Ok(())
+        })
+        .map_err(PyErr::from)
+    }
+
+    /// Restore an archive written by `zip_dataset` into `output_dir` and register
+    /// the dataset.  Returns the dataset name.
+    #[pyo3(signature = (archive_path, output_dir, progress=None))]
+    fn unzip_dataset(
+        &mut self,
+        py: Python<'_>,
+        archive_path: &str,
+        output_dir: &str,
+        progress: Option<PyRef<'_, PyProgress>>,
+    ) -> PyResult<String> {
+        let _session = db::Session::begin();
+        let archive_path = PathBuf::from(archive_path);
+        let output_dir = PathBuf::from(output_dir);
+        // Refuse a dataset already registered elsewhere before extracting it.
+        let name = archive::archive_dataset_name(&archive_path)?;
+        let registered_elsewhere = self
+            .dm
+            .state
+            .find_dataset(&name)
+            .is_some_and(|info| PathBuf::from(&info.root_path).exists());
+        if registered_elsewhere {
+            return Err(pyo3::exceptions::PyRuntimeError::new_err(
+                "Dataset with that name already exists!",
+            ));
+        }
+        let progress = progress_or_default(progress);
+        let state = py.detach(move || {
+            archive::extract_zip_with_progress(&archive_path, &output_dir, &progress)
+        })?;
+        if let Err(e) = self.register_restored(&name, &state) {
+            db::release_dataset(&state.root);
+            let _ = fs::remove_dir_all(&state.root);
+            return Err(e);
+        }
+        Ok(name)
     }
 
     fn prune(&mut self) -> PyResult<Vec<String>> {
+        let _session = db::Session::begin();
         let mut to_remove: Vec<String> = Vec::new();
 
         for info in &self.dm.state.dataset_infos {
@@ -917,6 +1787,7 @@ impl PyDataManager {
             if let Some(info) = self.dm.state.find_dataset(name).cloned() {
                 let root = PathBuf::from(&info.root_path);
                 if root.exists() {
+                    db::release_dataset(&root);
                     fs::remove_dir_all(&root)?;
                 }
             }
@@ -928,6 +1799,7 @@ impl PyDataManager {
     }
 
     fn reset(&mut self) -> PyResult<()> {
+        let _session = db::Session::begin();
         let mission_name = match self.dm.active_mission_name.clone().filter(|s| !s.is_empty()) {
             Some(n) => n,
             None => return Ok(()),
@@ -935,11 +1807,9 @@ impl PyDataManager {
 
         let ds = self.ensure_active_dataset()?;
         if let Some(mission) = ds.missions.iter_mut().find(|m| m.record.name == mission_name) {
-            mission.staged_files.clear();
+            Arc::make_mut(mission).staged_files.clear();
         }
-
-        let db = DatasetDb::open(&ds.root.clone())?;
-        db.clear_mission_staged_files(&mission_name)?;
+        dataset::save_dataset_state(ds)?;
 
         self.sync_active_dataset_info();
         self.dm.state.save()?;
@@ -953,6 +1823,141 @@ impl PyDataManager {
             .map(|d| d.name.clone())
             .collect()
     }
+
+    /// List `path`, annotated against the active dataset; see `listing`.
+    /// Returns a dict per entry.
+    #[pyo3(signature = (path, recursive=false, totals=false, hash=false))]
+    fn list_dir<'py>(
+        &mut self,
+        py: Python<'py>,
+        path: &str,
+        recursive: bool,
+        totals: bool,
+        hash: bool,
+    ) -> PyResult<Vec<Bound<'py, PyDict>>> {
+        let _session = db::Session::begin();
+        let ds = match self.shared_active_dataset() {
+            Ok(ds) => Some(ds),
+            Err(E4EError::Runtime(_)) => None,
+            Err(e) => return Err(e.into()),
+        };
+        let mission_name = self.dm.active_mission_name.clone();
+        let dir = PathBuf::from(path);
+        let options = ListOptions { recursive, totals, hash };
+        let entries = py.detach(move || -> errors::Result<Vec<ListEntry>> {
+            let context = match &ds {
+                Some(ds) => ListContext::new(ds, mission_name.as_deref(), &dir)?,
+                None => ListContext::default(),
+            };
+            listing::list_dir(&dir, &context, options)
+        })?;
+        let mut rows = Vec::with_capacity(entries.len());
+        for entry in entries {
+            let d = PyDict::new(py);
+            d.set_item("path", entry.path)?;
+            d.set_item("depth", entry.depth)?;
+            d.set_item("is_dir", entry.is_dir)?;
+            d.set_item("size", entry.size)?;
+            d.set_item("files", entry.files)?;
+            d.set_item("mtime", entry.mtime)?;
+            d.set_item("tracked", entry.tracked.map(|t| t.as_str()))?;
+            d.set_item("in_dataset", entry.content.map(|c| c.as_str()))?;
+            d.set_item("unreadable", entry.unreadable)?;
+            rows.push(d);
+        }
+        Ok(rows)
+    }
+
+    /// Search the catalog of every registered dataset; see `CatalogFilter`.
+    /// Returns a dict per matching mission, or per matching file if `files`.
+    #[pyo3(signature = (
+        files=false, dataset=None, site=None, device=None, country=None, region=None,
+        start=None, end=None, properties=Vec::new(), sha256=None, path=None
+    ))]
+    #[allow(clippy::too_many_arguments)]
+    fn query<'py>(
+        &self,
+        py: Python<'py>,
+        files: bool,
+        dataset: Option<String>,
+        site: Option<String>,
+        device: Option<String>,
+        country: Option<String>,
+        region: Option<String>,
+        start: Option<String>,
+        end: Option<String>,
+        properties: Vec<(String, String)>,
+        sha256: Option<String>,
+        path: Option<String>,
+    ) -> PyResult<Vec<Bound<'py, PyDict>>> {
+        let _session = db::Session::begin();
+        let filter = CatalogFilter {
+            dataset, site, device, country, region, start, end, properties, sha256, path,
+        };
+        let mut rows = Vec::new();
+        if files {
+            for file in self.dm.state.query_files(&filter)? {
+                let d = PyDict::new(py);
+                d.set_item("dataset", file.dataset)?;
+                d.set_item("mission", file.mission)?;
+                d.set_item("path", file.path)?;
+                d.set_item("sha256", file.entry.sha256sum)?;
+                d.set_item("size", file.entry.size)?;
+                rows.push(d);
+            }
+        } else {
+            for mission in self.dm.state.query_missions(&filter)? {
+                let meta = mission.record.metadata;
+                let d = PyDict::new(py);
+                d.set_item("dataset", mission.dataset)?;
+                d.set_item("mission", mission.record.name)?;
+                d.set_item("path", mission.record.path)?;
+                d.set_item("timestamp", meta.timestamp)?;
+                d.set_item("device", meta.device)?;
+                d.set_item("country", meta.country)?;
+                d.set_item("region", meta.region)?;
+                d.set_item("site", meta.site)?;
+                d.set_item("properties", meta.properties)?;
+                d.set_item("notes", meta.notes)?;
+                rows.push(d);
+            }
+        }
+        Ok(rows)
+    }
+}
+
+/// The counts of one mission (or, for '', of the files outside every
+/// mission) in `status_summary`.
+/// Writes of an export to stdout are gathered into chunks of this size.
+const STDOUT_BUFFER: usize = 1024 * 1024;
+
+/// A second handle on stdout that bypasses the line buffering of `stdout`,
+/// which would split binary output at every newline byte.  Keep `stdout`
+/// locked while the handle is in use.
+fn raw_stdout(stdout: &mut std::io::StdoutLock<'_>) -> std::io::Result<fs::File> {
+    use std::io::Write;
+    stdout.flush()?;
+    #[cfg(unix)]
+    let handle = std::os::fd::AsFd::as_fd(&*stdout).try_clone_to_owned()?;
+    #[cfg(windows)]
+    let handle = std::os::windows::io::AsHandle::as_handle(&*stdout).try_clone_to_owned()?;
+    Ok(fs::File::from(handle))
+}
+
+fn status_counts<'py>(
+    py: Python<'py>,
+    status: &DatasetStatus,
+    mission: &str,
+) -> PyResult<Bound<'py, PyDict>> {
+    let d = PyDict::new(py);
+    d.set_item("staged", status.totals(mission, "staged"))?;
+    d.set_item("committed", status.totals(mission, "committed"))?;
+    let pushed = PyDict::new(py);
+    for stats in status.pushed(mission) {
+        pushed.set_item(&stats.destination, (stats.files, stats.bytes))?;
+    }
+    d.set_item("pushed", pushed)?;
+    Ok(d)
 }
 
 // ─────────────────────────────────────────────────────────────
@@ -964,6 +1969,96 @@ fn default_config_dir() -> PyResult<Option<String>> {
     Ok(manager::default_config_dir().map(|p: std::path::PathBuf| p.to_string_lossy().into_owned()))
 }
 
+fn parse_io_priority(priority: &str) -> PyResult<IoPriority> {
+    IoPriority::parse(priority).ok_or_else(|| {
+        pyo3::exceptions::PyValueError::new_err(format!("Unknown I/O priority: {}", priority))
+    })
+}
+
+fn push_options(full: bool, durability: &str, readback: bool) -> PyResult<PushOptions> {
+    let durability = Durability::parse(durability).ok_or_else(|| {
+        pyo3::exceptions::PyValueError::new_err(format!("Unknown durability level: {}", durability))
+    })?;
+    Ok(PushOptions { full, durability, readback })
+}
+
+/// Override the process-wide I/O limits without persisting them.  `None` leaves
+/// a setting unchanged; 0 means unlimited.  Safe to call from a progress callback.
+#[pyfunction]
+#[pyo3(signature = (bytes_per_sec=None, files_per_sec=None, priority=None))]
+fn set_io_limits(
+    bytes_per_sec: Option<u64>,
+    files_per_sec: Option<u64>,
+    priority: Option<&str>,
+) -> PyResult<()> {
+    if let Some(p) = priority {
+        throttle::set_priority(parse_io_priority(p)?);
+    }
+    let (bytes, files) = throttle::limits();
+    throttle::set_limits(bytes_per_sec.unwrap_or(bytes), files_per_sec.unwrap_or(files));
+    Ok(())
+}
+
+/// Current process-wide `(bytes_per_sec, files_per_sec, priority)`.
+#[pyfunction]
+fn io_limits() -> (u64, u64, &'static str) {
+    let (bytes, files) = throttle::limits();
+    (bytes, files, throttle::priority().as_str())
+}
+
+/// Copy the member `name` of the tar export `archive` to the file `output`,
+/// locating it through the export's JSON `index`.
+#[pyfunction]
+fn read_export_entry(py: Python<'_>, archive: &str, index: &str, name: &str, output: &str) -> PyResult<()> {
+    let export_index: ExportIndex = serde_json::from_str(&fs::read_to_string(index)?)
+        .map_err(E4EError::from)?;
+    let entry = export_index.entries.get(name).cloned().ok_or_else(|| {
+        pyo3::exceptions::PyKeyError::new_err(format!("Not in the export index: {}", name))
+    })?;
+    let archive = PathBuf::from(archive);
+    let output = PathBuf::from(output);
+    py.detach(move || -> errors::Result<()> {
+        let mut out = std::io::BufWriter::new(fs::File::create(&output)?);
+        let result = export::read_indexed_entry(&archive, &entry, &mut out)
+            .and_then(|()| Ok(std::io::Write::flush(&mut out)?));
+        if result.is_err() {
+            drop(out);
+            let _ = fs::remove_file(&output);
+        }
+        result
+    })
+    .map_err(PyErr::from)
+}
+
+/// Start recording timing spans in this process, discarding any recorded before.
+#[pyfunction]
+fn start_trace() {
+    trace::start();
+}
+
+/// Stop recording spans.  With `path`, the spans are written there as a Chrome
+/// trace (chrome://tracing, Perfetto).  Returns one dict per span name with its
+/// `count` and `total` and `max` seconds, longest total first.
+#[pyfunction]
+#[pyo3(signature = (path=None))]
+fn stop_trace<'py>(py: Python<'py>, path: Option<PathBuf>) -> PyResult<Vec<Bound<'py, PyDict>>> {
+    let spans = trace::stop();
+    if let Some(path) = path {
+        fs::write(&path, trace::chrome_trace(&spans)?)?;
+    }
+    trace::summarize(&spans)
+        .into_iter()
+        .map(|s| {
+            let d = PyDict::new(py);
+            d.set_item("name", s.name)?;
+            d.set_item("count", s.count)?;
+            d.set_item("total", s.total.as_secs_f64())?;
+            d.set_item("max", s.max.as_secs_f64())?;
+            Ok(d)
+        })
+        .collect()
+}
+
 #[pymodule]
 fn _core(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add("Incomplete", m.py().get_type::<Incomplete>())?;
@@ -977,10 +2072,20 @@ fn _core(m: &Bound<'_, PyModule>) -> PyResult<()> {
     )?;
     m.add("ReadmeNotFound", m.py().get_type::<ReadmeNotFound>())?;
     m.add("CorruptedDataset", m.py().get_type::<CorruptedDataset>())?;
+    m.add("Cancelled", m.py().get_type::<Cancelled>())?;
     m.add_class::<PyStagedFile>()?;
     m.add_class::<PyMission>()?;
     m.add_class::<PyDataset>()?;
+    m.add_class::<PyManifest>()?;
+    m.add_class::<PyManifestIter>()?;
     m.add_class::<PyDataManager>()?;
+    m.add_class::<PyCancelToken>()?;
+    m.add_class::<PyProgress>()?;
     m.add_function(wrap_pyfunction!(default_config_dir, m)?)?;
+    m.add_function(wrap_pyfunction!(set_io_limits, m)?)?;
+    m.add_function(wrap_pyfunction!(io_limits, m)?)?;
+    m.add_function(wrap_pyfunction!(read_export_entry, m)?)?;
+    m.add_function(wrap_pyfunction!(start_trace, m)?)?;
+    m.add_function(wrap_pyfunction!(stop_trace, m)?)?;
     Ok(())
 }
@@ -0,0 +1,321 @@
+// throttle.rs – process-wide I/O throttling for the copy and hash engine.
+//
+// Every file read by `manifest::copy_and_verify`, `manifest::compute_file_hash`
+// and the object-store uploader draws from two token buckets: one in bytes/sec
+// and one in files/sec.  A rate of 0 means unlimited, which costs a single
+// relaxed atomic load per call.  Rates are plain atomics, so they can be changed
+// at any time (for example from a progress callback) and take effect on the
+// next chunk.
+//
+// An optional priority hint (nice level and ioprio on Linux, a QoS class on
+// macOS) is applied lazily to each worker thread the next time it starts on a
+// file.  Only the engine's own workers are touched: rayon's pool and threads
+// marked with `mark_worker_thread`.  The thread a caller runs a synchronous
+// operation on keeps its priority, since it could not raise it back.
+
+use std::cell::Cell;
+use std::sync::atomic::{AtomicU64, AtomicU8, Ordering};
+use std::sync::Mutex;
+use std::time::{Duration, Instant};
+
+// ─────────────────────────────────────────────────────────────
+// Token bucket
+// ─────────────────────────────────────────────────────────────
+
+struct BucketState {
+    tokens: f64,
+    last: Option<Instant>,
+}
+
+/// A token bucket refilled at `rate` tokens/sec with a one-second burst.
+///
+/// Requests larger than the available tokens go into debt and sleep until the
+/// debt is repaid, so a single large request never blocks forever.
+pub struct TokenBucket {
+    rate: AtomicU64,
+    state: Mutex<BucketState>,
+}
+
+impl TokenBucket {
+    pub const fn new() -> Self {
+        TokenBucket {
+            rate: AtomicU64::new(0),
+            state: Mutex::new(BucketState { tokens: 0.0, last: None }),
+        }
+    }
+
+    /// Set the refill rate in tokens/sec (0 = unlimited).
+    pub fn set_rate(&self, rate: u64) {
+        self.rate.store(rate, Ordering::Relaxed);
+    }
+
+    pub fn rate(&self) -> u64 {
+        self.rate.load(Ordering::Relaxed)
+    }
+
+    /// Take `n` tokens, sleeping as long as needed to honour the rate.
+    pub fn acquire(&self, n: u64) {
+        let rate = self.rate();
+        if rate == 0 || n == 0 {
+            return;
+        }
+        let wait = {
+            let mut state = self.state.lock().unwrap();
+            let now = Instant::now();
+            let capacity = rate as f64;
+            state.tokens = match state.last {
+                Some(last) => {
+                    (state.tokens + now.duration_since(last).as_secs_f64() * capacity).min(capacity)
+                }
+                None => capacity,
+            };
+            state.last = Some(now);
+            state.tokens -= n as f64;
+            if state.tokens >= 0.0 {
+                return;
+            }
+            Duration::from_secs_f64(-state.tokens / capacity)
+        };
+        std::thread::sleep(wait);
+    }
+}
+
+impl Default for TokenBucket {
+    fn default() -> Self {
+        Self::new()
+    }
+}
+
+// ─────────────────────────────────────────────────────────────
+// Priority hints
+// ─────────────────────────────────────────────────────────────
+
+#[derive(Clone, Copy, Debug, PartialEq, Eq)]
+pub enum IoPriority {
+    /// Leave the scheduler alone.
+    Normal,
+    /// nice 10, best-effort I/O class at the lowest level.
+    Low,
+    /// nice 19, idle I/O class: only uses the disk when nobody else does.
+    Idle,
+}
+
+impl IoPriority {
+    pub fn parse(s: &str) -> Option<IoPriority> {
+        match s.to_ascii_lowercase().as_str() {
+            "" | "normal" => Some(IoPriority::Normal),
+            "low" => Some(IoPriority::Low),
+            "idle" => Some(IoPriority::Idle),
+            _ => None,
+        }
+    }
+
+    pub fn as_str(&self) -> &'static str {
+        match self {
+            IoPriority::Normal => "normal",
+            IoPriority::Low => "low",
+            IoPriority::Idle => "idle",
+        }
+    }
+
+    fn to_u8(self) -> u8 {
+        match self {
+            IoPriority::Normal => 0,
+            IoPriority::Low => 1,
+            IoPriority::Idle => 2,
+        }
+    }
+
+    fn from_u8(v: u8) -> IoPriority {
+        match v {
+            1 => IoPriority::Low,
+            2 => IoPriority::Idle,
+            _ => IoPriority::Normal,
+        }
+    }
+}
+
+/// Apply `priority` to the calling thread.  Failures (e.g. lacking the privilege
+/// to raise priority back to normal) are ignored: these are hints.
+#[cfg(target_os = "linux")]
+fn apply_to_current_thread(priority: IoPriority) {
+    let nice = match priority {
+        IoPriority::Normal => 0,
+        IoPriority::Low => 10,
+        IoPriority::Idle => 19,
+    };
+    const IOPRIO_WHO_PROCESS: libc::c_long = 1;
+    const IOPRIO_CLASS_SHIFT: libc::c_long = 13;
+    const IOPRIO_CLASS_BE: libc::c_long = 2;
+    const IOPRIO_CLASS_IDLE: libc::c_long = 3;
+    let ioprio = match priority {
+        IoPriority::Normal => (IOPRIO_CLASS_BE << IOPRIO_CLASS_SHIFT) | 4,
+        IoPriority::Low => (IOPRIO_CLASS_BE << IOPRIO_CLASS_SHIFT) | 7,
+        IoPriority::Idle => IOPRIO_CLASS_IDLE << IOPRIO_CLASS_SHIFT,
+    };
+    // Linux takes a thread id wherever these calls take a process id, and
+    // then changes that thread alone.
+    unsafe {
+        let tid = libc::syscall(libc::SYS_gettid);
+        libc::setpriority(libc::PRIO_PROCESS, tid as libc::id_t, nice);
+        libc::syscall(libc::SYS_ioprio_set, IOPRIO_WHO_PROCESS, tid, ioprio);
+    }
+}
+
+/// Apply `priority` to the calling thread as its QoS class, which on macOS
+/// also sets its I/O priority.  `setpriority` would renice the whole process.
+#[cfg(target_os = "macos")]
+fn apply_to_current_thread(priority: IoPriority) {
+    let class = match priority {
+        IoPriority::Normal => libc::qos_class_t::QOS_CLASS_DEFAULT,
+        IoPriority::Low => libc::qos_class_t::QOS_CLASS_UTILITY,
+        IoPriority::Idle => libc::qos_class_t::QOS_CLASS_BACKGROUND,
+    };
+    unsafe {
+        libc::pthread_set_qos_class_self_np(class, 0);
+    }
+}
+
+#[cfg(not(any(target_os = "linux", target_os = "macos")))]
+fn apply_to_current_thread(_priority: IoPriority) {}
+
+// ─────────────────────────────────────────────────────────────
+// Process-wide limits
+// ─────────────────────────────────────────────────────────────
+
+static BYTES: TokenBucket = TokenBucket::new();
+static FILES: TokenBucket = TokenBucket::new();
+static PRIORITY: AtomicU8 = AtomicU8::new(0);
+/// Bumped on every priority change so threads know to re-apply it.
+static PRIORITY_GENERATION: AtomicU64 = AtomicU64::new(0);
+
+thread_local! {
+    static APPLIED_GENERATION: Cell<u64> = const { Cell::new(0) };
+    static IS_WORKER: Cell<bool> = const { Cell::new(false) };
+}
+
+/// Let priority hints apply to the calling thread, a worker the engine started
+/// for itself.  Threads of rayon's pool count as workers without this.
+pub fn mark_worker_thread() {
+    IS_WORKER.with(|w| w.set(true));
+}
+
+fn is_worker_thread() -> bool {
+    rayon::current_thread_index().is_some() || IS_WORKER.with(Cell::get)
+}
+
+/// Set the process-wide limits (0 = unlimited).  Safe to call while an
+/// operation is running; the new rates apply from the next chunk.
+pub fn set_limits(bytes_per_sec: u64, files_per_sec: u64) {
+    BYTES.set_rate(bytes_per_sec);
+    FILES.set_rate(files_per_sec);
+}
+
+/// Current `(bytes_per_sec, files_per_sec)` limits.
+#[cfg_attr(not(feature = "python"), allow(dead_code))]
+pub fn limits() -> (u64, u64) {
+    (BYTES.rate(), FILES.rate())
+}
+
+pub fn set_priority(priority: IoPriority) {
+    PRIORITY.store(priority.to_u8(), Ordering::Relaxed);
+    PRIORITY_GENERATION.fetch_add(1, Ordering::Release);
+}
+
+pub fn priority() -> IoPriority {
+    IoPriority::from_u8(PRIORITY.load(Ordering::Relaxed))
+}
+
+/// Account for `n` bytes about to be processed.
+pub fn acquire_bytes(n: u64) {
+    BYTES.acquire(n);
+}
+
+/// Account for one file about to be processed, applying any pending priority
+/// hint to the calling thread first if it is a worker.
+pub fn acquire_file() {
+    if is_worker_thread() {
+        let generation = PRIORITY_GENERATION.load(Ordering::Acquire);
+        APPLIED_GENERATION.with(|applied| {
+            if applied.get() != generation {
+                applied.set(generation);
+                apply_to_current_thread(priority());
+            }
+        });
+    }
+    FILES.acquire(1);
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    // ── TokenBucket ──────────────────────────────────────────────
+
+    #[test]
+    fn unlimited_bucket_never_blocks() {
+        let bucket = TokenBucket::new();
+        let start = Instant::now();
+        bucket.acquire(u64::MAX / 2);
+        assert!(start.elapsed() < Duration::from_millis(50));
+    }
+
+    #[test]
+    fn first_second_of_tokens_is_a_free_burst() {
+        let bucket = TokenBucket::new();
+        bucket.set_rate(1000);
+        let start = Instant::now();
+        bucket.acquire(1000);
+        assert!(start.elapsed() < Duration::from_millis(50));
+    }
+
+    #[test]
+    fn exceeding_the_burst_sleeps_for_the_debt() {
+        let bucket = TokenBucket::new();
+        bucket.set_rate(1000);
+        bucket.acquire(1000);
+        let start = Instant::now();
+        bucket.acquire(200);
+        let elapsed = start.elapsed();
+        assert!(elapsed >= Duration::from_millis(150), "slept {:?}", elapsed);
+        assert!(elapsed < Duration::from_millis(1000), "slept {:?}", elapsed);
+    }
+
+    #[test]
+    fn rate_change_takes_effect_on_next_acquire() {
+        let bucket = TokenBucket::new();
+        bucket.set_rate(10);
+        bucket.acquire(10);
+        bucket.set_rate(0);
+        let start = Instant::now();
+        bucket.acquire(1_000_000);
+        assert!(start.elapsed() < Duration::from_millis(50));
+    }
+
+    // ── IoPriority ───────────────────────────────────────────────
+
+    #[test]
+    fn only_worker_threads_take_priority_hints() {
+        assert!(!is_worker_thread());
+        std::thread::spawn(|| {
+            mark_worker_thread();
+            assert!(is_worker_thread());
+        })
+        .join()
+        .unwrap();
+        assert!(!is_worker_thread());
+        rayon::ThreadPoolBuilder::new()
+            .num_threads(1)
+            .build()
+            .unwrap()
+            .install(|| assert!(is_worker_thread()));
+    }
+
+    #[test]
+    fn io_priority_round_trips_through_strings() {
+        for p in [IoPriority::Normal, IoPriority::Low, IoPriority::Idle] {
+            assert_eq!(IoPriority::parse(p.as_str()), Some(p));
+        }
+        assert_eq!(IoPriority::parse("urgent"), None);
+    }
+}
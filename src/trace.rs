@@ -0,0 +1,250 @@
+// trace.rs – timing spans around the hot paths, exportable as a Chrome trace.
+//
+// `span("commit.copy")` returns a guard that records, when dropped, how long it
+// lived and on which thread.  Collection is off by default, and a span then
+// costs a single relaxed atomic load and no allocation.  `start` turns it on;
+// finished spans go into a buffer of their own thread, so rayon workers do not
+// contend on a shared lock, and `stop` turns collection off and drains every
+// thread's buffer into the spans recorded since, which
+// `chrome_trace` writes in the Trace Event Format (chrome://tracing, Perfetto)
+// and `summarize` totals by name.
+//
+// Span names are `<area>.<step>`; the area becomes the trace event category.
+
+use std::cell::Cell;
+use std::collections::HashMap;
+use std::sync::atomic::{AtomicBool, AtomicU64, Ordering};
+use std::sync::{Arc, Mutex, OnceLock};
+use std::time::{Duration, Instant};
+
+use serde::Serialize;
+
+use crate::errors::Result;
+
+static ENABLED: AtomicBool = AtomicBool::new(false);
+static NEXT_THREAD: AtomicU64 = AtomicU64::new(1);
+/// When `start` was called, in nanoseconds since `clock_base`.
+static EPOCH: AtomicU64 = AtomicU64::new(0);
+/// The span buffer of every thread that has finished a span.
+static BUFFERS: Mutex<Vec<SpanBuffer>> = Mutex::new(Vec::new());
+
+type SpanBuffer = Arc<Mutex<Vec<SpanRecord>>>;
+
+thread_local! {
+    static THREAD: Cell<u64> = const { Cell::new(0) };
+    static BUFFER: SpanBuffer = {
+        let buffer = SpanBuffer::default();
+        BUFFERS.lock().unwrap().push(Arc::clone(&buffer));
+        buffer
+    };
+}
+
+fn clock_base() -> Instant {
+    static BASE: OnceLock<Instant> = OnceLock::new();
+    *BASE.get_or_init(Instant::now)
+}
+
+/// One finished span.
+#[derive(Clone, Debug)]
+#[cfg_attr(not(any(feature = "python", test)), allow(dead_code))]
+pub struct SpanRecord {
+    pub name: &'static str,
+    /// Small per-thread number, stable for the life of the process.
+    pub thread: u64,
+    /// Since `start`.
+    pub start: Duration,
+    pub duration: Duration,
+}
+
+/// A running span; records itself when dropped.
+pub struct Span {
+    name: &'static str,
+    start: Instant,
+}
+
+impl Drop for Span {
+    fn drop(&mut self) {
+        if !ENABLED.load(Ordering::Acquire) {
+            return;
+        }
+        let duration = self.start.elapsed();
+        let epoch = clock_base() + Duration::from_nanos(EPOCH.load(Ordering::Relaxed));
+        let record = SpanRecord {
+            name: self.name,
+            thread: thread_number(),
+            start: self.start.saturating_duration_since(epoch),
+            duration,
+        };
+        // The buffer is gone only while its thread is exiting; drop the span then.
+        let _ = BUFFER.try_with(|buffer| buffer.lock().unwrap().push(record));
+    }
+}
+
+fn thread_number() -> u64 {
+    THREAD.with(|t| {
+        if t.get() == 0 {
+            t.set(NEXT_THREAD.fetch_add(1, Ordering::Relaxed));
+        }
+        t.get()
+    })
+}
+
+/// Time the enclosing scope as `name` if tracing is on; bind the result to a
+/// named variable (`let _span = ...`) so it lives until the end of the scope.
+#[inline]
+pub fn span(name: &'static str) -> Option<Span> {
+    if !ENABLED.load(Ordering::Relaxed) {
+        return None;
+    }
+    Some(Span { name, start: Instant::now() })
+}
+
+/// Start recording spans, discarding any recorded before.
+#[cfg_attr(not(any(feature = "python", test)), allow(dead_code))]
+pub fn start() {
+    let base = clock_base();
+    for buffer in BUFFERS.lock().unwrap().iter() {
+        buffer.lock().unwrap().clear();
+    }
+    EPOCH.store(base.elapsed().as_nanos() as u64, Ordering::Relaxed);
+    ENABLED.store(true, Ordering::Release);
+}
+
+/// Stop recording and return the spans finished since `start`, in the order
+/// they finished.
+#[cfg_attr(not(any(feature = "python", test)), allow(dead_code))]
+pub fn stop() -> Vec<SpanRecord> {
+    ENABLED.store(false, Ordering::Relaxed);
+    let mut buffers = BUFFERS.lock().unwrap();
+    let mut spans = Vec::new();
+    for buffer in buffers.iter() {
+        spans.append(&mut buffer.lock().unwrap());
+    }
+    // A thread that has exited no longer holds its buffer.
+    buffers.retain(|buffer| Arc::strong_count(buffer) > 1);
+    spans.sort_by_key(|s| s.start + s.duration);
+    spans
+}
+
+// ─────────────────────────────────────────────────────────────
+// Export
+// ─────────────────────────────────────────────────────────────
+
+#[cfg_attr(not(any(feature = "python", test)), allow(dead_code))]
+#[derive(Serialize)]
+struct TraceEvent<'a> {
+    name: &'a str,
+    cat: &'a str,
+    ph: &'static str,
+    /// Microseconds.
+    ts: f64,
+    dur: f64,
+    pid: u32,
+    tid: u64,
+}
+
+#[cfg_attr(not(any(feature = "python", test)), allow(dead_code))]
+#[derive(Serialize)]
+struct Trace<'a> {
+    #[serde(rename = "traceEvents")]
+    trace_events: Vec<TraceEvent<'a>>,
+    #[serde(rename = "displayTimeUnit")]
+    display_time_unit: &'static str,
+}
+
+/// `spans` as Chrome Trace Event Format JSON: one complete (`X`) event each.
+#[cfg_attr(not(any(feature = "python", test)), allow(dead_code))]
+pub fn chrome_trace(spans: &[SpanRecord]) -> Result<String> {
+    let pid = std::process::id();
+    let trace = Trace {
+        trace_events: spans
+            .iter()
+            .map(|s| TraceEvent {
+                name: s.name,
+                cat: s.name.split('.').next().unwrap_or(s.name),
+                ph: "X",
+                ts: s.start.as_secs_f64() * 1e6,
+                dur: s.duration.as_secs_f64() * 1e6,
+                pid,
+                tid: s.thread,
+            })
+            .collect(),
+        display_time_unit: "ms",
+    };
+    Ok(serde_json::to_string(&trace)?)
+}
+
+/// Count, total and longest duration of the spans with one name.
+#[derive(Clone, Debug, PartialEq)]
+#[cfg_attr(not(any(feature = "python", test)), allow(dead_code))]
+pub struct SpanSummary {
+    pub name: &'static str,
+    pub count: u64,
+    pub total: Duration,
+    pub max: Duration,
+}
+
+/// `spans` totalled by name, longest total first.  Nested spans are counted
+/// in full under each name, so totals overlap.
+#[cfg_attr(not(any(feature = "python", test)), allow(dead_code))]
+pub fn summarize(spans: &[SpanRecord]) -> Vec<SpanSummary> {
+    let mut by_name: HashMap<&'static str, SpanSummary> = HashMap::new();
+    for s in spans {
+        let summary = by_name.entry(s.name).or_insert(SpanSummary {
+            name: s.name,
+            count: 0,
+            total: Duration::ZERO,
+            max: Duration::ZERO,
+        });
+        summary.count += 1;
+        summary.total += s.duration;
+        summary.max = summary.max.max(s.duration);
+    }
+    let mut summaries: Vec<SpanSummary> = by_name.into_values().collect();
+    summaries.sort_by(|a, b| b.total.cmp(&a.total).then(a.name.cmp(b.name)));
+    summaries
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn spans_are_recorded_only_while_started() {
+        // Tests share the global recording, so everything is checked in one.
+        drop(span("test.before"));
+        start();
+        {
+            let _outer = span("test.outer");
+            for _ in 0..3 {
+                let _inner = span("test.inner");
+            }
+            std::thread::spawn(|| drop(span("test.inner"))).join().unwrap();
+        }
+        let spans = stop();
+        drop(span("test.after"));
+
+        let names: Vec<&str> =
+            spans.iter().map(|s| s.name).filter(|n| n.starts_with("test.")).collect();
+        assert_eq!(names.iter().filter(|n| **n == "test.inner").count(), 4);
+        assert_eq!(names.iter().filter(|n| **n == "test.outer").count(), 1);
+        assert!(!names.contains(&"test.before") && !names.contains(&"test.after"));
+        let threads: std::collections::HashSet<u64> = spans.iter().map(|s| s.thread).collect();
+        assert!(threads.len() >= 2);
+        let end = |s: &SpanRecord| s.start + s.duration;
+        assert!(spans.windows(2).all(|w| end(&w[0]) <= end(&w[1])));
+
+        let summary = summarize(&spans);
+        let inner = summary.iter().find(|s| s.name == "test.inner").unwrap();
+        assert_eq!(inner.count, 4);
+        assert!(inner.max <= inner.total);
+
+        let json: serde_json::Value = serde_json::from_str(&chrome_trace(&spans).unwrap()).unwrap();
+        let events = json["traceEvents"].as_array().unwrap();
+        assert_eq!(events.len(), spans.len());
+        let outer = events.iter().find(|e| e["name"] == "test.outer").unwrap();
+        assert_eq!(outer["ph"], "X");
+        assert_eq!(outer["cat"], "test");
+        assert!(outer["dur"].as_f64().unwrap() >= 0.0);
+    }
+}
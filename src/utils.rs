@@ -14,6 +14,17 @@ pub fn convert_to_4space_indent(s: &str) -> String {
     result
 }
 
+/// A byte count for display, in binary units with one decimal.
+#[cfg_attr(not(feature = "python"), allow(dead_code))]
+pub fn format_size(bytes: u64) -> String {
+    for (suffix, scale) in [("GiB", 1u64 << 30), ("MiB", 1 << 20), ("KiB", 1 << 10)] {
+        if bytes >= scale {
+            return format!("{:.1} {}", bytes as f64 / scale as f64, suffix);
+        }
+    }
+    format!("{} B", bytes)
+}
+
 #[cfg(test)]
 mod tests {
     use super::*;
@@ -30,4 +41,11 @@ mod tests {
         assert_eq!(convert_to_4space_indent("{}"), "{}");
         assert_eq!(convert_to_4space_indent("{}\n"), "{}\n");
     }
+
+    #[test]
+    fn sizes_are_shown_in_binary_units() {
+        assert_eq!(format_size(512), "512 B");
+        assert_eq!(format_size(1536), "1.5 KiB");
+        assert_eq!(format_size(3 << 30), "3.0 GiB");
+    }
 }
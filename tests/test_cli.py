@@ -85,6 +85,44 @@ def test_init_mission(test_app: Tuple[Mock, DataManager, Path]):
             )
         )
 
+def test_init_mission_defaults(single_mission: Tuple[Mock, DataManager, Path]):
+    """Tests that `e4edm init mission` defaults the location to the active dataset's last one
+
+    Args:
+        single_mission (Tuple[Mock, DataManager, Path]): Single mission app
+    """
+    mock, app, _ = single_mission
+    mock.active_dataset = app.active_dataset
+
+    args = split('e4edm init mission --timestamp 2023-03-02T20:00-08:00 --device Device2 '
+                 '--name RUN002')
+    with patch('sys.argv', args):
+        main()
+        mock.initialize_mission.assert_called_once_with(
+            metadata=Metadata(
+                timestamp=dt.datetime(2023, 3, 2, 20, 0,
+                                      tzinfo=dt.timezone(dt.timedelta(hours=-8))),
+                country='USA',
+                device='Device2',
+                region='California',
+                site='SD',
+                mission='RUN002',
+                notes=''
+            )
+        )
+
+def test_version_does_not_load(test_app: Tuple[Mock, DataManager, Path]):
+    """Tests that `e4edm --version` neither loads the data manager nor the dataset
+
+    Args:
+        test_app (Tuple[Mock, DataManager, Path]): Test application
+    """
+    mock, _, _ = test_app
+    args = split('e4edm --version')
+    with patch('sys.argv', args), pytest.raises(SystemExit):
+        main()
+    mock.load.assert_not_called()
+
 def test_add_files(single_mission: Tuple[Mock, DataManager, Path],
                    test_data: Tuple[Path, int, int]):
     """Tests adding files
@@ -224,6 +262,25 @@ def test_commit_files(single_mission: Tuple[Mock, DataManager, Path],
         main()
         mock.commit.assert_called_once()
 
+def test_ingest(single_mission: Tuple[Mock, DataManager, Path],
+                test_data: Tuple[Path, int, int]):
+    """Tests that `e4edm ingest` passes each MISSION=PATH source to DataManager.ingest
+
+    Args:
+        single_mission (Tuple[Mock, DataManager, Path]): Mock App
+        test_data (Tuple[Path, int, int]): Test Data
+    """
+    mock, _, _ = single_mission
+    data_dir, _, _ = test_data
+
+    args = split(f'e4edm ingest --mission "TPF001={data_dir.as_posix()}" '
+                 f'-m "ED-00 TPF002={data_dir.as_posix()}"')
+    with patch('sys.argv', args):
+        main()
+        args, kwargs = mock.ingest.call_args
+        assert args[0] == [('TPF001', data_dir), ('ED-00 TPF002', data_dir)]
+        assert 'progress' in kwargs
+
 def test_push_files(
         single_mission_data: Tuple[Tuple[Mock, DataManager, Path], Tuple[Path, int, int]]):
     """Tests pushing files
@@ -240,7 +297,105 @@ def test_push_files(
         args = split(f'e4edm push {push_path.as_posix()}')
         with patch('sys.argv', args):
             main()
-            mock.push_with_progress.assert_called_once()
+            mock.push.assert_called_once()
+
+def test_push_io_overrides(
+        single_mission_data: Tuple[Tuple[Mock, DataManager, Path], Tuple[Path, int, int]]):
+    """Tests that per-command I/O flags override the limits before pushing
+
+    Args:
+        single_mission_data (Tuple[Tuple[Mock, DataManager, Path], Tuple[Path, int, int]]): Mock
+        App and Test Data
+    """
+    test_app, _ = single_mission_data
+    mock, _, _ = test_app
+
+    with TemporaryDirectory() as push_dir:
+        push_path = Path(push_dir)
+        args = split(f'e4edm push {push_path.as_posix()} --io-rate 50M --io-priority idle')
+        with patch('sys.argv', args):
+            main()
+            mock.set_io_limits.assert_called_once_with(bytes_per_sec=50 * 1024 * 1024,
+                                                       files_per_sec=None,
+                                                       priority='idle')
+            mock.push.assert_called_once()
+
+def test_push_durability(
+        single_mission_data: Tuple[Tuple[Mock, DataManager, Path], Tuple[Path, int, int]]):
+    """Tests that durability flags are passed through to the push
+
+    Args:
+        single_mission_data (Tuple[Tuple[Mock, DataManager, Path], Tuple[Path, int, int]]): Mock
+        App and Test Data
+    """
+    test_app, _ = single_mission_data
+    mock, _, _ = test_app
+
+    with TemporaryDirectory() as push_dir:
+        push_path = Path(push_dir)
+        args = split(f'e4edm push {push_path.as_posix()} --durability batched --readback')
+        with patch('sys.argv', args):
+            main()
+            _, kwargs = mock.push.call_args
+            assert kwargs['durability'] == 'batched'
+            assert kwargs['readback']
+
+def test_zip(
+        single_mission_data: Tuple[Tuple[Mock, DataManager, Path], Tuple[Path, int, int]]):
+    """Tests that `e4edm zip` calls DataManager.zip with the output path
+
+    Args:
+        single_mission_data (Tuple[Tuple[Mock, DataManager, Path], Tuple[Path, int, int]]): Mock
+        App and Test Data
+    """
+    test_app, _ = single_mission_data
+    mock, _, _ = test_app
+
+    with TemporaryDirectory() as zip_dir:
+        zip_path = Path(zip_dir)
+        args = split(f'e4edm zip {zip_path.as_posix()}')
+        with patch('sys.argv', args):
+            main()
+            args, _ = mock.zip.call_args
+            assert args[0] == zip_path
+
+def test_unzip(test_app: Tuple[Mock, DataManager, Path]):
+    """Tests that `e4edm unzip` calls DataManager.unzip with both paths
+
+    Args:
+        test_app (Tuple[Mock, DataManager, Path]): Test application
+    """
+    mock, _, _ = test_app
+
+    with TemporaryDirectory() as target_dir:
+        target = Path(target_dir)
+        archive = target.joinpath('dataset.zip')
+        args = split(f'e4edm unzip {archive.as_posix()} {target.as_posix()}')
+        with patch('sys.argv', args):
+            main()
+            args, _ = mock.unzip.call_args
+            assert args[0] == archive
+            assert args[1] == target
+
+def test_export_stdout(single_mission_data: Tuple[Tuple[Mock, DataManager, Path],
+                                              Tuple[Path, int, int]]):
+    """Tests that `e4edm export -` streams to stdout with the requested format
+
+    Args:
+        single_mission_data (Tuple[Tuple[Mock, DataManager, Path], Tuple[Path, int, int]]): Mock
+        App and Test Data
+    """
+    test_app, _ = single_mission_data
+    mock, _, _ = test_app
+
+    args = split('e4edm export - --format tar.zst --threads 4')
+    with patch('sys.argv', args):
+        main()
+        args, kwargs = mock.export.call_args
+        assert args[0] == '-'
+        assert kwargs['format'] == 'tar.zst'
+        assert kwargs['threads'] == 4
+        assert kwargs['index'] is None
 
 def test_add_readme(single_mission: Tuple[Mock, DataManager, Path], test_readme: Path):
     """Tests pushing readmes
@@ -285,7 +440,8 @@ def test_duplicate(
         args = split(f'e4edm duplicate {target1.as_posix()} {target2.as_posix()}')
         with patch('sys.argv', args):
             main()
-            mock.duplicate.assert_called_once_with(paths=[target1, target2])
+            mock.duplicate.assert_called_once_with(paths=[target1, target2],
+                                                   durability='none', readback=False)
 
 def test_status(test_app: Tuple[Mock, DataManager, Path]):
     """Tests the status command line interface
@@ -301,6 +457,38 @@ def test_status(test_app: Tuple[Mock, DataManager, Path]):
         main()
         mock.status.assert_called_once_with()
 
+def test_status_files(test_app: Tuple[Mock, DataManager, Path]):
+    """Tests listing a page of files with the status command
+
+    Args:
+        test_app (Tuple[Mock, DataManager, Path]): Test app
+    """
+    mock, _,_ = test_app
+
+    args = split('e4edm status --files committed --match "*.bin" --offset 10 --limit 5')
+    mock.status_files.return_value = [{'path': 'a.bin', 'sha256': '0' * 64, 'size': 1}]
+    with patch('sys.argv', args):
+        main()
+        mock.status_files.assert_called_once_with(state='committed', mission=None,
+                                                  pattern='*.bin', offset=10, limit=5)
+        mock.status.assert_not_called()
+
+def test_profile(test_app: Tuple[Mock, DataManager, Path]):
+    """Tests that --profile profiles the command and writes the trace
+
+    Args:
+        test_app (Tuple[Mock, DataManager, Path]): Test app
+    """
+    mock, _,_ = test_app
+
+    args = split('e4edm --profile trace.json status')
+    mock.stop_profiling.return_value = [{'name': 'db.load', 'count': 1, 'total': 0.5, 'max': 0.5}]
+    with patch('sys.argv', args):
+        main()
+        mock.start_profiling.assert_called_once_with()
+        mock.status.assert_called_once_with()
+        mock.stop_profiling.assert_called_once_with(Path('trace.json'))
+
 def test_list(single_mission: Tuple[Mock, DataManager, Path]):
     """Tests the list command
 
@@ -388,6 +576,26 @@ def test_set_dataset_dir(test_bare_app: Tuple[Mock, DataManager, Path]):
             main()
             assert mock.dataset_dir == temp_path
 
+@pytest.mark.parametrize('parameter,value,attribute,expected', [
+    ('io_rate', '10M', 'io_bytes_per_sec', 10 * 1024 * 1024),
+    ('io_files_rate', '25', 'io_files_per_sec', 25),
+    ('io_priority', 'Low', 'io_priority', 'low'),
+])
+def test_set_io_config(test_bare_app: Tuple[Mock, DataManager, Path],
+                       parameter: str, value: str, attribute: str, expected):
+    """Tests persisting the I/O limits through `e4edm config`
+
+    Args:
+        test_bare_app (Tuple[Mock, DataManager, Path]): Test application
+    """
+    mock, _, _ = test_bare_app
+
+    args = split(f'e4edm config {parameter} {value}')
+    with patch('sys.argv', args):
+        main()
+        assert getattr(mock, attribute) == expected
+        mock.save.assert_called_once()
+
 def test_e4edm_empty_call(test_app: Tuple[Mock, DataManager, Path]):
     """Tests calling `e4edm` and ensures that it does not result in an Exception
 
@@ -447,3 +655,96 @@ def test_list_mission(single_mission: Tuple[Mock, DataManager, Path]):
     args = split(f'e4edm list mission "{dataset_name}"')
     with patch('sys.argv', args):
         main()
+
+def test_query(test_app: Tuple[Mock, DataManager, Path]):
+    """Tests that `e4edm query` passes its conditions to DataManager.query
+
+    Args:
+        test_app (Tuple[Mock, DataManager, Path]): Test application
+    """
+    mock, _, _ = test_app
+    mock.query.return_value = []
+    args = split('e4edm query --site SD --start 2023-03-02 --end 2023-03-03T12:00-08:00 '
+                 '-p depth=5 -p tag=reef')
+    with patch('sys.argv', args):
+        main()
+        mock.query.assert_called_once_with(
+            dataset=None,
+            site='SD',
+            device=None,
+            country=None,
+            region=None,
+            start=dt.date(2023, 3, 2),
+            end=dt.datetime(2023, 3, 3, 12, 0, tzinfo=dt.timezone(dt.timedelta(hours=-8))),
+            properties={'depth': '5', 'tag': 'reef'},
+            sha256=None,
+            path=None,
+        )
+
+def test_query_files(test_app: Tuple[Mock, DataManager, Path]):
+    """Tests that `e4edm query --files` routes to DataManager.query_files
+
+    Args:
+        test_app (Tuple[Mock, DataManager, Path]): Test application
+    """
+    mock, _, _ = test_app
+    mock.query_files.return_value = []
+    args = split('e4edm query --files --path "ED-00/*.bin"')
+    with patch('sys.argv', args):
+        main()
+        mock.query_files.assert_called_once()
+        assert mock.query_files.call_args.kwargs['path'] == 'ED-00/*.bin'
+        mock.query.assert_not_called()
+
+def test_ls(test_app: Tuple[Mock, DataManager, Path], capsys: pytest.CaptureFixture):
+    """Tests that `e4edm ls` passes its options to DataManager.ls and prints the annotations
+
+    Args:
+        test_app (Tuple[Mock, DataManager, Path]): Test application
+        capsys (pytest.CaptureFixture): Captured output
+    """
+    mock, _, root_dir = test_app
+    mtime = dt.datetime(2023, 3, 2, tzinfo=dt.timezone.utc)
+    mock.ls.return_value = [
+        {'path': Path('DCIM'), 'depth': 0, 'is_dir': True, 'size': 3072, 'files': 2,
+         'mtime': mtime, 'tracked': None, 'in_dataset': None,
+         'unreadable': False},
+        {'path': Path('DCIM/a.jpg'), 'depth': 1, 'is_dir': False, 'size': 2048, 'files': None,
+         'mtime': mtime, 'tracked': 'staged', 'in_dataset': 'hash',
+         'unreadable': False},
+        {'path': Path('DCIM/b.jpg'), 'depth': 1, 'is_dir': False, 'size': 1024, 'files': None,
+         'mtime': mtime, 'tracked': None, 'in_dataset': 'size',
+         'unreadable': False},
+        {'path': Path('DCIM/c.jpg'), 'depth': 1, 'is_dir': False, 'size': None, 'files': None,
+         'mtime': mtime, 'tracked': None, 'in_dataset': None, 'unreadable': True},
+    ]
+    args = split(f'e4edm ls -R --hash "{root_dir.as_posix()}"')
+    with patch('sys.argv', args):
+        main()
+    mock.ls.assert_called_once_with(root_dir, recursive=True, totals=False, hash_files=True)
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == root_dir.as_posix()
+    assert '3.0 KiB' in lines[1] and '2 files' in lines[1] and lines[1].endswith(' DCIM/')
+    assert 'staged, duplicate' in lines[2] and lines[2].endswith('  a.jpg')
+    assert 'same size' in lines[3]
+    assert 'unreadable' in lines[4] and lines[4].endswith('  c.jpg')
+
+def test_push_rejects_negative_io_rate(
+        single_mission_data: Tuple[Tuple[Mock, DataManager, Path], Tuple[Path, int, int]]):
+    """Tests that negative I/O rates are rejected before anything is changed
+
+    Args:
+        single_mission_data (Tuple[Tuple[Mock, DataManager, Path], Tuple[Path, int, int]]): Mock
+        App and Test Data
+    """
+    test_app, _ = single_mission_data
+    mock, _, _ = test_app
+
+    with TemporaryDirectory() as push_dir:
+        push_path = Path(push_dir)
+        for flag in ('--io-rate=-5M', '--io-files-rate=-1'):
+            args = split(f'e4edm push {push_path.as_posix()} {flag}')
+            with patch('sys.argv', args), pytest.raises(SystemExit):
+                main()
+        mock.set_io_limits.assert_not_called()
+        mock.push.assert_not_called()
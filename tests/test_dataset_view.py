@@ -80,3 +80,47 @@ def test_dataset_view_sites_empty_when_no_missions(test_app: Tuple[Mock, DataMan
     assert ds.countries == set()
     assert ds.regions == set()
     assert ds.devices == set()
+
+
+def test_datasets_serve_summary(multi_mission_app: DataManager):
+    name = multi_mission_app.active_dataset.name
+    ds = multi_mission_app.datasets[name]
+    assert ds.mission_count == 2
+    assert ds.file_count == 0
+    assert ds.sites == {'SD', 'Palmyra'}
+    assert ds.devices == {'Raven', 'Anaconda'}
+    assert ds.last_validated is None
+    assert len(ds.missions) == 2
+
+
+def test_datasets_record_validation(multi_mission_app: DataManager):
+    assert multi_mission_app.validate()
+    name = multi_mission_app.active_dataset.name
+    assert multi_mission_app.datasets[name].last_validated is not None
+
+
+def test_dataset_view_caches_what_it_derives(multi_mission_app: DataManager):
+    ds = multi_mission_app.active_dataset
+    assert ds.missions is ds.missions
+    assert ds.sites is ds.sites
+    assert ds.staged_files is ds.staged_files
+    mission = ds.missions['ED-00 M001']
+    assert mission.committed_files is mission.committed_files
+    assert not hasattr(ds, '__dict__')
+    assert not hasattr(mission, '__dict__')
+
+
+def test_dataset_view_is_a_snapshot(multi_mission_app: DataManager):
+    ds = multi_mission_app.active_dataset
+    multi_mission_app.initialize_mission(
+        metadata=Metadata(
+            timestamp=dt.datetime.fromisoformat('2024-01-15T16:00:00+00:00'),
+            device='Raven',
+            country='USA',
+            region='California',
+            site='La Jolla',
+            mission='M003',
+        )
+    )
+    assert len(ds.missions) == 2
+    assert len(multi_mission_app.active_dataset.missions) == 3
@@ -0,0 +1,48 @@
+'''Tests streaming tar export
+'''
+import tarfile
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Tuple
+from unittest.mock import Mock
+
+import pytest
+
+from e4e_data_management.core import DataManager, read_export_entry
+
+SingleMissionFixture = Tuple[Tuple[Mock,
+                                   DataManager, Path], Tuple[Path, int, int]]
+
+
+@pytest.mark.parametrize('archive_format', ['tar', 'tar.zst'])
+def test_export_and_read_entry(single_mission_data: SingleMissionFixture,
+                               test_readme: Path,
+                               archive_format: str):
+    """Tests exporting to a file and reading single members back through the index
+
+    Args:
+        single_mission_data (SingleMissionFixture): Single Mission test fixture
+        test_readme (Path): Test Readme
+        archive_format (str): Export format
+    """
+    test_app, _ = single_mission_data
+    _, app, _ = test_app
+
+    app.add([test_readme], readme=True)
+    app.commit(readme=True)
+    dataset = app.active_dataset
+    with TemporaryDirectory() as target_dir:
+        archive = Path(target_dir).joinpath(f'{dataset.name}.{archive_format}')
+        app.export(archive, format=archive_format)
+        assert Path(f'{archive}.index.json').is_file()
+
+        if archive_format == 'tar':
+            with tarfile.open(archive) as handle:
+                names = handle.getnames()
+            assert names[0] == f'{dataset.name}/manifest.json'
+            assert sorted(names[1:]) == sorted(f'{dataset.name}/{key}'
+                                               for key in dataset.manifest.get_dict())
+
+        output = Path(target_dir).joinpath('readme.md')
+        read_export_entry(archive, f'{dataset.name}/{test_readme.name}', output)
+        assert output.read_bytes() == test_readme.read_bytes()
@@ -0,0 +1,111 @@
+'''Tests ingesting into several missions at once
+'''
+import datetime as dt
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Tuple
+from unittest.mock import Mock
+
+import pytest
+
+from e4e_data_management.core import DataManager, Progress
+from e4e_data_management.metadata import Metadata
+
+
+def create_missions(app: DataManager, root: Path, names: Tuple[str, ...]) -> None:
+    """Creates a dataset holding a mission per name
+
+    Args:
+        app (DataManager): Data manager
+        root (Path): Dataset directory
+        names (Tuple[str, ...]): Mission names
+    """
+    app.initialize_dataset(
+        date=dt.date(2023, 3, 2),
+        project='TestIngest',
+        location='San Diego',
+        directory=root
+    )
+    for idx, name in enumerate(names):
+        app.initialize_mission(
+            metadata=Metadata(
+                timestamp=dt.datetime.fromisoformat('2023-03-02T10:00-08:00'),
+                device=f'Device {idx}',
+                country='USA',
+                region='California',
+                site='SD',
+                mission=name
+            )
+        )
+
+
+def test_ingest_missions(test_app: Tuple[Mock, DataManager, Path],
+                         test_data: Tuple[Path, int, int]):
+    """Tests that each card is staged and committed into its own mission
+
+    Args:
+        test_app (Tuple[Mock, DataManager, Path]): Test application
+        test_data (Tuple[Path, int, int]): Test data
+    """
+    _, app, root = test_app
+    data_dir, n_files, file_size = test_data
+    create_missions(app, root, ('TIM001', 'TIM002'))
+
+    with TemporaryDirectory() as card_dir:
+        card = Path(card_dir)
+        card.joinpath('DCIM').mkdir()
+        card.joinpath('DCIM', 'image.jpg').write_bytes(b'jpeg')
+
+        progress = Progress()
+        app.ingest([('TIM001', data_dir), ('ED-00 TIM002', card)], progress=progress)
+
+    missions = app.active_dataset.missions
+    assert len(missions['ED-00 TIM001'].committed_files) == n_files
+    assert missions['ED-00 TIM002'].committed_files == [str(Path('DCIM', 'image.jpg'))]
+    assert not missions['ED-00 TIM001'].staged_files
+
+    snapshot = progress.poll()
+    assert snapshot['phase'] == 'done'
+    assert snapshot['files_total'] == n_files + 1
+    assert snapshot['bytes_total'] == n_files * file_size + 4
+
+    assert app.validate()
+    assert len(app.query_files(path='ED-00/TIM002/DCIM/*')) == 1
+
+
+def test_ingest_keeps_missions_that_succeeded(test_app: Tuple[Mock, DataManager, Path],
+                                              test_data: Tuple[Path, int, int]):
+    """Tests that a failing source does not stop the other missions
+
+    Args:
+        test_app (Tuple[Mock, DataManager, Path]): Test application
+        test_data (Tuple[Path, int, int]): Test data
+    """
+    _, app, root = test_app
+    data_dir, n_files, _ = test_data
+    create_missions(app, root, ('TIM001', 'TIM002'))
+
+    with pytest.raises(RuntimeError, match='ED-00 TIM002'):
+        app.ingest([('TIM001', data_dir), ('TIM002', data_dir / 'missing.bin')])
+
+    missions = app.active_dataset.missions
+    assert len(missions['ED-00 TIM001'].committed_files) == n_files
+    assert not missions['ED-00 TIM002'].committed_files
+
+
+def test_ingest_unknown_mission(test_app: Tuple[Mock, DataManager, Path],
+                                test_data: Tuple[Path, int, int]):
+    """Tests that nothing is ingested if a mission does not exist
+
+    Args:
+        test_app (Tuple[Mock, DataManager, Path]): Test application
+        test_data (Tuple[Path, int, int]): Test data
+    """
+    _, app, root = test_app
+    data_dir, _, _ = test_data
+    create_missions(app, root, ('TIM001',))
+
+    with pytest.raises(RuntimeError, match='Mission not found'):
+        app.ingest([('TIM001', data_dir), ('TIM009', data_dir)])
+
+    assert not app.active_dataset.missions['ED-00 TIM001'].committed_files
@@ -0,0 +1,57 @@
+'''Tests listing directories against the active dataset
+'''
+import shutil
+from pathlib import Path
+from typing import Tuple
+from unittest.mock import Mock
+
+from e4e_data_management.core import DataManager
+
+SingleMissionFixture = Tuple[Tuple[Mock,
+                                   DataManager, Path], Tuple[Path, int, int]]
+
+
+def test_ls_marks_what_the_dataset_holds(single_mission_data: SingleMissionFixture):
+    """Files are marked staged, and as duplicates by size, or by hash if asked"""
+    test_app, test_data = single_mission_data
+    _, app, root_dir = test_app
+    data_dir, _, file_size = test_data
+
+    card = root_dir / 'card'
+    card.mkdir()
+    shutil.copy(data_dir / '0000.bin', card / 'copy.bin')
+    (card / 'other.bin').write_bytes(b'\0' * file_size)
+    (card / 'new.txt').write_text('new\n', encoding='ascii')
+    app.add([card / 'new.txt'])
+
+    entries = {entry['path'].name: entry for entry in app.ls(card)}
+    assert entries['new.txt']['tracked'] == 'staged'
+    assert entries['copy.bin']['tracked'] is None
+    assert entries['copy.bin']['in_dataset'] == 'size'
+    assert entries['other.bin']['in_dataset'] == 'size'
+
+    entries = {entry['path'].name: entry for entry in app.ls(card, hash_files=True)}
+    assert entries['copy.bin']['in_dataset'] == 'hash'
+    assert entries['other.bin']['in_dataset'] is None
+
+
+def test_ls_recursive_totals(single_mission_data: SingleMissionFixture):
+    """A recursive listing of the dataset sums each directory and marks committed files"""
+    test_app, test_data = single_mission_data
+    _, app, _ = test_app
+    _, n_files, file_size = test_data
+
+    entries = app.ls(app.active_dataset.root, recursive=True)
+    by_path = {entry['path'].as_posix(): entry for entry in entries}
+    mission = by_path['ED-00/TPF001']
+    assert mission['is_dir']
+    assert mission['depth'] == 1
+    assert mission['files'] >= n_files
+    assert mission['size'] >= n_files * file_size
+    bins = [entry for entry in entries if entry['path'].suffix == '.bin']
+    assert len(bins) == n_files
+    assert all(entry['tracked'] == 'committed' for entry in bins)
+
+    flat = app.ls(app.active_dataset.root)
+    assert all(entry['depth'] == 0 for entry in flat)
+    assert next(entry for entry in flat if entry['path'].name == 'ED-00')['size'] is None
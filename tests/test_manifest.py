@@ -0,0 +1,51 @@
+'''Tests reading the dataset manifest
+'''
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Tuple
+from unittest.mock import Mock
+
+from e4e_data_management.core import DataManager
+
+SingleMissionFixture = Tuple[Tuple[Mock,
+                                   DataManager, Path], Tuple[Path, int, int]]
+
+
+def test_manifest_is_a_mapping(single_mission_data: SingleMissionFixture):
+    """Entries are looked up by path and come back as (sha256sum, size) tuples"""
+    test_app, test_data = single_mission_data
+    _, app, _ = test_app
+    _, n_files, file_size = test_data
+
+    manifest = app.active_dataset.manifest
+    assert isinstance(manifest, Mapping)
+    bins = [key for key in manifest if key.endswith('.bin')]
+    assert len(bins) == n_files
+    assert len(manifest) == len(list(manifest.keys()))
+
+    sha256sum, size = manifest[bins[0]]
+    assert size == file_size
+    assert manifest.get_dict()[bins[0]] == {'sha256sum': sha256sum, 'size': size}
+    assert bins[0] in manifest
+    assert 'missing.bin' not in manifest
+    assert manifest.get('missing.bin') is None
+    assert dict(manifest.items())[bins[0]] == (sha256sum, size)
+
+
+def test_manifest_under_directory(single_mission_data: SingleMissionFixture):
+    """A manifest narrowed to a day or mission holds only the entries below it"""
+    test_app, test_data = single_mission_data
+    _, app, _ = test_app
+    _, n_files, file_size = test_data
+
+    manifest = app.active_dataset.manifest
+    mission = manifest.under('ED-00').under('TPF001')
+    assert all(key.startswith('ED-00/TPF001/') for key in mission)
+    assert len(mission) == len(manifest.under('ED-00/TPF001'))
+    bins = [key for key in mission if key.endswith('.bin')]
+    assert len(bins) == n_files
+    assert sum(size for key, (_, size) in mission.items() if key in bins) == n_files * file_size
+    assert mission.total_bytes == sum(size for _, size in mission.values())
+    assert manifest.total_bytes >= mission.total_bytes
+    assert not manifest.under('ED-01')
+    assert bins[0] not in manifest.under('ED-01')
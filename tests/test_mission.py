@@ -1,7 +1,6 @@
 '''Mission creation tests
 '''
 import datetime as dt
-import json
 from pathlib import Path
 from typing import Tuple
 from unittest.mock import Mock
@@ -121,9 +120,7 @@ def test_create_mission(test_app: Tuple[Mock, DataManager, Path]):
     ])
     assert current_files == expected_files
 
-    manifest_path = root.joinpath('2023.03.01.TEST.San Diego', 'manifest.json')
-    with open(manifest_path, 'r', encoding='ascii') as handle:
-        manifest = json.load(handle)
+    manifest = app.active_dataset.manifest.get_dict()
 
     metadata = root.joinpath('2023.03.01.TEST.San Diego', 'ED-00', 'TCM001', 'metadata.json')
     assert metadata.relative_to(root.joinpath('2023.03.01.TEST.San Diego')).as_posix() in manifest
@@ -0,0 +1,43 @@
+'''Tests for profiling operations
+'''
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Tuple
+from unittest.mock import Mock
+
+from e4e_data_management.core import DataManager
+
+
+def test_profile_records_spans(single_mission: Tuple[Mock, DataManager, Path],
+                               test_data: Tuple[Path, int, int]):
+    """Spans recorded while profiling are summarized by name and written as a Chrome trace
+
+    Args:
+        single_mission (Tuple[Mock, DataManager, Path]): Single mission test app
+        test_data (Tuple[Path, int, int]): Test data
+    """
+    _, app, _ = single_mission
+    data_dir, n_files, _ = test_data
+
+    with TemporaryDirectory() as tmp:
+        trace_path = Path(tmp) / 'trace.json'
+        DataManager.start_profiling()
+        app.add(sorted(data_dir.glob('*.bin')))
+        app.commit()
+        summary = DataManager.stop_profiling(trace_path)
+
+        spans = {span['name']: span for span in summary}
+        assert spans['stage.hash']['count'] == n_files
+        assert spans['commit.copy']['count'] == n_files
+        assert 'db.transaction' in spans
+        assert all(span['max'] <= span['total'] for span in summary)
+        totals = [span['total'] for span in summary]
+        assert totals == sorted(totals, reverse=True)
+
+        events = json.loads(trace_path.read_text(encoding='utf-8'))['traceEvents']
+        assert len(events) == sum(span['count'] for span in summary)
+        assert {event['cat'] for event in events} >= {'stage', 'commit', 'db'}
+
+    app.validate()
+    assert DataManager.stop_profiling() == []
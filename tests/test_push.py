@@ -1,5 +1,6 @@
 '''Tests pushing files
 '''
+import asyncio
 import json
 from pathlib import Path
 from tempfile import TemporaryDirectory
@@ -8,8 +9,9 @@ from unittest.mock import Mock
 
 import pytest
 
-from e4e_data_management.core import DataManager
+from e4e_data_management.core import CancelToken, DataManager, Progress
 from e4e_data_management.data import Dataset
+from e4e_data_management.exception import Cancelled
 
 
 def test_push(single_mission_data: Tuple[Tuple[Mock, DataManager, Path], Tuple[Path, int, int]],
@@ -142,6 +144,38 @@ def test_pushed_dataset_passes_validate(
         assert ds.validate_failures() == []
 
 
+def test_push_destination_validates_repeatedly(
+        single_mission_data: Tuple[Tuple[Mock, DataManager, Path], Tuple[Path, int, int]],
+        test_readme: Path):
+    """Validating a pushed copy reads its manifest.json and leaves no database behind, so
+    it can be loaded and validated again, also after a second push"""
+    test_app, test_data = single_mission_data
+    _, app, _ = test_app
+    data_dir, _, _ = test_data
+
+    app.add([test_readme], readme=True)
+    app.commit(readme=True)
+
+    with TemporaryDirectory() as push_dir:
+        push_path = Path(push_dir)
+        app.push(push_path)
+        dest = push_path / app.active_dataset.name
+
+        for _ in range(2):
+            assert Dataset.load(path=dest).validate_failures() == []
+            assert not (dest / '.e4edm.db').exists()
+
+        new_file = data_dir / 'late.bin'
+        new_file.write_bytes((data_dir / '0000.bin').read_bytes()[::-1])
+        app.add([new_file])
+        app.commit()
+        app.push(push_path)
+
+        assert Dataset.load(path=dest).validate_failures() == []
+        assert not (dest / '.e4edm.db').exists()
+        assert any(path.endswith('late.bin') for path in Dataset.load(path=dest).manifest.get_dict())
+
+
 def test_push_fails_when_destination_has_extra_file(
         single_mission_data: Tuple[Tuple[Mock, DataManager, Path], Tuple[Path, int, int]],
         test_readme: Path):
@@ -162,5 +196,172 @@ def test_push_fails_when_destination_has_extra_file(
         extra = dest / 'extra_file.bin'
         extra.write_bytes(b'not in manifest')
 
+        with pytest.raises(RuntimeError):
+            app.push(push_path, full=True)
+
+
+def test_incremental_push_fails_on_extra_file_beside_new_files(
+        single_mission_data: Tuple[Tuple[Mock, DataManager, Path], Tuple[Path, int, int]],
+        test_readme: Path):
+    """An incremental push checks the directories it writes into for unlisted files"""
+    test_app, test_data = single_mission_data
+    _, app, _ = test_app
+    data_dir, _, _ = test_data
+
+    app.add([test_readme], readme=True)
+    app.commit(readme=True)
+
+    with TemporaryDirectory() as push_dir:
+        push_path = Path(push_dir)
+        app.push(push_path)
+
+        dest = push_path / app.active_dataset.name
+        with open(dest / 'manifest.json', encoding='ascii') as f:
+            manifest = json.load(f)
+        data_key = next(key for key in manifest if key.endswith('.bin'))
+        (dest / data_key).parent.joinpath('extra_file.bin').write_bytes(b'not in manifest')
+
+        new_file = data_dir / 'late.bin'
+        new_file.write_bytes((data_dir / '0000.bin').read_bytes()[::-1])
+        app.add([new_file])
+        app.commit()
+
         with pytest.raises(RuntimeError):
             app.push(push_path)
+
+
+def test_repeated_push_only_verifies_new_files(
+        single_mission_data: Tuple[Tuple[Mock, DataManager, Path], Tuple[Path, int, int]],
+        test_readme: Path):
+    """A repeat push trusts the push ledger for files it already verified, while a
+    full push re-checks and repairs them"""
+    test_app, _ = single_mission_data
+    _, app, _ = test_app
+
+    app.add([test_readme], readme=True)
+    app.commit(readme=True)
+
+    with TemporaryDirectory() as push_dir:
+        push_path = Path(push_dir)
+        app.push(push_path)
+
+        dest = push_path / app.active_dataset.name
+        with open(dest / 'manifest.json', encoding='ascii') as f:
+            manifest = json.load(f)
+        data_key = next(key for key in manifest if key.endswith('.bin'))
+        pushed_file = dest / data_key
+        original = pushed_file.read_bytes()
+        pushed_file.write_bytes(b'tampered')
+
+        app.push(push_path)
+        assert pushed_file.read_bytes() == b'tampered'
+
+        app.push(push_path, full=True)
+        assert pushed_file.read_bytes() == original
+
+
+@pytest.mark.parametrize('durability', ['batched', 'full'])
+def test_durable_push_with_readback(
+        single_mission_data: Tuple[Tuple[Mock, DataManager, Path], Tuple[Path, int, int]],
+        test_readme: Path,
+        durability: str):
+    """A durable push with read-back verification produces a valid copy"""
+    test_app, _ = single_mission_data
+    _, app, _ = test_app
+
+    app.add([test_readme], readme=True)
+    app.commit(readme=True)
+
+    with TemporaryDirectory() as push_dir:
+        push_path = Path(push_dir)
+        app.push(push_path, durability=durability, readback=True)
+
+        ds = Dataset.load(path=push_path / app.active_dataset.name)
+        assert ds.validate_failures() == []
+
+
+def test_push_rejects_unknown_durability(
+        single_mission_data: Tuple[Tuple[Mock, DataManager, Path], Tuple[Path, int, int]],
+        test_readme: Path):
+    """An unknown durability level is rejected before anything is copied"""
+    test_app, _ = single_mission_data
+    _, app, _ = test_app
+
+    app.add([test_readme], readme=True)
+    app.commit(readme=True)
+
+    with TemporaryDirectory() as push_dir:
+        push_path = Path(push_dir)
+        with pytest.raises(ValueError):
+            app.push(push_path, durability='eventually')
+        assert not (push_path / app.active_dataset.name).exists()
+
+
+def test_push_reports_native_progress(
+        single_mission_data: Tuple[Tuple[Mock, DataManager, Path], Tuple[Path, int, int]],
+        test_readme: Path):
+    """A progress handle sees every phase of the push and ends complete"""
+    test_app, _ = single_mission_data
+    _, app, _ = test_app
+
+    app.add([test_readme], readme=True)
+    app.commit(readme=True)
+
+    phases = []
+    progress = Progress(lambda snapshot: phases.append(snapshot['phase']), interval=3600)
+    with TemporaryDirectory() as push_dir:
+        app.push(Path(push_dir), progress=progress)
+
+    snapshot = progress.poll()
+    assert snapshot['phase'] == 'done'
+    assert snapshot['files_done'] == snapshot['files_total']
+    assert [p for i, p in enumerate(phases) if i == 0 or phases[i - 1] != p] == \
+        ['hash', 'copy', 'verify', 'done']
+    # Throttled: phase changes and the last file of each phase only.
+    assert len(phases) <= 7
+
+
+def test_push_async(
+        single_mission_data: Tuple[Tuple[Mock, DataManager, Path], Tuple[Path, int, int]],
+        test_readme: Path):
+    """An awaited push completes from the worker thread and marks the dataset pushed"""
+    test_app, _ = single_mission_data
+    _, app, _ = test_app
+
+    app.add([test_readme], readme=True)
+    app.commit(readme=True)
+
+    with TemporaryDirectory() as push_dir:
+        push_path = Path(push_dir)
+        asyncio.run(app.push_async(push_path))
+
+        ds = Dataset.load(path=push_path / app.active_dataset.name)
+        assert ds.validate_failures() == []
+    assert app.active_dataset.pushed
+    assert asyncio.run(app.validate_failures_async()) == []
+
+
+def test_cancelled_push_async_leaves_no_manifest(
+        single_mission_data: Tuple[Tuple[Mock, DataManager, Path], Tuple[Path, int, int]],
+        test_readme: Path):
+    """A cancelled push raises Cancelled, leaves no temp files and can be resumed"""
+    test_app, _ = single_mission_data
+    _, app, _ = test_app
+
+    app.add([test_readme], readme=True)
+    app.commit(readme=True)
+
+    cancel = CancelToken()
+    cancel.cancel()
+    with TemporaryDirectory() as push_dir:
+        push_path = Path(push_dir)
+        with pytest.raises(Cancelled):
+            asyncio.run(app.push_async(push_path, cancel=cancel))
+
+        dest = push_path / app.active_dataset.name
+        assert not dest.joinpath('manifest.json').exists()
+        assert not list(push_path.rglob('*.e4edm_tmp'))
+        assert not app.active_dataset.pushed
+
+        asyncio.run(app.push_async(push_path))
+        assert Dataset.load(path=dest).validate_failures() == []
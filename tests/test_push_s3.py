@@ -0,0 +1,162 @@
+'''Tests pushing to an S3-compatible object store (moto stand-in)
+'''
+import hashlib
+import json
+from pathlib import Path
+from threading import Thread
+from typing import Any, Callable, Iterable, List, Tuple
+from unittest.mock import Mock
+
+import pytest
+
+from e4e_data_management.core import DataManager
+
+boto3 = pytest.importorskip('boto3')
+moto_server = pytest.importorskip('moto.server')
+serving = pytest.importorskip('werkzeug.serving')
+
+BUCKET = 'e4e-archive'
+
+
+class RequestLog:
+    """WSGI middleware that records the method and path of every request
+    """
+    def __init__(self, app: Callable[..., Iterable[bytes]]):
+        self.app = app
+        self.requests: List[Tuple[str, str]] = []
+
+    def __call__(self, environ: dict, start_response: Callable[..., Any]) -> Iterable[bytes]:
+        self.requests.append((environ['REQUEST_METHOD'], environ.get('PATH_INFO', '')))
+        return self.app(environ, start_response)
+
+    def paths(self, method: str) -> List[str]:
+        """Paths requested with `method`, in order
+
+        Args:
+            method (str): HTTP method
+
+        Returns:
+            List[str]: Request paths
+        """
+        return [path for request_method, path in self.requests if request_method == method]
+
+
+@pytest.fixture(name='s3_server')
+def create_s3_server(monkeypatch: pytest.MonkeyPatch):
+    """Starts a local moto S3 server with an empty bucket
+
+    Yields:
+        Tuple[S3.Client, RequestLog]: boto3 client pointed at the server, and the
+        requests it has received
+    """
+    log = RequestLog(moto_server.DomainDispatcherApplication(moto_server.create_backend_app))
+    server = serving.make_server('127.0.0.1', 0, log, threaded=True)
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    endpoint = f'http://127.0.0.1:{server.server_port}'
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'testing')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'testing')
+    monkeypatch.setenv('AWS_REGION', 'us-east-1')
+    monkeypatch.setenv('AWS_ENDPOINT_URL', endpoint)
+    client = boto3.client('s3', endpoint_url=endpoint, region_name='us-east-1')
+    client.create_bucket(Bucket=BUCKET)
+    yield client, log
+    server.shutdown()
+    thread.join()
+
+
+@pytest.fixture(name='s3')
+def create_s3(s3_server):
+    """The boto3 client of a local moto S3 server with an empty bucket
+
+    Returns:
+        S3.Client: boto3 client pointed at the server
+    """
+    client, _ = s3_server
+    return client
+
+
+def test_push_to_object_store(
+        single_mission_data: Tuple[Tuple[Mock, DataManager, Path], Tuple[Path, int, int]],
+        test_readme: Path,
+        s3):
+    """Every manifest entry is uploaded with its hash and manifest.json is written"""
+    test_app, _ = single_mission_data
+    _, app, _ = test_app
+
+    app.add([test_readme], readme=True)
+    app.commit(readme=True)
+    app.push(f's3://{BUCKET}/deployments')
+
+    prefix = f'deployments/{app.active_dataset.name}/'
+    body = s3.get_object(Bucket=BUCKET, Key=prefix + 'manifest.json')['Body'].read()
+    manifest = json.loads(body)
+    assert manifest == app.active_dataset.manifest.get_dict()
+
+    for rel_path, entry in manifest.items():
+        head = s3.head_object(Bucket=BUCKET, Key=prefix + rel_path)
+        assert head['Metadata']['sha256'] == entry['sha256sum']
+        assert head['ContentLength'] == entry['size']
+    assert app.active_dataset.pushed
+
+
+def test_repeated_push_skips_existing_objects(
+        single_mission_data: Tuple[Tuple[Mock, DataManager, Path], Tuple[Path, int, int]],
+        test_readme: Path,
+        s3_server):
+    """A second push uploads nothing but the manifest"""
+    test_app, _ = single_mission_data
+    _, app, _ = test_app
+    _, log = s3_server
+
+    app.add([test_readme], readme=True)
+    app.commit(readme=True)
+    log.requests.clear()
+    app.push(f's3://{BUCKET}')
+    manifest_key = f'/{BUCKET}/{app.active_dataset.name}/manifest.json'
+    uploads = log.paths('PUT')
+    assert len(uploads) == len(app.active_dataset.manifest.get_dict()) + 1
+    assert uploads[-1] == manifest_key
+
+    log.requests.clear()
+    app.push(f's3://{BUCKET}')
+    assert log.paths('PUT') == [manifest_key]
+
+
+def test_push_to_object_store_rejects_conflicting_manifest(
+        single_mission_data: Tuple[Tuple[Mock, DataManager, Path], Tuple[Path, int, int]],
+        test_readme: Path,
+        s3):
+    """A destination manifest that disagrees with the source aborts the push"""
+    test_app, _ = single_mission_data
+    _, app, _ = test_app
+
+    app.add([test_readme], readme=True)
+    app.commit(readme=True)
+    conflicting = {'readme.md': {'sha256sum': hashlib.sha256(b'other').hexdigest(), 'size': 5}}
+    s3.put_object(Bucket=BUCKET, Key=f'{app.active_dataset.name}/manifest.json',
+                  Body=json.dumps(conflicting).encode())
+
+    with pytest.raises(RuntimeError):
+        app.push(f's3://{BUCKET}')
+
+
+def test_push_to_object_store_rejects_unlisted_object_before_uploading(
+        single_mission_data: Tuple[Tuple[Mock, DataManager, Path], Tuple[Path, int, int]],
+        test_readme: Path,
+        s3_server):
+    """An object under the prefix that is not in the manifest aborts the push before
+    any upload"""
+    test_app, _ = single_mission_data
+    _, app, _ = test_app
+    s3, log = s3_server
+
+    app.add([test_readme], readme=True)
+    app.commit(readme=True)
+    s3.put_object(Bucket=BUCKET, Key=f'{app.active_dataset.name}/extra_file.bin',
+                  Body=b'not in manifest')
+    log.requests.clear()
+
+    with pytest.raises(RuntimeError):
+        app.push(f's3://{BUCKET}')
+    assert log.paths('PUT') == []
@@ -0,0 +1,99 @@
+'''Tests the catalog of missions and files across datasets'''
+import datetime as dt
+from pathlib import Path
+from typing import Tuple
+from unittest.mock import Mock
+
+from e4e_data_management.core import DataManager
+from e4e_data_management.data import Dataset
+from e4e_data_management.metadata import Metadata
+
+
+def _make_mission(app: DataManager, name: str, timestamp: str, site: str, **properties) -> str:
+    app.initialize_mission(
+        metadata=Metadata(
+            timestamp=dt.datetime.fromisoformat(timestamp),
+            device='Device1',
+            country='USA',
+            region='California',
+            site=site,
+            mission=name,
+            properties=properties,
+        )
+    )
+    return app.active_mission.name
+
+
+def _make_datasets(app: DataManager, root: Path) -> None:
+    for project, site in (('TEST', 'SD'), ('OTHER', 'LA')):
+        app.initialize_dataset(
+            date=dt.date(2023, 3, 2),
+            project=project,
+            location='San Diego',
+            directory=root,
+        )
+        _make_mission(app, 'M1', '2023-03-02T22:00-08:00', site, depth=5)
+        _make_mission(app, 'M2', '2023-03-03T09:00-08:00', 'SD', depth=9, night=False)
+
+
+def test_query_filters_missions_across_datasets(test_app: Tuple[Mock, DataManager, Path]):
+    """Missions of every registered dataset are searched"""
+    _, app, root = test_app
+    _make_datasets(app, root)
+
+    found = app.query(site='SD')
+    assert {(row['dataset'], row['mission']) for row in found} == {
+        ('2023.03.02.TEST.San Diego', 'ED-00 M1'),
+        ('2023.03.02.TEST.San Diego', 'ED-01 M2'),
+        ('2023.03.02.OTHER.San Diego', 'ED-01 M2'),
+    }
+    assert found[0]['properties']['depth'] in (5, 9)
+
+
+def test_query_by_date_and_properties(test_app: Tuple[Mock, DataManager, Path]):
+    """Dates bound the local mission date and properties are matched as JSON"""
+    _, app, root = test_app
+    _make_datasets(app, root)
+
+    on_day_0 = app.query(start=dt.date(2023, 3, 2), end=dt.date(2023, 3, 2))
+    assert {row['mission'] for row in on_day_0} == {'ED-00 M1'}
+    assert len(on_day_0) == 2
+
+    before_utc_midnight = app.query(end=dt.datetime(2023, 3, 3, tzinfo=dt.timezone.utc))
+    assert not before_utc_midnight
+
+    deep = app.query(properties={'depth': 9, 'night': False})
+    assert {row['mission'] for row in deep} == {'ED-01 M2'}
+    assert len(deep) == 2
+
+
+def test_query_files_after_commit(test_app: Tuple[Mock, DataManager, Path],
+                                  test_data: Tuple[Path, int, int]):
+    """Committed files are catalogued with their hashes"""
+    _, app, root = test_app
+    data_dir, n_files, _ = test_data
+    _make_datasets(app, root)
+    app.add(data_dir.rglob('*.bin'))
+    app.commit()
+
+    files = app.query_files(path='ED-01/M2/*.bin')
+    assert len(files) == n_files
+    assert all(row['dataset'] == '2023.03.02.OTHER.San Diego' for row in files)
+
+    dataset = Dataset.load(root / '2023.03.02.OTHER.San Diego')
+    entry = files[0]
+    expected = dataset.manifest.get_dict()[entry['path']]
+    assert entry['sha256'] == expected['sha256sum']
+    assert [row['mission'] for row in app.query(sha256=entry['sha256'])] == ['ED-01 M2']
+
+
+def test_query_drops_removed_missions(test_app: Tuple[Mock, DataManager, Path]):
+    """Removed missions and their files leave the catalog"""
+    _, app, root = test_app
+    _make_datasets(app, root)
+    dataset_name = app.active_dataset.name
+
+    app.remove_mission(dataset_name, 'ED-01 M2')
+
+    assert not app.query(dataset=dataset_name, site='SD')
+    assert not app.query_files(dataset=dataset_name, path='ED-01/*')
@@ -1,6 +1,5 @@
 '''Integration tests for the rm mission command'''
 import datetime as dt
-import json
 from pathlib import Path
 from typing import Tuple
 from unittest.mock import Mock
@@ -72,15 +71,12 @@ def test_rm_mission_updates_manifest(test_app: Tuple[Mock, DataManager, Path],
     app.add(bin_files)
     app.commit()
 
-    manifest_path = root / dataset_name / 'manifest.json'
-    with open(manifest_path, encoding='ascii') as f:
-        before = json.load(f)
+    before = app.datasets[dataset_name].manifest.get_dict()
     assert any('ED-00/M1' in k for k in before)
 
     app.remove_mission(dataset_name, 'ED-00 M1')
 
-    with open(manifest_path, encoding='ascii') as f:
-        after = json.load(f)
+    after = app.datasets[dataset_name].manifest.get_dict()
     assert not any('ED-00/M1' in k for k in after)
 
 
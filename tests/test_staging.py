@@ -1,12 +1,13 @@
 '''Data staging tests
 '''
+import asyncio
 import datetime as dt
 import os
 from pathlib import Path
 from typing import Tuple
 from unittest.mock import Mock
 
-from e4e_data_management.core import DataManager
+from e4e_data_management.core import DataManager, Progress
 from e4e_data_management.metadata import Metadata
 
 
@@ -153,3 +154,42 @@ def test_relative_path(test_app: Tuple[Mock, DataManager, Path], test_data: Tupl
                              'ED-00',
                              'test_relative_path',
                              '0000.bin').exists()
+
+
+def test_stage_commit_files_async(single_mission: Tuple[Mock, DataManager, Path],
+                                  test_data: Tuple[Path, int, int]):
+    """Awaited add and commit update the active mission like their blocking versions
+    """
+    _, app, _ = single_mission
+    data_dir, n_files, file_size = test_data
+
+    progress = Progress()
+    asyncio.run(app.add_async(data_dir.rglob('*.bin'), progress=progress))
+    assert len(app.active_mission.staged_files) == n_files
+    assert progress.poll()['phase'] == 'done'
+
+    progress = Progress()
+    asyncio.run(app.commit_async(progress=progress))
+    assert len(app.active_mission.staged_files) == 0
+    assert len(app.active_mission.committed_files) == n_files
+    assert progress.poll()['bytes_done'] == n_files * file_size
+    assert app.validate()
+
+
+def test_sync_add_during_async_add_is_kept(single_mission: Tuple[Mock, DataManager, Path],
+                                           test_data: Tuple[Path, int, int],
+                                           test_readme: Path):
+    """A blocking call made while an awaited add runs is not lost when the add completes
+    """
+    _, app, _ = single_mission
+    data_dir, n_files, _ = test_data
+
+    async def add_both():
+        task = asyncio.create_task(app.add_async(data_dir.rglob('*.bin')))
+        await asyncio.sleep(0)
+        app.add([test_readme], readme=True)
+        await task
+
+    asyncio.run(add_both())
+    assert len(app.active_mission.staged_files) == n_files
+    assert len(app.active_dataset.staged_files) == 1
@@ -7,6 +7,9 @@ from unittest.mock import Mock
 
 from e4e_data_management.core import DataManager
 
+SingleMissionFixture = Tuple[Tuple[Mock,
+                                   DataManager, Path], Tuple[Path, int, int]]
+
 
 def test_readme_staging(single_mission: Tuple[Mock, DataManager, Path], test_readme: Path):
     """Tests that a staged README file is displayed in the status output
@@ -26,3 +29,51 @@ def test_readme_staging(single_mission: Tuple[Mock, DataManager, Path], test_rea
     matches = re.findall(regex, status_output, re.MULTILINE | re.IGNORECASE)
 
     assert len(matches) != 0
+
+
+def test_status_summary_counts(single_mission_data: SingleMissionFixture):
+    """The summary counts each mission's committed files and bytes
+
+    Args:
+        single_mission_data (SingleMissionFixture): Single mission with committed data
+    """
+    test_app, test_data = single_mission_data
+    _, app, _ = test_app
+    _, n_files, file_size = test_data
+
+    summary = app.status_summary()
+    assert summary['mission'] == 'ED-00 TPF001'
+    counts = summary['missions']['ED-00 TPF001']
+    assert counts['staged'] == (0, 0)
+    committed_files, committed_bytes = counts['committed']
+    assert committed_files >= n_files
+    assert committed_bytes >= n_files * file_size
+    assert counts['pushed'] == {}
+    assert 'ED-00 TPF001' in app.status()
+
+
+def test_status_files_pages(single_mission: Tuple[Mock, DataManager, Path],
+                            test_data: Tuple[Path, int, int]):
+    """Staged and committed files are listed a page at a time, optionally matching a glob
+
+    Args:
+        single_mission (Tuple[Mock, DataManager, Path]): Single mission test app
+        test_data (Tuple[Path, int, int]): Test data
+    """
+    _, app, _ = single_mission
+    data_dir, n_files, file_size = test_data
+
+    app.add(sorted(data_dir.glob('*.bin')))
+    page = app.status_files(limit=10)
+    assert len(page) == 10
+    assert all(row['size'] == file_size for row in page)
+    assert all(row['origin_path'].name == row['path'] for row in page)
+    rest = app.status_files(offset=10, limit=n_files)
+    assert len(rest) == n_files - 10
+    assert {row['path'] for row in page}.isdisjoint(row['path'] for row in rest)
+    assert [row['path'] for row in app.status_files(pattern='0000.bin')] == ['0000.bin']
+
+    app.commit()
+    assert app.status_files() == []
+    committed = app.status_files('committed', pattern='*.bin', limit=n_files)
+    assert sorted(row['path'] for row in committed) == [f'{idx:04d}.bin' for idx in range(n_files)]
@@ -5,7 +5,11 @@ from tempfile import TemporaryDirectory
 from typing import Tuple
 from unittest.mock import Mock
 import zipfile
+
+import pytest
+
 from e4e_data_management.core import DataManager
+from e4e_data_management.data import Manifest
 
 SingleMissionFixture = Tuple[Tuple[Mock,
                                    DataManager, Path], Tuple[Path, int, int]]
@@ -34,14 +38,70 @@ def test_zip_to_dir(single_mission_data: SingleMissionFixture,
         with zipfile.ZipFile(file=final_path, mode='r') as handle:
             assert handle.testzip() is None
             manifest = app.active_dataset.manifest.get_dict()
-            for name in handle.filelist:
-                ar_name = Path(name.filename).relative_to(
-                    app.active_dataset.name)
-                assert ar_name.as_posix() in manifest
+            names = [Path(name.filename).relative_to(app.active_dataset.name).as_posix()
+                     for name in handle.filelist]
+            assert names[0] == 'manifest.json'
+            assert sorted(names[1:]) == sorted(manifest)
 
             handle.extractall(target_dir)
 
-            app.active_dataset.manifest.validate(
+            root = app.active_dataset.root
+            Manifest(root / 'manifest.json', root).validate(
                 manifest=manifest,
                 files=Path(app.active_dataset.name).rglob('*')
             )
+
+
+def test_unzip_restores_dataset(single_mission_data: SingleMissionFixture,
+                                test_readme: Path):
+    """Tests that an archive restores into a registered, valid dataset
+
+    Args:
+        single_mission(SingleMissionFixture): Single Mission test fixture
+        test_readme (Path): Test Readme
+    """
+    test_app, _ = single_mission_data
+    _, app, _ = test_app
+
+    app.add([test_readme], readme=True)
+    app.commit(readme=True)
+    dataset_name = app.active_dataset.name
+    with TemporaryDirectory() as target_dir, TemporaryDirectory() as config_dir:
+        zip_path = Path(target_dir)
+        app.zip(zip_path)
+
+        other = DataManager(app_config_dir=Path(config_dir))
+        restore_path = zip_path.joinpath('restore')
+        name = other.unzip(zip_path.joinpath(dataset_name + '.zip'), restore_path)
+        assert name == dataset_name
+        assert dataset_name in other.datasets
+
+        other.activate(dataset_name)
+        assert other.active_dataset.root == restore_path.joinpath(dataset_name)
+        assert other.validate()
+        assert len(other.active_dataset.missions) == len(app.active_dataset.missions)
+
+
+def test_unzip_refuses_registered_dataset(single_mission_data: SingleMissionFixture,
+                                          test_readme: Path):
+    """Tests that restoring a dataset registered elsewhere fails before extracting anything
+
+    Args:
+        single_mission(SingleMissionFixture): Single Mission test fixture
+        test_readme (Path): Test Readme
+    """
+    test_app, _ = single_mission_data
+    _, app, _ = test_app
+
+    app.add([test_readme], readme=True)
+    app.commit(readme=True)
+
+    dataset_name = app.active_dataset.name
+    with TemporaryDirectory() as target_dir:
+        zip_path = Path(target_dir)
+        app.zip(zip_path)
+
+        restore_path = zip_path.joinpath('restore')
+        with pytest.raises(RuntimeError):
+            app.unzip(zip_path.joinpath(dataset_name + '.zip'), restore_path)
+        assert not restore_path.joinpath(dataset_name).exists()